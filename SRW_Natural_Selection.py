@@ -1,34 +1,19 @@
+import argparse
+import math
 import pygame
-import random
 import sys
-import matplotlib.pyplot as plt
-from matplotlib.ticker import MaxNLocator, FuncFormatter
-
-# Inicializar Pygame
-pygame.init()
-
-#  PARÁMETROS CONFIGURABLES DE LA SIMULACIÓN 
-ANCHO_VENTANA = 1000
-ALTO_VENTANA = 750
-MARGEN = 50
-TAMANO_PASO = 20  # Tamaño de cada paso en píxeles
-PASOS_POR_VIDA = 100  # Número de pasos que puede dar cada partícula
-DURACION_DIA = 300  # Pasos del día (>PASOS_POR_VIDA)
-PORCENTAJE_COMIDA = 20  # Porcentaje del mapa con comida (valor por defecto)
-NUM_DIAS = 30  # Número de días a simular (valor por defecto)
-TAMANO_CELDA = 20  
-
-# Parámetros de DEPREDADORES
-NUM_DEPREDADORES = 5  # Número de depredadores que aparecen en día de purga
-FRECUENCIA_PURGA = 3  # Cada cuántos días aparecen los depredadores
-RADIO_VISION_DEPREDADOR = 5 * 20  # 5 pasos de visión para depredadores (100 píxeles)
-RADIO_VISION_PRESA = 3 * 20  # 3 pasos de visión para presas (60 píxeles)
-VELOCIDAD_DEPREDADOR = 2 
-
-# Parámetros de STAMINA
-STAMINA_MAXIMA = 100 
-STAMINA_RECARGA_POR_COMIDA = 60  
-STAMINA_AGOTAMIENTO = 1.0  # Stamina perdido por paso sin comer
+import time
+import numpy as np
+
+from camara import FACTOR_ZOOM, Camara
+from campo_comida import DISTRIBUCIONES, MODOS_REBROTE
+from historial_columnar import como_tabla
+from indice_espacial import IndiceEspacial
+from motor_simulacion import (
+    ANCHO_VENTANA, ALTO_VENTANA, TAMANO_CELDA, TAMANO_PASO, PASOS_POR_VIDA, DURACION_DIA, PORCENTAJE_COMIDA, NUM_DIAS,
+    NUM_DEPREDADORES, FRECUENCIA_PURGA, STAMINA_MAXIMA, COLOR_DEPREDADOR, MAX_CELDAS_MUNDO, DISTRIBUCION_COMIDA,
+    TICKS_REBROTE, MODO_REBROTE, SimulationEngine, calcular_limites, celdas_mundo
+)
 
 # Colores
 NEGRO = (20, 20, 20)
@@ -41,11 +26,31 @@ NARANJA = (255, 87, 34)
 ROJO = (255, 0, 0)
 AMARILLO = (255, 255, 0)
 CYAN = (0, 255, 255)
-# Colores por tipo de mutación
-COLOR_NORMAL = (255, 255, 255)  # Blanco - Tipo normal
-COLOR_MUTACION_VELOCIDAD = (0, 255, 0)  # Verde - Velocidad aumentada
-COLOR_MUTACION_PRIORIDAD = (255, 0, 0)  # Rojo - Prioridad para comer
-COLOR_DEPREDADOR = (139, 0, 139)  # Morado oscuro - Depredador
+CLAVE_TRANSPARENTE = (0, 0, 0)  # Color clave de las capas con transparencia
+
+# Bucle de simulación: el slider fija los ticks por segundo y el dibujo se limita a FPS_RENDER
+FPS_RENDER = 60
+TICKS_POR_SEGUNDO_MIN = 5
+TICKS_POR_SEGUNDO_MAX = 5000
+DIAS_ENTRE_CUADROS = 10  # En velocidad máxima solo se dibuja cada tantos días
+CUADROS_OVERLAY_PERFIL = 15  # El overlay del perfilador se recalcula cada tantos cuadros
+FILAS_POR_PAGINA = 25  # Filas visibles de las tablas del histórico
+FRAMES_MUERTE = 15  # Cuadros que dura la animación de una muerte
+MIN_PIXELES_MUERTE = 3  # Radio mínimo en pantalla de la animación de muerte al alejar la cámara
+CAPACIDAD_EFECTOS_MUERTE = 1024  # Animaciones simultáneas; con más, la nueva reemplaza a la más antigua
+# Cámara: con celdas más chicas que estos píxeles en pantalla no se dibuja la cuadrícula,
+# la comida se pinta como una imagen de densidad y las partículas sin barra de stamina
+MIN_PIXELES_CUADRICULA = 4
+MIN_PIXELES_SPRITE_COMIDA = 4
+MIN_PIXELES_BARRA_STAMINA = 10
+PASO_DESPLAZAMIENTO = 60  # Píxeles de pantalla por cada pulsación de flecha
+DESPLAZAMIENTOS_TECLA = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0), pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+CUBETAS_INDICE_DIBUJO = 256  # Cubetas por lado, como máximo, del índice con el que se recortan las partículas
+MARGEN_RECORTE = 20  # Píxeles del mundo alrededor de la vista: lo que sobresale de una entidad (radio, barra)
+MAX_PARTICULAS = 2000  # Partículas iniciales admitidas en la pantalla de configuración
+MAX_PARTICULAS_VECTORIZADO = 9999  # Con MotorVectorizado
+MOTORES = ("objetos", "vectorizado")  # Opciones del selector de motor
+MAX_REPLICAS = 1000  # Réplicas del ensamble admitidas en la pantalla de configuración
 
 
 # UI simple
@@ -56,12 +61,18 @@ class Boton:
         self.color_fondo = color_fondo
         self.color_hover = color_hover
         self.color_texto = color_texto
+        self._texto_render = None  # (fuente, superficie) del último render
+
+    def hover(self):
+        return self.rect.collidepoint(pygame.mouse.get_pos())
 
     def dibujar(self, pantalla, fuente):
-        color = self.color_hover if self.rect.collidepoint(pygame.mouse.get_pos()) else self.color_fondo
+        color = self.color_hover if self.hover() else self.color_fondo
         pygame.draw.rect(pantalla, color, self.rect, border_radius=8)
         pygame.draw.rect(pantalla, BLANCO, self.rect, 2, border_radius=8)
-        texto = fuente.render(self.texto, True, self.color_texto)
+        if self._texto_render is None or self._texto_render[0] is not fuente:
+            self._texto_render = (fuente, fuente.render(self.texto, True, self.color_texto))
+        texto = self._texto_render[1]
         texto_rect = texto.get_rect(center=self.rect.center)
         pantalla.blit(texto, texto_rect)
 
@@ -70,10 +81,12 @@ class Boton:
 
 
 class CampoTexto:
-    def __init__(self, rect, valor_inicial="0"):
+    def __init__(self, rect, valor_inicial="0", digitos=4, texto_vacio="0"):
         self.rect = pygame.Rect(rect)
         self.texto = valor_inicial
         self.activo = False
+        self.digitos = digitos
+        self.texto_vacio = texto_vacio
 
     def manejar_evento(self, evento):
         if evento.type == pygame.MOUSEBUTTONDOWN:
@@ -84,13 +97,13 @@ class CampoTexto:
             elif evento.key in (pygame.K_RETURN, pygame.K_TAB):
                 self.activo = False
             elif evento.unicode.isdigit():
-                self.texto = (self.texto + evento.unicode)[:4]
+                self.texto = (self.texto + evento.unicode)[:self.digitos]
 
     def dibujar(self, pantalla, fuente):
         color_fondo = AZUL_BOTON if self.activo else GRIS_OSCURO
         pygame.draw.rect(pantalla, color_fondo, self.rect, border_radius=6)
         pygame.draw.rect(pantalla, BLANCO, self.rect, 2, border_radius=6)
-        texto = self.texto if self.texto else "0"
+        texto = self.texto if self.texto else self.texto_vacio
         txt = fuente.render(texto, True, BLANCO)
         txt_rect = txt.get_rect(center=self.rect.center)
         pantalla.blit(txt, txt_rect)
@@ -103,20 +116,48 @@ class CampoTexto:
             return defecto
 
 
+class Selector(Boton):
+    """Botón que pasa a la siguiente opción con cada click"""
+    def __init__(self, rect, opciones, valor_inicial):
+        self.opciones = list(opciones)
+        self.indice = self.opciones.index(valor_inicial)
+        super().__init__(rect, valor_inicial, GRIS_OSCURO, GRIS)
+
+    @property
+    def valor(self):
+        return self.opciones[self.indice]
+
+    def click(self, pos):
+        if not super().click(pos):
+            return False
+        self.indice = (self.indice + 1) % len(self.opciones)
+        self.texto = self.valor
+        self._texto_render = None
+        return True
+
+
 class Slider:
-    def __init__(self, x, y, ancho, minimo, maximo, valor_inicial):
+    def __init__(self, x, y, ancho, minimo, maximo, valor_inicial, logaritmico=False):
         self.rect = pygame.Rect(x, y, ancho, 8)
         self.min = minimo
         self.max = maximo
         self.valor = valor_inicial
+        self.logaritmico = logaritmico  # Escala geométrica, para rangos de varios órdenes de magnitud
         self.handle_radius = 10
         self.arrastrando = False
 
     def _pos_a_valor(self, mouse_x):
         t = (mouse_x - self.rect.left) / self.rect.width
         t = max(0.0, min(1.0, t))
+        if self.logaritmico:
+            return int(round(self.min * (self.max / self.min) ** t))
         return int(self.min + t * (self.max - self.min))
 
+    def _proporcion(self):
+        if self.logaritmico:
+            return math.log(self.valor / self.min) / math.log(self.max / self.min)
+        return (self.valor - self.min) / (self.max - self.min)
+
     def manejar_evento(self, evento):
         if evento.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(evento.pos):
             self.arrastrando = True
@@ -128,506 +169,352 @@ class Slider:
 
     def dibujar(self, pantalla):
         pygame.draw.rect(pantalla, BLANCO, self.rect, border_radius=4)
-        filled_w = int(self.rect.width * (self.valor - self.min) / (self.max - self.min))
+        filled_w = int(self.rect.width * self._proporcion())
         pygame.draw.rect(pantalla, VERDE, (self.rect.left, self.rect.top, filled_w, self.rect.height), border_radius=4)
         handle_x = self.rect.left + filled_w
         pygame.draw.circle(pantalla, AZUL_BOTON, (handle_x, self.rect.centery), self.handle_radius)
 
 
-# Clase para representar una partícula con sistema de supervivencia
-class Particula:
-    def __init__(self, x, y, pasos_vida, tipo_mutacion="normal"):
-        self.x = x
-        self.y = y
-        self.pos_inicial = (x, y)  # Guardar posición inicial (casa)
-        self.tipo_mutacion = tipo_mutacion  # "normal", "mutacion_velocidad", "mutacion_prioridad"
-        self.color = self._obtener_color()
-        
-        # Velocidad: mutación de velocidad mueve más casillas por tick, mismos pasos de vida
-        self.velocidad_base = 2 if tipo_mutacion == "mutacion_velocidad" else 1
-        self.velocidad = self.velocidad_base  # Velocidad ajustada por stamina
-        self.pasos_vida = pasos_vida
-        self.pasos_restantes = self.pasos_vida
-        self.trayectoria = [(self.x, self.y)]
-        self.activa = True
-        self.en_casa = True
-        self.veces_comido = 0
-        self.ha_comido_hoy = False
-        self.salio_de_casa = False
-        self.debe_morir = False
-        self.puede_reproducirse = False
-        
-        # Sistema de STAMINA
-        self.stamina = STAMINA_MAXIMA
-        self.stamina_anterior = STAMINA_MAXIMA
-        
-        # Sistema de VIDA
-        self.vida_maxima = 2 if tipo_mutacion == "mutacion_prioridad" else 1
-        self.vida_actual = self.vida_maxima
-        self.invulnerable_frames = 0  # Frames de invulnerabilidad tras recibir daño
-        self.huyendo = False  # Estado de huida
-    
-    def _obtener_color(self):
-        """Retorna el color según el tipo de mutación"""
-        if self.tipo_mutacion == "mutacion_velocidad":
-            return COLOR_MUTACION_VELOCIDAD
-        elif self.tipo_mutacion == "mutacion_prioridad":
-            return COLOR_MUTACION_PRIORIDAD
-        else:
-            return COLOR_NORMAL
-    
-    def actualizar_velocidad_por_stamina(self):
-        """Ajusta la velocidad según el stamina actual"""
-        # Proporción de stamina (0 a 1)
-        proporcion_stamina = max(0, min(1, self.stamina / STAMINA_MAXIMA))
-        # La velocidad varía de 0% a 100% de la velocidad base según el stamina
-        self.velocidad = max(1, int(self.velocidad_base * proporcion_stamina))
-        if self.velocidad == 0:
-            self.velocidad = 1  # Mínimo 1 para poder moverse
-    
-    def recargar_stamina(self):
-        """Recarga el stamina al comer"""
-        self.stamina = min(STAMINA_MAXIMA, self.stamina + STAMINA_RECARGA_POR_COMIDA)
-    
-    def agotar_stamina(self, cantidad=STAMINA_AGOTAMIENTO):
-        """Reduce el stamina por no comer"""
-        self.stamina = max(0, self.stamina - cantidad)
-        self.actualizar_velocidad_por_stamina()
-    
-    def recibir_dano(self):
-        """Recibe daño de un depredador"""
-        if self.invulnerable_frames > 0:
-            return False  # Aún invulnerable
-        
-        self.vida_actual -= 1
-        self.invulnerable_frames = 30  # 30 frames de invulnerabilidad (~0.5 segundos a 60 FPS)
-        
-        if self.vida_actual <= 0:
-            self.activa = False
-            self.debe_morir = True
-            return True  # Murió
-        return False  # Sobrevivió
-    
-    def actualizar_invulnerabilidad(self):
-        """Actualiza el contador de invulnerabilidad"""
-        if self.invulnerable_frames > 0:
-            self.invulnerable_frames -= 1
-    
-    def detectar_depredador_cercano(self, depredadores):
-        """Detecta si hay un depredador en el radio de visión (3 pasos)"""
-        for depredador in depredadores:
-            if not depredador.activo:
-                continue
-            # Calcular distancia Manhattan (solo direcciones cardinales)
-            distancia_manhattan = abs(self.x - depredador.x) + abs(self.y - depredador.y)
-            if distancia_manhattan <= RADIO_VISION_PRESA:
-                return depredador
-        return None
-    
-    def calcular_vector_huida(self, depredador):
-        """Calcula dirección opuesta al depredador (solo direcciones cardinales)"""
-        dx = self.x - depredador.x
-        dy = self.y - depredador.y
-        
-        # Elegir la dirección cardinal que maximiza la distancia
-        # Priorizar el eje con mayor diferencia
-        if abs(dx) > abs(dy):
-            # Moverse horizontalmente
-            if dx > 0:
-                return TAMANO_PASO, 0  # Derecha (alejarse)
-            else:
-                return -TAMANO_PASO, 0  # Izquierda (alejarse)
-        else:
-            # Moverse verticalmente
-            if dy > 0:
-                return 0, TAMANO_PASO  # Abajo (alejarse)
-            else:
-                return 0, -TAMANO_PASO  # Arriba (alejarse)
-        
-    def esta_en_borde(self, limites):
-        """Verifica si la partícula está en el borde (casa)"""
-        return (self.x == limites['izq'] or self.x == limites['der'] or
-                self.y == limites['arr'] or self.y == limites['abaj'])
-    
-    def mover(self, limites, depredadores=None):
-        """Mueve la partícula; la mutación de velocidad realiza más pasos por tick"""
-        if self.pasos_restantes <= 0 or not self.activa:
-            return False
+class CacheTextos:
+    """Superficies de texto ya renderizadas por (fuente, texto, color); solo se renderiza lo nuevo"""
 
-        # Actualizar invulnerabilidad
-        self.actualizar_invulnerabilidad()
-        
-        # Detectar depredadores cercanos
-        depredador_cercano = None
-        if depredadores:
-            depredador_cercano = self.detectar_depredador_cercano(depredadores)
-        
-        self.huyendo = depredador_cercano is not None
-        
-        direcciones = [
-            (TAMANO_PASO, 0),      # Derecha
-            (-TAMANO_PASO, 0),     # Izquierda
-            (0, TAMANO_PASO),      # Abajo
-            (0, -TAMANO_PASO)      # Arriba
-        ]
+    def __init__(self, maximo=1024):
+        self.maximo = maximo
+        self._superficies = {}
 
-        movio = False
-        # Actualizar velocidad según stamina actual
-        self.actualizar_velocidad_por_stamina()
-        
-        # Mutación velocidad: realiza varios subpasos en el mismo tick
-        # Velocidad ajustada por stamina
-        for _ in range(self.velocidad):
-            if self.pasos_restantes <= 0 or not self.activa:
-                break
+    def render(self, fuente, texto, color):
+        clave = (id(fuente), texto, color)
+        superficie = self._superficies.get(clave)
+        if superficie is None:
+            if len(self._superficies) >= self.maximo:
+                self._superficies.clear()
+            superficie = self._superficies[clave] = fuente.render(texto, True, color)
+        return superficie
 
-            # Si hay un depredador cercano, huir
-            if self.huyendo and depredador_cercano:
-                dx, dy = self.calcular_vector_huida(depredador_cercano)
-            else:
-                dx, dy = random.choice(direcciones)
-            
-            nuevo_x = max(limites['izq'], min(self.x + dx, limites['der']))
-            nuevo_y = max(limites['arr'], min(self.y + dy, limites['abaj']))
 
-            # Alinear al grid
-            nuevo_x = (nuevo_x // TAMANO_PASO) * TAMANO_PASO
-            nuevo_y = (nuevo_y // TAMANO_PASO) * TAMANO_PASO
+# Dibujo de entidades del modelo
+def trayectoria_en_pantalla(camara, trayectoria):
+    """Puntos de la trayectoria (del mundo) convertidos a la pantalla, para pygame.draw.lines"""
+    xs, ys = camara.puntos(*np.asarray(trayectoria.puntos(), dtype=np.int64).T)
+    return list(zip(xs.tolist(), ys.tolist()))
 
-            self.x = nuevo_x
-            self.y = nuevo_y
-            self.trayectoria.append((self.x, self.y))
-            self.pasos_restantes -= 1
-            
-            # Agotar stamina por cada paso realizado
-            if not self.en_casa:
-                self.agotar_stamina()
-            
-            movio = True
 
-            # Verificar si está en casa
-            if self.esta_en_borde(limites):
-                self.en_casa = True
-            else:
-                self.en_casa = False
-                if not self.salio_de_casa:
-                    self.salio_de_casa = True
+def dibujar_particula(pantalla, particula, camara, mostrar_trayectoria=False):
+    """Dibuja la partícula en su posición de pantalla según la cámara"""
+    if mostrar_trayectoria and particula.trayectoria is not None and len(particula.trayectoria) > 1:
+        pygame.draw.lines(pantalla, particula.color, False, trayectoria_en_pantalla(camara, particula.trayectoria), 1)
 
-        return movio
-    
-    def intentar_comer(self, comida_pos):
-        """Intenta comer si hay comida en la posición actual"""
-        if (self.x, self.y) in comida_pos:
-            self.veces_comido += 1
-            self.ha_comido_hoy = True
-            self.recargar_stamina()  # Recargar stamina al comer
-            comida_pos.remove((self.x, self.y))
-            return True
-        return False
-    
-    def reiniciar_dia(self, limites):
-        """Reinicia la partícula para el siguiente día"""
-        # Generar nueva posición en el borde
-        self.x, self.y = generar_posicion_borde(limites)
-        self.pos_inicial = (self.x, self.y)
-        self.pasos_restantes = self.pasos_vida
-        self.trayectoria = [(self.x, self.y)]
-        self.en_casa = True
-        self.veces_comido = 0
-        self.ha_comido_hoy = False
-        self.salio_de_casa = False
-        self.activa = True
-        self.puede_reproducirse = False
-        # Reiniciar stamina al máximo
-        self.stamina = STAMINA_MAXIMA
-        self.actualizar_velocidad_por_stamina()
-        # Reiniciar vida al máximo
-        self.vida_actual = self.vida_maxima
-        self.invulnerable_frames = 0
-        self.huyendo = False
-    
-    def obtener_tipo_hijo(self):
-        """Determina el tipo de mutación del hijo basado en veces_comido del padre"""
-        if self.veces_comido >= 3:
-            # Mutación: 50% Mutación 1 (velocidad) o Mutación 2 (prioridad)
-            return random.choice(["mutacion_velocidad", "mutacion_prioridad"])
-        else:
-            # Sin mutación: mismo tipo que el padre
-            return self.tipo_mutacion
-    
-    def obtener_tipo_heredado(self):
-        """Si es mutado, retorna tipo heredado con 80% misma mutación, 20% normal"""
-        if self.tipo_mutacion in ["mutacion_velocidad", "mutacion_prioridad"]:
-            # 80% misma mutación, 20% normal
-            if random.random() < 0.8:
-                return self.tipo_mutacion
-            else:
-                return "normal"
-        return self.tipo_mutacion
-        
-    def dibujar(self, pantalla, mostrar_trayectoria=False):
-        """Dibuja la partícula"""
-        if mostrar_trayectoria and len(self.trayectoria) > 1:
-            pygame.draw.lines(pantalla, self.color, False, self.trayectoria, 1)
-        
-        # Dibujar la partícula
-        pygame.draw.circle(pantalla, self.color, (self.x, self.y), 7)
-        
-        # Si está huyendo, dibujar indicador
-        if self.huyendo:
-            pygame.draw.circle(pantalla, NARANJA, (self.x, self.y), 10, 1)
-        
-        # Si está en casa, dibujar un círculo alrededor
-        if self.en_casa:
-            pygame.draw.circle(pantalla, VERDE, (self.x, self.y), 11, 2)
-
-
-# Clase Depredador
-class Depredador:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.activo = True
-        self.velocidad = VELOCIDAD_DEPREDADOR
-        self.trayectoria = [(self.x, self.y)]
-        self.particulas_eliminadas = 0
-        self.objetivo = None  # Partícula objetivo actual
-    
-    def buscar_objetivo_cercano(self, particulas):
-        """Busca la partícula más cercana dentro del rango de visión (5 pasos)"""
-        particulas_activas = [p for p in particulas if p.activa and not p.en_casa]
-        if not particulas_activas:
-            return None
-        
-        # Encontrar la partícula más cercana dentro del rango de visión
-        min_dist = float('inf')
-        objetivo = None
-        for p in particulas_activas:
-            # Usar distancia Manhattan (solo direcciones cardinales)
-            dist_manhattan = abs(self.x - p.x) + abs(self.y - p.y)
-            if dist_manhattan <= RADIO_VISION_DEPREDADOR and dist_manhattan < min_dist:
-                min_dist = dist_manhattan
-                objetivo = p
-        
-        return objetivo
-    
-    def mover(self, limites, particulas):
-        """Mueve el depredador: random walk por defecto, persigue si detecta presa en rango de 5 pasos"""
-        if not self.activo:
-            return False
-        
-        # Buscar objetivo en el rango de visión
-        self.objetivo = self.buscar_objetivo_cercano(particulas)
-        
-        # Si no hay objetivo en rango, hacer simple random walk
-        if not self.objetivo:
-            direcciones = [
-                (TAMANO_PASO, 0),      # Derecha
-                (-TAMANO_PASO, 0),     # Izquierda
-                (0, TAMANO_PASO),      # Abajo
-                (0, -TAMANO_PASO)      # Arriba
-            ]
-            dx, dy = random.choice(direcciones)
-        else:
-            # Perseguir objetivo - elegir dirección cardinal que acerca más al objetivo
-            dx_diff = self.objetivo.x - self.x
-            dy_diff = self.objetivo.y - self.y
-            
-            # Elegir la dirección cardinal que más acerca al objetivo
-            # Priorizar el eje con mayor diferencia
-            if abs(dx_diff) > abs(dy_diff):
-                # Moverse horizontalmente
-                if dx_diff > 0:
-                    dx, dy = TAMANO_PASO * self.velocidad, 0  # Derecha
-                else:
-                    dx, dy = -TAMANO_PASO * self.velocidad, 0  # Izquierda
-            else:
-                # Moverse verticalmente
-                if dy_diff > 0:
-                    dx, dy = 0, TAMANO_PASO * self.velocidad  # Abajo
-                else:
-                    dx, dy = 0, -TAMANO_PASO * self.velocidad  # Arriba
-        
-        nuevo_x = max(limites['izq'], min(self.x + dx, limites['der']))
-        nuevo_y = max(limites['arr'], min(self.y + dy, limites['abaj']))
-        
-        self.x = nuevo_x
-        self.y = nuevo_y
-        self.trayectoria.append((self.x, self.y))
-        
-        return True
-    
-    def verificar_colision(self, particulas, anim_muertes):
-        """Verifica colisión con partículas y aplica daño"""
-        for particula in particulas:
-            if not particula.activa or particula.en_casa:
-                continue
-            
-            # Calcular distancia
-            distancia = ((self.x - particula.x)**2 + (self.y - particula.y)**2)**0.5
-            
-            # Si están lo suficientemente cerca (radio de colisión)
-            if distancia < 15:  # Radio de colisión
-                murio = particula.recibir_dano()
-                if murio:
-                    self.particulas_eliminadas += 1
-                    anim_muertes.append({"pos": (particula.x, particula.y), "frames": 15})
-                    # Buscar nuevo objetivo
-                    self.objetivo = None
-    
-    def dibujar(self, pantalla, mostrar_trayectoria=True):
-        """Dibuja el depredador como círculo morado con su trayectoria"""
-        if not self.activo:
-            return
-        
-        # Dibujar trayectoria del depredador
-        if mostrar_trayectoria and len(self.trayectoria) > 1:
-            pygame.draw.lines(pantalla, COLOR_DEPREDADOR, False, self.trayectoria, 2)
-        
-        # Dibujar depredador como círculo morado sólido
-        pygame.draw.circle(pantalla, COLOR_DEPREDADOR, (self.x, self.y), 10)
-        pygame.draw.circle(pantalla, BLANCO, (self.x, self.y), 10, 2)
+    # Dibujar la partícula
+    centro = camara.punto(particula.x, particula.y)
+    pygame.draw.circle(pantalla, particula.color, centro, camara.escala(7))
 
+    # Si está huyendo, dibujar indicador
+    if particula.huyendo:
+        pygame.draw.circle(pantalla, NARANJA, centro, camara.escala(10), 1)
 
-# Funciones auxiliares
-def generar_posicion_borde(limites):
-    """Genera una posición aleatoria en el borde (casa) y retorna con el primer movimiento hacia adentro"""
-    borde = random.choice(['izq', 'der', 'arr', 'abaj'])
-    
-    if borde == 'izq':
-        x = limites['izq'] + TAMANO_PASO  # Primer paso hacia adentro
-        y = (random.randrange(limites['arr'], limites['abaj'] + 1, TAMANO_PASO) // TAMANO_PASO) * TAMANO_PASO
-    elif borde == 'der':
-        x = limites['der'] - TAMANO_PASO  # Primer paso hacia adentro
-        y = (random.randrange(limites['arr'], limites['abaj'] + 1, TAMANO_PASO) // TAMANO_PASO) * TAMANO_PASO
-    elif borde == 'arr':
-        x = (random.randrange(limites['izq'], limites['der'] + 1, TAMANO_PASO) // TAMANO_PASO) * TAMANO_PASO
-        y = limites['arr'] + TAMANO_PASO  # Primer paso hacia adentro
-    else:  # 'abaj'
-        x = (random.randrange(limites['izq'], limites['der'] + 1, TAMANO_PASO) // TAMANO_PASO) * TAMANO_PASO
-        y = limites['abaj'] - TAMANO_PASO  # Primer paso hacia adentro
-    
-    return x, y
+    # Si está en casa, dibujar un círculo alrededor
+    if particula.en_casa:
+        pygame.draw.circle(pantalla, VERDE, centro, camara.escala(11), camara.escala(2))
 
 
-def generar_comida(limites, porcentaje):
-    """Genera posiciones de comida en el mapa"""
-    # Calcular dimensiones de la cuadrícula
-    ancho = (limites['der'] - limites['izq']) // TAMANO_PASO + 1
-    alto = (limites['abaj'] - limites['arr']) // TAMANO_PASO + 1
-    total_celdas = ancho * alto
-    
-    # Calcular número de comidas
-    num_comidas = int(total_celdas * porcentaje / 100)
-    
-    # Generar todas las posiciones posibles
-    todas_posiciones = []
-    for x in range(limites['izq'], limites['der'] + 1, TAMANO_PASO):
-        for y in range(limites['arr'], limites['abaj'] + 1, TAMANO_PASO):
-            # Excluir bordes (casa)
-            if x != limites['izq'] and x != limites['der'] and y != limites['arr'] and y != limites['abaj']:
-                todas_posiciones.append((x, y))
-    
-    # Seleccionar aleatoriamente
-    comida = set(random.sample(todas_posiciones, min(num_comidas, len(todas_posiciones))))
-    return comida
+def dibujar_depredador(pantalla, depredador, camara, mostrar_trayectoria=True):
+    """Dibuja el depredador como círculo morado con su trayectoria"""
+    if not depredador.activo:
+        return
 
+    # Dibujar trayectoria del depredador
+    if mostrar_trayectoria and depredador.trayectoria is not None and len(depredador.trayectoria) > 1:
+        pygame.draw.lines(pantalla, COLOR_DEPREDADOR, False, trayectoria_en_pantalla(camara, depredador.trayectoria), 2)
 
-def crear_particulas_iniciales(limites, num_particulas, pasos_vida):
-    """Crea las partículas iniciales en posiciones aleatorias del borde"""
-    particulas = []
-    for i in range(num_particulas):
-        x, y = generar_posicion_borde(limites)
-        particula = Particula(x, y, pasos_vida, tipo_mutacion="normal")
-        particulas.append(particula)
-    return particulas
+    # Dibujar depredador como círculo morado sólido
+    centro = camara.punto(depredador.x, depredador.y)
+    pygame.draw.circle(pantalla, COLOR_DEPREDADOR, centro, camara.escala(10))
+    pygame.draw.circle(pantalla, BLANCO, centro, camara.escala(10), camara.escala(2))
 
 
-def dibujar_paredes(pantalla, limites):
+
+def dibujar_paredes(pantalla, limites, camara):
     """Dibuja las paredes del ambiente"""
-    ancho = limites['der'] - limites['izq']
-    alto = limites['abaj'] - limites['arr']
-    pygame.draw.rect(pantalla, BLANCO, (limites['izq'], limites['arr'], ancho, alto), 3)
+    izq, arr = camara.punto(limites['izq'], limites['arr'])
+    der, abaj = camara.punto(limites['der'], limites['abaj'])
+    pygame.draw.rect(pantalla, BLANCO, (izq, arr, der - izq, abaj - arr), 3)
     
     # Resaltar que el borde es la casa
-    pygame.draw.rect(pantalla, VERDE, (limites['izq'], limites['arr'], ancho, alto), 1)
+    pygame.draw.rect(pantalla, VERDE, (izq, arr, der - izq, abaj - arr), 1)
 
 
-def intentar_comer_con_prioridad(particulas, posicion_comida):
-    """
-    Maneja el sistema de prioridad de comida cuando múltiples partículas llegan a la misma comida.
-    Reglas:
-    - Mutación Rojo (prioridad) tiene prioridad máxima
-    - Mutación Verde (velocidad) tiene prioridad media
-    - Normal (blanco) tiene prioridad mínima
-    - Si hay múltiples del mismo tipo, 50-50 entre ellos
-    """
-    # Buscar partículas activas en la posición de comida (sin filtrar por en_casa)
-    particulas_en_comida = [p for p in particulas if p.x == posicion_comida[0] and p.y == posicion_comida[1] and p.activa]
-    
-    if not particulas_en_comida:
-        return None
-    
-    # Separar por tipo
-    rojos = [p for p in particulas_en_comida if p.tipo_mutacion == "mutacion_prioridad"]
-    verdes = [p for p in particulas_en_comida if p.tipo_mutacion == "mutacion_velocidad"]
-    blancos = [p for p in particulas_en_comida if p.tipo_mutacion == "normal"]
-    
-    # Prioridad: Rojo (Alta) > Verde (Media) > Blanco (Baja)
-    if rojos:
-        return random.choice(rojos)
-    elif verdes:
-        return random.choice(verdes)
-    elif blancos:
-        return random.choice(blancos)
-    
-    return None
 
+def dibujar_cuadricula(pantalla, limites, camara):
+    """Dibuja solo las líneas de la cuadrícula que caen en la vista, y ninguna si las celdas se ven muy chicas"""
+    if TAMANO_CELDA * camara.zoom < MIN_PIXELES_CUADRICULA:
+        return
+    fila0, fila1, columna0, columna1 = camara.celdas_visibles(TAMANO_CELDA)
+    izq, arr = camara.punto(limites['izq'], limites['arr'])
+    der, abaj = camara.punto(limites['der'], limites['abaj'])
 
-def dibujar_cuadricula(pantalla, limites):
-    """Dibuja la cuadrícula del ambiente"""
     # Líneas verticales
-    for x in range(limites['izq'], limites['der'] + 1, TAMANO_CELDA):
-        pygame.draw.line(pantalla, GRIS, (x, limites['arr']), (x, limites['abaj']), 1)
+    for columna in range(columna0, columna1):
+        x, _ = camara.punto(limites['izq'] + columna * TAMANO_CELDA, limites['arr'])
+        pygame.draw.line(pantalla, GRIS, (x, arr), (x, abaj), 1)
     
     # Líneas horizontales
-    for y in range(limites['arr'], limites['abaj'] + 1, TAMANO_CELDA):
-        pygame.draw.line(pantalla, GRIS, (limites['izq'], y), (limites['der'], y), 1)
+    for fila in range(fila0, fila1):
+        _, y = camara.punto(limites['izq'], limites['arr'] + fila * TAMANO_CELDA)
+        pygame.draw.line(pantalla, GRIS, (izq, y), (der, y), 1)
+
+
+# Panel de estadísticas: títulos y controles fijos; el resto son valores que cambian
+PANEL_X = ANCHO_VENTANA - 280
+PANEL_Y = 120
+PANEL_INTERLINEA = 28
+LINEAS_PANEL_FIJAS = {0: "ESTADÍSTICAS", 6: "PARTÍCULAS", 12: "CONTROLES",
+                      13: "ESPACIO / Botón: Pausa", 14: "T: Trayectorias", 15: "M: Velocidad máxima",
+                      16: "P: Tiempos por fase", 17: "Flechas / arrastrar: Mover", 18: "Rueda / + -: Zoom",
+                      19: "Inicio: Vista inicial", 20: "ESC: Salir"}
+TITULOS_PANEL = (0, 6, 12)
+
+# Regiones de la pantalla que se actualizan por separado
+RECT_ENCABEZADO = pygame.Rect(0, 0, ANCHO_VENTANA, 102)
+RECT_MUNDO = pygame.Rect(0, 102, PANEL_X, ALTO_VENTANA - 102)
+RECT_PANEL = pygame.Rect(PANEL_X, 102, ANCHO_VENTANA - PANEL_X, ALTO_VENTANA - 102)
+
+
+def dibujar_linea_panel(pantalla, i, linea, fuente, fuente_pequena, textos):
+    if i in TITULOS_PANEL:
+        texto = textos.render(fuente, linea, AZUL_BOTON)
+    else:
+        texto = textos.render(fuente_pequena, linea, BLANCO)
+    pantalla.blit(texto, (PANEL_X + 10, PANEL_Y + i * PANEL_INTERLINEA))
+
+
+def crear_fondo(fuente, fuente_pequena, textos):
+    """Capa estática: barra superior y panel con sus textos fijos"""
+    fondo = pygame.Surface((ANCHO_VENTANA, ALTO_VENTANA)).convert()
+    fondo.fill(NEGRO)
 
+    pygame.draw.rect(fondo, GRIS_OSCURO, (0, 0, ANCHO_VENTANA, 100))
+    pygame.draw.line(fondo, BLANCO, (0, 100), (ANCHO_VENTANA, 100), 2)
 
-def dibujar_comida(pantalla, comida_pos):
-    """Dibuja la comida en el mapa"""
-    for x, y in comida_pos:
-        pygame.draw.circle(pantalla, AMARILLO, (x, y), 3)
-        pygame.draw.circle(pantalla, NARANJA, (x, y), 5, 1)
+    pygame.draw.rect(fondo, GRIS_OSCURO, (PANEL_X, 100, 280, ALTO_VENTANA - 100))
+    pygame.draw.line(fondo, BLANCO, (PANEL_X, 100), (PANEL_X, ALTO_VENTANA), 2)
+    for i, linea in LINEAS_PANEL_FIJAS.items():
+        dibujar_linea_panel(fondo, i, linea, fuente, fuente_pequena, textos)
+    return fondo
+
+
+def crear_fondo_mundo(limites, camara):
+    """Cuadrícula y paredes vistas por la cámara; se rehace solo cuando la cámara se mueve"""
+    fondo = pygame.Surface((ANCHO_VENTANA, ALTO_VENTANA)).convert()
+    fondo.fill(NEGRO)
+    dibujar_cuadricula(fondo, limites, camara)
+    dibujar_paredes(fondo, limites, camara)
+    return fondo
+
+
+def crear_sprite_comida():
+    """Una comida (círculo amarillo con borde naranja) centrada en una superficie de 11x11"""
+    sprite = pygame.Surface((11, 11))
+    sprite.fill(CLAVE_TRANSPARENTE)
+    sprite.set_colorkey(CLAVE_TRANSPARENTE)
+    pygame.draw.circle(sprite, AMARILLO, (5, 5), 3)
+    pygame.draw.circle(sprite, NARANJA, (5, 5), 5, 1)
+    return sprite
+
+
+class EfectosMuerte:
+    """
+    Animaciones de muerte en un buffer circular de capacidad fija (x, y y cuadros
+    restantes en arreglos de NumPy): agregar una muerte solo escribe una posición
+    y las animaciones terminadas no se quitan de ninguna lista.
+    """
+
+    def __init__(self, capacidad=CAPACIDAD_EFECTOS_MUERTE):
+        self.x = np.zeros(capacidad, dtype=np.int32)
+        self.y = np.zeros(capacidad, dtype=np.int32)
+        self.frames = np.zeros(capacidad, dtype=np.int16)
+        self._cursor = 0
+
+    def agregar(self, posiciones):
+        for x, y in posiciones:
+            i = self._cursor
+            self.x[i] = x
+            self.y[i] = y
+            self.frames[i] = FRAMES_MUERTE
+            self._cursor = (i + 1) % len(self.frames)
+
+    def limpiar(self):
+        self.frames[:] = 0
+
+    def dibujar(self, pantalla, camara):
+        """Dibuja las animaciones activas que caen en la vista y les descuenta un cuadro a todas"""
+        activos = np.flatnonzero(self.frames > 0)
+        if len(activos) == 0:
+            return
+        # La cruz mide hasta 2 * FRAMES_MUERTE píxeles del mundo desde su centro
+        x0, y0, x1, y1 = camara.rectangulo_visible(max(MARGEN_RECORTE, 2 * FRAMES_MUERTE))
+        xs, ys = self.x[activos], self.y[activos]
+        visibles = (xs >= x0) & (xs <= x1) & (ys >= y0) & (ys <= y1)
+        xs, ys = camara.puntos(xs[visibles], ys[visibles])
+        for x, y, frames in zip(xs.tolist(), ys.tolist(), self.frames[activos[visibles]].tolist()):
+            dibujar_muerte(pantalla, (x, y), frames, camara.zoom)
+        self.frames[activos] -= 1
+
+
+class CapaComida:
+    """
+    Comida visible pintada en una superficie persistente que se dibuja con un solo blit.
+
+    Solo se pintan las celdas que caen en la vista de la cámara. La capa se
+    repinta completa con un campo nuevo (RESET) o cuando la cámara se mueve; en
+    el resto de los cuadros solo se borran las celdas consumidas y se pintan las
+    que aparecieron (nuevo día o rebrote) desde el cuadro anterior. Con celdas
+    de menos de MIN_PIXELES_SPRITE_COMIDA píxeles en pantalla la comida se pinta
+    como una imagen con un punto por píxel, sin importar el tamaño del mundo.
+    """
 
+    def __init__(self):
+        self.superficie = pygame.Surface((ANCHO_VENTANA, ALTO_VENTANA))
+        self.superficie.set_colorkey(CLAVE_TRANSPARENTE)
+        self.sprite_base = crear_sprite_comida()
+        self.sprite = self.sprite_base
+        self._clave = None  # (campo, estado de la cámara) de lo que está pintado
+        self._ventana = None  # (fila0, fila1, columna0, columna1) de las celdas pintadas
+        self._dibujadas = None  # Copia de las celdas visibles (o de la imagen) ya pintadas
+
+    def actualizar(self, campo, camara):
+        clave = (campo, camara.estado())
+        if campo.tamano_celda * camara.zoom < MIN_PIXELES_SPRITE_COMIDA:
+            imagen = self._imagen_densidad(campo, camara)
+            if clave != self._clave or not np.array_equal(imagen, self._dibujadas):
+                colores = np.zeros(imagen.shape + (3,), dtype=np.uint8)
+                colores[imagen] = AMARILLO
+                self.superficie.fill(CLAVE_TRANSPARENTE)
+                pygame.surfarray.blit_array(self.superficie.subsurface(camara.vista), colores)
+            self._clave = clave
+            self._dibujadas = imagen
+            return
 
-def dibujar_muerte(pantalla, pos, frames_restantes):
-    """Pequeña animación de muerte en rojo"""
+        if clave != self._clave:
+            self._ventana = camara.celdas_visibles(campo.tamano_celda)
+        fila0, fila1, columna0, columna1 = self._ventana
+        visibles = campo.celdas[fila0:fila1, columna0:columna1]
+        if clave != self._clave:
+            lado = camara.escala(self.sprite_base.get_width(), 3)
+            self.sprite = pygame.transform.scale(self.sprite_base, (lado, lado))
+            self.sprite.set_colorkey(CLAVE_TRANSPARENTE)
+            self.superficie.fill(CLAVE_TRANSPARENTE)
+            self._pintar(campo, camara, visibles)
+        else:
+            self._borrar(campo, camara, self._dibujadas & ~visibles)
+            self._pintar(campo, camara, visibles & ~self._dibujadas)
+        self._clave = clave
+        self._dibujadas = visibles.copy()
+
+    def _en_pantalla(self, campo, camara, mascara):
+        """Posiciones de pantalla de las celdas marcadas en `mascara` (relativa a la ventana pintada)"""
+        fila0, _, columna0, _ = self._ventana
+        filas, columnas = np.nonzero(mascara)
+        xs, ys = camara.puntos(campo.limites['izq'] + (columnas + columna0) * campo.tamano_celda,
+                               campo.limites['arr'] + (filas + fila0) * campo.tamano_celda)
+        medio = self.sprite.get_width() // 2
+        return zip((xs - medio).tolist(), (ys - medio).tolist())
+
+    def _pintar(self, campo, camara, mascara):
+        self.superficie.blits([(self.sprite, posicion) for posicion in self._en_pantalla(campo, camara, mascara)],
+                              doreturn=False)
+
+    def _borrar(self, campo, camara, mascara):
+        lado = self.sprite.get_width()
+        for x, y in self._en_pantalla(campo, camara, mascara):
+            self.superficie.fill(CLAVE_TRANSPARENTE, (x, y, lado, lado))
+
+    @staticmethod
+    def _imagen_densidad(campo, camara):
+        """Para cada píxel de la vista, si la celda más cercana del mundo tiene comida: arreglo (ancho, alto)"""
+        izq, arr, ancho, alto = camara.vista
+        xs, ys = camara.a_mundo(izq + np.arange(ancho), arr + np.arange(alto))
+        columnas = np.rint((xs - campo.limites['izq']) / campo.tamano_celda).astype(np.int64)
+        filas = np.rint((ys - campo.limites['arr']) / campo.tamano_celda).astype(np.int64)
+        dentro_x = (columnas >= 0) & (columnas < campo.columnas)
+        dentro_y = (filas >= 0) & (filas < campo.filas)
+        imagen = np.zeros((ancho, alto), dtype=bool)
+        imagen[np.ix_(dentro_x, dentro_y)] = campo.celdas[np.ix_(filas[dentro_y], columnas[dentro_x])].T
+        return imagen
+
+    def dibujar(self, pantalla, area):
+        pantalla.blit(self.superficie, area, area)
+
+
+def crear_overlay_perfil(resumen, fuente):
+    """Tabla semitransparente con la media, p50 y p95 (ms por cuadro) y el % de cada fase"""
+    columnas = (0, 115, 170, 225, 280)
+    filas = [("Fase", "media", "p50", "p95", "%")]
+    filas += [(fase, f"{media:.2f}", f"{p50:.2f}", f"{p95:.2f}", f"{porcentaje:.0f}")
+              for fase, media, p50, p95, porcentaje in resumen]
+    overlay = pygame.Surface((320, 12 + 20 * len(filas)), pygame.SRCALPHA)
+    overlay.fill((0, 0, 0, 180))
+    for i, fila in enumerate(filas):
+        for x, texto in zip(columnas, fila):
+            overlay.blit(fuente.render(texto, True, CYAN if i == 0 else BLANCO), (8 + x, 6 + 20 * i))
+    return overlay
+
+
+def dibujar_muerte(pantalla, pos, frames_restantes, zoom=1.0):
+    """Pequeña animación de muerte en rojo, escalada con el zoom de la cámara"""
     x, y = pos
-    escala = max(4, 2 * frames_restantes)
+    escala = max(MIN_PIXELES_MUERTE, round(max(4, 2 * frames_restantes) * zoom))
+    grosor = max(1, round(2 * zoom))
     color = (255, 80, 80)
-    pygame.draw.circle(pantalla, color, (x, y), escala, 2)
-    pygame.draw.line(pantalla, color, (x - escala, y - escala), (x + escala, y + escala), 2)
-    pygame.draw.line(pantalla, color, (x - escala, y + escala), (x + escala, y - escala), 2)
+    pygame.draw.circle(pantalla, color, (x, y), escala, grosor)
+    pygame.draw.line(pantalla, color, (x - escala, y - escala), (x + escala, y + escala), grosor)
+    pygame.draw.line(pantalla, color, (x - escala, y + escala), (x + escala, y - escala), grosor)
 
 
-def pantalla_configuracion(pantalla, reloj):
-    """Pantalla inicial para configurar días, partículas y % comida"""
+def pantalla_configuracion(pantalla, reloj, inicial=None):
+    """
+    Pantalla inicial para configurar días, partículas, % comida, tamaño del mundo
+    y el motor; `inicial` (p. ej. desde la línea de comandos) fija los valores de
+    semilla, motor, distribución, rebrote y réplicas con los que abre.
+    """
+    inicial = inicial or {}
     fuente_titulo = pygame.font.Font(None, 64)
     fuente = pygame.font.Font(None, 32)
     fuente_small = pygame.font.Font(None, 24)
 
-    campo_dias = CampoTexto((ANCHO_VENTANA//2 + 140, 180, 120, 45), str(NUM_DIAS))
-    campo_duracion = CampoTexto((ANCHO_VENTANA//2 + 140, 240, 120, 45), str(DURACION_DIA))
-    campo_particulas = CampoTexto((ANCHO_VENTANA//2 + 140, 300, 120, 45), "50")
-    campo_comida = CampoTexto((ANCHO_VENTANA//2 + 140, 360, 120, 45), str(PORCENTAJE_COMIDA))
-    campo_pasos = CampoTexto((ANCHO_VENTANA//2 + 140, 420, 120, 45), str(PASOS_POR_VIDA))
-    campo_depredadores = CampoTexto((ANCHO_VENTANA//2 + 140, 480, 120, 45), str(NUM_DEPREDADORES))
-    campo_frecuencia = CampoTexto((ANCHO_VENTANA//2 + 140, 540, 120, 45), str(FRECUENCIA_PURGA))
-
-    boton_iniciar = Boton((ANCHO_VENTANA//2 - 160, 620, 150, 60), "INICIAR", VERDE, (102, 187, 106))
-    boton_salir = Boton((ANCHO_VENTANA//2 + 20, 620, 150, 60), "SALIR", ROJO, (200, 50, 50))
+    # Por defecto, el mundo que cabe en la ventana
+    columnas_ventana, filas_ventana = celdas_mundo(calcular_limites())
+
+    # Columna izquierda: parámetros del modelo; derecha: semilla, comida y motor
+    x_campo = ANCHO_VENTANA//2 - 155
+    x_opcion = ANCHO_VENTANA//2 + 300
+    campo_dias = CampoTexto((x_campo, 160, 120, 42), str(NUM_DIAS))
+    campo_duracion = CampoTexto((x_campo, 212, 120, 42), str(DURACION_DIA))
+    campo_particulas = CampoTexto((x_campo, 264, 120, 42), "50")
+    campo_comida = CampoTexto((x_campo, 316, 120, 42), str(PORCENTAJE_COMIDA))
+    campo_pasos = CampoTexto((x_campo, 368, 120, 42), str(PASOS_POR_VIDA))
+    campo_depredadores = CampoTexto((x_campo, 420, 120, 42), str(NUM_DEPREDADORES))
+    campo_frecuencia = CampoTexto((x_campo, 472, 120, 42), str(FRECUENCIA_PURGA))
+    campo_ancho_mundo = CampoTexto((x_campo, 524, 120, 42), str(columnas_ventana))
+    campo_alto_mundo = CampoTexto((x_campo, 576, 120, 42), str(filas_ventana))
+
+    semilla = inicial.get("semilla")
+    campo_semilla = CampoTexto((x_opcion, 160, 160, 42), "" if semilla is None else str(semilla), digitos=9,
+                               texto_vacio="al azar")
+    selector_distribucion = Selector((x_opcion, 212, 160, 42), DISTRIBUCIONES,
+                                     inicial.get("distribucion", DISTRIBUCION_COMIDA))
+    campo_rebrote = CampoTexto((x_opcion, 264, 160, 42), str(inicial.get("rebrote", TICKS_REBROTE)))
+    selector_modo_rebrote = Selector((x_opcion, 316, 160, 42), MODOS_REBROTE, inicial.get("modo_rebrote", MODO_REBROTE))
+    selector_motor = Selector((x_opcion, 368, 160, 42), MOTORES, MOTORES[bool(inicial.get("vectorizado"))])
+    campo_replicas = CampoTexto((x_opcion, 420, 160, 42), str(inicial.get("replicas", 1)))
+
+    boton_iniciar = Boton((ANCHO_VENTANA//2 - 160, 660, 150, 60), "INICIAR", VERDE, (102, 187, 106))
+    boton_salir = Boton((ANCHO_VENTANA//2 + 20, 660, 150, 60), "SALIR", ROJO, (200, 50, 50))
+
+    campos = [campo_dias, campo_duracion, campo_particulas, campo_comida, campo_pasos, campo_depredadores, campo_frecuencia,
+              campo_ancho_mundo, campo_alto_mundo]
+    opciones = [campo_semilla, selector_distribucion, campo_rebrote, selector_modo_rebrote, selector_motor,
+                campo_replicas]
+    selectores = [selector_distribucion, selector_modo_rebrote, selector_motor]
 
     corriendo = True
     error_msg = ""
@@ -640,30 +527,41 @@ def pantalla_configuracion(pantalla, reloj):
                 pygame.quit()
                 sys.exit()
 
-            campo_dias.manejar_evento(evento)
-            campo_duracion.manejar_evento(evento)
-            campo_particulas.manejar_evento(evento)
-            campo_comida.manejar_evento(evento)
-            campo_pasos.manejar_evento(evento)
-            campo_depredadores.manejar_evento(evento)
-            campo_frecuencia.manejar_evento(evento)
+            for campo in campos + [campo_semilla, campo_rebrote, campo_replicas]:
+                campo.manejar_evento(evento)
 
             if evento.type == pygame.MOUSEBUTTONDOWN:
+                for selector in selectores:
+                    selector.click(evento.pos)
                 if boton_iniciar.click(evento.pos):
                     error_msg = ""
                     pasos_val = campo_pasos.valor(minimo=1, maximo=500, defecto=PASOS_POR_VIDA)
                     duracion_val = campo_duracion.valor(minimo=1, maximo=5000, defecto=DURACION_DIA)
+                    vectorizado = selector_motor.valor == "vectorizado"
                     if duracion_val <= pasos_val:
                         error_msg = "La duración del día debe ser mayor que los pasos por vida."
                     else:
                         return {
                             "dias": campo_dias.valor(minimo=1, maximo=999, defecto=NUM_DIAS),
                             "duracion": duracion_val,
-                            "particulas": campo_particulas.valor(minimo=1, maximo=2000, defecto=50),
+                            "particulas": campo_particulas.valor(
+                                minimo=1, maximo=MAX_PARTICULAS_VECTORIZADO if vectorizado else MAX_PARTICULAS,
+                                defecto=50),
                             "comida": campo_comida.valor(minimo=1, maximo=90, defecto=PORCENTAJE_COMIDA),
                             "pasos": pasos_val,
                             "depredadores": campo_depredadores.valor(minimo=0, maximo=50, defecto=NUM_DEPREDADORES),
-                            "frecuencia_purga": campo_frecuencia.valor(minimo=0, maximo=100, defecto=FRECUENCIA_PURGA)
+                            "frecuencia_purga": campo_frecuencia.valor(minimo=0, maximo=100, defecto=FRECUENCIA_PURGA),
+                            "distribucion": selector_distribucion.valor,
+                            "rebrote": campo_rebrote.valor(minimo=0, maximo=9999, defecto=TICKS_REBROTE),
+                            "modo_rebrote": selector_modo_rebrote.valor,
+                            "ancho_mundo": campo_ancho_mundo.valor(minimo=3, maximo=MAX_CELDAS_MUNDO,
+                                                                   defecto=columnas_ventana),
+                            "alto_mundo": campo_alto_mundo.valor(minimo=3, maximo=MAX_CELDAS_MUNDO, defecto=filas_ventana),
+                            # Sin semilla, cada corrida es distinta
+                            "semilla": int(campo_semilla.texto) if campo_semilla.texto else None,
+                            "vectorizado": vectorizado,
+                            # Con más de una, las gráficas muestran el ensamble de réplicas
+                            "replicas": campo_replicas.valor(minimo=1, maximo=MAX_REPLICAS, defecto=1)
                         }
                 if boton_salir.click(evento.pos):
                     pygame.quit()
@@ -671,7 +569,7 @@ def pantalla_configuracion(pantalla, reloj):
 
         pantalla.fill(NEGRO)
         titulo = fuente_titulo.render("Configuración", True, AZUL_BOTON)
-        pantalla.blit(titulo, titulo.get_rect(center=(ANCHO_VENTANA//2, 120)))
+        pantalla.blit(titulo, titulo.get_rect(center=(ANCHO_VENTANA//2, 100)))
 
         labels = [
             "Número de días",
@@ -681,17 +579,28 @@ def pantalla_configuracion(pantalla, reloj):
             "Pasos por vida",
             "Depredadores por purga",
             "Frecuencia de purga",
+            "Ancho del mundo (celdas)",
+            "Alto del mundo (celdas)",
+        ]
+        labels_opciones = [
+            "Semilla",
+            "Distribución comida",
+            "Rebrote (ticks, 0 = no)",
+            "Modo de rebrote",
+            "Motor",
+            "Réplicas (ensamble)",
         ]
-        campos = [campo_dias, campo_duracion, campo_particulas, campo_comida, campo_pasos, campo_depredadores, campo_frecuencia]
-        y_base = 180
-        for i, (lbl, campo) in enumerate(zip(labels, campos)):
-            texto = fuente.render(lbl + ":", True, BLANCO)
-            pantalla.blit(texto, (ANCHO_VENTANA//2 - 300, y_base + i*60))
-            campo.dibujar(pantalla, fuente)
+        y_base = 160
+        for x_label, columna in ((ANCHO_VENTANA//2 - 460, zip(labels, campos)),
+                                 (ANCHO_VENTANA//2 + 20, zip(labels_opciones, opciones))):
+            for i, (lbl, campo) in enumerate(columna):
+                texto = fuente.render(lbl + ":", True, BLANCO)
+                pantalla.blit(texto, (x_label, y_base + 10 + i*52))
+                campo.dibujar(pantalla, fuente)
 
         if error_msg:
             error_txt = fuente_small.render(error_msg, True, ROJO)
-            pantalla.blit(error_txt, (ANCHO_VENTANA//2 - error_txt.get_width()//2, 580))
+            pantalla.blit(error_txt, (ANCHO_VENTANA//2 - error_txt.get_width()//2, 628))
 
         boton_iniciar.dibujar(pantalla, fuente)
         boton_salir.dibujar(pantalla, fuente)
@@ -700,297 +609,213 @@ def pantalla_configuracion(pantalla, reloj):
         reloj.tick(60)
 
 
-def simulacion(pantalla, reloj, num_dias, pasos_vida, duracion_dia, porcentaje_comida, num_particulas_inicial, num_depredadores=5, frecuencia_purga=3):
-    """Ejecuta la simulación de selección natural por varios días con sistema de depredadores"""
+def simulacion(pantalla, reloj, config, clase=SimulationEngine):
+    """
+    Visualiza la simulación de selección natural; el modelo avanza en un motor
+    `clase` (SimulationEngine o MotorVectorizado) creado con `config`.
+    """
     fuente_grande = pygame.font.Font(None, 40)
     fuente = pygame.font.Font(None, 28)
     fuente_pequena = pygame.font.Font(None, 22)
 
-    # Garantizar que la duración del día siempre sea mayor a los pasos de vida
-    duracion_dia = max(duracion_dia, pasos_vida + 1)
+    motor = clase.desde_config(config)
+    limites = motor.limites
+    num_dias = motor.num_dias
 
-    # Definir límites del mundo (alineados al grid)
-    limites = {
-        'izq': (MARGEN // TAMANO_PASO) * TAMANO_PASO,
-        'der': ((ANCHO_VENTANA - MARGEN - 300) // TAMANO_PASO) * TAMANO_PASO,
-        'arr': ((MARGEN + 100) // TAMANO_PASO) * TAMANO_PASO,
-        'abaj': ((ALTO_VENTANA - MARGEN) // TAMANO_PASO) * TAMANO_PASO
-    }
+    # Cámara sobre el mundo, y el índice espacial con el que se recortan las partículas fuera de la vista
+    camara = Camara(limites, RECT_MUNDO)
+    arrastre = False
+    cubeta = TAMANO_PASO * max(1, -(-max(celdas_mundo(limites)) // CUBETAS_INDICE_DIBUJO))
+    indice_dibujo = IndiceEspacial(limites, cubeta)
 
     # Botones y slider
     boton_pausa = Boton((ANCHO_VENTANA - 275, 20, 85, 45), "PAUSA", AZUL_BOTON, (90, 190, 255))
     boton_reiniciar = Boton((ANCHO_VENTANA - 180, 20, 90, 45), "RESET", NARANJA, (255, 140, 60))
     boton_menu = Boton((ANCHO_VENTANA - 80, 20, 70, 45), "MENU", ROJO, (200, 50, 50))
-    slider_vel = Slider(ANCHO_VENTANA - 260, 72, 210, 5, 120, 30)
-
-    def reset_state():
-        part = crear_particulas_iniciales(limites, num_particulas_inicial, pasos_vida)
-        food = generar_comida(limites, porcentaje_comida)
-        # Historial de depredadores: {dia, num_depredadores, particulas_eliminadas}
-        hist_depredadores = []
-        historial_estadisticas = []
-        # Retornar: particulas, comida, historial_poblacion, historial_tipos, historial_depredadores, historial_estadisticas, dia, paso, pausado, velocidad
-        return part, food, [len(part)], [{"normal": len(part), "verde": 0, "rojo": 0}], hist_depredadores, historial_estadisticas, 1, 0, False, slider_vel.valor
-
-    particulas, comida_pos, historial_poblacion, historial_tipos, historial_depredadores, historial_estadisticas, dia_actual, paso_actual_dia, pausado, velocidad = reset_state()
-    comida_inicial_dia = len(comida_pos)
-    mostrar_trayectorias = False
-    anim_muertes = []  # lista de {'pos': (x,y), 'frames': n}
-    depredadores = []  # Lista de depredadores activos
-    es_dia_purga = False
+    slider_vel = Slider(ANCHO_VENTANA - 260, 72, 210, TICKS_POR_SEGUNDO_MIN, TICKS_POR_SEGUNDO_MAX, 30,
+                        logaritmico=True)
 
-    corriendo = True
-    while corriendo and dia_actual <= num_dias:
+    pausado = False
+    mostrar_trayectorias = False
+    velocidad_maxima = False
+    efectos_muerte = EfectosMuerte()
+
+    # Caché de render: capa estática, textos y último estado dibujado de encabezado y panel
+    textos = CacheTextos()
+    capa_comida = CapaComida()
+    fondo = None
+    fondo_mundo = None
+    camara_fondo = None
+    ultimo_encabezado = None
+    ultimo_panel = None
+    redibujar_todo = True
+    overlay_perfil = None
+    cuadros_dibujados = 0
+
+    # Estado del bucle a paso fijo
+    ultimo_tiempo = time.perf_counter()
+    acumulado = 0.0  # Ticks pendientes (fracción) por el tiempo transcurrido
+    dia_dibujado = motor.dia_actual
+
+    while not motor.terminado:
         for evento in pygame.event.get():
             if evento.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             elif evento.type == pygame.KEYDOWN:
                 if evento.key == pygame.K_ESCAPE:
-                    return historial_poblacion
+                    return motor.historiales()
                 elif evento.key == pygame.K_SPACE:
                     pausado = not pausado
                 elif evento.key == pygame.K_t:
                     mostrar_trayectorias = not mostrar_trayectorias
+                    motor.activar_trayectorias(mostrar_trayectorias)
+                elif evento.key == pygame.K_m:
+                    velocidad_maxima = not velocidad_maxima
+                    dia_dibujado = motor.dia_actual
+                elif evento.key == pygame.K_p:
+                    motor.activar_perfilador(motor.perfilador is None)
+                    overlay_perfil = None
+                elif evento.key in DESPLAZAMIENTOS_TECLA:
+                    dx, dy = DESPLAZAMIENTOS_TECLA[evento.key]
+                    camara.desplazar(dx * PASO_DESPLAZAMIENTO, dy * PASO_DESPLAZAMIENTO)
+                elif evento.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    camara.acercar(FACTOR_ZOOM)
+                elif evento.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    camara.acercar(1 / FACTOR_ZOOM)
+                elif evento.key == pygame.K_HOME:
+                    camara.restablecer()
+            elif evento.type == pygame.MOUSEWHEEL:
+                posicion = pygame.mouse.get_pos()
+                if RECT_MUNDO.collidepoint(posicion):
+                    camara.acercar(FACTOR_ZOOM ** evento.y, ancla=posicion)
+            elif evento.type == pygame.MOUSEMOTION and arrastre:
+                camara.desplazar(-evento.rel[0], -evento.rel[1])
+            elif evento.type == pygame.MOUSEBUTTONUP and evento.button == 1:
+                arrastre = False
             slider_vel.manejar_evento(evento)
+            if evento.type == pygame.MOUSEBUTTONDOWN and evento.button == 1 and RECT_MUNDO.collidepoint(evento.pos):
+                arrastre = True
             if evento.type == pygame.MOUSEBUTTONDOWN:
                 if boton_pausa.click(evento.pos):
                     pausado = not pausado
                 if boton_reiniciar.click(evento.pos):
-                    particulas, comida_pos, historial_poblacion, historial_tipos, historial_depredadores, dia_actual, paso_actual_dia, pausado, velocidad = reset_state()
-                    anim_muertes.clear()
-                    depredadores.clear()
-                    es_dia_purga = False
+                    motor.reiniciar()
+                    pausado = False
+                    efectos_muerte.limpiar()
+                    redibujar_todo = True
+                    dia_dibujado = motor.dia_actual
                 if boton_menu.click(evento.pos):
                     return None, None, None, None
 
         velocidad = slider_vel.valor
 
-        # Simulación del día
-        if not pausado and paso_actual_dia < duracion_dia:
-            # Verificar si es día de purga y spawner depredadores
-            if paso_actual_dia == 0 and frecuencia_purga > 0 and dia_actual % frecuencia_purga == 0:
-                es_dia_purga = True
-                depredadores.clear()
-                for _ in range(num_depredadores):
-                    x, y = generar_posicion_borde(limites)
-                    depredador = Depredador(x, y)
-                    depredadores.append(depredador)
-            # Registrar comida inicial del día al primer paso
-            if paso_actual_dia == 0:
-                comida_inicial_dia = len(comida_pos)
-            
-            # Paso 1: Mover todas las partículas (con evasión de depredadores)
-            for particula in particulas:
-                if particula.activa and particula.pasos_restantes > 0:
-                    particula.mover(limites, depredadores if es_dia_purga else None)
-            
-            # Paso 1.5: Mover depredadores y verificar colisiones
-            if es_dia_purga:
-                for depredador in depredadores:
-                    depredador.mover(limites, particulas)
-                    depredador.verificar_colision(particulas, anim_muertes)
-            
-            # Paso 2: Procesar comida SOLO para partículas activas que están fuera de casa
-            # Se construye un mapeo de posición -> lista de partículas
-            pos_a_particulas = {}
-            for pos_comida in comida_pos:
-                pos_a_particulas[pos_comida] = []
-            
-            for particula in particulas:
-                if particula.activa and (particula.x, particula.y) in pos_a_particulas:
-                    pos_a_particulas[(particula.x, particula.y)].append(particula)
-            
-            # Ahora procesar la comida - una partícula por posición de comida
-            comidas_consumidas = set()
-            for pos_comida, particulas_en_pos in pos_a_particulas.items():
-                if particulas_en_pos:  # Si hay partículas en esta posición
-                    # Aplicar reglas de prioridad
-                    verdes = [p for p in particulas_en_pos if p.tipo_mutacion == "mutacion_prioridad"]
-                    rojos = [p for p in particulas_en_pos if p.tipo_mutacion == "mutacion_velocidad"]
-                    blancos = [p for p in particulas_en_pos if p.tipo_mutacion == "normal"]
-                    
-                    # Elegir ganador según prioridad
-                    if verdes:
-                        ganador = random.choice(verdes)
-                    elif rojos:
-                        ganador = random.choice(rojos)
-                    else:
-                        ganador = random.choice(blancos)
-                    
-                    # El ganador come
-                    ganador.veces_comido += 1
-                    ganador.ha_comido_hoy = True
-                    ganador.recargar_stamina()
-                    comidas_consumidas.add(pos_comida)
-            
-            # Eliminar comida consumida del mapa
-            comida_pos -= comidas_consumidas
-            
-            # Paso 3: Manejar muertes por agotamiento y reglas de regreso a casa
-            for particula in particulas:
-                # Regla 5: Si salió de casa y se quedó sin pasos fuera de casa, muere INMEDIATAMENTE
-                if particula.salio_de_casa and not particula.en_casa and particula.pasos_restantes <= 0 and particula.activa:
-                    particula.activa = False
-                    particula.debe_morir = True
-                    anim_muertes.append({"pos": (particula.x, particula.y), "frames": 15})
-                
-                # Regla 19: Si regresó a casa y comió, se queda
-                # Regla 10: Si regresó sin comer pero con pasos, debe salir de nuevo
-                elif particula.en_casa and particula.salio_de_casa and particula.activa:
-                    if particula.ha_comido_hoy:
-                        # Regla 19: Se queda en casa
-                        particula.activa = False
-                        if particula.veces_comido >= 2:
-                            particula.puede_reproducirse = True
-                    elif particula.pasos_restantes > 0:
-                        # Regla 10: Debe salir de nuevo
-                        particula.en_casa = False
-
-            paso_actual_dia += 1
-
-        # Fin de día
-        if paso_actual_dia >= duracion_dia and not pausado:
-            # Registrar estadísticas del día
-            historial_estadisticas.append({
-                "dia": dia_actual,
-                "poblacion_total": len(particulas),
-                "comida": comida_inicial_dia,
-                "vivas": len([p for p in particulas if p.activa]),
-                "en_casa": len([p for p in particulas if p.en_casa]),
-                "comieron": len([p for p in particulas if p.ha_comido_hoy]),
-                "pueden_reproducirse": len([p for p in particulas if p.puede_reproducirse]),
-                "normales": len([p for p in particulas if p.tipo_mutacion == "normal"]),
-                "verdes": len([p for p in particulas if p.tipo_mutacion == "mutacion_velocidad"]),
-                "rojos": len([p for p in particulas if p.tipo_mutacion == "mutacion_prioridad"]),
-                "depredadores": len(depredadores) if es_dia_purga else 0
-            })
-            # Registrar estadísticas de depredadores si fue día de purga
-            if es_dia_purga:
-                vel_elim = sum(1 for p in particulas if not p.activa and p.debe_morir and p.tipo_mutacion == "mutacion_velocidad")
-                pri_elim = sum(1 for p in particulas if not p.activa and p.debe_morir and p.tipo_mutacion == "mutacion_prioridad")
-                nor_elim = sum(1 for p in particulas if not p.activa and p.debe_morir and p.tipo_mutacion == "normal")
-                total_eliminadas = vel_elim + pri_elim + nor_elim
-                
-                historial_depredadores.append({
-                    "dia": dia_actual,
-                    "num_depredadores": len(depredadores),
-                    "particulas_eliminadas": total_eliminadas,
-                    "velocidad_eliminadas": vel_elim,
-                    "prioridad_eliminadas": pri_elim,
-                    "normal_eliminadas": nor_elim
-                })
-                # Eliminar depredadores al final del día
-                depredadores.clear()
-                es_dia_purga = False
-            
-            sobrevivientes = []
-            nuevas_particulas = []
-
-            for particula in particulas:
-                # Regla 3: Sobrevive SI Y SOLO SI comió al menos 1 vez Y regresó a casa
-                # En cualquier otro caso (no comió O no regresó) = muere
-                sobrevive = particula.ha_comido_hoy and particula.en_casa
-
-                if sobrevive:
-                    sobrevivientes.append(particula)
-                    # Regla 7: Si comió 2+ veces, se reproduce
-                    if particula.puede_reproducirse:
-                        # Si comió 2 veces: hijo igual al padre
-                        # Si comió 3+ veces: hijo puede mutar
-                        tipo_hijo = particula.obtener_tipo_hijo()
-                        
-                        # Si el hijo es mutado, aplicar herencia (80% misma mutación, 20% normal)
-                        if tipo_hijo in ["mutacion_velocidad", "mutacion_prioridad"]:
-                            # El hijo nace con la mutación, luego aplicamos herencia
-                            tipo_final = tipo_hijo
-                            # Si el padre es mutado, el hijo puede perder la mutación
-                            if particula.tipo_mutacion in ["mutacion_velocidad", "mutacion_prioridad"]:
-                                if random.random() >= 0.8:  # 20% de perder mutación
-                                    tipo_final = "normal"
-                        else:
-                            # Tipo normal
-                            tipo_final = tipo_hijo
-                        
-                        x, y = generar_posicion_borde(limites)
-                        hijo = Particula(x, y, pasos_vida, tipo_mutacion=tipo_final)
-                        nuevas_particulas.append(hijo)
-                else:
-                    # Solo agregar animación si no murió durante el día (Regla 5)
-                    if not particula.debe_morir:
-                        anim_muertes.append({"pos": (particula.x, particula.y), "frames": 15})
-
-            particulas = sobrevivientes + nuevas_particulas
-
-            if len(particulas) == 0:
-                historial_poblacion.append(0)
-                historial_tipos.append({"normal": 0, "verde": 0, "rojo": 0})
+        # Simulación a paso fijo: se acumulan los ticks que corresponden al tiempo
+        # transcurrido y se ejecutan todos antes de dibujar, sin pasar del tiempo de un cuadro
+        ahora = time.perf_counter()
+        transcurrido = ahora - ultimo_tiempo
+        ultimo_tiempo = ahora
+        if not pausado:
+            if velocidad_maxima:
+                ticks = None  # Tantos como quepan en el tiempo de un cuadro
+            else:
+                acumulado += transcurrido * velocidad
+                ticks = int(acumulado)
+                acumulado -= ticks
+            limite = ahora + 1 / FPS_RENDER
+            hechos = 0
+            while (ticks is None or hechos < ticks) and not motor.terminado:
+                motor.step()
+                hechos += 1
+                if not velocidad_maxima and motor.muertes:
+                    efectos_muerte.agregar(motor.muertes)
+                if time.perf_counter() > limite:
+                    # No se alcanza la velocidad pedida: descartar el atraso en lugar de acumularlo
+                    acumulado = 0.0
+                    break
+            if motor.extinta:
                 break
+        else:
+            acumulado = 0.0
 
-            for p in particulas:
-                p.reiniciar_dia(limites)
-
-            comida_pos = generar_comida(limites, porcentaje_comida)
-            comida_inicial_dia = len(comida_pos)
-            historial_poblacion.append(len(particulas))
-            
-            # Registrar cantidad de cada tipo de partícula
-            num_normales = len([p for p in particulas if p.tipo_mutacion == "normal"])
-            num_verdes = len([p for p in particulas if p.tipo_mutacion == "mutacion_velocidad"])
-            num_rojos = len([p for p in particulas if p.tipo_mutacion == "mutacion_prioridad"])
-            historial_tipos.append({"normal": num_normales, "verde": num_verdes, "rojo": num_rojos})
-            
-            dia_actual += 1
-            paso_actual_dia = 0
-
-        # Dibujar
-        pantalla.fill(NEGRO)
-
-        pygame.draw.rect(pantalla, GRIS_OSCURO, (0, 0, ANCHO_VENTANA, 100))
-        pygame.draw.line(pantalla, BLANCO, (0, 100), (ANCHO_VENTANA, 100), 2)
-
-        titulo_dia = f"DÍA {dia_actual}/{num_dias}"
-        if es_dia_purga:
-            titulo_dia += " - PURGA"
-        texto_dia = fuente_grande.render(titulo_dia, True, AZUL_BOTON if not es_dia_purga else ROJO)
-        pantalla.blit(texto_dia, (20, 20))
-
-        texto_poblacion = fuente.render(f"Población: {len(particulas)}", True, BLANCO)
-        pantalla.blit(texto_poblacion, (320, 20))
-
-        texto_comida = fuente.render(f"Comida: {len(comida_pos)}", True, BLANCO)
-        pantalla.blit(texto_comida, (320, 60))
-
-        if pausado:
-            texto_pausa = fuente.render("PAUSADO", True, ROJO)
-            pantalla.blit(texto_pausa, (ANCHO_VENTANA - 450, 30))
-
-        boton_pausa.dibujar(pantalla, fuente)
-        boton_reiniciar.dibujar(pantalla, fuente)
-        boton_menu.dibujar(pantalla, fuente)
-        slider_vel.dibujar(pantalla)
-        texto_vel = fuente_pequena.render(f"Velocidad: {velocidad} FPS", True, BLANCO)
-        pantalla.blit(texto_vel, (ANCHO_VENTANA - 255, 82))
-
-        dibujar_cuadricula(pantalla, limites)
-        dibujar_paredes(pantalla, limites)
-        dibujar_comida(pantalla, comida_pos)
+        # En velocidad máxima solo se dibuja cada DIAS_ENTRE_CUADROS días
+        if velocidad_maxima and not pausado and not motor.terminado:
+            if motor.dia_actual - dia_dibujado < DIAS_ENTRE_CUADROS:
+                continue
+            dia_dibujado = motor.dia_actual
+
+        perfilador = motor.perfilador
+        if perfilador is not None:
+            inicio_dibujo = time.perf_counter_ns()
+        contadores = motor.contadores
+        depredadores = motor.depredadores
+        es_dia_purga = motor.es_dia_purga
+
+        # Capas estáticas: el encabezado y el panel se crean una vez; la cuadrícula, cuando se mueve la cámara
+        if fondo is None:
+            fondo = crear_fondo(fuente, fuente_pequena, textos)
+            redibujar_todo = True
+        if camara_fondo != camara.estado():
+            fondo_mundo = crear_fondo_mundo(limites, camara)
+            camara_fondo = camara.estado()
+        sucios = []
+
+        # Encabezado: solo si cambió algo de lo que muestra
+        estado_encabezado = (motor.dia_actual, es_dia_purga, contadores.total, len(motor.comida_pos), pausado,
+                             velocidad, velocidad_maxima, boton_pausa.hover(), boton_reiniciar.hover(),
+                             boton_menu.hover())
+        if redibujar_todo or estado_encabezado != ultimo_encabezado:
+            ultimo_encabezado = estado_encabezado
+            pantalla.blit(fondo, RECT_ENCABEZADO, RECT_ENCABEZADO)
+
+            titulo_dia = f"DÍA {motor.dia_actual}/{num_dias}"
+            if es_dia_purga:
+                titulo_dia += " - PURGA"
+            pantalla.blit(textos.render(fuente_grande, titulo_dia, AZUL_BOTON if not es_dia_purga else ROJO), (20, 20))
+            pantalla.blit(textos.render(fuente, f"Población: {contadores.total}", BLANCO), (320, 20))
+            pantalla.blit(textos.render(fuente, f"Comida: {len(motor.comida_pos)}", BLANCO), (320, 60))
+
+            if pausado:
+                pantalla.blit(textos.render(fuente, "PAUSADO", ROJO), (ANCHO_VENTANA - 450, 30))
+
+            boton_pausa.dibujar(pantalla, fuente)
+            boton_reiniciar.dibujar(pantalla, fuente)
+            boton_menu.dibujar(pantalla, fuente)
+            slider_vel.dibujar(pantalla)
+            texto_vel = "Velocidad: MÁXIMA" if velocidad_maxima else f"Velocidad: {velocidad} ticks/s"
+            pantalla.blit(textos.render(fuente_pequena, texto_vel, BLANCO), (ANCHO_VENTANA - 255, 82))
+            sucios.append(RECT_ENCABEZADO)
+
+        # Mundo: se redibuja en cada cuadro sobre la cuadrícula y paredes precalculadas,
+        # solo con lo que cae en la vista de la cámara
+        pantalla.blit(fondo_mundo, RECT_MUNDO, RECT_MUNDO)
+        pantalla.set_clip(RECT_MUNDO)
+        capa_comida.actualizar(motor.comida_pos, camara)
+        capa_comida.dibujar(pantalla, RECT_MUNDO)
+        x0, y0, x1, y1 = camara.rectangulo_visible(MARGEN_RECORTE)
 
         # Dibujar depredadores con trayectoria
         for depredador in depredadores:
-            depredador.dibujar(pantalla, mostrar_trayectorias)
-        
-        for particula in particulas:
+            if x0 <= depredador.x <= x1 and y0 <= depredador.y <= y1:
+                dibujar_depredador(pantalla, depredador, camara, mostrar_trayectorias)
+
+        indice_dibujo.construir(*motor.posiciones_particulas())
+        con_barra = TAMANO_CELDA * camara.zoom >= MIN_PIXELES_BARRA_STAMINA
+        for i in indice_dibujo.en_rectangulo(x0, y0, x1, y1).tolist():
+            particula = motor.particula(i)
             if particula.debe_morir:
                 continue
-            particula.dibujar(pantalla, mostrar_trayectorias)
+            dibujar_particula(pantalla, particula, camara, mostrar_trayectorias)
             
             # Dibujar barra de stamina encima de la partícula
-            if particula.activa:
-                barra_x = particula.x - 10
-                barra_y = particula.y - 18
+            if particula.activa and con_barra:
+                centro_x, centro_y = camara.punto(particula.x, particula.y)
+                barra_x = centro_x - camara.escala(10)
+                barra_y = centro_y - camara.escala(18)
+                largo_barra = camara.escala(20)
+                alto_barra = camara.escala(6)
                 # Barra de fondo (gris oscuro)
-                pygame.draw.rect(pantalla, GRIS_OSCURO, (barra_x, barra_y, 20, 6))
+                pygame.draw.rect(pantalla, GRIS_OSCURO, (barra_x, barra_y, largo_barra, alto_barra))
                 # Barra de stamina (verde -> amarillo -> rojo según stamina)
                 proporcion = particula.stamina / STAMINA_MAXIMA
                 if proporcion > 0.5:
@@ -999,58 +824,57 @@ def simulacion(pantalla, reloj, num_dias, pasos_vida, duracion_dia, porcentaje_c
                     color_stamina = (255, 255 * proporcion, 0)  # Naranja a amarillo
                 else:
                     color_stamina = (255, 0, 0)  # Rojo
-                ancho_barra = max(1, int(20 * proporcion))
-                pygame.draw.rect(pantalla, color_stamina, (barra_x, barra_y, ancho_barra, 6))
-
-        for anim in list(anim_muertes):
-            dibujar_muerte(pantalla, anim["pos"], anim["frames"])
-            anim["frames"] -= 1
-            if anim["frames"] <= 0:
-                anim_muertes.remove(anim)
-
-        panel_x = ANCHO_VENTANA - 280
-        pygame.draw.rect(pantalla, GRIS_OSCURO, (panel_x, 100, 280, ALTO_VENTANA - 100))
-        pygame.draw.line(pantalla, BLANCO, (panel_x, 100), (panel_x, ALTO_VENTANA), 2)
-
-        y_pos = 120
-        lineas_panel = [
-            "ESTADÍSTICAS",
-            f"Partículas vivas: {len([p for p in particulas if p.activa])}",
-            f"En casa: {len([p for p in particulas if p.en_casa])}",
-            f"Comieron hoy: {len([p for p in particulas if p.ha_comido_hoy])}",
-            f"Pueden reproducirse: {len([p for p in particulas if p.puede_reproducirse])}",
-            "",
-            "PARTÍCULAS",
-            f"Normales: {len([p for p in particulas if p.tipo_mutacion == 'normal'])}",
-            f"Verdes: {len([p for p in particulas if p.tipo_mutacion == 'mutacion_velocidad'])}",
-            f"Rojos: {len([p for p in particulas if p.tipo_mutacion == 'mutacion_prioridad'])}",
-            f"Depredadores: {len(depredadores)}",
-            "",
-            "CONTROLES",
-            "ESPACIO / Botón: Pausa",
-            "T: Trayectorias",
-            "ESC: Salir"
-        ]
-
-        for i, linea in enumerate(lineas_panel):
-            if i == 0 or i == 6 or i == 12:
-                color = AZUL_BOTON
-                fuente_usar = fuente
-            else:
-                color = BLANCO
-                fuente_usar = fuente_pequena
-
-            texto = fuente_usar.render(linea, True, color)
-            pantalla.blit(texto, (panel_x + 10, y_pos + i * 28))
+                ancho_barra = max(1, int(largo_barra * proporcion))
+                pygame.draw.rect(pantalla, color_stamina, (barra_x, barra_y, ancho_barra, alto_barra))
+
+        efectos_muerte.dibujar(pantalla, camara)
+        pantalla.set_clip(None)
+
+        if perfilador is not None:
+            if overlay_perfil is None or cuadros_dibujados % CUADROS_OVERLAY_PERFIL == 0:
+                overlay_perfil = crear_overlay_perfil(perfilador.resumen(), fuente_pequena)
+            pantalla.blit(overlay_perfil, (RECT_MUNDO.left + 50, RECT_MUNDO.top + 48))
+        sucios.append(RECT_MUNDO)
+
+        # Panel: solo las líneas con valores, y solo si alguno cambió
+        lineas_panel = {
+            1: f"Partículas vivas: {contadores.vivas}",
+            2: f"En casa: {contadores.en_casa}",
+            3: f"Comieron hoy: {contadores.comieron}",
+            4: f"Pueden reproducirse: {contadores.pueden_reproducirse}",
+            7: f"Normales: {contadores.normales}",
+            8: f"Verdes: {contadores.verdes}",
+            9: f"Rojos: {contadores.rojos}",
+            10: f"Depredadores: {len(depredadores)}",
+        }
+        if redibujar_todo or lineas_panel != ultimo_panel:
+            ultimo_panel = lineas_panel
+            pantalla.blit(fondo, RECT_PANEL, RECT_PANEL)
+            for i, linea in lineas_panel.items():
+                dibujar_linea_panel(pantalla, i, linea, fuente, fuente_pequena, textos)
+            sucios.append(RECT_PANEL)
+
+        if redibujar_todo:
+            pygame.display.flip()
+            redibujar_todo = False
+        else:
+            pygame.display.update(sucios)
+        cuadros_dibujados += 1
 
-        pygame.display.flip()
-        reloj.tick(velocidad)
+        if perfilador is None:
+            reloj.tick(FPS_RENDER)
+        else:
+            perfilador.agregar("dibujo", time.perf_counter_ns() - inicio_dibujo)
+            perfilador.medir("espera", lambda: reloj.tick(FPS_RENDER))
+            perfilador.cerrar_cuadro()
 
-    return historial_poblacion, historial_tipos, historial_depredadores, historial_estadisticas
+    return motor.historiales()
 
 
 def mostrar_grafica_poblacion(historial_poblacion):
     """Muestra una gráfica de la evolución de la población"""
+    import matplotlib.pyplot as plt
+
     fig = plt.figure(figsize=(10, 6), facecolor='#1a1a1a')
     ax = fig.add_subplot(111)
     ax.set_facecolor('#2d2d2d')
@@ -1065,139 +889,44 @@ def mostrar_grafica_poblacion(historial_poblacion):
     plt.show()
 
 
-def pantalla_graficas(pantalla, reloj, historial_poblacion, historial_tipos, historial_depredadores):
-    """Pantalla interactiva para mostrar las gráficas con botón para volver"""
-    fuente_titulo = pygame.font.Font(None, 48)
-    fuente = pygame.font.Font(None, 28)
-    
-    boton_volver = Boton((ANCHO_VENTANA//2 - 75, ALTO_VENTANA - 80, 150, 60), "VOLVER", AZUL_BOTON, (90, 190, 255))
-    
-    # Crear las figuras de matplotlib
-    fig = plt.figure(figsize=(16, 10), facecolor='#1a1a1a')
-    ax1 = plt.subplot(2, 2, 1)
-    ax2 = plt.subplot(2, 2, 2)
-    ax3 = plt.subplot(2, 2, 3)
-    ax4 = plt.subplot(2, 2, 4)
-    
-    ax1.set_facecolor('#2d2d2d')
-    ax2.set_facecolor('#2d2d2d')
-    ax3.set_facecolor('#2d2d2d')
-    ax4.set_facecolor('#2d2d2d')
-    
-    # Gráfica 1: Evolución total de la población
-    ax1.plot(range(len(historial_poblacion)), historial_poblacion, marker='o', 
-             linewidth=2, markersize=6, color='#42A5F5', label='Población Total')
-    ax1.set_xlabel('Día', fontsize=12, color='white')
-    ax1.set_ylabel('Población', fontsize=12, color='white')
-    ax1.set_title('Evolución de la Población a lo Largo del Tiempo', fontsize=13, fontweight='bold', color='white')
-    ax1.grid(True, alpha=0.3, color='white')
-    ax1.tick_params(colors='white')
-    ax1.legend(facecolor='#2d2d2d', edgecolor='white', labelcolor='white')
-    
-    # Gráfica 2: Desglose por tipo
-    dias = range(len(historial_tipos))
-    normales = [h["normal"] for h in historial_tipos]
-    rojos = [h["rojo"] for h in historial_tipos]
-    verdes = [h["verde"] for h in historial_tipos]
-    
-    ax2.plot(dias, normales, marker='o', linewidth=2, markersize=6, color='#FFD700', label='Normales (Dorado)')
-    ax2.plot(dias, verdes, marker='s', linewidth=2, markersize=6, color='#00FF00', label='Mutación Velocidad (Verde)')
-    ax2.plot(dias, rojos, marker='^', linewidth=2, markersize=6, color='#FF0000', label='Mutación Prioridad (Rojo)')
-    ax2.set_xlabel('Día', fontsize=12, color='white')
-    ax2.set_ylabel('Cantidad de Partículas', fontsize=12, color='white')
-    ax2.set_title('Población por Tipo de Mutación', fontsize=13, fontweight='bold', color='white')
-    ax2.grid(True, alpha=0.3, color='white')
-    ax2.tick_params(colors='white')
-    ax2.legend(facecolor='#2d2d2d', edgecolor='white', labelcolor='white')
-    
-    # Gráfica 3: Partículas eliminadas por depredadores por día
-    if historial_depredadores:
-        dias_purga = [h["dia"] for h in historial_depredadores]
-        eliminadas = [int(h["particulas_eliminadas"]) for h in historial_depredadores]
-        
-        ax3.bar(dias_purga, eliminadas, color='#8B008B', alpha=0.7, label='Partículas Eliminadas')
-        ax3.set_xlabel('Día de Purga', fontsize=12, color='white')
-        ax3.set_ylabel('Partículas Eliminadas', fontsize=12, color='white')
-        ax3.set_title('Impacto de Depredadores por Día de Purga', fontsize=13, fontweight='bold', color='white')
-        ax3.grid(True, alpha=0.3, color='white', axis='y')
-        ax3.yaxis.set_major_locator(MaxNLocator(integer=True))
-        ax3.yaxis.set_major_formatter(FuncFormatter(lambda x, _: f"{int(x)}"))
-        ax3.tick_params(colors='white')
-        ax3.legend(facecolor='#2d2d2d', edgecolor='white', labelcolor='white')
-    else:
-        ax3.text(0.5, 0.5, 'No hubo días de purga', ha='center', va='center', 
-                fontsize=14, color='white', transform=ax3.transAxes)
-        ax3.set_title('Impacto de Depredadores', fontsize=13, fontweight='bold', color='white')
-    
-    # Gráfica 4: Desglose de tipos eliminados por depredadores
-    if historial_depredadores:
-        dias_purga = [h["dia"] for h in historial_depredadores]
-        vel_elim = [int(h.get("velocidad_eliminadas", 0)) for h in historial_depredadores]
-        pri_elim = [int(h.get("prioridad_eliminadas", 0)) for h in historial_depredadores]
-        nor_elim = [int(h.get("normal_eliminadas", 0)) for h in historial_depredadores]
-        
-        width = 0.25
-        x = range(len(dias_purga))
-        
-        ax4.bar([i - width for i in x], nor_elim, width, label='Normales', color='#FFD700', alpha=0.7)
-        ax4.bar(x, vel_elim, width, label='Velocidad', color='#00FF00', alpha=0.7)
-        ax4.bar([i + width for i in x], pri_elim, width, label='Prioridad', color='#FF0000', alpha=0.7)
-        
-        ax4.set_xlabel('Día de Purga', fontsize=12, color='white')
-        ax4.set_ylabel('Cantidad Eliminada', fontsize=12, color='white')
-        ax4.set_title('Tipos de Partículas Eliminadas por Depredadores', fontsize=13, fontweight='bold', color='white')
-        ax4.set_xticks(x)
-        ax4.set_xticklabels(dias_purga)
-        ax4.grid(True, alpha=0.3, color='white', axis='y')
-        ax4.yaxis.set_major_locator(MaxNLocator(integer=True))
-        ax4.yaxis.set_major_formatter(FuncFormatter(lambda x, _: f"{int(x)}"))
-        ax4.tick_params(colors='white')
-        ax4.legend(facecolor='#2d2d2d', edgecolor='white', labelcolor='white')
-    else:
-        ax4.text(0.5, 0.5, 'No hubo días de purga', ha='center', va='center', 
-                fontsize=14, color='white', transform=ax4.transAxes)
-        ax4.set_title('Tipos Eliminados por Depredadores', fontsize=13, fontweight='bold', color='white')
-    
-    # Ajustar diseño
-    plt.tight_layout()
-    
-    # Mostrar las gráficas
+def pantalla_graficas(pantalla, reloj, historial_poblacion, historial_tipos, historial_depredadores,
+                      estadisticas=None):
+    """
+    Muestra las gráficas de resultados en una ventana de matplotlib; con
+    `estadisticas` (EstadisticasEnsamble) muestra las bandas del ensamble.
+    """
+    if estadisticas is not None:
+        from ensamble import graficar_ensamble
+        graficar_ensamble(estadisticas)
+        return
+
+    import matplotlib.pyplot as plt
+    from graficas import TAMANO_FIGURA, dibujar_resultados
+
+    fig = plt.figure(figsize=TAMANO_FIGURA, facecolor='#1a1a1a')
+    dibujar_resultados(fig, historial_poblacion, historial_tipos, historial_depredadores)
     plt.show()
 
 
-def mostrar_tabla_historico(historial_estadisticas):
-    """Muestra la tabla de histórico diario"""
-    fig = plt.figure(figsize=(16, 10), facecolor='#1a1a1a')
-    ax = fig.add_subplot(111)
-    ax.axis('off')
+def mostrar_tabla_paginada(ax, titulo, encabezados, columnas, anchos, bbox, tamano_fuente, escala):
+    """
+    Tabla de matplotlib con celdas solo para una página de FILAS_POR_PAGINA
+    filas; al paginar (flechas, RePág/AvPág, Inicio/Fin o la rueda del ratón)
+    se reemplaza el texto de esas celdas con la porción visible de `columnas`
+    (arreglos del mismo largo), así una tabla de miles de días abre al instante.
+    """
+    total = len(columnas[0])
+    filas_pagina = min(FILAS_POR_PAGINA, total)
+    paginas = max(1, math.ceil(total / FILAS_POR_PAGINA))
+    celdas = [encabezados] + [[""] * len(encabezados) for _ in range(filas_pagina)]
 
-    data_unificada = [[
-        'Día', 'Población Total', 'En casa', 'Comieron',
-        'Pueden Reproducirse', 'Normales', 'Verdes', 'Rojos', 'Depredadores'
-    ]]
-
-    for estad in historial_estadisticas:
-        data_unificada.append([
-            str(estad['dia']),
-            str(estad['poblacion_total']),
-            str(estad['en_casa']),
-            str(estad['comieron']),
-            str(estad['pueden_reproducirse']),
-            str(estad['normales']),
-            str(estad['verdes']),
-            str(estad['rojos']),
-            str(estad['depredadores'])
-        ])
-
-    table = ax.table(cellText=data_unificada, cellLoc='center', loc='center',
-                     colWidths=[0.05, 0.12, 0.08, 0.08, 0.14, 0.08, 0.07, 0.07, 0.1],
-                     bbox=[0, 0, 1, 0.9])
+    table = ax.table(cellText=celdas, cellLoc='center', loc='center', colWidths=anchos, bbox=bbox)
     table.auto_set_font_size(False)
-    table.set_fontsize(8)
-    table.scale(1, 2.2)
+    table.set_fontsize(tamano_fuente)
+    table.scale(1, escala)
 
-    for i in range(len(data_unificada)):
-        for j in range(len(data_unificada[0])):
+    for i in range(len(celdas)):
+        for j in range(len(encabezados)):
             cell = table[(i, j)]
             if i == 0:
                 cell.set_facecolor('#1a8cff')
@@ -1206,54 +935,94 @@ def mostrar_tabla_historico(historial_estadisticas):
                 cell.set_facecolor('#2d2d2d' if i % 2 == 0 else '#3a3a3a')
                 cell.set_text_props(color='white')
 
-    ax.set_title('Histórico', fontsize=14, fontweight='bold', color='white', pad=30)
+    estado = {"pagina": 0}
+
+    def mostrar_pagina(pagina):
+        estado["pagina"] = pagina = min(max(pagina, 0), paginas - 1)
+        inicio = pagina * FILAS_POR_PAGINA
+        # Solo las filas visibles pasan de los arreglos a texto
+        visibles = [columna[inicio:inicio + filas_pagina].tolist() for columna in columnas]
+        for j, valores in enumerate(visibles):
+            for i in range(filas_pagina):
+                table[(i + 1, j)].get_text().set_text(str(valores[i]) if i < len(valores) else "")
+        if paginas > 1:
+            fin = min(inicio + filas_pagina, total)
+            ax.set_title(f'{titulo} (filas {inicio + 1}-{fin} de {total}, página {pagina + 1}/{paginas}; '
+                         f'← → para cambiar)', fontsize=14, fontweight='bold', color='white', pad=30)
+        else:
+            ax.set_title(titulo, fontsize=14, fontweight='bold', color='white', pad=30)
+        ax.figure.canvas.draw_idle()
+
+    desplazamientos = {'right': 1, 'pagedown': 1, 'down': 1, 'left': -1, 'pageup': -1, 'up': -1}
+
+    def al_presionar(evento):
+        if evento.key in desplazamientos:
+            mostrar_pagina(estado["pagina"] + desplazamientos[evento.key])
+        elif evento.key == 'home':
+            mostrar_pagina(0)
+        elif evento.key == 'end':
+            mostrar_pagina(paginas - 1)
+
+    def al_girar(evento):
+        mostrar_pagina(estado["pagina"] + (1 if evento.button == 'down' else -1))
+
+    if paginas > 1:
+        ax.figure.canvas.mpl_connect('key_press_event', al_presionar)
+        ax.figure.canvas.mpl_connect('scroll_event', al_girar)
+    mostrar_pagina(0)
+    return table
+
+
+def mostrar_tabla_historico(historial_estadisticas):
+    """Muestra la tabla de histórico diario"""
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=(16, 10), facecolor='#1a1a1a')
+    ax = fig.add_subplot(111)
+    ax.axis('off')
+
+    estadisticas = como_tabla(historial_estadisticas)
+    claves = ['dia', 'poblacion_total', 'en_casa', 'comieron', 'pueden_reproducirse', 'normales', 'verdes', 'rojos',
+              'depredadores']
+    encabezados = ['Día', 'Población Total', 'En casa', 'Comieron',
+                   'Pueden Reproducirse', 'Normales', 'Verdes', 'Rojos', 'Depredadores']
+    if estadisticas:
+        mostrar_tabla_paginada(ax, 'Histórico', encabezados, [estadisticas.columna(clave) for clave in claves],
+                               [0.05, 0.12, 0.08, 0.08, 0.14, 0.08, 0.07, 0.07, 0.1], [0, 0, 1, 0.9], 8, 2.2)
+    else:
+        ax.text(0.5, 0.5, 'No hay días registrados', ha='center', va='center',
+                fontsize=14, color='white', transform=ax.transAxes)
+        ax.set_title('Histórico', fontsize=14, fontweight='bold', color='white', pad=30)
     plt.tight_layout()
     plt.show()
 
 
 def mostrar_tabla_depredadores(historial_depredadores):
     """Muestra la tabla de impacto de depredadores"""
+    import matplotlib.pyplot as plt
+
     fig = plt.figure(figsize=(12, 8), facecolor='#1a1a1a')
     ax = fig.add_subplot(111)
     ax.axis('off')
 
-    if historial_depredadores:
-        data_depredadores = [['Día Purga', 'Eliminadas', 'Normales', 'Verdes', 'Rojos']]
-        for dep in historial_depredadores:
-            data_depredadores.append([
-                str(dep['dia']),
-                str(dep['particulas_eliminadas']),
-                str(dep.get('normal_eliminadas', 0)),
-                str(dep.get('velocidad_eliminadas', 0)),
-                str(dep.get('prioridad_eliminadas', 0))
-            ])
-
-        table = ax.table(cellText=data_depredadores, cellLoc='center', loc='center',
-                         colWidths=[0.18, 0.22, 0.2, 0.2, 0.2], bbox=[0, 0, 1, 0.85])
-        table.auto_set_font_size(False)
-        table.set_fontsize(9)
-        table.scale(1, 2.0)
-
-        for i in range(len(data_depredadores)):
-            for j in range(len(data_depredadores[0])):
-                cell = table[(i, j)]
-                if i == 0:
-                    cell.set_facecolor('#1a8cff')
-                    cell.set_text_props(weight='bold', color='white')
-                else:
-                    cell.set_facecolor('#2d2d2d' if i % 2 == 0 else '#3a3a3a')
-                    cell.set_text_props(color='white')
+    depredadores = como_tabla(historial_depredadores)
+    if depredadores:
+        claves = ['dia', 'particulas_eliminadas', 'normal_eliminadas', 'velocidad_eliminadas', 'prioridad_eliminadas']
+        mostrar_tabla_paginada(ax, 'Impacto de Depredadores', ['Día Purga', 'Eliminadas', 'Normales', 'Verdes', 'Rojos'],
+                               [depredadores.columna(clave) for clave in claves],
+                               [0.18, 0.22, 0.2, 0.2, 0.2], [0, 0, 1, 0.85], 9, 2.0)
     else:
         ax.text(0.5, 0.5, 'No hubo días de purga', ha='center', va='center',
                 fontsize=14, color='white', transform=ax.transAxes)
-
-    ax.set_title('Impacto de Depredadores', fontsize=14, fontweight='bold', color='white', pad=30)
+        ax.set_title('Impacto de Depredadores', fontsize=14, fontweight='bold', color='white', pad=30)
     plt.tight_layout()
     plt.show()
 
 
 def mostrar_tabla_resumen(historial_poblacion, historial_depredadores, historial_estadisticas, config):
     """Muestra la tabla de resumen de simulación"""
+    import matplotlib.pyplot as plt
+
     fig = plt.figure(figsize=(10, 10), facecolor='#1a1a1a')
     ax = fig.add_subplot(111)
     ax.axis('off')
@@ -1268,6 +1037,11 @@ def mostrar_tabla_resumen(historial_poblacion, historial_depredadores, historial
         ['Depredadores por Purga', str(config['depredadores'])],
         ['Frecuencia de Purga', str(config['frecuencia_purga'])],
         ['Comida (%)', str(config['comida'])],
+        ['Mundo (celdas)', f"{config['ancho_mundo']} x {config['alto_mundo']}"],
+        ['Distribución de Comida', config['distribucion']],
+        ['Rebrote (ticks)', f"{config['rebrote']} ({config['modo_rebrote']})" if config['rebrote'] else 'No'],
+        ['Semilla', 'Al azar' if config['semilla'] is None else str(config['semilla'])],
+        ['Motor', 'Vectorizado' if config['vectorizado'] else 'Objetos'],
         ['Total de Días', str(len(historial_estadisticas))]
     ]
 
@@ -1308,6 +1082,20 @@ def pantalla_fin_simulacion(pantalla, reloj, historial_poblacion, historial_tipo
     boton_tablas = Boton((ANCHO_VENTANA//2 - 90, ALTO_VENTANA//2 - 50, 180, 50), "VER TABLAS", AZUL_BOTON, (90, 190, 255))
     boton_menu = Boton((ANCHO_VENTANA//2 - 90, ALTO_VENTANA//2 + 20, 180, 50), "MENU", AZUL_BOTON, (90, 190, 255))
     boton_salir = Boton((ANCHO_VENTANA//2 - 90, ALTO_VENTANA//2 + 90, 180, 50), "SALIR", ROJO, (200, 50, 50))
+    boton_exportar = Boton((ANCHO_VENTANA//2 - 90, ALTO_VENTANA//2 + 160, 180, 50), "EXPORTAR PNG", AZUL_BOTON,
+                           (90, 190, 255))
+    # Exportación de las gráficas en otro proceso: (ruta, Future) y el último mensaje
+    exportacion = None
+    mensaje_exportacion = ""
+    # Con réplicas, el ensamble corre en segundo plano mientras la pantalla sigue activa
+    replicas = config.get("replicas", 1)
+    ensamble = None
+    avance_ensamble = [0]
+    if replicas > 1:
+        from ensamble import ejecutar_ensamble_en_segundo_plano
+        ensamble = ejecutar_ensamble_en_segundo_plano(
+            config, replicas, vectorizado=config["vectorizado"],
+            progreso=lambda hechas, total, extinta: avance_ensamble.__setitem__(0, hechas))
     
     corriendo = True
     while corriendo:
@@ -1321,7 +1109,11 @@ def pantalla_fin_simulacion(pantalla, reloj, historial_poblacion, historial_tipo
             
             if evento.type == pygame.MOUSEBUTTONDOWN:
                 if boton_graficas.click(evento.pos):
-                    pantalla_graficas(pantalla, reloj, historial_poblacion, historial_tipos, historial_depredadores)
+                    if ensamble is None:
+                        pantalla_graficas(pantalla, reloj, historial_poblacion, historial_tipos, historial_depredadores)
+                    elif ensamble.done():
+                        pantalla_graficas(pantalla, reloj, historial_poblacion, historial_tipos, historial_depredadores,
+                                          estadisticas=ensamble.result())
                 if boton_tablas.click(evento.pos):
                     pantalla_tablas_historico(pantalla, reloj, historial_poblacion, historial_tipos, historial_depredadores, historial_estadisticas, config)
                 if boton_menu.click(evento.pos):
@@ -1329,6 +1121,18 @@ def pantalla_fin_simulacion(pantalla, reloj, historial_poblacion, historial_tipo
                 if boton_salir.click(evento.pos):
                     pygame.quit()
                     sys.exit()
+                if boton_exportar.click(evento.pos) and exportacion is None:
+                    from graficas import guardar_graficas_en_segundo_plano
+                    ruta = time.strftime("graficas_%Y%m%d_%H%M%S.png")
+                    exportacion = (ruta, guardar_graficas_en_segundo_plano(
+                        ruta, historial_poblacion, historial_tipos, historial_depredadores))
+                    mensaje_exportacion = f"Exportando {ruta}..."
+
+        if exportacion is not None and exportacion[1].done():
+            ruta, futuro = exportacion
+            error = futuro.exception()
+            mensaje_exportacion = f"Gráficas guardadas en {ruta}" if error is None else f"Error al exportar: {error}"
+            exportacion = None
         
         pantalla.fill(NEGRO)
         
@@ -1340,6 +1144,19 @@ def pantalla_fin_simulacion(pantalla, reloj, historial_poblacion, historial_tipo
         boton_tablas.dibujar(pantalla, fuente)
         boton_menu.dibujar(pantalla, fuente)
         boton_salir.dibujar(pantalla, fuente)
+        boton_exportar.dibujar(pantalla, fuente)
+        if ensamble is not None:
+            if not ensamble.done():
+                estado = f"Ensamble: {avance_ensamble[0]}/{replicas} réplicas..."
+            elif ensamble.exception() is not None:
+                estado = f"Error en el ensamble: {ensamble.exception()}"
+            else:
+                estado = f"Ensamble de {replicas} réplicas listo: VER GRÁFICAS muestra sus bandas"
+            texto = fuente.render(estado, True, BLANCO)
+            pantalla.blit(texto, texto.get_rect(center=(ANCHO_VENTANA//2, ALTO_VENTANA//2 - 170)))
+        if mensaje_exportacion:
+            texto = fuente.render(mensaje_exportacion, True, BLANCO)
+            pantalla.blit(texto, texto.get_rect(center=(ANCHO_VENTANA//2, ALTO_VENTANA//2 + 240)))
         
         pygame.display.flip()
         reloj.tick(60)
@@ -1347,27 +1164,46 @@ def pantalla_fin_simulacion(pantalla, reloj, historial_poblacion, historial_tipo
     return None
 
 
-def main():
+def crear_parser():
+    """Valores con los que abre la pantalla de configuración (mismas opciones que el modo batch)"""
+    parser = argparse.ArgumentParser(description="Simulación de selección natural con interfaz gráfica")
+    parser.add_argument("--semilla", type=int, default=None,
+                        help="Semilla de la corrida (misma configuración y semilla = mismo historial)")
+    parser.add_argument("--vectorizado", action="store_true",
+                        help="Usar la población en arreglos de NumPy (MotorVectorizado)")
+    parser.add_argument("--distribucion", choices=tuple(DISTRIBUCIONES), default=DISTRIBUCION_COMIDA,
+                        help="Reparto de la comida en el mapa")
+    parser.add_argument("--rebrote", type=int, default=TICKS_REBROTE,
+                        help="Ticks hasta que rebrota cada celda comida (0 = la comida se reparte de nuevo cada día)")
+    parser.add_argument("--modo-rebrote", dest="modo_rebrote", choices=MODOS_REBROTE, default=MODO_REBROTE,
+                        help="fijo: rebrota a los --rebrote ticks; probabilidad: con probabilidad 1/--rebrote por tick")
+    parser.add_argument("--replicas", type=int, default=1,
+                        help="Réplicas del ensamble que resumen las gráficas (1 = solo la corrida mostrada)")
+    return parser
+
+
+def main(argv=None):
     """Función principal"""
+    inicial = vars(crear_parser().parse_args(argv))
+    # Pygame (y matplotlib, en las pantallas de resultados) se inicializa solo al abrir
+    # la ventana: importar este módulo no toca pantalla ni fuentes
+    pygame.init()
     pantalla = pygame.display.set_mode((ANCHO_VENTANA, ALTO_VENTANA))
     pygame.display.set_caption("Simulación de Selección Natural")
     reloj = pygame.time.Clock()
 
     while True:
-        config = pantalla_configuracion(pantalla, reloj)
+        config = pantalla_configuracion(pantalla, reloj, inicial)
+        # Al volver al menú, semilla, comida y motor quedan como se eligieron
+        inicial = config
+
+        clase = SimulationEngine
+        if config["vectorizado"]:
+            from motor_vectorizado import MotorVectorizado
+            clase = MotorVectorizado
 
         # Ejecutar simulación
-        resultado = simulacion(
-            pantalla,
-            reloj,
-            config["dias"],
-            config["pasos"],
-            config["duracion"],
-            config["comida"],
-            config["particulas"],
-            config["depredadores"],
-            config["frecuencia_purga"]
-        )
+        resultado = simulacion(pantalla, reloj, config, clase)
         
         # Si resultado es (None, None, None), el usuario quiere volver al menú
         if resultado == (None, None, None, None):
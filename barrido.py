@@ -0,0 +1,216 @@
+"""
+Barrido de parámetros en paralelo, sin interfaz gráfica.
+
+Expande una rejilla de valores (o una lista de configuraciones con las mismas
+claves que pantalla_configuracion) y reparte las corridas entre todos los
+núcleos con ProcessPoolExecutor. Los historiales de todas las corridas se
+reúnen en una sola tabla, con una fila por corrida y día, que se escribe
+(CSV, JSON Lines o Parquet) a medida que termina cada corrida.
+
+Cada réplica de cada configuración usa su propio hijo del SeedSequence de la
+semilla, con spawn_key (índice en la rejilla, réplica): las configuraciones son
+independientes entre sí y cada corrida se puede repetir sola a partir de la
+semilla y el spawn_key que quedan en su fila:
+
+    python barrido.py --comida 10 20 30 --pasos 50 100 --dias 100 --salida barrido.csv
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from motor_simulacion import CONFIG_POR_DEFECTO, SimulationEngine
+from sumideros import crear_sumidero
+
+SALIDA_POR_DEFECTO = "barrido.csv"
+# Tipo de las opciones cuyo valor por defecto es None (no se puede deducir del valor)
+TIPOS_OPCIONALES = {"ancho_mundo": int, "alto_mundo": int, "semilla": int}
+
+# Columnas de la tabla de resultados tomadas de historial_estadisticas; "comida" y
+# "depredadores" se renombran para no chocar con las claves de la configuración
+COLUMNAS_DIA = {"dia": "dia", "poblacion_total": "poblacion_total", "comida": "comida_dia", "vivas": "vivas",
+                "en_casa": "en_casa", "comieron": "comieron", "pueden_reproducirse": "pueden_reproducirse",
+                "normales": "normales", "verdes": "verdes", "rojos": "rojos", "depredadores": "depredadores_dia"}
+
+
+def expandir_rejilla(rejilla, base=None):
+    """
+    Configuraciones del producto cartesiano de `rejilla` ({clave: [valores]}),
+    completadas con `base` (por defecto CONFIG_POR_DEFECTO).
+    """
+    base = dict(CONFIG_POR_DEFECTO if base is None else base)
+    claves = list(rejilla)
+    return [{**base, **dict(zip(claves, valores))}
+            for valores in itertools.product(*(rejilla[clave] for clave in claves))]
+
+
+def semilla_corrida(semilla, indice, replica=0):
+    """
+    SeedSequence de la réplica `replica` de la configuración `indice` de la
+    rejilla: un hijo fijo de `semilla`, del que el motor deriva sus generadores
+    con flujos_aleatorios. Distintas (indice, replica) dan flujos independientes.
+    """
+    return np.random.SeedSequence(semilla, spawn_key=(indice, replica))
+
+
+def ejecutar_corrida(config, vectorizado=False, semilla=None, replica=0):
+    """
+    Ejecuta una corrida completa y retorna sus historiales (se llama dentro del
+    pool); `semilla` (p. ej. de semilla_corrida) reemplaza a config["semilla"].
+    """
+    if vectorizado:
+        from motor_vectorizado import MotorVectorizado
+        clase = MotorVectorizado
+    else:
+        clase = SimulationEngine
+    inicio = time.perf_counter()
+    motor = clase.desde_config(config, semilla=semilla)
+    historial_poblacion, historial_tipos, historial_depredadores, historial_estadisticas = motor.run()
+    return {
+        "config": config,
+        "replica": replica,
+        "spawn_key": list(semilla.spawn_key) if isinstance(semilla, np.random.SeedSequence) else None,
+        "extinta": motor.extinta,
+        "segundos": time.perf_counter() - inicio,
+        "historial_poblacion": historial_poblacion,
+        "historial_tipos": historial_tipos,
+        "historial_depredadores": historial_depredadores,
+        "historial_estadisticas": historial_estadisticas
+    }
+
+
+def ejecutar_barrido(configs, procesos=None, vectorizado=False, progreso=None, conservar=True, replicas=1):
+    """
+    Ejecuta `replicas` corridas de cada configuración en un ProcessPoolExecutor
+    (por defecto con un proceso por núcleo) y retorna los resultados en el orden
+    de `configs` (las réplicas de una configuración, seguidas). La réplica r de
+    configs[i] usa semilla_corrida(config["semilla"], i, r); las configuraciones
+    sin semilla comparten una elegida al azar para todo el barrido, que queda en
+    su "config". Con conservar=False los resultados solo pasan por `progreso` y
+    no se acumulan (la lista retornada queda con None).
+
+    progreso(hechas, total, indice, resultado) se llama cada vez que termina una corrida.
+    """
+    # concurrent.futures.process arrastra multiprocessing: se importa al lanzar el pool, no con el módulo
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    # Entero de 63 bits: entra en una columna int64 de Parquet
+    semilla_barrido = int(np.random.default_rng().integers(2 ** 63))
+    total = len(configs) * replicas
+    resultados = [None] * total
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = {}
+        for i, config in enumerate(configs):
+            if config.get("semilla") is None:
+                config = dict(config, semilla=semilla_barrido)
+            for replica in range(replicas):
+                semilla = semilla_corrida(config["semilla"], i, replica)
+                futuros[pool.submit(ejecutar_corrida, config, vectorizado, semilla, replica)] = i * replicas + replica
+        for hechas, futuro in enumerate(as_completed(futuros), 1):
+            k = futuros[futuro]
+            resultado = futuro.result()
+            if conservar:
+                resultados[k] = resultado
+            if progreso is not None:
+                progreso(hechas, total, k, resultado)
+    return resultados
+
+
+def filas_corrida(corrida, resultado):
+    """Filas de la tabla de resultados de una corrida: una por día"""
+    eliminadas = {d["dia"]: d["particulas_eliminadas"] for d in resultado["historial_depredadores"]}
+    filas = []
+    for estadisticas in resultado["historial_estadisticas"]:
+        fila = {"corrida": corrida, "replica": resultado["replica"], "spawn_key": resultado["spawn_key"],
+                **resultado["config"]}
+        fila.update((columna, estadisticas[clave]) for clave, columna in COLUMNAS_DIA.items())
+        fila["particulas_eliminadas"] = eliminadas.get(estadisticas["dia"], 0)
+        filas.append(fila)
+    return filas
+
+
+def tabla_resultados(resultados):
+    """
+    Una fila por corrida y día: índice de corrida, réplica, spawn_key,
+    configuración (con su semilla) y estadísticas del día
+    """
+    return [fila for corrida, resultado in enumerate(resultados) for fila in filas_corrida(corrida, resultado)]
+
+
+def guardar_csv(filas, ruta):
+    """Guarda la tabla de resultados como CSV (una columna por clave)"""
+    if not filas:
+        return
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=list(filas[0]))
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+
+def imprimir_progreso(hechas, total, indice, resultado):
+    """Callback de progreso de main: una línea por corrida terminada"""
+    config = resultado["config"]
+    parametros = " ".join(f"{clave}={config[clave]}" for clave in config if clave != "dias")
+    print(f"[{hechas}/{total}] corrida {indice}: {parametros} -> "
+          f"{len(resultado['historial_estadisticas'])} días, final {resultado['historial_poblacion'][-1]}"
+          f"{' (extinta)' if resultado['extinta'] else ''} ({resultado['segundos']:.1f} s)",
+          file=sys.stderr, flush=True)
+
+
+def crear_parser():
+    """Argumentos del barrido: una lista de valores por clave de configuración"""
+    parser = argparse.ArgumentParser(description="Barrido de parámetros de la simulación en paralelo")
+    # Cada parámetro acepta varios valores; se ejecuta el producto cartesiano
+    for clave, valor in CONFIG_POR_DEFECTO.items():
+        if valor is None:
+            # Sin la opción la clave no entra en la rejilla y queda el valor por defecto de la configuración
+            parser.add_argument("--" + clave.replace("_", "-"), dest=clave, type=TIPOS_OPCIONALES[clave], nargs="+",
+                                default=None, help=f"Valores de '{clave}' (por defecto sin fijar)")
+            continue
+        parser.add_argument("--" + clave.replace("_", "-"), dest=clave, type=type(valor), nargs="+", default=[valor],
+                            help=f"Valores de '{clave}' (por defecto {valor})")
+    parser.add_argument("--configs", help="Archivo JSON con una lista de configuraciones (reemplaza la rejilla)")
+    parser.add_argument("--replicas", type=int, default=1,
+                        help="Corridas de cada configuración, cada una con su propio flujo aleatorio")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help=f"Procesos en paralelo (por defecto {os.cpu_count()})")
+    parser.add_argument("--vectorizado", action="store_true",
+                        help="Usar la población en arreglos de NumPy (MotorVectorizado)")
+    parser.add_argument("--salida", default=SALIDA_POR_DEFECTO,
+                        help="Archivo con la tabla de resultados (.csv, .jsonl o .parquet; "
+                             f"por defecto {SALIDA_POR_DEFECTO})")
+    return parser
+
+
+def main(argv=None):
+    """Ejecuta el barrido en paralelo informando el progreso en stderr"""
+    args = crear_parser().parse_args(argv)
+    if args.configs:
+        with open(args.configs, encoding="utf-8") as f:
+            configs = [{**CONFIG_POR_DEFECTO, **config} for config in json.load(f)]
+    else:
+        configs = expandir_rejilla({clave: getattr(args, clave) for clave in CONFIG_POR_DEFECTO
+                                    if getattr(args, clave) is not None})
+
+    print(f"Ejecutando {len(configs)} configuraciones x {args.replicas} réplicas...", file=sys.stderr)
+    inicio = time.perf_counter()
+    # Las filas de cada corrida se escriben en cuanto termina (en orden de llegada)
+    with crear_sumidero(args.salida) as sumidero:
+        def escribir_corrida(hechas, total, indice, resultado):
+            imprimir_progreso(hechas, total, indice, resultado)
+            sumidero.escribir_filas(filas_corrida(indice, resultado))
+            sumidero.vaciar()
+        ejecutar_barrido(configs, args.procesos, args.vectorizado, escribir_corrida, conservar=False,
+                         replicas=args.replicas)
+    print(f"Tabla de resultados ({sumidero.filas_escritas} filas) guardada en {args.salida}", file=sys.stderr)
+    print(f"Barrido completo en {time.perf_counter() - inicio:.1f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
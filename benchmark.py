@@ -0,0 +1,366 @@
+"""
+Benchmarks de los caminos críticos de la simulación.
+
+Micro-benchmarks: Particula.mover, Depredador.mover, buscar_objetivo_cercano,
+verificar_colision, la resolución de la comida (Paso 2), generar_comida y el
+cierre del día, medidos sobre escenarios fijos (misma semilla en cada corrida).
+El movimiento de toda la población se mide además con 1000 y 5000 partículas
+en los dos motores (Particula.mover en un bucle contra el kernel mover_poblacion).
+Macro-benchmarks: ticks/s y días/s de corridas completas para una matriz de
+tamaños de población, porcentajes de comida y frecuencias de purga. El motor
+de objetos solo corre los tamaños chicos (hasta MAX_PARTICULAS_OBJETOS) salvo
+con --objetos-grandes: con 10000 partículas una sola corrida tarda minutos.
+Importación: tiempo de `import` de cada módulo en un proceso nuevo, que se
+compara contra la referencia guardada como las demás métricas (con su propio
+umbral, más holgado); ninguno puede cargar matplotlib ni inicializar pygame.
+
+Los resultados se guardan como JSON para comparar entre commits; con
+--comparar se informa cada métrica que empeoró más que --umbral (%) y el
+proceso termina con código 1:
+
+    python benchmark.py --salida base.json
+    python benchmark.py --comparar base.json --umbral 10
+"""
+import argparse
+import copy
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from motor_simulacion import SimulationEngine, generar_comida
+from movimiento import mover_poblacion
+
+SEMILLA = 12345
+TAMANOS = (50, 500, 2000, 10000)
+MAX_PARTICULAS_OBJETOS = 2000  # Mayor población del motor de objetos en los macro-benchmarks por defecto
+TAMANOS_MOVIMIENTO = (1000, 5000)  # Poblaciones fijas del micro-benchmark de movimiento
+PORCENTAJES_COMIDA = (10, 30)
+FRECUENCIAS_PURGA = (0, 2)  # 0 = sin depredadores; 2 = el segundo día es de purga
+REPETICIONES = 7
+UMBRAL_REGRESION = 10  # % de empeoramiento que dispara una alerta
+# Arrancar un proceso tiene más ruido que un micro-benchmark: las importaciones toleran más
+UMBRAL_IMPORTACION = 25
+# Módulos cuyo `import` se mide en un proceso nuevo: lo que paga cada worker del
+# barrido o del ensamble, y la interfaz antes de abrir la ventana
+MODULOS_IMPORTACION = ("motor_simulacion", "motor_vectorizado", "checkpoint", "barrido", "ensamble",
+                       "SRW_Natural_Selection")
+REPETICIONES_IMPORTACION = 5
+CODIGO_IMPORTACION = """
+import sys, time
+inicio = time.perf_counter_ns()
+import {modulo}
+duracion = time.perf_counter_ns() - inicio
+pygame = sys.modules.get("pygame")
+print(duracion, "matplotlib" in sys.modules, bool(pygame and pygame.get_init()))
+"""
+
+
+def clase_motor(nombre):
+    if nombre == "vectorizado":
+        from motor_vectorizado import MotorVectorizado
+        return MotorVectorizado
+    return SimulationEngine
+
+
+def medir(funcion, preparar=None, repeticiones=REPETICIONES, operaciones=1):
+    """
+    Mediana y mínimo de `repeticiones` llamadas a funcion(estado), donde
+    estado = preparar() se construye fuera de la medición.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        estado = preparar() if preparar is not None else None
+        inicio = time.perf_counter_ns()
+        funcion(estado)
+        tiempos.append(time.perf_counter_ns() - inicio)
+    mediana = statistics.median(tiempos)
+    return {"mediana_ms": mediana / 1e6, "minimo_ms": min(tiempos) / 1e6, "repeticiones": repeticiones,
+            "operaciones": operaciones, "us_por_operacion": mediana / 1e3 / operaciones}
+
+
+def escenario_purga(clase, particulas, ticks=20):
+    """Motor en pleno día de purga, con partículas repartidas por el mapa y pasos de sobra"""
+    motor = clase(num_dias=1, pasos_vida=9999, duracion_dia=10000, num_particulas_inicial=particulas,
+                  num_depredadores=10, frecuencia_purga=1, semilla=SEMILLA)
+    for _ in range(ticks):
+        motor.step()
+    return motor
+
+
+def escenario_fin_de_dia(clase, particulas):
+    """Motor en el último tick del día, justo antes de _cerrar_dia"""
+    motor = clase(num_dias=2, num_particulas_inicial=particulas, frecuencia_purga=0, semilla=SEMILLA)
+    while motor.paso_actual_dia < motor.duracion_dia - 1:
+        motor.step()
+    return motor
+
+
+def escenario_movimiento(clase, particulas):
+    """Motor al inicio de un día sin purga, con pasos de sobra para que todas las partículas se muevan"""
+    return clase(num_dias=1, pasos_vida=9999, duracion_dia=10000, num_particulas_inicial=particulas,
+                 frecuencia_purga=0, semilla=SEMILLA)
+
+
+def micro_benchmarks(particulas, repeticiones=REPETICIONES):
+    """Tiempo de cada camino crítico sobre una población de `particulas`"""
+    resultados = {}
+    motor = escenario_purga(SimulationEngine, particulas)
+    limites, aleatorio = motor.limites, motor.aleatorio
+    lista, depredadores = motor.particulas, motor.depredadores
+
+    def mover_particulas(_):
+        for p in lista:
+            p.mover(limites, aleatorio)
+    resultados["particula_mover"] = medir(mover_particulas, repeticiones=repeticiones, operaciones=len(lista))
+
+    motor._construir_indice()
+    indice = motor.indice
+
+    def mover_depredadores(_):
+        for d in depredadores:
+            d.mover(limites, lista, aleatorio, indice)
+    resultados["depredador_mover"] = medir(mover_depredadores, repeticiones=repeticiones,
+                                           operaciones=len(depredadores))
+
+    def buscar_objetivos(_):
+        for d in depredadores:
+            d.buscar_objetivo_cercano(lista, indice)
+    resultados["buscar_objetivo_cercano"] = medir(buscar_objetivos, repeticiones=repeticiones,
+                                                  operaciones=len(depredadores))
+
+    # Invulnerables: las colisiones se detectan pero no cambian el estado entre repeticiones
+    for p in lista:
+        p.invulnerable_frames = 10 ** 9
+
+    def verificar_colisiones(_):
+        for d in depredadores:
+            d.verificar_colision(lista, [], indice)
+    resultados["verificar_colision"] = medir(verificar_colisiones, repeticiones=repeticiones,
+                                             operaciones=len(depredadores))
+
+    resultados["generar_comida"] = medir(lambda _: generar_comida(limites, 20, motor.rng, motor.distribucion),
+                                         repeticiones=repeticiones)
+
+    for nombre in ("objetos", "vectorizado"):
+        clase = clase_motor(nombre)
+        con_comida = escenario_purga(clase, particulas)
+
+        def preparar_comida():
+            con_comida._regenerar_comida()
+            return con_comida
+        resultados[f"procesar_comida_{nombre}"] = medir(lambda m: m._procesar_comida(), preparar_comida,
+                                                        repeticiones)
+
+        fin_de_dia = escenario_fin_de_dia(clase, particulas)
+        resultados[f"cerrar_dia_{nombre}"] = medir(lambda m: m._cerrar_dia(), lambda: copy.deepcopy(fin_de_dia),
+                                                   repeticiones)
+
+    # Un tick de movimiento de toda la población: bucle de objetos contra el kernel vectorizado
+    for n in TAMANOS_MOVIMIENTO:
+        objetos = escenario_movimiento(SimulationEngine, n)
+
+        def mover_objetos(_, lista=objetos.particulas, limites=objetos.limites, aleatorio=objetos.aleatorio):
+            for p in lista:
+                p.mover(limites, aleatorio)
+        resultados[f"mover_objetos_n={n}"] = medir(mover_objetos, repeticiones=repeticiones, operaciones=n)
+
+        vectorizado = escenario_movimiento(clase_motor("vectorizado"), n)
+        resultados[f"mover_poblacion_n={n}"] = medir(
+            lambda _, m=vectorizado: mover_poblacion(m.poblacion, m.limites, m.rng), repeticiones=repeticiones,
+            operaciones=n)
+    return resultados
+
+
+def macro_benchmark(motor, particulas, comida, frecuencia_purga, dias):
+    """Ticks/s y días/s de una corrida completa de `dias` días"""
+    m = clase_motor(motor)(num_dias=dias, num_particulas_inicial=particulas, porcentaje_comida=comida,
+                           frecuencia_purga=frecuencia_purga, semilla=SEMILLA)
+    ticks = 0
+    inicio = time.perf_counter()
+    while not m.terminado:
+        m.step()
+        ticks += 1
+    segundos = time.perf_counter() - inicio
+    return {"motor": motor, "particulas": particulas, "comida": comida, "frecuencia_purga": frecuencia_purga,
+            "dias": len(m.historial_estadisticas), "ticks": ticks, "segundos": segundos,
+            "ticks_por_segundo": ticks / segundos, "dias_por_segundo": len(m.historial_estadisticas) / segundos}
+
+
+def medir_importacion(modulo, repeticiones=REPETICIONES_IMPORTACION):
+    """Mediana de `import modulo` en procesos nuevos y si cargó matplotlib o inicializó pygame"""
+    tiempos = []
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, "-c", CODIGO_IMPORTACION.format(modulo=modulo)], capture_output=True,
+                                text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        # pygame escribe su saludo antes; la medición es la última línea
+        nanosegundos, matplotlib, pygame = salida.splitlines()[-1].split()
+        tiempos.append(int(nanosegundos))
+    return {"mediana_ms": statistics.median(tiempos) / 1e6, "minimo_ms": min(tiempos) / 1e6,
+            "repeticiones": repeticiones, "matplotlib": matplotlib == "True", "pygame_iniciado": pygame == "True"}
+
+
+def medir_importaciones(modulos=MODULOS_IMPORTACION, repeticiones=REPETICIONES_IMPORTACION):
+    return {modulo: medir_importacion(modulo, repeticiones) for modulo in modulos}
+
+
+def importaciones_prohibidas(importaciones):
+    """(módulo, motivo) de cada importación que carga lo que no debe; el tiempo se compara contra la referencia"""
+    fallas = []
+    for modulo, datos in importaciones.items():
+        if datos["matplotlib"]:
+            fallas.append((modulo, "importa matplotlib"))
+        if datos["pygame_iniciado"]:
+            fallas.append((modulo, "inicializa pygame"))
+    return fallas
+
+
+def clave_macro(resultado):
+    return (f"{resultado['motor']}/n={resultado['particulas']}/comida={resultado['comida']}"
+            f"/purga={resultado['frecuencia_purga']}")
+
+
+def combinaciones_macro(motores, tamanos=TAMANOS, comidas=PORCENTAJES_COMIDA, frecuencias=FRECUENCIAS_PURGA,
+                        objetos_grandes=False):
+    """(motor, tamaño, comida, purga) a medir; sin `objetos_grandes`, el motor de objetos solo con los tamaños chicos"""
+    return [(motor, particulas, comida, frecuencia)
+            for motor, particulas, comida, frecuencia in itertools.product(motores, tamanos, comidas, frecuencias)
+            if motor != "objetos" or objetos_grandes or particulas <= MAX_PARTICULAS_OBJETOS]
+
+
+def macro_benchmarks(motores, tamanos=TAMANOS, comidas=PORCENTAJES_COMIDA, frecuencias=FRECUENCIAS_PURGA, dias=2,
+                     progreso=None, objetos_grandes=False):
+    """Matriz motor x tamaño x comida x purga, indexada por clave_macro"""
+    resultados = {}
+    for combinacion in combinaciones_macro(motores, tamanos, comidas, frecuencias, objetos_grandes):
+        resultado = macro_benchmark(*combinacion, dias)
+        resultados[clave_macro(resultado)] = resultado
+        if progreso is not None:
+            progreso(clave_macro(resultado), resultado)
+    return resultados
+
+
+def metadatos():
+    """Commit y entorno de la corrida, para ubicar los resultados al compararlos"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"fecha": time.strftime("%Y-%m-%d %H:%M:%S"), "commit": commit, "python": platform.python_version(),
+            "numpy": np.__version__, "plataforma": platform.platform(), "semilla": SEMILLA}
+
+
+def comparar(actual, base, umbral=UMBRAL_REGRESION, umbral_importacion=UMBRAL_IMPORTACION):
+    """
+    Regresiones de `actual` respecto de `base`: (métrica, valor base, valor
+    actual, % de empeoramiento) para cada métrica que empeoró más de `umbral`
+    (`umbral_importacion` para las importaciones). En los micro-benchmarks y
+    las importaciones empeorar es tardar más (los micro solo se comparan con la
+    misma población); en los macro, hacer menos ticks/s.
+    """
+    regresiones = []
+    if actual.get("particulas_micro") != base.get("particulas_micro"):
+        actual = {clave: valor for clave, valor in actual.items() if clave != "micro"}
+    for nombre, datos in actual.get("micro", {}).items():
+        anterior = base.get("micro", {}).get(nombre)
+        if anterior:
+            cambio = (datos["mediana_ms"] - anterior["mediana_ms"]) / anterior["mediana_ms"] * 100
+            if cambio > umbral:
+                regresiones.append((f"micro/{nombre} (ms)", anterior["mediana_ms"], datos["mediana_ms"], cambio))
+    for modulo, datos in actual.get("importacion", {}).items():
+        anterior = base.get("importacion", {}).get(modulo)
+        if anterior:
+            cambio = (datos["mediana_ms"] - anterior["mediana_ms"]) / anterior["mediana_ms"] * 100
+            if cambio > umbral_importacion:
+                regresiones.append((f"importacion/{modulo} (ms)", anterior["mediana_ms"], datos["mediana_ms"], cambio))
+    for clave, datos in actual.get("macro", {}).items():
+        anterior = base.get("macro", {}).get(clave)
+        if anterior:
+            cambio = (anterior["ticks_por_segundo"] - datos["ticks_por_segundo"]) / anterior["ticks_por_segundo"] * 100
+            if cambio > umbral:
+                regresiones.append((f"macro/{clave} (ticks/s)", anterior["ticks_por_segundo"],
+                                    datos["ticks_por_segundo"], cambio))
+    return regresiones
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Benchmarks de la simulación de selección natural")
+    parser.add_argument("--solo", choices=("micro", "macro", "importacion"), help="Ejecutar solo un grupo de benchmarks")
+    parser.add_argument("--particulas-micro", type=int, default=2000,
+                        help="Población de los micro-benchmarks (por defecto 2000)")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES,
+                        help=f"Repeticiones por micro-benchmark (por defecto {REPETICIONES})")
+    parser.add_argument("--motores", nargs="+", choices=("objetos", "vectorizado"), default=["objetos", "vectorizado"])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=list(TAMANOS), help="Poblaciones iniciales")
+    parser.add_argument("--objetos-grandes", dest="objetos_grandes", action="store_true",
+                        help=f"Medir también el motor de objetos con más de {MAX_PARTICULAS_OBJETOS} partículas")
+    parser.add_argument("--comida", type=int, nargs="+", default=list(PORCENTAJES_COMIDA), help="Comida (%%)")
+    parser.add_argument("--frecuencia-purga", dest="frecuencia_purga", type=int, nargs="+",
+                        default=list(FRECUENCIAS_PURGA), help="Frecuencias de purga (0 = nunca)")
+    parser.add_argument("--dias", type=int, default=2, help="Días por corrida de los macro-benchmarks")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior contra el cual comparar")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION,
+                        help=f"Empeoramiento (%%) que se informa como regresión (por defecto {UMBRAL_REGRESION})")
+    parser.add_argument("--umbral-importacion", dest="umbral_importacion", type=float, default=UMBRAL_IMPORTACION,
+                        help=f"Umbral (%%) de las importaciones (por defecto {UMBRAL_IMPORTACION})")
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    resultados = {"metadatos": metadatos()}
+
+    if args.solo in (None, "micro"):
+        print(f"Micro-benchmarks ({args.particulas_micro} partículas)", file=sys.stderr)
+        resultados["particulas_micro"] = args.particulas_micro
+        resultados["micro"] = micro_benchmarks(args.particulas_micro, args.repeticiones)
+        for nombre, datos in resultados["micro"].items():
+            print(f"  {nombre:<28} {datos['mediana_ms']:10.3f} ms  ({datos['us_por_operacion']:.2f} us/op)",
+                  file=sys.stderr)
+
+    fallas = []
+    if args.solo in (None, "importacion"):
+        print("Importación (proceso nuevo)", file=sys.stderr)
+        resultados["importacion"] = medir_importaciones()
+        for modulo, datos in resultados["importacion"].items():
+            print(f"  {modulo:<28} {datos['mediana_ms']:10.1f} ms", file=sys.stderr)
+        fallas = importaciones_prohibidas(resultados["importacion"])
+        for modulo, motivo in fallas:
+            print(f"  IMPORTACIÓN PROHIBIDA {modulo}: {motivo}", file=sys.stderr)
+
+    if args.solo in (None, "macro"):
+        print("Macro-benchmarks", file=sys.stderr)
+        resultados["macro"] = macro_benchmarks(
+            args.motores, args.tamanos, args.comida, args.frecuencia_purga, args.dias,
+            lambda clave, r: print(f"  {clave:<42} {r['ticks_por_segundo']:10.1f} ticks/s "
+                                   f"{r['dias_por_segundo']:8.3f} días/s", file=sys.stderr, flush=True),
+            args.objetos_grandes)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+        print(f"Resultados guardados en {args.salida}", file=sys.stderr)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        regresiones = comparar(resultados, base, args.umbral, args.umbral_importacion)
+        print(f"Comparación con {args.comparar} (commit {base.get('metadatos', {}).get('commit')}): "
+              f"{len(regresiones)} regresiones mayores a {args.umbral}%", file=sys.stderr)
+        for metrica, anterior, actual, cambio in regresiones:
+            print(f"  REGRESIÓN {metrica}: {anterior:.3f} -> {actual:.3f} ({cambio:+.1f}%)", file=sys.stderr)
+        if regresiones:
+            return 1
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
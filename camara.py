@@ -0,0 +1,110 @@
+"""
+Cámara sobre el mundo de la simulación, sin dependencias de Pygame.
+
+El mundo puede ser mucho más grande que la ventana (ver calcular_limites).
+La cámara decide qué rectángulo del mundo se ve en el área de dibujo y con
+qué zoom: convierte coordenadas del mundo a la pantalla y de vuelta, y
+entrega el rectángulo visible en píxeles del mundo y en celdas, para que la
+interfaz dibuje (y consulte) solo lo que cae dentro:
+
+    camara = Camara(motor.limites, (0, 102, 720, 648))
+    camara.acercar(1.25, ancla=evento.pos)
+    x0, y0, x1, y1 = camara.rectangulo_visible()
+
+Con zoom 1 y la vista inicial, la coordenada de pantalla es la del mundo,
+como cuando el mundo se derivaba de la ventana.
+"""
+import numpy as np
+
+ZOOM_MAXIMO = 4.0
+FACTOR_ZOOM = 1.25  # Por cada paso de la rueda del ratón o tecla +/-
+MARGEN_CAMARA = 30  # Píxeles del mundo visibles más allá de las paredes (menos que en la vista inicial)
+
+
+class Camara:
+    """
+    Vista de `limites` en el rectángulo de pantalla `vista` = (izq, arr, ancho, alto).
+    (x, y) es el punto del mundo que se ve en la esquina superior izquierda de la vista.
+    """
+
+    def __init__(self, limites, vista):
+        self.limites = limites
+        self.vista = tuple(vista)
+        izq, arr, ancho, alto = self.vista
+        # Alejar solo hasta que el mundo completo quepa en la vista
+        self.zoom_minimo = min(1.0, ancho / (limites['der'] - limites['izq'] + 2 * MARGEN_CAMARA),
+                               alto / (limites['abaj'] - limites['arr'] + 2 * MARGEN_CAMARA))
+        self.restablecer()
+
+    def restablecer(self):
+        """Vuelve a la vista inicial: zoom 1, mundo y pantalla con las mismas coordenadas"""
+        self.zoom = 1.0
+        self.x, self.y = float(self.vista[0]), float(self.vista[1])
+        self._acotar()
+
+    def estado(self):
+        """Tupla que cambia cada vez que cambia lo que se ve (para invalidar cachés)"""
+        return (self.x, self.y, self.zoom)
+
+    def punto(self, x, y):
+        """Coordenadas enteras de pantalla del punto (x, y) del mundo"""
+        return (round(self.vista[0] + (x - self.x) * self.zoom),
+                round(self.vista[1] + (y - self.y) * self.zoom))
+
+    def puntos(self, xs, ys):
+        """Versión vectorizada de punto() para arreglos de coordenadas"""
+        return (np.rint(self.vista[0] + (np.asarray(xs) - self.x) * self.zoom).astype(np.int64),
+                np.rint(self.vista[1] + (np.asarray(ys) - self.y) * self.zoom).astype(np.int64))
+
+    def a_mundo(self, sx, sy):
+        """Punto del mundo que se ve en la posición (sx, sy) de la pantalla"""
+        return (self.x + (sx - self.vista[0]) / self.zoom,
+                self.y + (sy - self.vista[1]) / self.zoom)
+
+    def escala(self, largo, minimo=1):
+        """Un largo del mundo (radio, grosor) en píxeles de pantalla, al menos `minimo`"""
+        return max(minimo, round(largo * self.zoom))
+
+    def rectangulo_visible(self, margen=0):
+        """(x0, y0, x1, y1) del mundo visible, ampliado en `margen` píxeles del mundo"""
+        return (self.x - margen, self.y - margen,
+                self.x + self.vista[2] / self.zoom + margen, self.y + self.vista[3] / self.zoom + margen)
+
+    def celdas_visibles(self, tamano_celda, margen=1):
+        """(fila0, fila1, columna0, columna1) de las celdas visibles (fin exclusivo), dentro del mundo"""
+        limites = self.limites
+        columnas = (limites['der'] - limites['izq']) // tamano_celda + 1
+        filas = (limites['abaj'] - limites['arr']) // tamano_celda + 1
+        x0, y0, x1, y1 = self.rectangulo_visible()
+        columna0 = int(np.clip((x0 - limites['izq']) // tamano_celda - margen, 0, columnas))
+        columna1 = int(np.clip((x1 - limites['izq']) // tamano_celda + margen + 1, 0, columnas))
+        fila0 = int(np.clip((y0 - limites['arr']) // tamano_celda - margen, 0, filas))
+        fila1 = int(np.clip((y1 - limites['arr']) // tamano_celda + margen + 1, 0, filas))
+        return fila0, fila1, columna0, columna1
+
+    def desplazar(self, dx, dy):
+        """Mueve la vista `dx`, `dy` píxeles de pantalla (positivo = hacia la derecha/abajo)"""
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+        self._acotar()
+
+    def acercar(self, factor, ancla=None):
+        """Multiplica el zoom por `factor` dejando fijo el punto de pantalla `ancla` (por defecto, el centro)"""
+        if ancla is None:
+            ancla = (self.vista[0] + self.vista[2] / 2, self.vista[1] + self.vista[3] / 2)
+        mundo_x, mundo_y = self.a_mundo(*ancla)
+        self.zoom = min(max(self.zoom * factor, self.zoom_minimo), ZOOM_MAXIMO)
+        self.x = mundo_x - (ancla[0] - self.vista[0]) / self.zoom
+        self.y = mundo_y - (ancla[1] - self.vista[1]) / self.zoom
+        self._acotar()
+
+    def _acotar(self):
+        # En cada eje: si el mundo cabe en la vista se ve completo; si no, la vista no sale del mundo
+        limites = self.limites
+        self.x = self._acotar_eje(self.x, limites['izq'], limites['der'], self.vista[2] / self.zoom)
+        self.y = self._acotar_eje(self.y, limites['arr'], limites['abaj'], self.vista[3] / self.zoom)
+
+    @staticmethod
+    def _acotar_eje(inicio, minimo, maximo, largo_visible):
+        extremos = (minimo - MARGEN_CAMARA, maximo + MARGEN_CAMARA - largo_visible)
+        return min(max(inicio, min(extremos)), max(extremos))
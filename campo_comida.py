@@ -0,0 +1,304 @@
+"""
+Campo de comida como arreglo booleano 2D indexado por celda del grid.
+
+Reemplaza al set de tuplas (x, y): consultar o consumir una celda es un acceso
+al arreglo, y el concurso por la comida (prioridad > velocidad > normal, con
+desempate aleatorio) se resuelve para todas las celdas ocupadas en una sola
+pasada vectorizada, con un costo que depende del número de partículas y no de
+la cantidad de comida en el mapa.
+
+La comida del día se reparte sobre las celdas interiores (todas menos el
+borde, que es la casa). Ese índice depende solo de la geometría del mundo, así
+que se calcula una vez y se reutiliza entre días, reinicios y corridas con los
+mismos límites. Las distribuciones (uniforme, parches, gradiente) se
+construyen sobre él y sortean las celdas del día con una sola llamada al
+generador de NumPy:
+
+    distribucion = crear_distribucion("parches", limites, TAMANO_PASO, rng)
+    campo.cargar_celdas(distribucion.muestrear(cantidad, rng))
+
+Con un RebroteComida asociado al campo, cada celda consumida vuelve a tener
+comida tras un retraso (fijo, o con una probabilidad por tick) en lugar de
+reponerse todo el mapa cada día.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+NUM_PARCHES = 5
+PESO_FUERA_DE_PARCHE = 0.02  # Peso relativo de las celdas lejos de todo parche
+PESO_MINIMO_GRADIENTE = 0.1  # Peso relativo del extremo pobre del gradiente
+# "fijo": la celda rebrota exactamente `retraso` ticks después de comida;
+# "probabilidad": rebrota en cada tick con probabilidad 1 / retraso
+MODOS_REBROTE = ("fijo", "probabilidad")
+
+
+@lru_cache(maxsize=8)
+def _indice_interior(izq, der, arr, abaj, tamano_celda):
+    columnas = (der - izq) // tamano_celda + 1
+    filas = (abaj - arr) // tamano_celda + 1
+    fila, columna = np.divmod(np.arange(filas * columnas), columnas)
+    interior = np.flatnonzero((fila > 0) & (fila < filas - 1) & (columna > 0) & (columna < columnas - 1))
+    # Compartido por todos los motores con la misma geometría: de solo lectura
+    interior.flags.writeable = False
+    return interior
+
+
+def indice_interior(limites, tamano_celda):
+    """Índices planos (ver CampoComida.celda) de las celdas fuera del borde, calculados una vez por geometría"""
+    return _indice_interior(limites['izq'], limites['der'], limites['arr'], limites['abaj'], tamano_celda)
+
+
+class Distribucion:
+    """
+    Reparto de la comida sobre las celdas interiores. Las subclases definen
+    pesos() (None = todas iguales); se llama una sola vez por motor.
+    """
+
+    def __init__(self, limites, tamano_celda, rng):
+        self.limites = limites
+        self.tamano_celda = tamano_celda
+        self.columnas = (limites['der'] - limites['izq']) // tamano_celda + 1
+        self.filas = (limites['abaj'] - limites['arr']) // tamano_celda + 1
+        self.interior = indice_interior(limites, tamano_celda)
+        self._pesos = self.pesos(rng)
+
+    def pesos(self, rng):
+        return None
+
+    def restaurar(self, pesos):
+        """Reemplaza los pesos sorteados (al cargar un checkpoint); None = todas iguales"""
+        self._pesos = None if pesos is None else np.asarray(pesos, dtype=np.float64)
+
+    def coordenadas(self):
+        """(fila, columna) de cada celda interior"""
+        return np.divmod(self.interior, self.columnas)
+
+    def muestrear(self, cantidad, rng):
+        """Índices planos de `cantidad` celdas interiores distintas"""
+        cantidad = min(cantidad, len(self.interior))
+        if cantidad <= 0:
+            return self.interior[:0]
+        if self._pesos is None:
+            seleccion = rng.choice(len(self.interior), size=cantidad, replace=False, shuffle=False)
+        else:
+            # Muestreo ponderado sin reemplazo: las `cantidad` claves exponenciales / peso más chicas
+            claves = rng.exponential(size=len(self.interior)) / self._pesos
+            seleccion = np.argpartition(claves, cantidad - 1)[:cantidad]
+        return self.interior[seleccion]
+
+
+class DistribucionUniforme(Distribucion):
+    """Todas las celdas interiores tienen la misma probabilidad"""
+
+
+class DistribucionParches(Distribucion):
+    """La comida se concentra alrededor de NUM_PARCHES centros sorteados al crear el motor"""
+
+    def __init__(self, limites, tamano_celda, rng, num_parches=NUM_PARCHES):
+        self.num_parches = num_parches
+        super().__init__(limites, tamano_celda, rng)
+
+    def pesos(self, rng):
+        fila, columna = self.coordenadas()
+        centros = rng.choice(len(self.interior), size=min(self.num_parches, len(self.interior)), replace=False)
+        radio = max(1.0, min(self.filas, self.columnas) / 8)
+        pesos = np.full(len(self.interior), PESO_FUERA_DE_PARCHE)
+        for fila_centro, columna_centro in zip(fila[centros].tolist(), columna[centros].tolist()):
+            distancia2 = (fila - fila_centro) ** 2 + (columna - columna_centro) ** 2
+            pesos += np.exp(-distancia2 / (2 * radio ** 2))
+        return pesos
+
+
+class DistribucionGradiente(Distribucion):
+    """La probabilidad crece linealmente de izquierda a derecha"""
+
+    def pesos(self, rng):
+        _, columna = self.coordenadas()
+        return PESO_MINIMO_GRADIENTE + (1 - PESO_MINIMO_GRADIENTE) * columna / max(self.columnas - 1, 1)
+
+
+DISTRIBUCIONES = {"uniforme": DistribucionUniforme, "parches": DistribucionParches,
+                  "gradiente": DistribucionGradiente}
+
+
+def crear_distribucion(distribucion, limites, tamano_celda, rng):
+    """Distribución por nombre (ver DISTRIBUCIONES) o a partir de una subclase de Distribucion"""
+    if isinstance(distribucion, str):
+        if distribucion not in DISTRIBUCIONES:
+            raise ValueError(f"Distribución de comida desconocida: '{distribucion}' (use {', '.join(DISTRIBUCIONES)})")
+        distribucion = DISTRIBUCIONES[distribucion]
+    return distribucion(limites, tamano_celda, rng)
+
+
+class CampoComida:
+    """
+    Comida del mapa en celdas[fila, columna] (fila = eje y, columna = eje x).
+
+    Conserva la interfaz de set que usan el renderer y Particula.intentar_comer:
+    len(), iteración sobre posiciones (x, y), `in` y remove().
+    """
+
+    def __init__(self, limites, tamano_celda):
+        self.limites = limites
+        self.tamano_celda = tamano_celda
+        self.columnas = (limites['der'] - limites['izq']) // tamano_celda + 1
+        self.filas = (limites['abaj'] - limites['arr']) // tamano_celda + 1
+        self.celdas = np.zeros((self.filas, self.columnas), dtype=bool)
+        # Vista plana: índice de celda = fila * columnas + columna
+        self._plano = self.celdas.reshape(-1)
+        self.cantidad = 0
+        # RebroteComida que agenda las celdas consumidas, o None (la comida no vuelve sola)
+        self.rebrote = None
+
+    def celda(self, xs, ys):
+        """Índice plano de la celda de cada posición"""
+        return ((ys - self.limites['arr']) // self.tamano_celda * self.columnas
+                + (xs - self.limites['izq']) // self.tamano_celda)
+
+    def posicion(self, celdas):
+        """Coordenadas (xs, ys) en píxeles de los índices planos de celda"""
+        filas, columnas = np.divmod(np.asarray(celdas), self.columnas)
+        return (self.limites['izq'] + columnas * self.tamano_celda,
+                self.limites['arr'] + filas * self.tamano_celda)
+
+    def cargar(self, posiciones):
+        """Reemplaza la comida por las posiciones (x, y) dadas"""
+        posiciones = list(posiciones)
+        if posiciones:
+            xs, ys = np.array(posiciones, dtype=np.int64).T
+            self.cargar_celdas(self.celda(xs, ys))
+        else:
+            self.cargar_celdas([])
+
+    def cargar_celdas(self, celdas):
+        """Reemplaza la comida por las celdas (índices planos) dadas"""
+        self.celdas[:] = False
+        self._plano[np.asarray(celdas, dtype=np.int64)] = True
+        self.cantidad = int(np.count_nonzero(self._plano))
+        if self.rebrote is not None:
+            self.rebrote.limpiar()
+
+    def consumir(self, xs, ys, prioridad, rng):
+        """
+        Resuelve el concurso por la comida entre las partículas en (xs[i], ys[i]).
+
+        En cada celda con comida y al menos una partícula gana la de mayor
+        prioridad, con desempate aleatorio; la comida de esas celdas se elimina.
+        Retorna las posiciones en xs de las ganadoras.
+        """
+        celdas = self.celda(np.asarray(xs), np.asarray(ys))
+        en_comida = np.flatnonzero(self._plano[celdas])
+        if len(en_comida) == 0:
+            return en_comida
+
+        # Ordenar por (celda, prioridad descendente, clave aleatoria) y tomar la primera de cada celda
+        celdas = celdas[en_comida]
+        orden = np.lexsort((rng.random(len(en_comida)), -np.asarray(prioridad)[en_comida].astype(np.int16), celdas))
+        celdas = celdas[orden]
+        primera = np.ones(len(celdas), dtype=bool)
+        primera[1:] = celdas[1:] != celdas[:-1]
+
+        self._plano[celdas[primera]] = False
+        self.cantidad -= int(np.count_nonzero(primera))
+        if self.rebrote is not None:
+            self.rebrote.agendar(celdas[primera])
+        return en_comida[orden[primera]]
+
+    def __len__(self):
+        return self.cantidad
+
+    def __iter__(self):
+        xs, ys = self.posicion(np.flatnonzero(self._plano))
+        return zip(xs.tolist(), ys.tolist())
+
+    def __contains__(self, pos):
+        x, y = pos
+        if not (self.limites['izq'] <= x <= self.limites['der'] and self.limites['arr'] <= y <= self.limites['abaj']):
+            return False
+        return bool(self._plano[self.celda(x, y)])
+
+    def remove(self, pos):
+        celda = self.celda(*pos)
+        if not self._plano[celda]:
+            raise KeyError(pos)
+        self._plano[celda] = False
+        self.cantidad -= 1
+        if self.rebrote is not None:
+            self.rebrote.agendar(np.array([celda]))
+
+
+class RebroteComida:
+    """
+    Rebrote incremental de las celdas consumidas de `campo`, con una rueda de tiempos.
+
+    vence[celda] es el tick en que la celda vuelve a tener comida (-1 = no
+    agendada). Cada celda agendada se guarda además en la ranura vence % ranuras
+    de la rueda, así avanzar() solo revisa las celdas de la ranura actual; las
+    que vencen en una vuelta posterior de la rueda se quedan en ella.
+    `retraso` son ticks: un número, o un arreglo con el retraso de cada celda.
+    """
+
+    def __init__(self, campo, retraso, rng, modo="fijo"):
+        if modo not in MODOS_REBROTE:
+            raise ValueError(f"Modo de rebrote desconocido: '{modo}' (use {', '.join(MODOS_REBROTE)})")
+        self.campo = campo
+        self.retraso = np.maximum(np.asarray(retraso, dtype=np.int64), 1)
+        self.rng = rng
+        self.modo = modo
+        self.tick = 0
+        self.vence = np.full(campo.celdas.size, -1, dtype=np.int64)
+        # Con retrasos fijos ninguna celda da más de una vuelta; con probabilidad, pocas
+        self._ranuras = [[] for _ in range(int(self.retraso.max()) + 1)]
+        campo.rebrote = self
+
+    def agendar(self, celdas):
+        """Agenda el rebrote de las celdas recién consumidas"""
+        if len(celdas) == 0:
+            return
+        retraso = self.retraso if self.retraso.ndim == 0 else self.retraso[celdas]
+        if self.modo == "probabilidad":
+            # Ticks hasta el primer éxito con probabilidad 1 / retraso por tick
+            retraso = self.rng.geometric(1 / retraso, size=len(celdas))
+        vence = self.tick + np.broadcast_to(retraso, (len(celdas),))
+        self.vence[celdas] = vence
+        if vence.min() == vence.max():
+            self._ranuras[int(vence[0]) % len(self._ranuras)].append(celdas)
+            return
+        ranuras = vence % len(self._ranuras)
+        orden = np.argsort(ranuras, kind='stable')
+        ranuras, inicios = np.unique(ranuras[orden], return_index=True)
+        for ranura, grupo in zip(ranuras.tolist(), np.split(celdas[orden], inicios[1:])):
+            self._ranuras[ranura].append(grupo)
+
+    def avanzar(self):
+        """Avanza un tick y hace rebrotar las celdas que vencen en él; retorna cuántas rebrotaron"""
+        self.tick += 1
+        ranura = self.tick % len(self._ranuras)
+        pendientes = self._ranuras[ranura]
+        if not pendientes:
+            return 0
+        celdas = np.concatenate(pendientes)
+        vencen = self.vence[celdas] == self.tick
+        rebrotan = celdas[vencen]
+        self._ranuras[ranura] = [celdas[~vencen]] if not vencen.all() else []
+
+        self.vence[rebrotan] = -1
+        self.campo._plano[rebrotan] = True
+        self.campo.cantidad += len(rebrotan)
+        return len(rebrotan)
+
+    def limpiar(self):
+        """Olvida todos los rebrotes agendados (p. ej. al repartir la comida de nuevo)"""
+        self.vence[:] = -1
+        self._ranuras = [[] for _ in self._ranuras]
+
+    def restaurar(self, vence, tick):
+        """Reconstruye la rueda a partir de los vencimientos guardados (ver checkpoint)"""
+        self.limpiar()
+        self.tick = tick
+        celdas = np.flatnonzero(vence >= 0)
+        self.vence[celdas] = vence[celdas]
+        ranuras = self.vence[celdas] % len(self._ranuras)
+        for ranura in np.unique(ranuras).tolist():
+            self._ranuras[ranura].append(celdas[ranuras == ranura])
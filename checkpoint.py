@@ -0,0 +1,211 @@
+"""
+Checkpoints binarios del estado completo de una simulación.
+
+Un checkpoint es un .npz con la población en columnas (los mismos campos de
+PoblacionArrays para ambos motores), el campo de comida empaquetado en bits,
+los pesos de la distribución de comida, los depredadores, los contadores, el
+estado de los dos generadores aleatorios y los historiales guardados columna
+por columna. Los parámetros y escalares van en una entrada JSON con la versión
+del formato.
+
+Cargar sin semilla reanuda exactamente la corrida; con una semilla nueva el
+checkpoint es el punto de partida común de corridas bifurcadas:
+
+    motor = cargar_checkpoint("dia_500.npz")               # reanudar
+    motor = cargar_checkpoint("dia_500.npz", semilla=7)    # bifurcar
+"""
+import json
+import os
+
+import numpy as np
+
+from campo_comida import DISTRIBUCIONES
+from contadores import TIPOS
+from historial_columnar import SerieColumnar, TablaColumnar, como_tabla
+from motor_simulacion import HISTORIALES, Depredador, SimulationEngine, celdas_mundo, flujos_aleatorios
+from motor_vectorizado import MotorVectorizado
+from poblacion_arrays import CAMPOS, NOMBRES_CAMPOS, PoblacionArrays
+
+VERSION_FORMATO = 1
+CLASES = {"SimulationEngine": SimulationEngine, "MotorVectorizado": MotorVectorizado}
+CONTADORES = ("total", "vivas", "en_casa", "comieron", "pueden_reproducirse")
+# Únicos atributos escalares del motor que se restauran desde meta["estado"]
+ESTADO = ("dia_actual", "paso_actual_dia", "dias_cerrados", "es_dia_purga", "extinta", "comida_inicial_dia")
+
+
+def _semilla_a_json(semilla):
+    if semilla is None:
+        return None
+    if isinstance(semilla, np.random.SeedSequence):
+        return {"entropia": semilla.entropy, "spawn_key": list(semilla.spawn_key)}
+    return {"entropia": semilla, "spawn_key": []}
+
+
+def _distribucion_a_json(distribucion):
+    """Nombre de la distribución de comida; las clases propias deben estar registradas en DISTRIBUCIONES"""
+    if isinstance(distribucion, str):
+        return distribucion
+    for nombre, clase in DISTRIBUCIONES.items():
+        if clase is distribucion:
+            return nombre
+    raise ValueError(f"La distribución {distribucion.__name__} no está registrada en campo_comida.DISTRIBUCIONES")
+
+
+def _semilla_desde_json(datos):
+    if datos is None:
+        return None
+    if not datos["spawn_key"]:
+        return datos["entropia"]
+    return np.random.SeedSequence(datos["entropia"], spawn_key=tuple(datos["spawn_key"]))
+
+
+def _guardar_historial(arreglos, nombre, historial):
+    """Guarda historial_poblacion como un arreglo y las tablas como una columna por clave"""
+    if nombre == "historial_poblacion":
+        arreglos[nombre] = np.asarray(historial, dtype=np.int64)
+        return None
+    # Con cola_historial el motor guarda los registros en un deque de dicts
+    tabla = como_tabla(historial)
+    for columna in tabla.claves:
+        arreglos[f"{nombre}/{columna}"] = tabla.columna(columna)
+    return tabla.claves
+
+
+def _cargar_historial(datos, nombre, columnas):
+    if columnas is None:
+        return SerieColumnar(datos[nombre])
+    return TablaColumnar.desde_columnas({columna: datos[f"{nombre}/{columna}"] for columna in columnas})
+
+
+def leer_config(ruta):
+    """Configuración (claves de pantalla_configuracion) con la que se creó el checkpoint"""
+    with np.load(ruta, allow_pickle=False) as datos:
+        meta = json.loads(str(datos["meta"]))
+    semilla = _semilla_desde_json(meta["semilla"])
+    # Una semilla derivada (SeedSequence hijo de un ensamble) no tiene forma de config
+    return dict(meta["config"], semilla=semilla if not isinstance(semilla, np.random.SeedSequence) else None)
+
+
+def guardar_checkpoint(motor, ruta):
+    """
+    Escribe el estado de `motor` en `ruta` (.npz comprimido). Se escribe en un
+    archivo temporal y luego se reemplaza, así un corte nunca deja un checkpoint a medias.
+    """
+    if isinstance(motor, MotorVectorizado):
+        poblacion = motor.poblacion
+    else:
+        poblacion = PoblacionArrays.desde_particulas(motor.particulas)
+    arreglos = {f"poblacion/{nombre}": getattr(poblacion, nombre) for nombre in NOMBRES_CAMPOS}
+
+    arreglos["comida"] = np.packbits(motor.comida_pos.celdas)
+    rebrote = motor.comida_pos.rebrote
+    if rebrote is not None:
+        arreglos["comida/vence"] = rebrote.vence
+    # Los pesos pueden depender del generador (p. ej. los centros de los parches)
+    if motor.distribucion._pesos is not None:
+        arreglos["comida/pesos"] = motor.distribucion._pesos
+    depredadores = motor.depredadores
+    arreglos["depredadores/x"] = np.array([d.x for d in depredadores], dtype=np.int32)
+    arreglos["depredadores/y"] = np.array([d.y for d in depredadores], dtype=np.int32)
+    arreglos["depredadores/activo"] = np.array([d.activo for d in depredadores], dtype=bool)
+    arreglos["depredadores/particulas_eliminadas"] = np.array([d.particulas_eliminadas for d in depredadores],
+                                                              dtype=np.int64)
+
+    c = motor.contadores
+    arreglos["contadores"] = np.array([getattr(c, nombre) for nombre in CONTADORES], dtype=np.int64)
+    arreglos["contadores/por_tipo"] = np.array([c.por_tipo[tipo] for tipo in TIPOS], dtype=np.int64)
+    arreglos["contadores/muertas_por_tipo"] = np.array([c.muertas_por_tipo[tipo] for tipo in TIPOS], dtype=np.int64)
+
+    # random.Random: (versión, 625 enteros de Mersenne Twister, gauss_next)
+    version_aleatorio, estado_aleatorio, gauss = motor.aleatorio.getstate()
+    arreglos["aleatorio"] = np.array(estado_aleatorio, dtype=np.uint32)
+
+    columnas_mundo, filas_mundo = celdas_mundo(motor.limites)
+    columnas = {nombre: _guardar_historial(arreglos, nombre, getattr(motor, nombre)) for nombre in HISTORIALES}
+    meta = {
+        "version": VERSION_FORMATO,
+        "clase": type(motor).__name__,
+        "config": {"dias": motor.num_dias, "duracion": motor.duracion_dia, "particulas": motor.num_particulas_inicial,
+                   "comida": motor.porcentaje_comida, "pasos": motor.pasos_vida,
+                   "depredadores": motor.num_depredadores, "frecuencia_purga": motor.frecuencia_purga,
+                   "distribucion": _distribucion_a_json(motor.distribucion_comida),
+                   "rebrote": motor.ticks_rebrote, "modo_rebrote": motor.modo_rebrote,
+                   "ancho_mundo": columnas_mundo, "alto_mundo": filas_mundo},
+        "limites": motor.limites,
+        "semilla": _semilla_a_json(motor.semilla),
+        "estado": {nombre: getattr(motor, nombre) for nombre in ESTADO},
+        "tick_rebrote": rebrote.tick if rebrote is not None else 0,
+        "rng": motor.rng.bit_generator.state,
+        "aleatorio": {"version": version_aleatorio, "gauss": gauss},
+        "columnas": columnas
+    }
+    arreglos["meta"] = np.array(json.dumps(meta))
+
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        np.savez_compressed(f, **arreglos)
+    os.replace(temporal, ruta)
+
+
+def cargar_checkpoint(ruta, semilla=None, clase=None):
+    """
+    Reconstruye el motor guardado en `ruta`. Sin `semilla` se restauran los
+    generadores y la corrida sigue exactamente igual; con `semilla` se derivan
+    generadores nuevos (bifurcación). `clase` permite reanudar con el otro motor.
+    """
+    with np.load(ruta, allow_pickle=False) as datos:
+        meta = json.loads(str(datos["meta"]))
+        if meta["version"] != VERSION_FORMATO:
+            raise ValueError(f"Versión de checkpoint no soportada: {meta['version']}")
+        clase = clase or CLASES[meta["clase"]]
+        motor = clase.desde_config(meta["config"], limites=meta["limites"],
+                                   semilla=_semilla_desde_json(meta["semilla"]))
+
+        n = len(datos["poblacion/x"])
+        poblacion = PoblacionArrays(capacidad=n)
+        poblacion.n = n
+        poblacion._actualizar_vistas()
+        for nombre, dtype in CAMPOS:
+            getattr(poblacion, nombre)[:] = datos[f"poblacion/{nombre}"].astype(dtype, copy=False)
+        if isinstance(motor, MotorVectorizado):
+            motor.poblacion = poblacion
+        else:
+            motor.particulas = poblacion.a_particulas()
+
+        campo = motor.comida_pos
+        campo.celdas[:] = np.unpackbits(datos["comida"], count=campo.celdas.size).reshape(campo.celdas.shape)
+        campo.cantidad = int(np.count_nonzero(campo.celdas))
+        if campo.rebrote is not None:
+            campo.rebrote.restaurar(datos["comida/vence"], meta["tick_rebrote"])
+        motor.distribucion.restaurar(datos["comida/pesos"] if "comida/pesos" in datos else None)
+
+        motor.depredadores = []
+        for x, y, activo, eliminadas in zip(datos["depredadores/x"].tolist(), datos["depredadores/y"].tolist(),
+                                            datos["depredadores/activo"].tolist(),
+                                            datos["depredadores/particulas_eliminadas"].tolist()):
+            depredador = Depredador(x, y)
+            depredador.activo = activo
+            depredador.particulas_eliminadas = eliminadas
+            motor.depredadores.append(depredador)
+
+        c = motor.contadores
+        for nombre, valor in zip(CONTADORES, datos["contadores"].tolist()):
+            setattr(c, nombre, valor)
+        c.por_tipo = dict(zip(TIPOS, datos["contadores/por_tipo"].tolist()))
+        c.muertas_por_tipo = dict(zip(TIPOS, datos["contadores/muertas_por_tipo"].tolist()))
+
+        for nombre in HISTORIALES:
+            setattr(motor, nombre, _cargar_historial(datos, nombre, meta["columnas"][nombre]))
+        estado_aleatorio = tuple(datos["aleatorio"].tolist())
+
+    for nombre in ESTADO:
+        setattr(motor, nombre, meta["estado"][nombre])
+    motor.indice_vigente = False
+
+    if semilla is None:
+        motor.rng.bit_generator.state = meta["rng"]
+        motor.aleatorio.setstate((meta["aleatorio"]["version"], estado_aleatorio, meta["aleatorio"]["gauss"]))
+    else:
+        motor.semilla = semilla
+        motor.rng, motor.aleatorio = flujos_aleatorios(semilla)
+    return motor
@@ -0,0 +1,74 @@
+"""
+Contadores de la población mantenidos de forma incremental.
+
+Los motores los actualizan en cada transición de estado (comer, salir o entrar
+a casa, morir, nacer, reinicio del día), de modo que el panel de estadísticas
+y el registro de fin de día leen cada cifra en O(1) en lugar de recorrer toda
+la población.
+"""
+
+TIPOS = ("normal", "mutacion_velocidad", "mutacion_prioridad")
+
+
+class ContadoresPoblacion:
+    """Conteos de la población actual y del día en curso"""
+
+    def __init__(self):
+        self.total = 0
+        self.por_tipo = dict.fromkeys(TIPOS, 0)
+        self.iniciar_dia()
+
+    def iniciar_dia(self):
+        """Al empezar el día todas las partículas están activas, en casa y sin comer"""
+        self.vivas = self.total
+        self.en_casa = self.total
+        self.comieron = 0
+        self.pueden_reproducirse = 0
+        # Muertas durante el día (depredadores y agotamiento), por tipo
+        self.muertas_por_tipo = dict.fromkeys(TIPOS, 0)
+
+    def nacer(self, tipo, cantidad=1):
+        """Nuevas partículas de un tipo (población inicial o hijos)"""
+        self.total += cantidad
+        self.por_tipo[tipo] += cantidad
+
+    def quitar(self, tipo, cantidad=1):
+        """Partículas retiradas de la población al cerrar el día"""
+        self.total -= cantidad
+        self.por_tipo[tipo] -= cantidad
+
+    def comer(self, cantidad=1):
+        """Partículas que comen por primera vez en el día"""
+        self.comieron += cantidad
+
+    def entrar_casa(self, cantidad=1):
+        self.en_casa += cantidad
+
+    def salir_casa(self, cantidad=1):
+        self.en_casa -= cantidad
+
+    def morir(self, tipo, cantidad=1):
+        """Partículas eliminadas durante el día"""
+        self.vivas -= cantidad
+        self.muertas_por_tipo[tipo] += cantidad
+
+    def quedarse_en_casa(self, cantidad=1, reproducen=0):
+        """Partículas que regresaron tras comer (Regla 19); `reproducen` comieron 2+ veces"""
+        self.vivas -= cantidad
+        self.pueden_reproducirse += reproducen
+
+    @property
+    def normales(self):
+        return self.por_tipo["normal"]
+
+    @property
+    def verdes(self):
+        return self.por_tipo["mutacion_velocidad"]
+
+    @property
+    def rojos(self):
+        return self.por_tipo["mutacion_prioridad"]
+
+    @property
+    def muertas(self):
+        return sum(self.muertas_por_tipo.values())
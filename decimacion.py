@@ -0,0 +1,44 @@
+"""
+Decimación de series largas antes de graficarlas.
+
+Una serie con más puntos que píxeles de ancho no gana detalle al dibujarse
+completa, solo tiempo de dibujo. envolvente_min_max reparte la serie en
+cubetas consecutivas y conserva de cada una el mínimo y el máximo, en su
+orden original, así los picos y las caídas (una extinción, una purga) se ven
+igual que con la serie completa. agrupar_barras hace lo mismo para las
+gráficas de barras, sumando los valores de cada grupo de barras.
+"""
+import numpy as np
+
+
+def indices_envolvente(y, cubetas):
+    """Índices (ordenados) del primer y último punto y del mínimo y máximo de cada cubeta"""
+    y = np.asarray(y)
+    n = len(y)
+    if n <= 2 * cubetas:
+        return np.arange(n)
+    largo = -(-n // cubetas)
+    # Se rellena con el último valor para que todas las cubetas tengan el mismo largo
+    relleno = np.concatenate([y, np.full(largo * cubetas - n, y[-1], dtype=y.dtype)]).reshape(cubetas, largo)
+    inicios = np.arange(cubetas) * largo
+    indices = np.concatenate([[0, n - 1], inicios + relleno.argmin(axis=1), inicios + relleno.argmax(axis=1)])
+    return np.unique(np.minimum(indices, n - 1))
+
+
+def envolvente_min_max(x, y, cubetas):
+    """(x, y) con a lo sumo 2 * cubetas + 2 puntos; sin cambios si la serie ya es corta"""
+    indices = indices_envolvente(y, cubetas)
+    return np.asarray(x)[indices], np.asarray(y)[indices]
+
+
+def agrupar_barras(x, columnas, grupos):
+    """
+    Agrupa barras consecutivas en a lo sumo `grupos`: retorna (x inicial, x final,
+    suma de cada columna por grupo). Con pocas barras cada una es su propio grupo.
+    """
+    x = np.asarray(x)
+    if len(x) <= grupos:
+        return x, x, [np.asarray(columna) for columna in columnas]
+    inicios = np.linspace(0, len(x), grupos, endpoint=False).astype(np.int64)
+    finales = np.append(inicios[1:], len(x)) - 1
+    return x[inicios], x[finales], [np.add.reduceat(np.asarray(columna), inicios) for columna in columnas]
@@ -0,0 +1,357 @@
+"""
+Ensambles Monte Carlo: R réplicas independientes de una misma configuración.
+
+Cada réplica corre en un ProcessPoolExecutor con su propio flujo aleatorio
+(hijos de un SeedSequence) y, al terminar, su historial de población y de
+tipos se agrega a acumuladores en streaming, en el orden de las réplicas:
+media y varianza con el algoritmo de Welford y cuantiles con el estimador P².
+Mientras hay pocas réplicas (REPLICAS_EXACTAS) los cuantiles son exactos,
+porque P² con pocas observaciones se equivoca bastante. Así la memoria depende
+del número de días y no del número de réplicas. El resultado se grafica como bandas
+(cuantiles e intervalo de confianza de la media) o se guarda como CSV:
+
+    python ensamble.py --replicas 200 --comida 20 --dias 100 --grafica --salida ensamble.csv
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from barrido import guardar_csv
+from motor_simulacion import CONFIG_POR_DEFECTO, SimulationEngine
+
+SERIES = ("poblacion", "normal", "verde", "rojo")
+CUANTILES = (0.05, 0.5, 0.95)
+Z_IC95 = 1.96  # Intervalo de confianza del 95% para la media
+REPLICAS_EXACTAS = 20  # Hasta tantas réplicas los cuantiles se calculan exactos (np.quantile)
+
+
+class AcumuladorWelford:
+    """Media y varianza por día, actualizadas réplica a réplica (algoritmo de Welford)"""
+
+    def __init__(self, largo):
+        self.n = 0
+        self.media = np.zeros(largo)
+        self._m2 = np.zeros(largo)
+
+    def agregar(self, valores):
+        self.n += 1
+        delta = valores - self.media
+        self.media += delta / self.n
+        self._m2 += delta * (valores - self.media)
+
+    @property
+    def varianza(self):
+        """Varianza muestral (n - 1)"""
+        if self.n < 2:
+            return np.zeros_like(self._m2)
+        return self._m2 / (self.n - 1)
+
+    @property
+    def desviacion(self):
+        return np.sqrt(self.varianza)
+
+    def intervalo_confianza(self, z=Z_IC95):
+        """(inferior, superior) del intervalo de confianza de la media"""
+        margen = z * np.sqrt(self.varianza / max(self.n, 1))
+        return self.media - margen, self.media + margen
+
+
+class CuantilP2:
+    """
+    Cuantil p por día con el estimador P² (Jain y Chlamtac): cinco marcadores
+    por día cuyas alturas se ajustan con cada observación, sin guardarlas.
+    """
+
+    def __init__(self, p, largo):
+        self.p = p
+        self.n = 0
+        self._alturas = np.zeros((largo, 5))
+        self._posiciones = np.tile(np.arange(1.0, 6.0), (largo, 1))
+        # Las posiciones deseadas solo dependen de n, así que son comunes a todos los días
+        self._deseadas = np.array([1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5])
+        self._incrementos = np.array([0, p / 2, p, (1 + p) / 2, 1])
+
+    def agregar(self, valores):
+        q, pos = self._alturas, self._posiciones
+        if self.n < 5:
+            # Las primeras cinco observaciones inicializan los marcadores
+            q[:, self.n] = valores
+            self.n += 1
+            if self.n == 5:
+                q.sort(axis=1)
+            return
+        self.n += 1
+
+        np.minimum(q[:, 0], valores, out=q[:, 0])
+        np.maximum(q[:, 4], valores, out=q[:, 4])
+        # Celda de cada observación (0..3): se desplazan los marcadores a su derecha
+        celda = (valores[:, None] >= q[:, 1:4]).sum(axis=1)
+        pos[:, 1:] += np.arange(1, 5) > celda[:, None]
+        self._deseadas += self._incrementos
+
+        for i in (1, 2, 3):
+            d = self._deseadas[i] - pos[:, i]
+            ajustar = (((d >= 1) & (pos[:, i + 1] - pos[:, i] > 1))
+                       | ((d <= -1) & (pos[:, i - 1] - pos[:, i] < -1)))
+            if not ajustar.any():
+                continue
+            s = np.sign(d[ajustar])
+            q_ant, q_i, q_sig = q[ajustar, i - 1], q[ajustar, i], q[ajustar, i + 1]
+            n_ant, n_i, n_sig = pos[ajustar, i - 1], pos[ajustar, i], pos[ajustar, i + 1]
+            parabolica = q_i + s / (n_sig - n_ant) * ((n_i - n_ant + s) * (q_sig - q_i) / (n_sig - n_i)
+                                                     + (n_sig - n_i - s) * (q_i - q_ant) / (n_i - n_ant))
+            lineal = q_i + s * (np.where(s > 0, q_sig, q_ant) - q_i) / (np.where(s > 0, n_sig, n_ant) - n_i)
+            q[ajustar, i] = np.where((q_ant < parabolica) & (parabolica < q_sig), parabolica, lineal)
+            pos[ajustar, i] += s
+
+    def valor(self):
+        """Estimación actual del cuantil para cada día"""
+        if self.n == 0:
+            return np.full(len(self._alturas), np.nan)
+        if self.n < 5:
+            return np.quantile(self._alturas[:, :self.n], self.p, axis=1)
+        return self._alturas[:, 2].copy()
+
+
+class EstadisticasEnsamble:
+    """Acumuladores de población total y por tipo para cada día de la configuración"""
+
+    def __init__(self, num_dias, cuantiles=CUANTILES, replicas_exactas=REPLICAS_EXACTAS):
+        # historial_poblacion incluye la población inicial además de un valor por día
+        self.largo = num_dias + 1
+        self.cuantiles = cuantiles
+        self.replicas = 0
+        self.extinciones = 0
+        self.welford = {serie: AcumuladorWelford(self.largo) for serie in SERIES}
+        self.estimadores = {serie: [CuantilP2(p, self.largo) for p in cuantiles] for serie in SERIES}
+        # Valores de las primeras réplicas, para los cuantiles exactos; se descartan al superar el umbral
+        self._exactos = np.empty((replicas_exactas, len(SERIES), self.largo))
+
+    def agregar(self, historial_poblacion, historial_tipos, extinta=False):
+        """Suma una réplica; tras una extinción la población cuenta como 0 el resto de los días"""
+        valores = np.zeros((len(SERIES), self.largo))
+        n = min(len(historial_poblacion), self.largo)
+        valores[0, :n] = historial_poblacion[:n]
+        for fila, tipo in enumerate(SERIES[1:], 1):
+            valores[fila, :n] = [h[tipo] for h in historial_tipos[:n]]
+
+        for serie, fila in zip(SERIES, valores):
+            self.welford[serie].agregar(fila)
+            for estimador in self.estimadores[serie]:
+                estimador.agregar(fila)
+        if self._exactos is not None:
+            if self.replicas < len(self._exactos):
+                self._exactos[self.replicas] = valores
+            else:
+                self._exactos = None
+        self.replicas += 1
+        self.extinciones += bool(extinta)
+
+    def resumen(self, serie):
+        """{media, desviacion, ic_inf, ic_sup, p05, p50, p95...} de la serie, como arreglos por día"""
+        acumulador = self.welford[serie]
+        ic_inf, ic_sup = acumulador.intervalo_confianza()
+        datos = {"media": acumulador.media.copy(), "desviacion": acumulador.desviacion,
+                 "ic_inf": ic_inf, "ic_sup": ic_sup}
+        if self._exactos is not None and self.replicas:
+            valores = self._exactos[:self.replicas, SERIES.index(serie)]
+            for p in self.cuantiles:
+                datos[nombre_cuantil(p)] = np.quantile(valores, p, axis=0)
+            return datos
+        for estimador in self.estimadores[serie]:
+            datos[nombre_cuantil(estimador.p)] = estimador.valor()
+        return datos
+
+    def tabla(self):
+        """Una fila por día con las columnas {serie}_{estadística}"""
+        resumenes = {serie: self.resumen(serie) for serie in SERIES}
+        filas = []
+        for dia in range(self.largo):
+            fila = {"dia": dia}
+            for serie, datos in resumenes.items():
+                fila.update((f"{serie}_{clave}", round(float(valores[dia]), 3)) for clave, valores in datos.items())
+            filas.append(fila)
+        return filas
+
+
+def nombre_cuantil(p):
+    return f"p{round(p * 100):02d}"
+
+
+def ejecutar_replica(config, semilla, vectorizado=False, desde=None):
+    """
+    Corre una réplica con el flujo aleatorio `semilla` (SeedSequence) y retorna
+    sus historiales; con `desde`, la réplica es una bifurcación de ese checkpoint.
+    """
+    if vectorizado:
+        from motor_vectorizado import MotorVectorizado
+        clase = MotorVectorizado
+    else:
+        clase = SimulationEngine
+    if desde is not None:
+        from checkpoint import cargar_checkpoint
+        # Sin --vectorizado se reanuda con el motor que guardó el checkpoint
+        motor = cargar_checkpoint(desde, semilla=semilla, clase=clase if vectorizado else None)
+    else:
+        motor = clase.desde_config(config, semilla=semilla)
+    historial_poblacion, historial_tipos, _, _ = motor.run()
+    return historial_poblacion, historial_tipos, motor.extinta
+
+
+def ejecutar_ensamble(config, replicas, procesos=None, vectorizado=False, progreso=None, desde=None):
+    """
+    Ejecuta `replicas` corridas de `config` en paralelo y retorna sus
+    EstadisticasEnsamble. La réplica i usa el hijo i del SeedSequence de
+    config["semilla"], así el ensamble no depende del número de procesos.
+    Con `desde` (ruta de un checkpoint de `config`) todas las réplicas parten
+    de ese estado y solo difieren a partir de él.
+    Las réplicas se agregan en orden de índice (P² depende del orden de las
+    observaciones): las que terminan antes de tiempo esperan a las anteriores.
+    Entre réplicas en vuelo y terminadas que esperan su turno hay a lo sumo dos
+    por proceso, así los historiales completos no se acumulan en memoria.
+
+    progreso(hechas, total, extinta) se llama cada vez que termina una réplica.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    procesos = procesos or os.cpu_count()
+    semillas = enumerate(np.random.SeedSequence(config.get("semilla")).spawn(replicas))
+    estadisticas = EstadisticasEnsamble(config["dias"])
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        pendientes = {}
+        # Resultados que terminaron antes que alguna réplica anterior, por índice
+        adelantados = {}
+        while True:
+            # Las réplicas en vuelo y las adelantadas cuentan juntas: si una réplica lenta retiene
+            # a las siguientes, no se lanzan más hasta que se agregue
+            while len(pendientes) + len(adelantados) < 2 * procesos:
+                siguiente = next(semillas, None)
+                if siguiente is None:
+                    break
+                indice, semilla_replica = siguiente
+                pendientes[pool.submit(ejecutar_replica, config, semilla_replica, vectorizado, desde)] = indice
+            if not pendientes:
+                break
+            terminados, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                adelantados[pendientes.pop(futuro)] = futuro.result()
+            while estadisticas.replicas in adelantados:
+                historial_poblacion, historial_tipos, extinta = adelantados.pop(estadisticas.replicas)
+                estadisticas.agregar(historial_poblacion, historial_tipos, extinta)
+                if progreso is not None:
+                    progreso(estadisticas.replicas, replicas, extinta)
+    return estadisticas
+
+
+def ejecutar_ensamble_en_segundo_plano(config, replicas, vectorizado=False, progreso=None):
+    """
+    ejecutar_ensamble en un hilo aparte (las réplicas siguen en su pool de
+    procesos); retorna el Future, cuyo resultado son las EstadisticasEnsamble.
+    Pensado para la interfaz, que sigue dibujando mientras el ensamble corre.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    hilo = ThreadPoolExecutor(max_workers=1)
+    futuro = hilo.submit(ejecutar_ensamble, config, replicas, vectorizado=vectorizado, progreso=progreso)
+    # El hilo termina solo al completar el ensamble
+    hilo.shutdown(wait=False)
+    return futuro
+
+
+def graficar_ensamble(estadisticas, titulo=None):
+    """Población total y por tipo como bandas: cuantiles extremos, IC de la media y mediana"""
+    import matplotlib.pyplot as plt
+
+    inf, mediana, sup = (nombre_cuantil(p) for p in (estadisticas.cuantiles[0], 0.5, estadisticas.cuantiles[-1]))
+    dias = np.arange(estadisticas.largo)
+    fig = plt.figure(figsize=(16, 7), facecolor='#1a1a1a')
+    ax1 = plt.subplot(1, 2, 1)
+    ax2 = plt.subplot(1, 2, 2)
+
+    # Gráfica 1: población total
+    datos = estadisticas.resumen("poblacion")
+    ax1.fill_between(dias, datos[inf], datos[sup], color='#42A5F5', alpha=0.2,
+                     label=f'Cuantiles {inf[1:]}-{sup[1:]}%')
+    ax1.fill_between(dias, datos["ic_inf"], datos["ic_sup"], color='#42A5F5', alpha=0.45, label='IC 95% de la media')
+    ax1.plot(dias, datos["media"], linewidth=2, color='#42A5F5', label='Media')
+    if mediana in datos:
+        ax1.plot(dias, datos[mediana], linewidth=1.5, linestyle='--', color='white', label='Mediana')
+    ax1.set_ylabel('Población', fontsize=12, color='white')
+    ax1.set_title('Evolución de la Población (Ensamble)', fontsize=13, fontweight='bold', color='white')
+
+    # Gráfica 2: desglose por tipo
+    for serie, color, etiqueta in (("normal", '#FFD700', 'Normales (Dorado)'),
+                                   ("verde", '#00FF00', 'Mutación Velocidad (Verde)'),
+                                   ("rojo", '#FF0000', 'Mutación Prioridad (Rojo)')):
+        datos = estadisticas.resumen(serie)
+        ax2.fill_between(dias, datos[inf], datos[sup], color=color, alpha=0.15)
+        ax2.plot(dias, datos["media"], linewidth=2, color=color, label=etiqueta)
+    ax2.set_ylabel('Cantidad de Partículas', fontsize=12, color='white')
+    ax2.set_title('Población por Tipo de Mutación (Ensamble)', fontsize=13, fontweight='bold', color='white')
+
+    for ax in (ax1, ax2):
+        ax.set_facecolor('#2d2d2d')
+        ax.set_xlabel('Día', fontsize=12, color='white')
+        ax.grid(True, alpha=0.3, color='white')
+        ax.tick_params(colors='white')
+        ax.legend(facecolor='#2d2d2d', edgecolor='white', labelcolor='white')
+
+    fig.suptitle(titulo or f'{estadisticas.replicas} réplicas, {estadisticas.extinciones} extinciones',
+                 fontsize=14, fontweight='bold', color='white')
+    plt.tight_layout()
+    plt.show()
+
+
+def imprimir_progreso(hechas, total, extinta):
+    """Callback de progreso de main: sobrescribe una sola línea en stderr"""
+    print(f"\r[{hechas}/{total}] réplicas{' (extinta)' if extinta else ''}          ",
+          end="\n" if hechas == total else "", file=sys.stderr, flush=True)
+
+
+def crear_parser():
+    """Argumentos del ensamble: una configuración y el número de réplicas"""
+    parser = argparse.ArgumentParser(description="Ensamble Monte Carlo de réplicas de una configuración")
+    for clave, valor in CONFIG_POR_DEFECTO.items():
+        # Los parámetros son enteros salvo los que tienen un nombre por defecto (p. ej. la distribución)
+        tipo = str if isinstance(valor, str) else int
+        parser.add_argument("--" + clave.replace("_", "-"), dest=clave, type=tipo, default=valor,
+                            help=f"Valor de '{clave}' (por defecto {valor})")
+    parser.add_argument("--replicas", type=int, default=100, help="Número de réplicas (por defecto 100)")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help=f"Procesos en paralelo (por defecto {os.cpu_count()})")
+    parser.add_argument("--vectorizado", action="store_true",
+                        help="Usar la población en arreglos de NumPy (MotorVectorizado)")
+    parser.add_argument("--desde", help="Checkpoint del que parten todas las réplicas (reemplaza la configuración)")
+    parser.add_argument("--salida", help="Archivo CSV con las estadísticas por día")
+    parser.add_argument("--grafica", action="store_true", help="Mostrar las bandas con matplotlib")
+    return parser
+
+
+def main(argv=None):
+    """Ejecuta el ensamble en paralelo y guarda o grafica sus estadísticas"""
+    args = crear_parser().parse_args(argv)
+    config = {clave: getattr(args, clave) for clave in CONFIG_POR_DEFECTO}
+    if args.desde:
+        from checkpoint import leer_config
+        config = dict(leer_config(args.desde), semilla=args.semilla)
+
+    print(f"Ejecutando {args.replicas} réplicas...", file=sys.stderr)
+    inicio = time.perf_counter()
+    estadisticas = ejecutar_ensamble(config, args.replicas, args.procesos, args.vectorizado, imprimir_progreso,
+                                     args.desde)
+    print(f"Ensamble completo en {time.perf_counter() - inicio:.1f} s "
+          f"({estadisticas.extinciones} extinciones)", file=sys.stderr)
+
+    if args.salida:
+        guardar_csv(estadisticas.tabla(), args.salida)
+        print(f"Estadísticas por día guardadas en {args.salida}", file=sys.stderr)
+    if args.grafica:
+        graficar_ensamble(estadisticas)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Gráficas de resultados de una corrida, sin Pygame.
+
+dibujar_resultados llena una Figure con las cuatro gráficas que muestra
+pantalla_graficas. Las series con más puntos que píxeles de ancho se decimán
+con una envolvente de mínimos y máximos, los marcadores solo se dibujan
+cuando los puntos están espaciados, y las purgas se agrupan cuando hay más
+barras que las que caben. guardar_graficas dibuja fuera de pantalla (PNG,
+SVG o PDF según la extensión) y guardar_graficas_en_segundo_plano lo hace
+en otro proceso, así la interfaz sigue respondiendo:
+
+    futuro = guardar_graficas_en_segundo_plano("resultados.png", *motor.historiales()[:3])
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+from decimacion import agrupar_barras, envolvente_min_max
+from historial_columnar import como_tabla
+
+TAMANO_FIGURA = (16, 10)
+MAX_PUNTOS_CON_MARCADOR = 60  # Con más puntos visibles las líneas se dibujan sin marcadores
+MAX_BARRAS = 60  # Con más días de purga las barras se agrupan
+MAX_ETIQUETAS = 20
+
+
+def _estilo(ax, titulo, xlabel, ylabel, eje_grilla='both'):
+    ax.set_xlabel(xlabel, fontsize=12, color='white')
+    ax.set_ylabel(ylabel, fontsize=12, color='white')
+    ax.set_title(titulo, fontsize=13, fontweight='bold', color='white')
+    ax.grid(True, alpha=0.3, color='white', axis=eje_grilla)
+    ax.tick_params(colors='white')
+    ax.legend(facecolor='#2d2d2d', edgecolor='white', labelcolor='white')
+
+
+def _ejes_enteros(ax):
+    ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: f"{int(x)}"))
+
+
+def _linea(ax, y, marcador, **estilo):
+    """Dibuja y contra el día, decimada al ancho del eje en píxeles"""
+    x, y = envolvente_min_max(np.arange(len(y)), y, max(int(ax.bbox.width), 1))
+    denso = len(x) > MAX_PUNTOS_CON_MARCADOR
+    ax.plot(x, y, marker=None if denso else marcador, linewidth=1.5 if denso else 2, markersize=6, **estilo)
+
+
+def _sin_purgas(ax, titulo):
+    ax.text(0.5, 0.5, 'No hubo días de purga', ha='center', va='center',
+            fontsize=14, color='white', transform=ax.transAxes)
+    ax.set_title(titulo, fontsize=13, fontweight='bold', color='white')
+
+
+def _etiqueta_grupo(inicio, fin):
+    return str(inicio) if inicio == fin else f"{inicio}-{fin}"
+
+
+def dibujar_resultados(fig, historial_poblacion, historial_tipos, historial_depredadores):
+    """Las cuatro gráficas de resultados sobre `fig` (de pyplot o una Figure fuera de pantalla)"""
+    ax1 = fig.add_subplot(2, 2, 1)
+    ax2 = fig.add_subplot(2, 2, 2)
+    ax3 = fig.add_subplot(2, 2, 3)
+    ax4 = fig.add_subplot(2, 2, 4)
+    for ax in (ax1, ax2, ax3, ax4):
+        ax.set_facecolor('#2d2d2d')
+
+    # Las columnas son vistas de los arreglos del historial: matplotlib las recibe sin copias
+    poblacion = np.asarray(historial_poblacion)
+    tipos = como_tabla(historial_tipos)
+    depredadores = como_tabla(historial_depredadores)
+
+    # Gráfica 1: Evolución total de la población
+    _linea(ax1, poblacion, 'o', color='#42A5F5', label='Población Total')
+    _estilo(ax1, 'Evolución de la Población a lo Largo del Tiempo', 'Día', 'Población')
+
+    # Gráfica 2: Desglose por tipo
+    _linea(ax2, tipos.columna("normal"), 'o', color='#FFD700', label='Normales (Dorado)')
+    _linea(ax2, tipos.columna("verde"), 's', color='#00FF00', label='Mutación Velocidad (Verde)')
+    _linea(ax2, tipos.columna("rojo"), '^', color='#FF0000', label='Mutación Prioridad (Rojo)')
+    _estilo(ax2, 'Población por Tipo de Mutación', 'Día', 'Cantidad de Partículas')
+
+    if not depredadores:
+        _sin_purgas(ax3, 'Impacto de Depredadores')
+        _sin_purgas(ax4, 'Tipos Eliminados por Depredadores')
+        fig.tight_layout()
+        return fig
+
+    inicios, finales, (eliminadas, nor_elim, vel_elim, pri_elim) = agrupar_barras(
+        depredadores.columna("dia"),
+        [depredadores.columna(clave) for clave in ("particulas_eliminadas", "normal_eliminadas",
+                                                   "velocidad_eliminadas", "prioridad_eliminadas")],
+        MAX_BARRAS)
+    agrupadas = len(inicios) < len(depredadores)
+    sufijo = f' ({len(depredadores)} purgas en {len(inicios)} grupos)' if agrupadas else ''
+
+    # Gráfica 3: Partículas eliminadas por depredadores por día
+    if agrupadas:
+        ax3.bar(inicios, eliminadas, width=finales - inicios + 1, align='edge', color='#8B008B', alpha=0.7,
+                label='Partículas Eliminadas')
+    else:
+        ax3.bar(inicios, eliminadas, color='#8B008B', alpha=0.7, label='Partículas Eliminadas')
+    _ejes_enteros(ax3)
+    _estilo(ax3, 'Impacto de Depredadores por Día de Purga' + sufijo, 'Día de Purga', 'Partículas Eliminadas', 'y')
+
+    # Gráfica 4: Desglose de tipos eliminados por depredadores
+    width = 0.25
+    x = np.arange(len(inicios))
+    ax4.bar(x - width, nor_elim, width, label='Normales', color='#FFD700', alpha=0.7)
+    ax4.bar(x, vel_elim, width, label='Velocidad', color='#00FF00', alpha=0.7)
+    ax4.bar(x + width, pri_elim, width, label='Prioridad', color='#FF0000', alpha=0.7)
+    paso = max(1, -(-len(x) // MAX_ETIQUETAS))
+    ax4.set_xticks(x[::paso])
+    ax4.set_xticklabels([_etiqueta_grupo(inicio, fin) for inicio, fin in zip(inicios[::paso].tolist(),
+                                                                             finales[::paso].tolist())],
+                        rotation=45 if agrupadas else 0)
+    _ejes_enteros(ax4)
+    _estilo(ax4, 'Tipos de Partículas Eliminadas por Depredadores', 'Día de Purga', 'Cantidad Eliminada', 'y')
+
+    fig.tight_layout()
+    return fig
+
+
+def guardar_graficas(ruta, historial_poblacion, historial_tipos, historial_depredadores, dpi=100):
+    """Dibuja las gráficas fuera de pantalla y las guarda en `ruta` (el formato sale de la extensión)"""
+    fig = Figure(figsize=TAMANO_FIGURA, facecolor='#1a1a1a')
+    dibujar_resultados(fig, historial_poblacion, historial_tipos, historial_depredadores)
+    fig.savefig(ruta, dpi=dpi, facecolor=fig.get_facecolor())
+    return ruta
+
+
+def guardar_graficas_en_segundo_plano(ruta, historial_poblacion, historial_tipos, historial_depredadores):
+    """guardar_graficas en un proceso aparte; retorna el Future (su resultado es la ruta)"""
+    pool = ProcessPoolExecutor(max_workers=1)
+    futuro = pool.submit(guardar_graficas, ruta, historial_poblacion, historial_tipos, historial_depredadores)
+    # El proceso termina solo al completar el trabajo
+    pool.shutdown(wait=False)
+    return futuro
@@ -0,0 +1,118 @@
+"""
+Historiales guardados en columnas tipadas de NumPy.
+
+SerieColumnar reemplaza a la lista de números (historial_poblacion) y
+TablaColumnar a la lista de dicts con las mismas claves (historial_tipos,
+historial_estadisticas, ...): cada clave es un arreglo que crece por
+duplicación. Ambas siguen comportándose como listas (append, len, índices,
+iteración), así el resto del código no cambia, y además entregan vistas sin
+copia de cada columna para graficar o paginar:
+
+    ax.plot(historial_tipos.columna("verde"))
+"""
+import numpy as np
+
+CAPACIDAD_INICIAL = 64
+
+
+def tipo_columna(valor):
+    """dtype de la columna para un valor de Python (bool, int o float)"""
+    if isinstance(valor, (bool, np.bool_)):
+        return np.bool_
+    if isinstance(valor, (int, np.integer)):
+        return np.int64
+    return np.float64
+
+
+class SerieColumnar:
+    """Serie de números en un arreglo que crece por duplicación"""
+
+    def __init__(self, valores=(), dtype=np.int64):
+        valores = np.asarray(valores, dtype=getattr(valores, "dtype", dtype))
+        self._datos = np.empty(max(CAPACIDAD_INICIAL, len(valores)), dtype=valores.dtype)
+        self._datos[:len(valores)] = valores
+        self.n = len(valores)
+
+    def append(self, valor):
+        if self.n == len(self._datos):
+            self._crecer(self.n + 1)
+        self._datos[self.n] = valor
+        self.n += 1
+
+    def _crecer(self, minimo):
+        datos = np.empty(max(minimo, 2 * len(self._datos)), dtype=self._datos.dtype)
+        datos[:self.n] = self._datos[:self.n]
+        self._datos = datos
+
+    def vista(self):
+        """Arreglo con los valores registrados, sin copia (no modificar)"""
+        return self._datos[:self.n]
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        return iter(self.vista().tolist())
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return self.vista()[indice].tolist()
+        return self.vista()[indice].item()
+
+    def __array__(self, dtype=None, copy=None):
+        return self.vista() if dtype is None else self.vista().astype(dtype)
+
+    def __repr__(self):
+        return f"SerieColumnar({self.vista().tolist()!r})"
+
+
+class TablaColumnar:
+    """Registros (dicts con las mismas claves) guardados como una SerieColumnar por clave"""
+
+    def __init__(self, registros=()):
+        # Las columnas y sus tipos se crean con el primer registro
+        self.series = {}
+        for registro in registros:
+            self.append(registro)
+
+    @classmethod
+    def desde_columnas(cls, columnas):
+        """Tabla a partir de {clave: arreglo}, todos del mismo largo"""
+        tabla = cls()
+        tabla.series = {clave: SerieColumnar(valores) for clave, valores in columnas.items()}
+        return tabla
+
+    def append(self, registro):
+        if not self.series:
+            self.series = {clave: SerieColumnar(dtype=tipo_columna(valor)) for clave, valor in registro.items()}
+        for clave, serie in self.series.items():
+            serie.append(registro[clave])
+
+    @property
+    def claves(self):
+        return list(self.series)
+
+    def columna(self, clave):
+        """Vista sin copia de la columna `clave`"""
+        return self.series[clave].vista()
+
+    def __len__(self):
+        return next(iter(self.series.values())).n if self.series else 0
+
+    def __iter__(self):
+        claves = list(self.series)
+        return (dict(zip(claves, fila)) for fila in zip(*(serie.vista().tolist() for serie in self.series.values())))
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return list(TablaColumnar.desde_columnas({clave: serie.vista()[indice]
+                                                     for clave, serie in self.series.items()}))
+        return {clave: serie[indice] for clave, serie in self.series.items()}
+
+    def __repr__(self):
+        return f"TablaColumnar({len(self)} registros, claves={self.claves})"
+
+
+def como_tabla(historial):
+    """TablaColumnar de `historial` (sin copia si ya lo es; p. ej. un deque de dicts se convierte)"""
+    return historial if isinstance(historial, TablaColumnar) else TablaColumnar(historial)
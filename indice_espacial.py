@@ -0,0 +1,231 @@
+"""
+Índice espacial uniforme (spatial hash) sobre las celdas del grid (TAMANO_PASO).
+
+Las posiciones se ordenan por clave de celda y las consultas buscan con
+searchsorted dónde empieza y termina cada rango de celdas, de modo que una
+consulta de radio r solo revisa las celdas vecinas: una rebanada contigua por
+fila de celdas. Solo se guardan las claves de las celdas ocupadas (una por
+posición), así la memoria y el tiempo de reconstrucción crecen con la
+población y no con el área del mundo. Cuando el mundo tiene pocas celdas para
+la población (CELDAS_POR_POSICION) se arma además la tabla densa con el
+inicio de cada celda, que responde cada búsqueda con un solo acceso. Se
+reconstruye una vez por tick y responde las consultas de visión de presas y
+depredadores y de colisión sin recorrer toda la población. Las consultas
+aceptan varios puntos a la vez (uno por depredador) y se resuelven en una
+sola pasada vectorizada. en_rectangulo responde qué posiciones caen en el
+área visible de la cámara, así la interfaz dibuja solo esas aunque el mundo
+sea enorme.
+"""
+import numpy as np
+
+# Hasta tantas celdas por posición indexada conviene la tabla densa de inicios
+CELDAS_POR_POSICION = 4
+# Desde este radio (en celdas) las consultas Manhattan en lote recorren solo el rombo
+RADIO_ROMBO = 4
+
+
+class IndiceEspacial:
+    """Hash espacial de posiciones enteras dentro de `limites`; las consultas retornan índices"""
+
+    def __init__(self, limites, tamano_celda):
+        self.limites = limites
+        self.tamano_celda = tamano_celda
+        self.columnas = (limites['der'] - limites['izq']) // tamano_celda + 1
+        self.filas = (limites['abaj'] - limites['arr']) // tamano_celda + 1
+        self.construir(np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32))
+
+    def construir(self, xs, ys):
+        """Indexa las posiciones (xs[i], ys[i]); el índice i es el que retornan las consultas"""
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        celdas = self._celda_y(ys).astype(np.int64) * self.columnas + self._celda_x(xs)
+        self._orden = np.argsort(celdas, kind='stable')
+        self._claves = celdas[self._orden]
+        self._xs = xs[self._orden]
+        self._ys = ys[self._orden]
+        total_celdas = self.columnas * self.filas
+        if 0 < total_celdas <= CELDAS_POR_POSICION * len(celdas):
+            self._densa = np.zeros(total_celdas + 1, dtype=np.int64)
+            np.cumsum(np.bincount(celdas, minlength=total_celdas), out=self._densa[1:])
+        else:
+            self._densa = None
+
+    def _inicio(self, claves):
+        """Posición en el arreglo ordenado de la primera entrada con clave >= claves"""
+        if self._densa is not None:
+            return self._densa[claves]
+        return np.searchsorted(self._claves, claves)
+
+    def _rebanadas(self, filas, cx0, cx1):
+        """Rangos [inicio, fin) del arreglo ordenado para las celdas cx0..cx1 de cada fila"""
+        base = np.asarray(filas, dtype=np.int64) * self.columnas
+        return self._inicio(base + cx0), self._inicio(base + cx1 + 1)
+
+    def __len__(self):
+        return len(self._orden)
+
+    def _celda_x(self, xs):
+        return np.minimum(np.maximum((xs - self.limites['izq']) // self.tamano_celda, 0), self.columnas - 1)
+
+    def _celda_y(self, ys):
+        return np.minimum(np.maximum((ys - self.limites['arr']) // self.tamano_celda, 0), self.filas - 1)
+
+    def _resto_manhattan(self, fila, y, radio):
+        """
+        Radio horizontal que deja la distancia vertical de y a cada fila de celdas:
+        las consultas Manhattan solo recorren el rombo y no todo el cuadrado.
+        La primera y la última fila también guardan las posiciones recortadas al mundo.
+        """
+        y_sup = self.limites['arr'] + fila * self.tamano_celda
+        y_inf = y_sup + self.tamano_celda - 1
+        arriba = np.where(fila > 0, y_sup - y, 0)
+        abajo = np.where(fila < self.filas - 1, y - y_inf, 0)
+        return radio - np.maximum(np.maximum(arriba, abajo), 0)
+
+    def _pares(self, xs, ys, radio, manhattan=False):
+        """
+        Para cada punto de consulta q, las posiciones (en el arreglo ordenado) de
+        las celdas que tocan el cuadrado de lado 2*radio centrado en (xs[q], ys[q])
+        (con manhattan=True, solo las que tocan el rombo de ese radio).
+        Retorna (consulta, posicion) con una entrada por par candidato.
+        """
+        xs = np.atleast_1d(np.asarray(xs, dtype=np.int64))
+        ys = np.atleast_1d(np.asarray(ys, dtype=np.int64))
+        cx0, cx1 = self._celda_x(xs - radio), self._celda_x(xs + radio)
+        cy0, cy1 = self._celda_y(ys - radio), self._celda_y(ys + radio)
+
+        # Una rebanada contigua [inicio, fin) por cada fila de celdas de cada consulta
+        filas_por_consulta = cy1 - cy0 + 1
+        consulta_fila = np.repeat(np.arange(len(xs)), filas_por_consulta)
+        desfase = np.arange(len(consulta_fila)) - np.repeat(np.cumsum(filas_por_consulta) - filas_por_consulta,
+                                                            filas_por_consulta)
+        fila = cy0[consulta_fila] + desfase
+        if manhattan and radio >= RADIO_ROMBO * self.tamano_celda:
+            resto = self._resto_manhattan(fila, ys[consulta_fila], radio)
+            x = xs[consulta_fila]
+            inicio, fin = self._rebanadas(fila, self._celda_x(x - resto), self._celda_x(x + resto))
+        else:
+            inicio, fin = self._rebanadas(fila, cx0[consulta_fila], cx1[consulta_fila])
+
+        longitudes = fin - inicio
+        consulta = np.repeat(consulta_fila, longitudes)
+        posicion = (np.repeat(inicio - (np.cumsum(longitudes) - longitudes), longitudes)
+                    + np.arange(int(longitudes.sum())))
+        return consulta, posicion
+
+    def pares_dentro_de_manhattan(self, xs, ys, radio, ordenar=True):
+        """
+        Pares (consulta, índice) a distancia Manhattan <= radio, agrupados por
+        consulta; con ordenar=True los índices de cada consulta van en orden creciente.
+        """
+        xs = np.atleast_1d(xs)
+        ys = np.atleast_1d(ys)
+        consulta, posicion = self._pares(xs, ys, radio, manhattan=True)
+        cerca = np.abs(self._xs[posicion] - xs[consulta]) + np.abs(self._ys[posicion] - ys[consulta]) <= radio
+        return self._agrupar(consulta[cerca], self._orden[posicion[cerca]], ordenar)
+
+    def pares_dentro_de_radio(self, xs, ys, radio, ordenar=True):
+        """Pares (consulta, índice) a distancia euclidiana < radio (ver pares_dentro_de_manhattan)"""
+        xs = np.atleast_1d(xs)
+        ys = np.atleast_1d(ys)
+        consulta, posicion = self._pares(xs, ys, radio)
+        dx = self._xs[posicion] - xs[consulta]
+        dy = self._ys[posicion] - ys[consulta]
+        cerca = dx * dx + dy * dy < radio * radio
+        return self._agrupar(consulta[cerca], self._orden[posicion[cerca]], ordenar)
+
+    @staticmethod
+    def _agrupar(consulta, indices, ordenar):
+        # _pares ya genera las consultas en orden; solo falta ordenar los índices dentro de cada una
+        if not ordenar or len(indices) < 2:
+            return consulta, indices
+        orden = np.lexsort((indices, consulta))
+        return consulta[orden], indices[orden]
+
+    def mas_cercanos_manhattan(self, xs, ys, radio, validos=None, vence=None, turnos=None):
+        """
+        Para cada consulta, el índice más cercano (Manhattan <= radio) entre los
+        que cumplen validos[i]; ante empates gana el índice menor. -1 si no hay.
+        Con `vence` y `turnos`, el índice i además solo es válido para la
+        consulta q si turnos[q] <= vence[i].
+        """
+        xs = np.atleast_1d(xs)
+        ys = np.atleast_1d(ys)
+        consulta, posicion = self._pares(xs, ys, radio, manhattan=True)
+        indices = self._orden[posicion]
+        dist = np.abs(self._xs[posicion] - xs[consulta]) + np.abs(self._ys[posicion] - ys[consulta])
+        seleccion = dist <= radio
+        if validos is not None:
+            seleccion &= validos[indices]
+        if vence is not None:
+            seleccion &= np.asarray(turnos)[consulta] <= vence[indices]
+        consulta, indices, dist = consulta[seleccion], indices[seleccion], dist[seleccion]
+
+        resultado = np.full(len(xs), -1, dtype=np.int64)
+        if len(consulta) > 0:
+            # Las consultas ya vienen agrupadas: mínimo de (dist, índice) por grupo en una clave entera
+            clave = dist.astype(np.int64) * (len(self._orden) + 1) + indices
+            inicio_grupo = np.flatnonzero(np.concatenate(([True], consulta[1:] != consulta[:-1])))
+            resultado[consulta[inicio_grupo]] = np.minimum.reduceat(clave, inicio_grupo) % (len(self._orden) + 1)
+        return resultado
+
+    def _rango(self, x, y, radio, manhattan=False):
+        """Versión escalar de _pares para una sola consulta (sin el costo de armar los lotes)"""
+        cy0 = min(max((y - radio - self.limites['arr']) // self.tamano_celda, 0), self.filas - 1)
+        cy1 = min(max((y + radio - self.limites['arr']) // self.tamano_celda, 0), self.filas - 1)
+        filas = range(cy0, cy1 + 1)
+        restos = [radio] * len(filas)
+        if manhattan:
+            # Mismo recorte que _resto_manhattan, sin el costo de los arreglos para una sola consulta
+            for i, cy in enumerate(filas):
+                y_sup = self.limites['arr'] + cy * self.tamano_celda
+                arriba = y_sup - y if cy > 0 else 0
+                abajo = y - (y_sup + self.tamano_celda - 1) if cy < self.filas - 1 else 0
+                restos[i] = radio - max(arriba, abajo, 0)
+        # Un solo searchsorted con los límites [inicio, fin) de todas las filas intercalados
+        claves = []
+        for cy, resto in zip(filas, restos):
+            cx0 = min(max((x - resto - self.limites['izq']) // self.tamano_celda, 0), self.columnas - 1)
+            cx1 = min(max((x + resto - self.limites['izq']) // self.tamano_celda, 0), self.columnas - 1)
+            base = cy * self.columnas
+            claves += (base + cx0, base + cx1 + 1)
+        limites = self._inicio(claves).tolist()
+        partes = [np.arange(limites[i], limites[i + 1]) for i in range(0, len(limites), 2)]
+        return np.concatenate(partes) if len(partes) > 1 else partes[0]
+
+    def dentro_de_manhattan(self, x, y, radio):
+        """Índices (ordenados) a distancia Manhattan <= radio de (x, y)"""
+        rango = self._rango(x, y, radio, manhattan=True)
+        dist = np.abs(self._xs[rango] - x) + np.abs(self._ys[rango] - y)
+        return np.sort(self._orden[rango[dist <= radio]])
+
+    def dentro_de_radio(self, x, y, radio):
+        """Índices (ordenados) a distancia euclidiana estrictamente menor que radio"""
+        rango = self._rango(x, y, radio)
+        dx = self._xs[rango] - x
+        dy = self._ys[rango] - y
+        return np.sort(self._orden[rango[dx * dx + dy * dy < radio * radio]])
+
+    def mas_cercano_manhattan(self, x, y, radio, validos=None):
+        """Índice más cercano a (x, y) entre los válidos (menor índice ante empates), o -1"""
+        rango = self._rango(x, y, radio, manhattan=True)
+        indices = self._orden[rango]
+        dist = np.abs(self._xs[rango] - x) + np.abs(self._ys[rango] - y)
+        seleccion = dist <= radio
+        if validos is not None:
+            seleccion &= validos[indices]
+        if not seleccion.any():
+            return -1
+        clave = dist[seleccion].astype(np.int64) * (len(self._orden) + 1) + indices[seleccion]
+        return int(clave.min() % (len(self._orden) + 1))
+
+    def en_rectangulo(self, x0, y0, x1, y1):
+        """Índices (ordenados) de las posiciones dentro de [x0, x1] x [y0, y1]: una rebanada por fila de celdas"""
+        cx0 = int(self._celda_x(x0))
+        cx1 = int(self._celda_x(x1))
+        cy0 = int(self._celda_y(y0))
+        cy1 = int(self._celda_y(y1))
+        inicio, fin = self._rebanadas(np.arange(cy0, cy1 + 1), cx0, cx1)
+        rango = np.concatenate([np.arange(a, b) for a, b in zip(inicio.tolist(), fin.tolist())])
+        dentro = (self._xs[rango] >= x0) & (self._xs[rango] <= x1) & (self._ys[rango] >= y0) & (self._ys[rango] <= y1)
+        return np.sort(self._orden[rango[dentro]])
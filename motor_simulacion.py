@@ -0,0 +1,1215 @@
+"""
+Motor de la simulación de selección natural, independiente de Pygame.
+
+Contiene el modelo (partículas, depredadores, comida, reglas de muerte y
+reproducción) y la clase SimulationEngine, que avanza la simulación paso a
+paso y registra los mismos historiales que muestra la interfaz gráfica.
+Puede ejecutarse en modo batch desde la línea de comandos:
+
+    python motor_simulacion.py --dias 999 --particulas 50 --comida 20
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from campo_comida import DISTRIBUCIONES, MODOS_REBROTE, CampoComida, RebroteComida, crear_distribucion
+from contadores import ContadoresPoblacion
+from historial_columnar import SerieColumnar, TablaColumnar
+from indice_espacial import IndiceEspacial
+from perfilador import Perfilador, resumen_dias
+from trayectorias import LARGO_TRAYECTORIA, Trayectoria
+
+#  PARÁMETROS CONFIGURABLES DE LA SIMULACIÓN 
+ANCHO_VENTANA = 1000
+ALTO_VENTANA = 750
+MARGEN = 50
+TAMANO_PASO = 20  # Tamaño de cada paso en píxeles
+# Lado máximo del mundo en celdas: las trayectorias guardan coordenadas de 16 bits sin signo
+MAX_CELDAS_MUNDO = 3000
+PASOS_POR_VIDA = 100  # Número de pasos que puede dar cada partícula
+DURACION_DIA = 300  # Pasos del día (>PASOS_POR_VIDA)
+PORCENTAJE_COMIDA = 20  # Porcentaje del mapa con comida (valor por defecto)
+DISTRIBUCION_COMIDA = "uniforme"  # Reparto de la comida en el mapa (ver campo_comida.DISTRIBUCIONES)
+TICKS_REBROTE = 0  # Ticks hasta que rebrota una celda comida; 0 = la comida se reparte de nuevo cada día
+MODO_REBROTE = "fijo"  # Ver campo_comida.MODOS_REBROTE
+NUM_DIAS = 30  # Número de días a simular (valor por defecto)
+TAMANO_CELDA = 20  
+
+# Parámetros de DEPREDADORES
+NUM_DEPREDADORES = 5  # Número de depredadores que aparecen en día de purga
+FRECUENCIA_PURGA = 3  # Cada cuántos días aparecen los depredadores
+RADIO_VISION_DEPREDADOR = 5 * 20  # 5 pasos de visión para depredadores (100 píxeles)
+RADIO_VISION_PRESA = 3 * 20  # 3 pasos de visión para presas (60 píxeles)
+VELOCIDAD_DEPREDADOR = 2 
+RADIO_COLISION = 15  # Distancia (píxeles) a la que un depredador daña a una presa
+
+# Parámetros de STAMINA
+STAMINA_MAXIMA = 100 
+STAMINA_RECARGA_POR_COMIDA = 60  
+STAMINA_AGOTAMIENTO = 1.0  # Stamina perdido por paso sin comer
+
+# Colores por tipo de mutación
+COLOR_NORMAL = (255, 255, 255)  # Blanco - Tipo normal
+COLOR_MUTACION_VELOCIDAD = (0, 255, 0)  # Verde - Velocidad aumentada
+COLOR_MUTACION_PRIORIDAD = (255, 0, 0)  # Rojo - Prioridad para comer
+COLOR_DEPREDADOR = (139, 0, 139)  # Morado oscuro - Depredador
+
+# Configuración por defecto con las claves de pantalla_configuracion
+CONFIG_POR_DEFECTO = {
+    "dias": NUM_DIAS,
+    "duracion": DURACION_DIA,
+    "particulas": 50,
+    "comida": PORCENTAJE_COMIDA,
+    "pasos": PASOS_POR_VIDA,
+    "depredadores": NUM_DEPREDADORES,
+    "frecuencia_purga": FRECUENCIA_PURGA,
+    "distribucion": DISTRIBUCION_COMIDA,
+    "rebrote": TICKS_REBROTE,
+    "modo_rebrote": MODO_REBROTE,
+    "ancho_mundo": None,  # Celdas; None = el mundo que cabe en la ventana
+    "alto_mundo": None,
+    "semilla": None  # None = entropía del sistema (corridas no reproducibles)
+}
+
+
+
+def flujos_aleatorios(semilla=None):
+    """
+    Generadores independientes derivados de `semilla` (int, SeedSequence o None):
+    un Generator de NumPy para las fases vectorizadas y un random.Random para las
+    decisiones escalares, más barato por llamada.
+    """
+    if not isinstance(semilla, np.random.SeedSequence):
+        semilla = np.random.SeedSequence(semilla)
+    # Hijos fijos de la semilla (lo mismo que spawn(2), sin alterar la secuencia recibida)
+    vectorial, escalar = (np.random.SeedSequence(semilla.entropy, spawn_key=semilla.spawn_key + (i,))
+                          for i in range(2))
+    return np.random.default_rng(vectorial), random.Random(int.from_bytes(escalar.generate_state(4).tobytes(), "little"))
+
+
+# Historiales del motor, en el orden en que se guardan y se vuelcan
+HISTORIALES = ("historial_poblacion", "historial_tipos", "historial_depredadores", "historial_estadisticas",
+               "historial_tiempos")
+
+# Prioridad para comer: Rojo (Alta) > Verde (Media) > Blanco (Baja)
+PRIORIDAD_COMIDA = {"normal": 0, "mutacion_velocidad": 1, "mutacion_prioridad": 2}
+
+
+def _trayectoria_nueva(anterior, largo, x, y):
+    """Trayectoria vacía en (x, y), reutilizando el buffer anterior si tiene el mismo largo"""
+    if not largo:
+        return None
+    if anterior is not None and anterior.largo == largo:
+        anterior.reiniciar(x, y)
+        return anterior
+    return Trayectoria(largo, x, y)
+
+
+class Reserva:
+    """
+    Lista libre de entidades (Particula o Depredador) que ya no se usan: obtener()
+    reinicia una de ellas con _iniciar en lugar de crear un objeto nuevo, así el
+    recambio de cada día casi no reserva memoria ni deja basura para el GC.
+    """
+
+    __slots__ = ("clase", "libres")
+
+    def __init__(self, clase):
+        self.clase = clase
+        self.libres = []
+
+    def obtener(self, *args):
+        if self.libres:
+            entidad = self.libres.pop()
+            entidad._iniciar(*args)
+            return entidad
+        return self.clase(*args)
+
+    def devolver(self, entidad):
+        self.libres.append(entidad)
+
+    def devolver_todas(self, entidades):
+        self.libres.extend(entidades)
+
+
+# Clase para representar una partícula con sistema de supervivencia
+class Particula:
+    __slots__ = ("x", "y", "pos_inicial", "tipo_mutacion", "color", "velocidad_base", "velocidad", "pasos_vida",
+                 "pasos_restantes", "trayectoria", "activa", "en_casa", "veces_comido", "ha_comido_hoy",
+                 "salio_de_casa", "debe_morir", "puede_reproducirse", "stamina", "stamina_anterior", "vida_maxima",
+                 "vida_actual", "invulnerable_frames", "huyendo")
+
+    def __init__(self, x, y, pasos_vida, tipo_mutacion="normal", largo_trayectoria=0):
+        self.trayectoria = None
+        self._iniciar(x, y, pasos_vida, tipo_mutacion, largo_trayectoria)
+
+    def _iniciar(self, x, y, pasos_vida, tipo_mutacion="normal", largo_trayectoria=0):
+        """Estado de una partícula recién nacida (también al reutilizarla desde una Reserva)"""
+        self.x = x
+        self.y = y
+        self.pos_inicial = (x, y)  # Guardar posición inicial (casa)
+        self.tipo_mutacion = tipo_mutacion  # "normal", "mutacion_velocidad", "mutacion_prioridad"
+        self.color = self._obtener_color()
+        
+        # Velocidad: mutación de velocidad mueve más casillas por tick, mismos pasos de vida
+        self.velocidad_base = 2 if tipo_mutacion == "mutacion_velocidad" else 1
+        self.velocidad = self.velocidad_base  # Velocidad ajustada por stamina
+        self.pasos_vida = pasos_vida
+        self.pasos_restantes = self.pasos_vida
+        # Solo se registra mientras se muestran las trayectorias (largo_trayectoria > 0)
+        self.trayectoria = _trayectoria_nueva(self.trayectoria, largo_trayectoria, x, y)
+        self.activa = True
+        self.en_casa = True
+        self.veces_comido = 0
+        self.ha_comido_hoy = False
+        self.salio_de_casa = False
+        self.debe_morir = False
+        self.puede_reproducirse = False
+        
+        # Sistema de STAMINA
+        self.stamina = STAMINA_MAXIMA
+        self.stamina_anterior = STAMINA_MAXIMA
+        
+        # Sistema de VIDA
+        self.vida_maxima = 2 if tipo_mutacion == "mutacion_prioridad" else 1
+        self.vida_actual = self.vida_maxima
+        self.invulnerable_frames = 0  # Frames de invulnerabilidad tras recibir daño
+        self.huyendo = False  # Estado de huida
+    
+    def _obtener_color(self):
+        """Retorna el color según el tipo de mutación"""
+        if self.tipo_mutacion == "mutacion_velocidad":
+            return COLOR_MUTACION_VELOCIDAD
+        elif self.tipo_mutacion == "mutacion_prioridad":
+            return COLOR_MUTACION_PRIORIDAD
+        else:
+            return COLOR_NORMAL
+    
+    def actualizar_velocidad_por_stamina(self):
+        """Ajusta la velocidad según el stamina actual"""
+        # Proporción de stamina (0 a 1)
+        proporcion_stamina = max(0, min(1, self.stamina / STAMINA_MAXIMA))
+        # La velocidad varía de 0% a 100% de la velocidad base según el stamina
+        self.velocidad = max(1, int(self.velocidad_base * proporcion_stamina))
+        if self.velocidad == 0:
+            self.velocidad = 1  # Mínimo 1 para poder moverse
+    
+    def recargar_stamina(self):
+        """Recarga el stamina al comer"""
+        self.stamina = min(STAMINA_MAXIMA, self.stamina + STAMINA_RECARGA_POR_COMIDA)
+    
+    def agotar_stamina(self, cantidad=STAMINA_AGOTAMIENTO):
+        """Reduce el stamina por no comer"""
+        self.stamina = max(0, self.stamina - cantidad)
+        self.actualizar_velocidad_por_stamina()
+    
+    def recibir_dano(self):
+        """Recibe daño de un depredador"""
+        if self.invulnerable_frames > 0:
+            return False  # Aún invulnerable
+        
+        self.vida_actual -= 1
+        self.invulnerable_frames = 30  # 30 frames de invulnerabilidad (~0.5 segundos a 60 FPS)
+        
+        if self.vida_actual <= 0:
+            self.activa = False
+            self.debe_morir = True
+            return True  # Murió
+        return False  # Sobrevivió
+    
+    def actualizar_invulnerabilidad(self):
+        """Actualiza el contador de invulnerabilidad"""
+        if self.invulnerable_frames > 0:
+            self.invulnerable_frames -= 1
+    
+    def detectar_depredador_cercano(self, depredadores):
+        """Detecta si hay un depredador en el radio de visión (3 pasos)"""
+        for depredador in depredadores:
+            if not depredador.activo:
+                continue
+            # Calcular distancia Manhattan (solo direcciones cardinales)
+            distancia_manhattan = abs(self.x - depredador.x) + abs(self.y - depredador.y)
+            if distancia_manhattan <= RADIO_VISION_PRESA:
+                return depredador
+        return None
+    
+    def calcular_vector_huida(self, depredador):
+        """Calcula dirección opuesta al depredador (solo direcciones cardinales)"""
+        dx = self.x - depredador.x
+        dy = self.y - depredador.y
+        
+        # Elegir la dirección cardinal que maximiza la distancia
+        # Priorizar el eje con mayor diferencia
+        if abs(dx) > abs(dy):
+            # Moverse horizontalmente
+            if dx > 0:
+                return TAMANO_PASO, 0  # Derecha (alejarse)
+            else:
+                return -TAMANO_PASO, 0  # Izquierda (alejarse)
+        else:
+            # Moverse verticalmente
+            if dy > 0:
+                return 0, TAMANO_PASO  # Abajo (alejarse)
+            else:
+                return 0, -TAMANO_PASO  # Arriba (alejarse)
+        
+    def esta_en_borde(self, limites):
+        """Verifica si la partícula está en el borde (casa)"""
+        return (self.x == limites['izq'] or self.x == limites['der'] or
+                self.y == limites['arr'] or self.y == limites['abaj'])
+    
+    def mover(self, limites, aleatorio, depredadores=None, depredador_cercano=None):
+        """
+        Mueve la partícula; la mutación de velocidad realiza más pasos por tick.
+        depredador_cercano permite pasar la amenaza ya detectada (índice espacial)
+        en lugar de recorrer la lista de depredadores.
+        """
+        if self.pasos_restantes <= 0 or not self.activa:
+            return False
+
+        # Actualizar invulnerabilidad
+        self.actualizar_invulnerabilidad()
+        
+        # Detectar depredadores cercanos
+        if depredador_cercano is None and depredadores:
+            depredador_cercano = self.detectar_depredador_cercano(depredadores)
+        
+        self.huyendo = depredador_cercano is not None
+        
+        direcciones = [
+            (TAMANO_PASO, 0),      # Derecha
+            (-TAMANO_PASO, 0),     # Izquierda
+            (0, TAMANO_PASO),      # Abajo
+            (0, -TAMANO_PASO)      # Arriba
+        ]
+
+        movio = False
+        # Actualizar velocidad según stamina actual
+        self.actualizar_velocidad_por_stamina()
+        
+        # Mutación velocidad: realiza varios subpasos en el mismo tick
+        # Velocidad ajustada por stamina
+        for _ in range(self.velocidad):
+            if self.pasos_restantes <= 0 or not self.activa:
+                break
+
+            # Si hay un depredador cercano, huir
+            if self.huyendo and depredador_cercano:
+                dx, dy = self.calcular_vector_huida(depredador_cercano)
+            else:
+                dx, dy = aleatorio.choice(direcciones)
+            
+            nuevo_x = max(limites['izq'], min(self.x + dx, limites['der']))
+            nuevo_y = max(limites['arr'], min(self.y + dy, limites['abaj']))
+
+            # Alinear al grid
+            nuevo_x = (nuevo_x // TAMANO_PASO) * TAMANO_PASO
+            nuevo_y = (nuevo_y // TAMANO_PASO) * TAMANO_PASO
+
+            self.x = nuevo_x
+            self.y = nuevo_y
+            if self.trayectoria is not None:
+                self.trayectoria.agregar(self.x, self.y)
+            self.pasos_restantes -= 1
+            
+            # Agotar stamina por cada paso realizado
+            if not self.en_casa:
+                self.agotar_stamina()
+            
+            movio = True
+
+            # Verificar si está en casa
+            if self.esta_en_borde(limites):
+                self.en_casa = True
+            else:
+                self.en_casa = False
+                if not self.salio_de_casa:
+                    self.salio_de_casa = True
+
+        return movio
+    
+    def intentar_comer(self, comida_pos):
+        """Intenta comer si hay comida en la posición actual"""
+        if (self.x, self.y) in comida_pos:
+            self.veces_comido += 1
+            self.ha_comido_hoy = True
+            self.recargar_stamina()  # Recargar stamina al comer
+            comida_pos.remove((self.x, self.y))
+            return True
+        return False
+    
+    def reiniciar_dia(self, limites, aleatorio):
+        """Reinicia la partícula para el siguiente día"""
+        # Generar nueva posición en el borde
+        self.x, self.y = generar_posicion_borde(limites, aleatorio)
+        self.pos_inicial = (self.x, self.y)
+        self.pasos_restantes = self.pasos_vida
+        if self.trayectoria is not None:
+            self.trayectoria.reiniciar(self.x, self.y)
+        self.en_casa = True
+        self.veces_comido = 0
+        self.ha_comido_hoy = False
+        self.salio_de_casa = False
+        self.activa = True
+        self.puede_reproducirse = False
+        # Reiniciar stamina al máximo
+        self.stamina = STAMINA_MAXIMA
+        self.actualizar_velocidad_por_stamina()
+        # Reiniciar vida al máximo
+        self.vida_actual = self.vida_maxima
+        self.invulnerable_frames = 0
+        self.huyendo = False
+    
+    def obtener_tipo_hijo(self, aleatorio):
+        """Determina el tipo de mutación del hijo basado en veces_comido del padre"""
+        if self.veces_comido >= 3:
+            # Mutación: 50% Mutación 1 (velocidad) o Mutación 2 (prioridad)
+            return aleatorio.choice(["mutacion_velocidad", "mutacion_prioridad"])
+        else:
+            # Sin mutación: mismo tipo que el padre
+            return self.tipo_mutacion
+    
+    def obtener_tipo_heredado(self, aleatorio):
+        """Si es mutado, retorna tipo heredado con 80% misma mutación, 20% normal"""
+        if self.tipo_mutacion in ["mutacion_velocidad", "mutacion_prioridad"]:
+            # 80% misma mutación, 20% normal
+            if aleatorio.random() < 0.8:
+                return self.tipo_mutacion
+            else:
+                return "normal"
+        return self.tipo_mutacion
+        
+
+# Clase Depredador
+class Depredador:
+    __slots__ = ("x", "y", "activo", "velocidad", "trayectoria", "particulas_eliminadas", "objetivo")
+
+    def __init__(self, x, y, largo_trayectoria=0):
+        self.trayectoria = None
+        self._iniciar(x, y, largo_trayectoria)
+
+    def _iniciar(self, x, y, largo_trayectoria=0):
+        """Estado de un depredador recién aparecido (también al reutilizarlo desde una Reserva)"""
+        self.x = x
+        self.y = y
+        self.activo = True
+        self.velocidad = VELOCIDAD_DEPREDADOR
+        self.trayectoria = _trayectoria_nueva(self.trayectoria, largo_trayectoria, x, y)
+        self.particulas_eliminadas = 0
+        self.objetivo = None  # Partícula objetivo actual
+    
+    def buscar_objetivo_cercano(self, particulas, indice=None):
+        """
+        Busca la partícula más cercana dentro del rango de visión (5 pasos).
+        Con un IndiceEspacial de las partículas solo se revisan las celdas vecinas.
+        """
+        if indice is not None:
+            cercanas = indice.dentro_de_manhattan(self.x, self.y, RADIO_VISION_DEPREDADOR).tolist()
+            particulas = [particulas[i] for i in cercanas]
+        particulas_activas = [p for p in particulas if p.activa and not p.en_casa]
+        if not particulas_activas:
+            return None
+        
+        # Encontrar la partícula más cercana dentro del rango de visión
+        min_dist = float('inf')
+        objetivo = None
+        for p in particulas_activas:
+            # Usar distancia Manhattan (solo direcciones cardinales)
+            dist_manhattan = abs(self.x - p.x) + abs(self.y - p.y)
+            if dist_manhattan <= RADIO_VISION_DEPREDADOR and dist_manhattan < min_dist:
+                min_dist = dist_manhattan
+                objetivo = p
+        
+        return objetivo
+    
+    def mover(self, limites, particulas, aleatorio, indice=None):
+        """Mueve el depredador: random walk por defecto, persigue si detecta presa en rango de 5 pasos"""
+        if not self.activo:
+            return False
+        
+        # Buscar objetivo en el rango de visión
+        self.objetivo = self.buscar_objetivo_cercano(particulas, indice)
+        objetivo_pos = (self.objetivo.x, self.objetivo.y) if self.objetivo else None
+        return self.desplazar(limites, aleatorio, objetivo_pos)
+    
+    def desplazar(self, limites, aleatorio, objetivo_pos=None):
+        """Da un paso hacia objetivo_pos (x, y), o un paso aleatorio si no hay objetivo"""
+        self.mover_a(*self.calcular_destino(limites, aleatorio, objetivo_pos))
+        return True
+    
+    def mover_a(self, x, y):
+        """Coloca al depredador en (x, y) registrando la trayectoria"""
+        self.x = x
+        self.y = y
+        if self.trayectoria is not None:
+            self.trayectoria.agregar(self.x, self.y)
+    
+    def calcular_destino(self, limites, aleatorio, objetivo_pos=None):
+        """Posición tras el paso que daría desplazar(), sin mover al depredador"""
+        # Si no hay objetivo en rango, hacer simple random walk
+        if objetivo_pos is None:
+            direcciones = [
+                (TAMANO_PASO, 0),      # Derecha
+                (-TAMANO_PASO, 0),     # Izquierda
+                (0, TAMANO_PASO),      # Abajo
+                (0, -TAMANO_PASO)      # Arriba
+            ]
+            dx, dy = aleatorio.choice(direcciones)
+        else:
+            # Perseguir objetivo - elegir dirección cardinal que acerca más al objetivo
+            dx_diff = objetivo_pos[0] - self.x
+            dy_diff = objetivo_pos[1] - self.y
+            
+            # Elegir la dirección cardinal que más acerca al objetivo
+            # Priorizar el eje con mayor diferencia
+            if abs(dx_diff) > abs(dy_diff):
+                # Moverse horizontalmente
+                if dx_diff > 0:
+                    dx, dy = TAMANO_PASO * self.velocidad, 0  # Derecha
+                else:
+                    dx, dy = -TAMANO_PASO * self.velocidad, 0  # Izquierda
+            else:
+                # Moverse verticalmente
+                if dy_diff > 0:
+                    dx, dy = 0, TAMANO_PASO * self.velocidad  # Abajo
+                else:
+                    dx, dy = 0, -TAMANO_PASO * self.velocidad  # Arriba
+        
+        nuevo_x = max(limites['izq'], min(self.x + dx, limites['der']))
+        nuevo_y = max(limites['arr'], min(self.y + dy, limites['abaj']))
+        return nuevo_x, nuevo_y
+    
+    def verificar_colision(self, particulas, muertes, indice=None):
+        """
+        Verifica colisión con partículas y aplica daño; registra en muertes la
+        posición de cada baja y retorna las partículas eliminadas.
+        """
+        eliminadas = []
+        if indice is not None:
+            particulas = [particulas[i] for i in indice.dentro_de_radio(self.x, self.y, RADIO_COLISION).tolist()]
+        for particula in particulas:
+            if not particula.activa or particula.en_casa:
+                continue
+            
+            # Calcular distancia
+            distancia = ((self.x - particula.x)**2 + (self.y - particula.y)**2)**0.5
+            
+            # Si están lo suficientemente cerca (radio de colisión)
+            if distancia < RADIO_COLISION:
+                murio = particula.recibir_dano()
+                if murio:
+                    self.particulas_eliminadas += 1
+                    muertes.append((particula.x, particula.y))
+                    eliminadas.append(particula)
+                    # Buscar nuevo objetivo
+                    self.objetivo = None
+        return eliminadas
+    
+
+# Funciones auxiliares
+def generar_posicion_borde(limites, aleatorio):
+    """Genera una posición aleatoria en el borde (casa) y retorna con el primer movimiento hacia adentro"""
+    borde = aleatorio.choice(['izq', 'der', 'arr', 'abaj'])
+    
+    if borde == 'izq':
+        x = limites['izq'] + TAMANO_PASO  # Primer paso hacia adentro
+        y = (aleatorio.randrange(limites['arr'], limites['abaj'] + 1, TAMANO_PASO) // TAMANO_PASO) * TAMANO_PASO
+    elif borde == 'der':
+        x = limites['der'] - TAMANO_PASO  # Primer paso hacia adentro
+        y = (aleatorio.randrange(limites['arr'], limites['abaj'] + 1, TAMANO_PASO) // TAMANO_PASO) * TAMANO_PASO
+    elif borde == 'arr':
+        x = (aleatorio.randrange(limites['izq'], limites['der'] + 1, TAMANO_PASO) // TAMANO_PASO) * TAMANO_PASO
+        y = limites['arr'] + TAMANO_PASO  # Primer paso hacia adentro
+    else:  # 'abaj'
+        x = (aleatorio.randrange(limites['izq'], limites['der'] + 1, TAMANO_PASO) // TAMANO_PASO) * TAMANO_PASO
+        y = limites['abaj'] - TAMANO_PASO  # Primer paso hacia adentro
+    
+    return x, y
+
+
+def generar_comida(limites, porcentaje, rng, distribucion=None):
+    """
+    Celdas con comida del día (índices planos de CampoComida), sorteadas con
+    `distribucion` (uniforme por defecto) sobre el índice de celdas interiores
+    """
+    if distribucion is None:
+        distribucion = crear_distribucion(DISTRIBUCION_COMIDA, limites, TAMANO_PASO, rng)
+    # El porcentaje es sobre todo el mapa, incluido el borde (casa), donde nunca hay comida
+    ancho = (limites['der'] - limites['izq']) // TAMANO_PASO + 1
+    alto = (limites['abaj'] - limites['arr']) // TAMANO_PASO + 1
+    return distribucion.muestrear(int(ancho * alto * porcentaje / 100), rng)
+
+
+def crear_particulas_iniciales(limites, num_particulas, pasos_vida, aleatorio, largo_trayectoria=0):
+    """Crea las partículas iniciales en posiciones aleatorias del borde"""
+    particulas = []
+    for i in range(num_particulas):
+        x, y = generar_posicion_borde(limites, aleatorio)
+        particula = Particula(x, y, pasos_vida, tipo_mutacion="normal", largo_trayectoria=largo_trayectoria)
+        particulas.append(particula)
+    return particulas
+
+
+def intentar_comer_con_prioridad(particulas, posicion_comida, aleatorio):
+    """
+    Maneja el sistema de prioridad de comida cuando múltiples partículas llegan a la misma comida.
+    Reglas:
+    - Mutación Rojo (prioridad) tiene prioridad máxima
+    - Mutación Verde (velocidad) tiene prioridad media
+    - Normal (blanco) tiene prioridad mínima
+    - Si hay múltiples del mismo tipo, 50-50 entre ellos
+    """
+    # Buscar partículas activas en la posición de comida (sin filtrar por en_casa)
+    particulas_en_comida = [p for p in particulas if p.x == posicion_comida[0] and p.y == posicion_comida[1] and p.activa]
+    
+    if not particulas_en_comida:
+        return None
+    
+    # Separar por tipo
+    rojos = [p for p in particulas_en_comida if p.tipo_mutacion == "mutacion_prioridad"]
+    verdes = [p for p in particulas_en_comida if p.tipo_mutacion == "mutacion_velocidad"]
+    blancos = [p for p in particulas_en_comida if p.tipo_mutacion == "normal"]
+    
+    # Prioridad: Rojo (Alta) > Verde (Media) > Blanco (Baja)
+    if rojos:
+        return aleatorio.choice(rojos)
+    elif verdes:
+        return aleatorio.choice(verdes)
+    elif blancos:
+        return aleatorio.choice(blancos)
+    
+    return None
+
+
+def calcular_limites(columnas=None, filas=None):
+    """
+    Límites del mundo (alineados al grid). Por defecto se derivan de las
+    dimensiones de la ventana; con `columnas` y/o `filas` el mundo tiene ese
+    tamaño en celdas, independiente de la ventana (se recorre con la cámara).
+    """
+    izq = (MARGEN // TAMANO_PASO) * TAMANO_PASO
+    arr = ((MARGEN + 100) // TAMANO_PASO) * TAMANO_PASO
+    for celdas in (columnas, filas):
+        if celdas is not None and not 3 <= celdas <= MAX_CELDAS_MUNDO:
+            raise ValueError(f"El mundo debe tener entre 3 y {MAX_CELDAS_MUNDO} celdas por lado (se pidió {celdas})")
+    return {
+        'izq': izq,
+        'der': ((ANCHO_VENTANA - MARGEN - 300) // TAMANO_PASO) * TAMANO_PASO if columnas is None
+        else izq + (columnas - 1) * TAMANO_PASO,
+        'arr': arr,
+        'abaj': ((ALTO_VENTANA - MARGEN) // TAMANO_PASO) * TAMANO_PASO if filas is None
+        else arr + (filas - 1) * TAMANO_PASO
+    }
+
+
+def celdas_mundo(limites):
+    """(columnas, filas) del mundo con estos límites"""
+    return ((limites['der'] - limites['izq']) // TAMANO_PASO + 1,
+            (limites['abaj'] - limites['arr']) // TAMANO_PASO + 1)
+
+
+class SimulationEngine:
+    """
+    Estado y reglas de una simulación completa, sin dependencias gráficas.
+
+    La interfaz de Pygame llama a step() una vez por tick y solo dibuja el
+    estado; el modo batch usa run() para avanzar tan rápido como permita la CPU.
+    """
+
+    def __init__(self, num_dias=NUM_DIAS, pasos_vida=PASOS_POR_VIDA, duracion_dia=DURACION_DIA,
+                 porcentaje_comida=PORCENTAJE_COMIDA, num_particulas_inicial=50,
+                 num_depredadores=NUM_DEPREDADORES, frecuencia_purga=FRECUENCIA_PURGA, limites=None, semilla=None,
+                 largo_trayectoria=LARGO_TRAYECTORIA, distribucion_comida=DISTRIBUCION_COMIDA,
+                 ticks_rebrote=TICKS_REBROTE, modo_rebrote=MODO_REBROTE):
+        self.num_dias = num_dias
+        self.pasos_vida = pasos_vida
+        # Garantizar que la duración del día siempre sea mayor a los pasos de vida
+        self.duracion_dia = max(duracion_dia, pasos_vida + 1)
+        self.porcentaje_comida = porcentaje_comida
+        # Nombre de campo_comida.DISTRIBUCIONES o una subclase de Distribucion
+        self.distribucion_comida = distribucion_comida
+        # Con ticks_rebrote > 0 la comida no se repone cada día: cada celda comida rebrota sola
+        self.ticks_rebrote = ticks_rebrote
+        self.modo_rebrote = modo_rebrote
+        self.num_particulas_inicial = num_particulas_inicial
+        self.num_depredadores = num_depredadores
+        self.frecuencia_purga = frecuencia_purga
+        self.limites = limites if limites is not None else calcular_limites()
+        # Todo el azar de la corrida sale de la semilla (ver reiniciar)
+        self.semilla = semilla
+        # Índice espacial de las partículas, usado solo en días de purga
+        self.indice = IndiceEspacial(self.limites, TAMANO_PASO)
+        # Las trayectorias se registran solo mientras la interfaz las muestra
+        self.largo_trayectoria = largo_trayectoria
+        self.trayectorias_activas = False
+        # Temporizadores por fase, solo mientras se perfila (ver activar_perfilador)
+        self.perfilador = None
+        # (ruta, cada_dias) de los checkpoints periódicos, o None
+        self.checkpoints = None
+        # EscritorHistorial que recibe cada registro diario, y cuántos registros se conservan en memoria
+        self.escritor = None
+        self.cola_historial = None
+        self.reiniciar()
+
+    @classmethod
+    def desde_config(cls, config, limites=None, semilla=None):
+        """
+        Crea el motor a partir del diccionario que retorna pantalla_configuracion;
+        `semilla` (p. ej. un SeedSequence hijo) reemplaza a config["semilla"].
+        """
+        return cls(
+            num_dias=config["dias"],
+            pasos_vida=config["pasos"],
+            duracion_dia=config["duracion"],
+            porcentaje_comida=config["comida"],
+            num_particulas_inicial=config["particulas"],
+            num_depredadores=config["depredadores"],
+            frecuencia_purga=config["frecuencia_purga"],
+            limites=limites if limites is not None else calcular_limites(config.get("ancho_mundo"),
+                                                                         config.get("alto_mundo")),
+            distribucion_comida=config.get("distribucion", DISTRIBUCION_COMIDA),
+            ticks_rebrote=config.get("rebrote", TICKS_REBROTE),
+            modo_rebrote=config.get("modo_rebrote", MODO_REBROTE),
+            semilla=config.get("semilla") if semilla is None else semilla
+        )
+
+    def reiniciar(self):
+        """Vuelve al estado inicial (día 1) con los mismos parámetros"""
+        # Entidades muertas que se reutilizan para los hijos y los depredadores de cada purga
+        self.reserva_particulas = Reserva(Particula)
+        self.reserva_depredadores = Reserva(Depredador)
+        # rng (NumPy) para las fases vectorizadas y aleatorio (random.Random) para las
+        # decisiones por entidad; con semilla fija, reiniciar repite la misma corrida
+        self.rng, self.aleatorio = flujos_aleatorios(self.semilla)
+        self.contadores = ContadoresPoblacion()
+        self.contadores.nacer("normal", self.num_particulas_inicial)
+        self.contadores.iniciar_dia()
+        self._crear_poblacion_inicial()
+        self.comida_pos = CampoComida(self.limites, TAMANO_PASO)
+        self.distribucion = crear_distribucion(self.distribucion_comida, self.limites, TAMANO_PASO, self.rng)
+        self._regenerar_comida()
+        if self.ticks_rebrote > 0:
+            RebroteComida(self.comida_pos, self.ticks_rebrote, self.rng, self.modo_rebrote)
+        self.depredadores = []
+        self.es_dia_purga = False
+        self.dia_actual = 1
+        self.paso_actual_dia = 0
+        self.extinta = False
+        self.indice_vigente = False
+        # Posiciones de las partículas que murieron durante el último step()
+        self.muertes = []
+
+        self.dias_cerrados = 0
+        self.historial_poblacion = self._nuevo_historial([self.num_particulas_inicial], serie=True)
+        self.historial_tipos = self._nuevo_historial([{"normal": self.num_particulas_inicial, "verde": 0, "rojo": 0}])
+        # Historial de depredadores: {dia, num_depredadores, particulas_eliminadas}
+        self.historial_depredadores = self._nuevo_historial()
+        self.historial_estadisticas = self._nuevo_historial()
+        # Milisegundos por fase de cada día perfilado
+        self.historial_tiempos = self._nuevo_historial()
+        if self.perfilador is not None:
+            self.perfilador = Perfilador(self.historial_tiempos)
+        if self.escritor is not None:
+            # La corrida reiniciada vuelve a empezar en el día 1: se escribe en archivos nuevos
+            self.escritor.nueva_corrida()
+            self._volcar_historiales()
+
+    def _nuevo_historial(self, registros=(), serie=False):
+        """Historial completo en columnas o, con cola_historial, solo los últimos registros"""
+        if self.cola_historial is not None:
+            return deque(registros, maxlen=self.cola_historial)
+        return SerieColumnar(list(registros)) if serie else TablaColumnar(registros)
+
+    def _crear_poblacion_inicial(self):
+        self.particulas = crear_particulas_iniciales(self.limites, self.num_particulas_inicial, self.pasos_vida,
+                                                     self.aleatorio, self._largo_trayectoria())
+
+    def _largo_trayectoria(self):
+        """Capacidad de trayectoria para las entidades nuevas (0 = sin registro)"""
+        return self.largo_trayectoria if self.trayectorias_activas else 0
+
+    def activar_trayectorias(self, activas):
+        """Empieza (desde la posición actual) o deja de registrar las trayectorias"""
+        self.trayectorias_activas = activas
+        largo = self._largo_trayectoria()
+        for depredador in self.depredadores:
+            depredador.trayectoria = Trayectoria(largo, depredador.x, depredador.y) if largo else None
+        self._activar_trayectorias_particulas(largo)
+
+    def _activar_trayectorias_particulas(self, largo):
+        for particula in self.particulas:
+            particula.trayectoria = Trayectoria(largo, particula.x, particula.y) if largo else None
+
+    def activar_perfilador(self, activo):
+        """Empieza o deja de medir el tiempo de cada fase (historial_tiempos conserva los días medidos)"""
+        self.perfilador = Perfilador(self.historial_tiempos) if activo else None
+
+    def activar_historial(self, escritor, cola=None):
+        """
+        Envía cada registro diario a `escritor` (sumideros.EscritorHistorial) en
+        cuanto se produce, empezando por los ya registrados. Con `cola`, los
+        historiales en memoria conservan solo los últimos `cola` registros.
+        """
+        self.escritor = escritor
+        if escritor is not None:
+            self._volcar_historiales()
+        self.cola_historial = cola
+        for nombre in HISTORIALES:
+            setattr(self, nombre, self._nuevo_historial(getattr(self, nombre), serie=nombre == "historial_poblacion"))
+        if self.perfilador is not None:
+            self.perfilador.historial = self.historial_tiempos
+
+    def _volcar_historiales(self):
+        """Escribe lo que ya está en memoria (al activar el escritor o al reiniciar)"""
+        primer_dia = self.dias_cerrados - len(self.historial_poblacion) + 1
+        for dia, (total, tipos) in enumerate(zip(self.historial_poblacion, self.historial_tipos), primer_dia):
+            self.escritor.escribir("poblacion", {"dia": dia, "poblacion": total, **tipos})
+        for tabla, historial in (("estadisticas", self.historial_estadisticas),
+                                 ("depredadores", self.historial_depredadores), ("tiempos", self.historial_tiempos)):
+            for registro in historial:
+                self.escritor.escribir(tabla, registro)
+
+    def activar_checkpoints(self, ruta, cada_dias):
+        """
+        Guarda un checkpoint al cerrar cada `cada_dias` días; `ruta` puede incluir
+        {dia} para conservar uno por día (si no, se sobrescribe el mismo archivo).
+        """
+        self.checkpoints = (ruta, cada_dias) if ruta and cada_dias > 0 else None
+
+    def _checkpoint_periodico(self):
+        ruta, cada_dias = self.checkpoints
+        if self.dias_cerrados % cada_dias == 0:
+            from checkpoint import guardar_checkpoint
+            guardar_checkpoint(self, ruta.format(dia=self.dias_cerrados))
+            # Los archivos del historial quedan al día con el checkpoint
+            if self.escritor is not None:
+                self.escritor.vaciar()
+
+    def _regenerar_comida(self):
+        """Reparte la comida del día sobre el campo; con rebrote, la que hay ya rebrotó tick a tick"""
+        if self.comida_pos.rebrote is None:
+            self.comida_pos.cargar_celdas(generar_comida(self.limites, self.porcentaje_comida, self.rng,
+                                                         self.distribucion))
+        self.comida_inicial_dia = len(self.comida_pos)
+
+    @property
+    def terminado(self):
+        """True cuando la población se extinguió o se completaron todos los días"""
+        return self.extinta or self.dia_actual > self.num_dias
+
+    def posiciones_particulas(self):
+        """Arreglos (xs, ys) con la posición de cada partícula, en el orden de `particulas`"""
+        n = len(self.particulas)
+        return (np.fromiter((p.x for p in self.particulas), np.int64, n),
+                np.fromiter((p.y for p in self.particulas), np.int64, n))
+
+    def particula(self, i):
+        """La partícula i de `particulas` (sin armar la lista completa en el motor vectorizado)"""
+        return self.particulas[i]
+
+    def historiales(self):
+        """Retorna (historial_poblacion, historial_tipos, historial_depredadores, historial_estadisticas)"""
+        return self.historial_poblacion, self.historial_tipos, self.historial_depredadores, self.historial_estadisticas
+
+    def step(self):
+        """Avanza un paso del día; al completar la duración del día aplica el cambio de día"""
+        if self.terminado:
+            return False
+
+        self.muertes.clear()
+        if self.paso_actual_dia == 0:
+            self._iniciar_dia()
+
+        if self.comida_pos.rebrote is not None:
+            self.comida_pos.rebrote.avanzar()
+
+        perfilador = self.perfilador
+        if perfilador is None:
+            self._mover_particulas()
+            if self.es_dia_purga:
+                self._mover_depredadores()
+            self._procesar_comida()
+            self._aplicar_reglas_muerte()
+        else:
+            perfilador.medir("movimiento", self._mover_particulas)
+            if self.es_dia_purga:
+                perfilador.medir("depredadores", self._mover_depredadores)
+            perfilador.medir("comida", self._procesar_comida)
+            perfilador.medir("muerte", self._aplicar_reglas_muerte)
+            perfilador.ticks += 1
+        self.paso_actual_dia += 1
+
+        if self.paso_actual_dia >= self.duracion_dia:
+            if perfilador is None:
+                self._cerrar_dia()
+            else:
+                dia = self.dia_actual
+                perfilador.medir("cierre_dia", self._cerrar_dia)
+                perfilador.cerrar_dia(dia)
+                if self.escritor is not None:
+                    self.escritor.escribir("tiempos", self.historial_tiempos[-1])
+            if self.checkpoints is not None:
+                self._checkpoint_periodico()
+        return True
+
+    def run_day(self):
+        """Simula lo que resta del día actual"""
+        dia = self.dia_actual
+        while not self.terminado and self.dia_actual == dia:
+            self.step()
+
+    def run(self, num_dias=None):
+        """Simula num_dias días más (por defecto, hasta el final) o hasta la extinción"""
+        dia_final = self.num_dias if num_dias is None else self.dia_actual + num_dias - 1
+        while not self.terminado and self.dia_actual <= dia_final:
+            self.run_day()
+        return self.historiales()
+
+    def _iniciar_dia(self):
+        """Aparición de depredadores en día de purga y registro de la comida inicial"""
+        if self.frecuencia_purga > 0 and self.dia_actual % self.frecuencia_purga == 0:
+            self.es_dia_purga = True
+            self._retirar_depredadores()
+            for _ in range(self.num_depredadores):
+                x, y = generar_posicion_borde(self.limites, self.aleatorio)
+                self.depredadores.append(self.reserva_depredadores.obtener(x, y, self._largo_trayectoria()))
+        self.comida_inicial_dia = len(self.comida_pos)
+
+    def _construir_indice(self):
+        """Indexa las posiciones actuales de las partículas (una vez por tick en días de purga)"""
+        n = len(self.particulas)
+        self.indice.construir(np.fromiter((p.x for p in self.particulas), np.int32, n),
+                              np.fromiter((p.y for p in self.particulas), np.int32, n))
+        self.indice_vigente = True
+
+    def _mover_particulas(self):
+        """Paso 1: Mover todas las partículas (con evasión de depredadores)"""
+        if not self.es_dia_purga:
+            for particula in self.particulas:
+                if particula.activa and particula.pasos_restantes > 0:
+                    self._mover(particula)
+            return
+
+        # El índice construido tras el movimiento del tick anterior sigue vigente:
+        # las posiciones no cambian entre ese punto y este
+        if not self.indice_vigente:
+            self._construir_indice()
+        # Presas dentro del radio de visión de cada depredador; el primero de la lista tiene prioridad
+        amenazas = {}
+        for depredador in reversed(self.depredadores):
+            if depredador.activo:
+                for i in self.indice.dentro_de_manhattan(depredador.x, depredador.y, RADIO_VISION_PRESA).tolist():
+                    amenazas[i] = depredador
+
+        for i, particula in enumerate(self.particulas):
+            if particula.activa and particula.pasos_restantes > 0:
+                self._mover(particula, amenazas.get(i))
+        self._construir_indice()
+
+    def _mover(self, particula, depredador_cercano=None):
+        """Mueve una partícula y registra si entró o salió de casa"""
+        en_casa = particula.en_casa
+        particula.mover(self.limites, self.aleatorio, depredador_cercano=depredador_cercano)
+        if particula.en_casa != en_casa:
+            if particula.en_casa:
+                self.contadores.entrar_casa()
+            else:
+                self.contadores.salir_casa()
+
+    def _mover_depredadores(self):
+        """Paso 1.5: Mover depredadores y verificar colisiones"""
+        for depredador in self.depredadores:
+            depredador.mover(self.limites, self.particulas, self.aleatorio, self.indice)
+            for particula in depredador.verificar_colision(self.particulas, self.muertes, self.indice):
+                self.contadores.morir(particula.tipo_mutacion)
+
+    def _procesar_comida(self):
+        """Paso 2: Una partícula por posición de comida, según prioridad de mutación"""
+        activas = [p for p in self.particulas if p.activa]
+        n = len(activas)
+        # El campo resuelve el concurso de todas las celdas a la vez
+        ganadores = self.comida_pos.consumir(
+            np.fromiter((p.x for p in activas), np.int64, n),
+            np.fromiter((p.y for p in activas), np.int64, n),
+            np.fromiter((PRIORIDAD_COMIDA[p.tipo_mutacion] for p in activas), np.int8, n),
+            self.rng)
+
+        for i in ganadores.tolist():
+            # El ganador come
+            ganador = activas[i]
+            if not ganador.ha_comido_hoy:
+                self.contadores.comer()
+            ganador.veces_comido += 1
+            ganador.ha_comido_hoy = True
+            ganador.recargar_stamina()
+
+    def _aplicar_reglas_muerte(self):
+        """Paso 3: Manejar muertes por agotamiento y reglas de regreso a casa"""
+        for particula in self.particulas:
+            # Regla 5: Si salió de casa y se quedó sin pasos fuera de casa, muere INMEDIATAMENTE
+            if particula.salio_de_casa and not particula.en_casa and particula.pasos_restantes <= 0 and particula.activa:
+                particula.activa = False
+                particula.debe_morir = True
+                self.muertes.append((particula.x, particula.y))
+                self.contadores.morir(particula.tipo_mutacion)
+
+            # Regla 19: Si regresó a casa y comió, se queda
+            # Regla 10: Si regresó sin comer pero con pasos, debe salir de nuevo
+            elif particula.en_casa and particula.salio_de_casa and particula.activa:
+                if particula.ha_comido_hoy:
+                    # Regla 19: Se queda en casa
+                    particula.activa = False
+                    if particula.veces_comido >= 2:
+                        particula.puede_reproducirse = True
+                    self.contadores.quedarse_en_casa(reproducen=int(particula.puede_reproducirse))
+                elif particula.pasos_restantes > 0:
+                    # Regla 10: Debe salir de nuevo
+                    particula.en_casa = False
+                    self.contadores.salir_casa()
+
+    def _registrar_dia(self):
+        """Registra las estadísticas del día (y de la purga) a partir de los contadores"""
+        c = self.contadores
+        self.dias_cerrados += 1
+        estadisticas = {
+            "dia": self.dia_actual,
+            "poblacion_total": c.total,
+            "comida": self.comida_inicial_dia,
+            "vivas": c.vivas,
+            "en_casa": c.en_casa,
+            "comieron": c.comieron,
+            "pueden_reproducirse": c.pueden_reproducirse,
+            "normales": c.normales,
+            "verdes": c.verdes,
+            "rojos": c.rojos,
+            "depredadores": len(self.depredadores) if self.es_dia_purga else 0
+        }
+        self.historial_estadisticas.append(estadisticas)
+        if self.escritor is not None:
+            self.escritor.escribir("estadisticas", estadisticas)
+        # Registrar estadísticas de depredadores si fue día de purga
+        if self.es_dia_purga:
+            purga = {
+                "dia": self.dia_actual,
+                "num_depredadores": len(self.depredadores),
+                "particulas_eliminadas": c.muertas,
+                "velocidad_eliminadas": c.muertas_por_tipo["mutacion_velocidad"],
+                "prioridad_eliminadas": c.muertas_por_tipo["mutacion_prioridad"],
+                "normal_eliminadas": c.muertas_por_tipo["normal"]
+            }
+            self.historial_depredadores.append(purga)
+            if self.escritor is not None:
+                self.escritor.escribir("depredadores", purga)
+            # Eliminar depredadores al final del día
+            self._retirar_depredadores()
+            self.es_dia_purga = False
+            self.indice_vigente = False
+
+    def _retirar_depredadores(self):
+        """Devuelve los depredadores a su reserva (sin objetivo, para no retener partículas)"""
+        for depredador in self.depredadores:
+            depredador.objetivo = None
+        self.reserva_depredadores.devolver_todas(self.depredadores)
+        self.depredadores.clear()
+
+    def _registrar_poblacion(self):
+        """Registra el tamaño y la composición de la población del día siguiente"""
+        c = self.contadores
+        tipos = {"normal": c.normales, "verde": c.verdes, "rojo": c.rojos}
+        self.historial_poblacion.append(c.total)
+        self.historial_tipos.append(tipos)
+        if self.escritor is not None:
+            self.escritor.escribir("poblacion", {"dia": self.dias_cerrados, "poblacion": c.total, **tipos})
+
+    def _cerrar_dia(self):
+        """Fin de día: estadísticas, supervivencia, reproducción y nueva comida"""
+        particulas = self.particulas
+        self._registrar_dia()
+
+        sobrevivientes = []
+        nuevas_particulas = []
+
+        for particula in particulas:
+            # Regla 3: Sobrevive SI Y SOLO SI comió al menos 1 vez Y regresó a casa
+            # En cualquier otro caso (no comió O no regresó) = muere
+            sobrevive = particula.ha_comido_hoy and particula.en_casa
+
+            if sobrevive:
+                sobrevivientes.append(particula)
+                # Regla 7: Si comió 2+ veces, se reproduce
+                if particula.puede_reproducirse:
+                    # Si comió 2 veces: hijo igual al padre
+                    # Si comió 3+ veces: hijo puede mutar
+                    tipo_hijo = particula.obtener_tipo_hijo(self.aleatorio)
+
+                    # Si el hijo es mutado, aplicar herencia (80% misma mutación, 20% normal)
+                    if tipo_hijo in ["mutacion_velocidad", "mutacion_prioridad"]:
+                        # El hijo nace con la mutación, luego aplicamos herencia
+                        tipo_final = tipo_hijo
+                        # Si el padre es mutado, el hijo puede perder la mutación
+                        if particula.tipo_mutacion in ["mutacion_velocidad", "mutacion_prioridad"]:
+                            if self.aleatorio.random() >= 0.8:  # 20% de perder mutación
+                                tipo_final = "normal"
+                    else:
+                        # Tipo normal
+                        tipo_final = tipo_hijo
+
+                    x, y = generar_posicion_borde(self.limites, self.aleatorio)
+                    hijo = self.reserva_particulas.obtener(x, y, self.pasos_vida, tipo_final,
+                                                           self._largo_trayectoria())
+                    nuevas_particulas.append(hijo)
+            else:
+                self.contadores.quitar(particula.tipo_mutacion)
+                # Solo registrar la muerte si no murió durante el día (Regla 5)
+                if not particula.debe_morir:
+                    self.muertes.append((particula.x, particula.y))
+                # La partícula muerta queda libre para un hijo de este mismo cierre o de los siguientes
+                self.reserva_particulas.devolver(particula)
+
+        for hijo in nuevas_particulas:
+            self.contadores.nacer(hijo.tipo_mutacion)
+        self.contadores.iniciar_dia()
+        self.particulas = sobrevivientes + nuevas_particulas
+        self._registrar_poblacion()
+
+        if len(self.particulas) == 0:
+            self.extinta = True
+            return
+
+        for p in self.particulas:
+            p.reiniciar_dia(self.limites, self.aleatorio)
+
+        self._regenerar_comida()
+
+        self.dia_actual += 1
+        self.paso_actual_dia = 0
+
+
+def crear_parser():
+    """Argumentos del modo batch (mismas claves que la pantalla de configuración)"""
+    parser = argparse.ArgumentParser(description="Simulación de selección natural sin interfaz gráfica")
+    parser.add_argument("--dias", type=int, default=NUM_DIAS, help="Número de días a simular")
+    parser.add_argument("--duracion", type=int, default=DURACION_DIA, help="Duración del día (pasos)")
+    parser.add_argument("--particulas", type=int, default=50, help="Partículas iniciales")
+    parser.add_argument("--comida", type=int, default=PORCENTAJE_COMIDA, help="Comida en el mapa (%%)")
+    parser.add_argument("--pasos", type=int, default=PASOS_POR_VIDA, help="Pasos por vida")
+    parser.add_argument("--depredadores", type=int, default=NUM_DEPREDADORES, help="Depredadores por purga")
+    parser.add_argument("--frecuencia-purga", dest="frecuencia_purga", type=int, default=FRECUENCIA_PURGA,
+                        help="Cada cuántos días aparecen los depredadores (0 = nunca)")
+    parser.add_argument("--distribucion", choices=tuple(DISTRIBUCIONES), default=DISTRIBUCION_COMIDA,
+                        help="Reparto de la comida en el mapa")
+    parser.add_argument("--rebrote", type=int, default=TICKS_REBROTE,
+                        help="Ticks hasta que rebrota cada celda comida (0 = la comida se reparte de nuevo cada día)")
+    parser.add_argument("--modo-rebrote", dest="modo_rebrote", choices=MODOS_REBROTE, default=MODO_REBROTE,
+                        help="fijo: rebrota a los --rebrote ticks; probabilidad: con probabilidad 1/--rebrote por tick")
+    parser.add_argument("--ancho-mundo", dest="ancho_mundo", type=int, default=None,
+                        help=f"Ancho del mundo en celdas (hasta {MAX_CELDAS_MUNDO}; por defecto, el que cabe en la ventana)")
+    parser.add_argument("--alto-mundo", dest="alto_mundo", type=int, default=None,
+                        help=f"Alto del mundo en celdas (hasta {MAX_CELDAS_MUNDO}; por defecto, el que cabe en la ventana)")
+    parser.add_argument("--semilla", type=int, default=None,
+                        help="Semilla de la corrida (misma configuración y semilla = mismo historial)")
+    parser.add_argument("--vectorizado", action="store_true",
+                        help="Usar la población en arreglos de NumPy (MotorVectorizado)")
+    parser.add_argument("--perfilar", action="store_true",
+                        help="Medir el tiempo de cada fase por día (historial_tiempos en la salida)")
+    parser.add_argument("--checkpoint", help="Archivo .npz de checkpoints periódicos (admite {dia} en el nombre)")
+    parser.add_argument("--checkpoint-cada", dest="checkpoint_cada", type=int, default=50,
+                        help="Días entre checkpoints (por defecto 50)")
+    parser.add_argument("--desde", help="Reanudar desde un checkpoint (con --semilla, bifurcar desde él)")
+    parser.add_argument("--historial",
+                        help="Escribir cada registro diario mientras corre (.csv, .jsonl o .parquet; un archivo por tabla)")
+    parser.add_argument("--cola", type=int, default=None,
+                        help="Con --historial, registros que se conservan en memoria (por defecto todos)")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los historiales")
+    parser.add_argument("--graficas", help="Guardar las gráficas de resultados (.png, .svg o .pdf), sin ventana")
+    return parser
+
+
+def main(argv=None):
+    """Modo batch: ejecuta la simulación completa sin abrir ninguna ventana"""
+    args = crear_parser().parse_args(argv)
+    config = {
+        "dias": args.dias,
+        "duracion": args.duracion,
+        "particulas": args.particulas,
+        "comida": args.comida,
+        "pasos": args.pasos,
+        "depredadores": args.depredadores,
+        "frecuencia_purga": args.frecuencia_purga,
+        "distribucion": args.distribucion,
+        "rebrote": args.rebrote,
+        "modo_rebrote": args.modo_rebrote,
+        "ancho_mundo": args.ancho_mundo,
+        "alto_mundo": args.alto_mundo,
+        "semilla": args.semilla
+    }
+
+    clase = SimulationEngine
+    if args.vectorizado:
+        from motor_vectorizado import MotorVectorizado
+        clase = MotorVectorizado
+    if args.desde:
+        from checkpoint import cargar_checkpoint, leer_config
+        # Los parámetros salen del checkpoint; --semilla (si se da) bifurca la corrida
+        config = leer_config(args.desde)
+        if args.semilla is not None:
+            config["semilla"] = args.semilla
+        motor = cargar_checkpoint(args.desde, semilla=args.semilla, clase=clase if args.vectorizado else None)
+        print(f"Reanudando desde {args.desde} (día {motor.dia_actual}, paso {motor.paso_actual_dia})")
+    else:
+        motor = clase.desde_config(config)
+    motor.activar_perfilador(args.perfilar)
+    motor.activar_checkpoints(args.checkpoint, args.checkpoint_cada)
+    escritor = None
+    if args.historial:
+        from sumideros import EscritorHistorial
+        escritor = EscritorHistorial(args.historial)
+        motor.activar_historial(escritor, args.cola)
+    dias_previos = motor.dias_cerrados
+    inicio = time.perf_counter()
+    try:
+        historial_poblacion, historial_tipos, historial_depredadores, historial_estadisticas = motor.run()
+    finally:
+        if escritor is not None:
+            escritor.cerrar()
+    duracion = time.perf_counter() - inicio
+
+    dias_simulados = motor.dias_cerrados - dias_previos
+    print(f"Días simulados: {motor.dias_cerrados}/{config['dias']}"
+          + (" (población extinta)" if motor.extinta else ""))
+    # Con --cola solo queda en memoria el final de la corrida
+    print(f"Población inicial: {motor.num_particulas_inicial}  final: {historial_poblacion[-1]}"
+          + ("" if motor.cola_historial else f"  máxima: {max(historial_poblacion)}"))
+    if escritor is not None:
+        print("Historial escrito en " + ", ".join(escritor.ruta(tabla) for tabla in escritor.sumideros))
+    print(f"Tiempo: {duracion:.2f} s ({dias_simulados / duracion if duracion > 0 else 0:.1f} días/s)")
+    if args.perfilar:
+        print("Tiempo por fase: " + "  ".join(f"{fase} {ms:.0f} ms ({porcentaje:.1f}%)"
+                                              for fase, (ms, porcentaje) in resumen_dias(motor.historial_tiempos).items()
+                                              if ms > 0))
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump({
+                "config": config,
+                "historial_poblacion": list(historial_poblacion),
+                "historial_tipos": list(historial_tipos),
+                "historial_depredadores": list(historial_depredadores),
+                "historial_estadisticas": list(historial_estadisticas),
+                **({"historial_tiempos": list(motor.historial_tiempos)} if args.perfilar else {})
+            }, f, ensure_ascii=False, indent=2)
+        print(f"Historiales guardados en {args.salida}")
+    if args.graficas:
+        from graficas import guardar_graficas
+        guardar_graficas(args.graficas, historial_poblacion, historial_tipos, historial_depredadores)
+        print(f"Gráficas guardadas en {args.graficas}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
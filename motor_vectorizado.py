@@ -0,0 +1,280 @@
+"""
+Variante de SimulationEngine que guarda la población en PoblacionArrays.
+
+Las fases por tick (movimiento, depredadores, comida y reglas de muerte) operan
+sobre arreglos completos en lugar de recorrer objetos Particula, lo que permite
+poblaciones de miles de partículas. Produce los mismos historiales que
+SimulationEngine; `particulas` retorna vistas para el renderer.
+"""
+import numpy as np
+
+from motor_simulacion import (
+    RADIO_VISION_DEPREDADOR, RADIO_VISION_PRESA, RADIO_COLISION, STAMINA_MAXIMA, STAMINA_RECARGA_POR_COMIDA, SimulationEngine
+)
+from poblacion_arrays import (
+    PoblacionArrays, TIPO_NORMAL, TIPO_VELOCIDAD, TIPO_PRIORIDAD, NOMBRES_TIPO
+)
+from movimiento import DIRECCIONES_DX, destinos_depredadores, generar_posiciones_borde, mover_poblacion
+from trayectorias import TrayectoriasPoblacion
+
+# Frames de invulnerabilidad tras recibir daño (ver Particula.recibir_dano)
+FRAMES_INVULNERABILIDAD = 30
+
+
+class MotorVectorizado(SimulationEngine):
+    """SimulationEngine con la población en arreglos de NumPy y fases vectorizadas"""
+
+    @property
+    def particulas(self):
+        """Vistas de solo lectura de cada partícula, con la interfaz de Particula"""
+        return self.poblacion.vistas()
+
+    def posiciones_particulas(self):
+        return self.poblacion.x, self.poblacion.y
+
+    def particula(self, i):
+        return self.poblacion.vista(i)
+
+    def _crear_poblacion_inicial(self):
+        self.poblacion = PoblacionArrays(capacidad=self.num_particulas_inicial)
+        xs, ys = generar_posiciones_borde(self.limites, self.rng, self.num_particulas_inicial)
+        self.poblacion.agregar(xs, ys, TIPO_NORMAL, self.pasos_vida)
+        self._activar_trayectorias_particulas(self._largo_trayectoria())
+
+    def _activar_trayectorias_particulas(self, largo):
+        p = self.poblacion
+        p.trayectorias = TrayectoriasPoblacion(largo, p.x, p.y) if largo else None
+
+    def _posiciones_depredadores(self):
+        activos = [d for d in self.depredadores if d.activo]
+        xs = np.array([d.x for d in activos], dtype=np.int32)
+        ys = np.array([d.y for d in activos], dtype=np.int32)
+        return xs, ys
+
+    def _construir_indice(self):
+        self.indice.construir(self.poblacion.x, self.poblacion.y)
+        self.indice_vigente = True
+
+    def _mover_particulas(self):
+        """Paso 1: Mover todas las partículas en un solo kernel"""
+        p = self.poblacion
+        if not self.es_dia_purga:
+            mover_poblacion(p, self.limites, self.rng, contadores=self.contadores)
+            return
+
+        depredadores_x, depredadores_y = self._posiciones_depredadores()
+        if not self.indice_vigente:
+            self._construir_indice()
+        # Primer depredador (en orden de lista) que ve cada partícula, -1 si ninguno
+        consulta, filas = self.indice.pares_dentro_de_manhattan(depredadores_x, depredadores_y, RADIO_VISION_PRESA,
+                                                                ordenar=False)
+        objetivo = np.full(len(p), len(depredadores_x), dtype=np.int64)
+        np.minimum.at(objetivo, filas, consulta)
+        objetivo[objetivo == len(depredadores_x)] = -1
+        mover_poblacion(p, self.limites, self.rng, depredadores_x, depredadores_y, objetivo, self.contadores)
+        self._construir_indice()
+
+    def _mover_depredadores(self):
+        """
+        Paso 1.5: Mover depredadores y verificar colisiones.
+
+        Equivale a mover los depredadores uno por uno en orden de lista, pero se
+        resuelve en lote. Cada presa recibe a lo sumo un golpe por tick (luego
+        queda invulnerable): el del primer depredador que la alcanza, que se
+        obtiene con np.minimum.at. Un depredador cuya presa muere antes de su
+        turno busca la más cercana entre las que siguen vivas en ese turno; como
+        eso cambia sus golpes, el plan se recalcula hasta que ningún objetivo
+        cambia (cada ronda fija al menos al primer depredador replanteado).
+        El paso al azar de cada depredador se sortea antes, así replantear no
+        consume el generador.
+        """
+        activos = [d for d in self.depredadores if d.activo]
+        if not activos:
+            return
+        p = self.poblacion
+        cantidad = len(activos)
+        # Presas que pueden ser perseguidas o dañadas al empezar el paso, y las que mueren con un golpe
+        vulnerables = p.activa & ~p.en_casa
+        golpeables = vulnerables & (p.invulnerable_frames == 0)
+        letales = golpeables & (p.vida_actual <= 1)
+
+        xs, ys = self._posiciones_depredadores()
+        velocidad = np.array([d.velocidad for d in activos])
+        direccion = self.rng.integers(0, len(DIRECCIONES_DX), cantidad)
+        objetivos = self.indice.mas_cercanos_manhattan(xs, ys, RADIO_VISION_DEPREDADOR, vulnerables)
+        destinos_x, destinos_y = self._destinos_depredadores(xs, ys, objetivos, direccion, velocidad)
+        consulta, filas = self.indice.pares_dentro_de_radio(destinos_x, destinos_y, RADIO_COLISION, ordenar=False)
+
+        replanteados = np.zeros(cantidad, dtype=bool)
+        consultados, muere_consultado = None, None
+        while True:
+            # Primer depredador que golpea cada presa, y el que la mata (cantidad = ninguno)
+            golpe = golpeables[filas]
+            primero = np.full(len(p), cantidad, dtype=np.int64)
+            np.minimum.at(primero, filas[golpe], consulta[golpe])
+            muere_por = np.where(letales, primero, cantidad)
+
+            # Depredadores cuya presa muere antes de su turno, y los ya replanteados (su mejor opción puede cambiar)
+            con_objetivo = np.flatnonzero(objetivos >= 0)
+            revisar = replanteados.copy()
+            revisar[con_objetivo[muere_por[objetivos[con_objetivo]] < con_objetivo]] = True
+            if not revisar.any():
+                break
+            if consultados is not None and not (revisar & ~consultados).any():
+                # Sus objetivos ya se buscaron con muere_consultado: siguen valiendo si ninguna
+                # muerte cambió de turno antes del último de ellos
+                cambio = muere_por != muere_consultado
+                ultimo = np.flatnonzero(revisar)[-1]
+                if not cambio.any() or np.minimum(muere_por[cambio], muere_consultado[cambio]).min() >= ultimo:
+                    break
+            consultados, muere_consultado = revisar, muere_por
+            revisar = np.flatnonzero(revisar)
+            nuevos = self.indice.mas_cercanos_manhattan(xs[revisar], ys[revisar], RADIO_VISION_DEPREDADOR, vulnerables,
+                                                        vence=muere_por, turnos=revisar)
+            cambia = nuevos != objetivos[revisar]
+            if not cambia.any():
+                break
+            cambian = revisar[cambia]
+            replanteados[cambian] = True
+            objetivos[cambian] = nuevos[cambia]
+            destinos_x[cambian], destinos_y[cambian] = self._destinos_depredadores(
+                xs[cambian], ys[cambian], objetivos[cambian], direccion[cambian], velocidad[cambian])
+            consulta_nueva, filas_nuevas = self.indice.pares_dentro_de_radio(destinos_x[cambian], destinos_y[cambian],
+                                                                             RADIO_COLISION, ordenar=False)
+            descartar = np.zeros(cantidad, dtype=bool)
+            descartar[cambian] = True
+            mantener = ~descartar[consulta]
+            consulta = np.concatenate((consulta[mantener], cambian[consulta_nueva]))
+            filas = np.concatenate((filas[mantener], filas_nuevas))
+
+        for depredador, objetivo, x, y in zip(activos, objetivos.tolist(), destinos_x.tolist(), destinos_y.tolist()):
+            depredador.objetivo = objetivo if objetivo >= 0 else None
+            depredador.mover_a(x, y)
+
+        # Colisión: cada presa alcanzada recibe el golpe del primer depredador que llegó a ella
+        golpeadas = np.flatnonzero(primero < cantidad)
+        if not len(golpeadas):
+            return
+        asesino = primero[golpeadas]
+        murio = self._recibir_danos(golpeadas)
+        murieron, asesino = golpeadas[murio], asesino[murio]
+        if len(murieron):
+            orden = np.lexsort((murieron, asesino))
+            murieron, asesino = murieron[orden], asesino[orden]
+            self.muertes.extend(zip(p.x[murieron].tolist(), p.y[murieron].tolist()))
+            for k, eliminadas in zip(*np.unique(asesino, return_counts=True)):
+                activos[k].particulas_eliminadas += int(eliminadas)
+                # Buscar nuevo objetivo
+                activos[k].objetivo = None
+
+    def _destinos_depredadores(self, xs, ys, objetivos, direccion, velocidad):
+        """Destino de cada depredador hacia la fila `objetivos` (-1 = paso al azar en `direccion`)"""
+        p = self.poblacion
+        con_objetivo = objetivos >= 0
+        objetivo_x = np.zeros(len(xs), dtype=np.int64)
+        objetivo_y = np.zeros(len(xs), dtype=np.int64)
+        objetivo_x[con_objetivo] = p.x[objetivos[con_objetivo]]
+        objetivo_y[con_objetivo] = p.y[objetivos[con_objetivo]]
+        return destinos_depredadores(xs, ys, objetivo_x, objetivo_y, con_objetivo, direccion, velocidad, self.limites)
+
+    def _recibir_danos(self, filas):
+        """Equivalente de Particula.recibir_dano sobre filas sin invulnerabilidad; retorna la máscara de las que murieron"""
+        p = self.poblacion
+        p.vida_actual[filas] -= 1
+        p.invulnerable_frames[filas] = FRAMES_INVULNERABILIDAD
+        murio = p.vida_actual[filas] <= 0
+        murieron = filas[murio]
+        p.activa[murieron] = False
+        p.debe_morir[murieron] = True
+        self._contar_muertes(p.tipo[murieron])
+        return murio
+
+    def _procesar_comida(self):
+        """Paso 2: Una partícula por posición de comida, según prioridad de mutación"""
+        p = self.poblacion
+        activas = np.flatnonzero(p.activa)
+        # Los códigos de tipo están ordenados por prioridad para comer
+        ganadores = activas[self.comida_pos.consumir(p.x[activas], p.y[activas], p.tipo[activas], self.rng)]
+        # Los ganadores comen
+        self.contadores.comer(int(np.count_nonzero(~p.ha_comido_hoy[ganadores])))
+        p.veces_comido[ganadores] += 1
+        p.ha_comido_hoy[ganadores] = True
+        p.stamina[ganadores] = np.minimum(STAMINA_MAXIMA, p.stamina[ganadores] + STAMINA_RECARGA_POR_COMIDA)
+
+    def _aplicar_reglas_muerte(self):
+        """Paso 3: Muertes por agotamiento y reglas de regreso a casa, como máscaras"""
+        p = self.poblacion
+        # Regla 5: Si salió de casa y se quedó sin pasos fuera de casa, muere INMEDIATAMENTE
+        agotadas = p.salio_de_casa & ~p.en_casa & (p.pasos_restantes <= 0) & p.activa
+        if agotadas.any():
+            p.activa[agotadas] = False
+            p.debe_morir[agotadas] = True
+            self.muertes.extend(zip(p.x[agotadas].tolist(), p.y[agotadas].tolist()))
+            self._contar_muertes(p.tipo[agotadas])
+
+        regresaron = p.en_casa & p.salio_de_casa & p.activa
+        # Regla 19: Si regresó a casa y comió, se queda
+        se_quedan = regresaron & p.ha_comido_hoy
+        reproducen = se_quedan & (p.veces_comido >= 2)
+        p.activa[se_quedan] = False
+        p.puede_reproducirse[reproducen] = True
+        self.contadores.quedarse_en_casa(int(np.count_nonzero(se_quedan)), int(np.count_nonzero(reproducen)))
+        # Regla 10: Si regresó sin comer pero con pasos, debe salir de nuevo
+        salen = regresaron & ~p.ha_comido_hoy & (p.pasos_restantes > 0)
+        p.en_casa[salen] = False
+        self.contadores.salir_casa(int(np.count_nonzero(salen)))
+
+    def _contar_muertes(self, tipos):
+        """Registra en los contadores las muertes de las filas con los tipos dados"""
+        for codigo, cantidad in enumerate(np.bincount(tipos, minlength=len(NOMBRES_TIPO)).tolist()):
+            if cantidad:
+                self.contadores.morir(NOMBRES_TIPO[codigo], cantidad)
+
+    def _cerrar_dia(self):
+        """Fin de día: estadísticas, supervivencia, reproducción y nueva comida"""
+        p = self.poblacion
+        self._registrar_dia()
+
+        # Regla 3: Sobrevive SI Y SOLO SI comió al menos 1 vez Y regresó a casa
+        sobrevive = p.ha_comido_hoy & p.en_casa
+        # Solo registrar la muerte si no murió durante el día (Regla 5)
+        no_regresaron = ~sobrevive & ~p.debe_morir
+        self.muertes.extend(zip(p.x[no_regresaron].tolist(), p.y[no_regresaron].tolist()))
+
+        # Regla 7: Si comió 2+ veces, se reproduce. Todo el recambio se sortea en lote sobre los arreglos
+        padres = sobrevive & p.puede_reproducirse
+        tipos_padres = p.tipo[padres]
+        cantidad_hijos = len(tipos_padres)
+        # Si comió 3+ veces: hijo puede mutar; si comió 2 veces: hijo igual al padre
+        mutacion = np.where(self.rng.random(cantidad_hijos) < 0.5, TIPO_VELOCIDAD, TIPO_PRIORIDAD).astype(np.int8)
+        tipos_hijos = np.where(p.veces_comido[padres] >= 3, mutacion, tipos_padres)
+        # Si el hijo y el padre son mutados: 20% de perder la mutación
+        pierde = (tipos_hijos != TIPO_NORMAL) & (tipos_padres != TIPO_NORMAL) & (self.rng.random(cantidad_hijos) >= 0.8)
+        tipos_hijos[pierde] = TIPO_NORMAL
+
+        retiradas = np.bincount(p.tipo[~sobrevive], minlength=len(NOMBRES_TIPO)).tolist()
+        nacidas = np.bincount(tipos_hijos, minlength=len(NOMBRES_TIPO)).tolist()
+        for codigo, nombre in enumerate(NOMBRES_TIPO):
+            self.contadores.quitar(nombre, retiradas[codigo])
+            self.contadores.nacer(nombre, nacidas[codigo])
+        self.contadores.iniciar_dia()
+
+        p.compactar(sobrevive)
+        # Las posiciones de los hijos se asignan junto con las de todos al reiniciar el día
+        p.agregar(np.zeros(cantidad_hijos, dtype=np.int32), 0, tipos_hijos, self.pasos_vida)
+        self._registrar_poblacion()
+
+        if len(p) == 0:
+            self.extinta = True
+            return
+
+        # Nueva posición en el borde para cada partícula y reinicio del día
+        p.x[:], p.y[:] = generar_posiciones_borde(self.limites, self.rng, len(p))
+        p.reiniciar_dia()
+        if p.trayectorias is not None:
+            p.trayectorias.reiniciar(p.x, p.y)
+
+        self._regenerar_comida()
+
+        self.dia_actual += 1
+        self.paso_actual_dia = 0
@@ -0,0 +1,167 @@
+"""
+Kernels vectorizados de movimiento sobre PoblacionArrays.
+
+mover_poblacion avanza en una sola llamada a todas las partículas activas con
+pasos restantes, reproduciendo Particula.mover: huida del primer depredador en
+el radio de visión, subpasos de la mutación de velocidad escalados por stamina,
+límites del mundo, alineación al grid y la prueba de casa (esta_en_borde).
+"""
+import numpy as np
+
+from motor_simulacion import TAMANO_PASO, STAMINA_MAXIMA, STAMINA_AGOTAMIENTO, RADIO_VISION_PRESA
+
+# Derecha, Izquierda, Abajo, Arriba (mismo orden que Particula.mover)
+DIRECCIONES_DX = np.array([TAMANO_PASO, -TAMANO_PASO, 0, 0], dtype=np.int32)
+DIRECCIONES_DY = np.array([0, 0, TAMANO_PASO, -TAMANO_PASO], dtype=np.int32)
+
+
+def velocidad_por_stamina(velocidad_base, stamina):
+    """Equivalente vectorizado de Particula.actualizar_velocidad_por_stamina"""
+    proporcion = np.clip(stamina / STAMINA_MAXIMA, 0.0, 1.0)
+    return np.maximum(1, (velocidad_base * proporcion).astype(np.int8))
+
+
+def esta_en_borde(xs, ys, limites):
+    """Máscara de posiciones sobre el borde (casa)"""
+    return ((xs == limites['izq']) | (xs == limites['der']) |
+            (ys == limites['arr']) | (ys == limites['abaj']))
+
+
+def generar_posiciones_borde(limites, rng, cantidad):
+    """Equivalente vectorizado de generar_posicion_borde para `cantidad` partículas a la vez"""
+    borde = rng.integers(0, 4, cantidad)  # 0 izq, 1 der, 2 arr, 3 abaj
+    # Punto de la grilla a lo largo del borde, como randrange(inicio, fin + 1, TAMANO_PASO)
+    pasos_x = (limites['der'] - limites['izq']) // TAMANO_PASO + 1
+    pasos_y = (limites['abaj'] - limites['arr']) // TAMANO_PASO + 1
+    a_lo_largo_x = (limites['izq'] + rng.integers(0, pasos_x, cantidad) * TAMANO_PASO) // TAMANO_PASO * TAMANO_PASO
+    a_lo_largo_y = (limites['arr'] + rng.integers(0, pasos_y, cantidad) * TAMANO_PASO) // TAMANO_PASO * TAMANO_PASO
+    # Primer paso hacia adentro desde el borde elegido
+    xs = np.select([borde == 0, borde == 1], [limites['izq'] + TAMANO_PASO, limites['der'] - TAMANO_PASO],
+                   a_lo_largo_x)
+    ys = np.select([borde == 2, borde == 3], [limites['arr'] + TAMANO_PASO, limites['abaj'] - TAMANO_PASO],
+                   a_lo_largo_y)
+    return xs.astype(np.int32), ys.astype(np.int32)
+
+
+def detectar_depredadores(xs, ys, depredadores_x, depredadores_y):
+    """
+    Índice del primer depredador (en orden de lista) a distancia Manhattan
+    <= RADIO_VISION_PRESA de cada posición, o -1 si ninguno está en rango.
+    """
+    objetivo = np.full(len(xs), -1, dtype=np.int32)
+    # Recorrer en orden inverso para que el primer depredador en rango sobrescriba a los demás
+    for k in range(len(depredadores_x) - 1, -1, -1):
+        en_rango = np.abs(xs - depredadores_x[k]) + np.abs(ys - depredadores_y[k]) <= RADIO_VISION_PRESA
+        objetivo[en_rango] = k
+    return objetivo
+
+
+def vector_huida(xs, ys, depredadores_x, depredadores_y):
+    """Equivalente vectorizado de Particula.calcular_vector_huida"""
+    dx = xs - depredadores_x
+    dy = ys - depredadores_y
+    horizontal = np.abs(dx) > np.abs(dy)
+    paso_x = np.where(horizontal, np.where(dx > 0, TAMANO_PASO, -TAMANO_PASO), 0)
+    paso_y = np.where(horizontal, 0, np.where(dy > 0, TAMANO_PASO, -TAMANO_PASO))
+    return paso_x, paso_y
+
+
+def destinos_depredadores(xs, ys, objetivo_x, objetivo_y, con_objetivo, direccion, velocidad, limites):
+    """
+    Equivalente vectorizado de Depredador.calcular_destino: un paso de
+    `velocidad` celdas hacia el objetivo por el eje de mayor diferencia, o donde
+    no hay objetivo un paso en la dirección al azar `direccion` (0..3, mismo
+    orden que DIRECCIONES_DX/DIRECCIONES_DY).
+    """
+    dx = objetivo_x - xs
+    dy = objetivo_y - ys
+    horizontal = np.abs(dx) > np.abs(dy)
+    paso = TAMANO_PASO * velocidad
+    paso_x = np.where(con_objetivo, np.where(horizontal, np.where(dx > 0, paso, -paso), 0), DIRECCIONES_DX[direccion])
+    paso_y = np.where(con_objetivo, np.where(horizontal, 0, np.where(dy > 0, paso, -paso)), DIRECCIONES_DY[direccion])
+    return (np.clip(xs + paso_x, limites['izq'], limites['der']).astype(np.int32),
+            np.clip(ys + paso_y, limites['arr'], limites['abaj']).astype(np.int32))
+
+
+def mover_poblacion(poblacion, limites, rng, depredadores_x=None, depredadores_y=None, objetivo=None,
+                    contadores=None):
+    """
+    Mueve de una vez a todas las partículas activas con pasos restantes.
+
+    depredadores_x/depredadores_y son las posiciones de los depredadores activos
+    (solo en día de purga). Si se pasa `objetivo` (índice de depredador por
+    partícula, -1 sin amenaza) se usa en lugar de la búsqueda por fuerza bruta.
+    Si se pasan `contadores` (ContadoresPoblacion) se actualiza el conteo en casa.
+    Retorna los índices de las partículas que se movieron.
+    """
+    p = poblacion
+    indices = np.flatnonzero(p.activa & (p.pasos_restantes > 0))
+    if len(indices) == 0:
+        return indices
+
+    # Actualizar invulnerabilidad
+    invulnerables = indices[p.invulnerable_frames[indices] > 0]
+    p.invulnerable_frames[invulnerables] -= 1
+
+    # Detectar depredadores cercanos
+    amenaza = None
+    if depredadores_x is not None and len(depredadores_x) > 0:
+        if objetivo is None:
+            objetivo = detectar_depredadores(p.x[indices], p.y[indices], depredadores_x, depredadores_y)
+        else:
+            objetivo = objetivo[indices]
+        amenaza = objetivo
+        p.huyendo[indices] = objetivo >= 0
+    else:
+        p.huyendo[indices] = False
+
+    # Velocidad según stamina al inicio del tick: número de subpasos de cada partícula
+    subpasos = velocidad_por_stamina(p.velocidad_base[indices], p.stamina[indices])
+    p.velocidad[indices] = subpasos
+
+    for subpaso in range(int(subpasos.max())):
+        seleccion = (subpasos > subpaso) & (p.pasos_restantes[indices] > 0)
+        filas = indices[seleccion]
+        if len(filas) == 0:
+            break
+        xs = p.x[filas]
+        ys = p.y[filas]
+
+        direcciones = rng.integers(0, 4, size=len(filas))
+        dx = DIRECCIONES_DX[direcciones]
+        dy = DIRECCIONES_DY[direcciones]
+
+        # Si hay un depredador cercano, huir
+        if amenaza is not None:
+            amenaza_filas = amenaza[seleccion]
+            huyen = amenaza_filas >= 0
+            if huyen.any():
+                k = amenaza_filas[huyen]
+                dx[huyen], dy[huyen] = vector_huida(xs[huyen], ys[huyen], depredadores_x[k], depredadores_y[k])
+
+        nuevo_x = np.clip(xs + dx, limites['izq'], limites['der'])
+        nuevo_y = np.clip(ys + dy, limites['arr'], limites['abaj'])
+        # Alinear al grid
+        nuevo_x = (nuevo_x // TAMANO_PASO) * TAMANO_PASO
+        nuevo_y = (nuevo_y // TAMANO_PASO) * TAMANO_PASO
+
+        p.x[filas] = nuevo_x
+        p.y[filas] = nuevo_y
+        if p.trayectorias is not None:
+            p.trayectorias.registrar(filas, nuevo_x, nuevo_y)
+        p.pasos_restantes[filas] -= 1
+
+        # Agotar stamina por cada paso realizado fuera de casa
+        fuera = filas[~p.en_casa[filas]]
+        p.stamina[fuera] = np.maximum(0, p.stamina[fuera] - STAMINA_AGOTAMIENTO)
+        p.velocidad[fuera] = velocidad_por_stamina(p.velocidad_base[fuera], p.stamina[fuera])
+
+        # Verificar si está en casa
+        en_casa = esta_en_borde(nuevo_x, nuevo_y, limites)
+        if contadores is not None:
+            # Cambio neto: las que entraron menos las que salieron
+            contadores.entrar_casa(int(np.count_nonzero(en_casa)) - int(np.count_nonzero(p.en_casa[filas])))
+        p.en_casa[filas] = en_casa
+        p.salio_de_casa[filas[~en_casa]] = True
+
+    return indices
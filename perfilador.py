@@ -0,0 +1,70 @@
+"""
+Temporizadores por fase del bucle de simulación (perf_counter_ns).
+
+El motor mide cada fase del tick (Paso 1, 1.5, 2, 3 y el cierre del día) y la
+interfaz agrega el dibujo y la espera de reloj.tick. Los tiempos se acumulan
+por cuadro, para una ventana móvil que muestra el overlay, y por día, para el
+registro historial_tiempos que acompaña a historial_estadisticas. Con el
+perfilador desactivado (None) el motor no toma ningún tiempo.
+"""
+import time
+from collections import deque
+
+import numpy as np
+
+FASES = ("movimiento", "depredadores", "comida", "muerte", "cierre_dia", "dibujo", "espera")
+VENTANA_CUADROS = 120  # Cuadros de la ventana móvil del overlay (~2 s a 60 FPS)
+
+
+class Perfilador:
+    """Tiempo acumulado por fase, por cuadro y por día"""
+
+    def __init__(self, historial, ventana=VENTANA_CUADROS):
+        # Lista del motor donde se agrega un registro por día cerrado
+        self.historial = historial
+        self.ticks = 0
+        self._dia = dict.fromkeys(FASES, 0)
+        self._cuadro = dict.fromkeys(FASES, 0)
+        self._ventanas = {fase: deque(maxlen=ventana) for fase in FASES}
+
+    def medir(self, fase, funcion):
+        """Ejecuta funcion() sumando su duración a la fase"""
+        inicio = time.perf_counter_ns()
+        funcion()
+        self.agregar(fase, time.perf_counter_ns() - inicio)
+
+    def agregar(self, fase, nanosegundos):
+        self._dia[fase] += nanosegundos
+        self._cuadro[fase] += nanosegundos
+
+    def cerrar_cuadro(self):
+        """Pasa los tiempos del cuadro dibujado a la ventana móvil"""
+        for fase, nanosegundos in self._cuadro.items():
+            self._ventanas[fase].append(nanosegundos)
+            self._cuadro[fase] = 0
+
+    def cerrar_dia(self, dia):
+        """Registra los milisegundos por fase del día y empieza el siguiente"""
+        registro = {"dia": dia, "ticks": self.ticks}
+        registro.update((f"{fase}_ms", round(nanosegundos / 1e6, 3)) for fase, nanosegundos in self._dia.items())
+        self.historial.append(registro)
+        self._dia = dict.fromkeys(FASES, 0)
+        self.ticks = 0
+
+    def resumen(self):
+        """(fase, media, p50, p95 en ms por cuadro, % del total) de la ventana móvil"""
+        filas = []
+        for fase, ventana in self._ventanas.items():
+            if ventana:
+                ms = np.fromiter(ventana, dtype=np.float64, count=len(ventana)) / 1e6
+                p50, p95 = np.percentile(ms, (50, 95))
+                filas.append((fase, ms.mean(), p50, p95))
+        total = sum(media for _, media, _, _ in filas) or 1.0
+        return [(fase, media, p50, p95, 100 * media / total) for fase, media, p50, p95 in filas]
+
+
+def resumen_dias(historial):
+    """Total de milisegundos por fase y su porcentaje, sumando todos los días de historial"""
+    totales = {fase: sum(registro[f"{fase}_ms"] for registro in historial) for fase in FASES}
+    total = sum(totales.values()) or 1.0
+    return {fase: (ms, 100 * ms / total) for fase, ms in totales.items()}
@@ -0,0 +1,277 @@
+"""
+Almacenamiento de la población como arreglos paralelos de NumPy (struct-of-arrays).
+
+Cada campo de Particula es un arreglo de longitud len(poblacion) y el tipo de
+mutación se guarda como un entero (TIPO_NORMAL, TIPO_VELOCIDAD, TIPO_PRIORIDAD)
+en lugar de un string, de modo que cada fase puede operar sobre toda la
+población con operaciones vectorizadas. VistaParticula expone una fila con la
+misma interfaz que Particula para que el renderer pueda dibujarla.
+"""
+import numpy as np
+
+from motor_simulacion import (
+    STAMINA_MAXIMA, COLOR_NORMAL, COLOR_MUTACION_VELOCIDAD, COLOR_MUTACION_PRIORIDAD, Particula
+)
+
+# Códigos enteros de los tipos de mutación
+TIPO_NORMAL = 0
+TIPO_VELOCIDAD = 1
+TIPO_PRIORIDAD = 2
+
+NOMBRES_TIPO = ("normal", "mutacion_velocidad", "mutacion_prioridad")
+CODIGO_TIPO = {nombre: codigo for codigo, nombre in enumerate(NOMBRES_TIPO)}
+COLORES_TIPO = (COLOR_NORMAL, COLOR_MUTACION_VELOCIDAD, COLOR_MUTACION_PRIORIDAD)
+
+# Velocidad base y vida máxima indexadas por código de tipo
+VELOCIDAD_BASE_TIPO = np.array([1, 2, 1], dtype=np.int8)
+VIDA_MAXIMA_TIPO = np.array([1, 1, 2], dtype=np.int8)
+
+# Campos de la población y su dtype
+CAMPOS = (
+    ("x", np.int32),
+    ("y", np.int32),
+    ("pos_inicial_x", np.int32),
+    ("pos_inicial_y", np.int32),
+    ("tipo", np.int8),
+    ("velocidad_base", np.int8),
+    ("velocidad", np.int8),
+    ("pasos_vida", np.int32),
+    ("pasos_restantes", np.int32),
+    ("activa", np.bool_),
+    ("en_casa", np.bool_),
+    ("veces_comido", np.int16),
+    ("ha_comido_hoy", np.bool_),
+    ("salio_de_casa", np.bool_),
+    ("debe_morir", np.bool_),
+    ("puede_reproducirse", np.bool_),
+    ("stamina", np.float64),
+    ("vida_maxima", np.int8),
+    ("vida_actual", np.int8),
+    ("invulnerable_frames", np.int16),
+    ("huyendo", np.bool_),
+)
+NOMBRES_CAMPOS = tuple(nombre for nombre, _ in CAMPOS)
+
+CAPACIDAD_MINIMA = 64
+
+
+class PoblacionArrays:
+    """
+    Población de partículas guardada como arreglos paralelos.
+
+    Los atributos con el nombre de cada campo (x, y, stamina, activa, ...) son
+    vistas de longitud len(self) sobre buffers con capacidad de reserva; se
+    vuelven a crear al agregar o compactar, por lo que no deben guardarse
+    entre llamadas a agregar()/compactar().
+    """
+
+    def __init__(self, capacidad=CAPACIDAD_MINIMA):
+        self.n = 0
+        # TrayectoriasPoblacion mientras se registran las trayectorias, None si no
+        self.trayectorias = None
+        self._buffers = {nombre: np.zeros(max(capacidad, 1), dtype=dtype) for nombre, dtype in CAMPOS}
+        self._actualizar_vistas()
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def capacidad(self):
+        return len(self._buffers["x"])
+
+    def _actualizar_vistas(self):
+        for nombre in NOMBRES_CAMPOS:
+            setattr(self, nombre, self._buffers[nombre][:self.n])
+
+    def _reservar(self, capacidad):
+        """Garantiza espacio para al menos `capacidad` partículas (crecimiento geométrico)"""
+        if capacidad <= self.capacidad:
+            return
+        nueva = max(capacidad, 2 * self.capacidad, CAPACIDAD_MINIMA)
+        for nombre, dtype in CAMPOS:
+            buffer = np.zeros(nueva, dtype=dtype)
+            buffer[:self.n] = self._buffers[nombre][:self.n]
+            self._buffers[nombre] = buffer
+
+    def agregar(self, xs, ys, tipos, pasos_vida):
+        """Agrega un lote de partículas nuevas (en casa, con stamina y vida máximas)"""
+        xs = np.asarray(xs, dtype=np.int32)
+        cantidad = len(xs)
+        if cantidad == 0:
+            return
+        inicio = self.n
+        self._reservar(inicio + cantidad)
+        self.n = inicio + cantidad
+        self._actualizar_vistas()
+
+        nuevos = slice(inicio, self.n)
+        tipos = np.broadcast_to(np.asarray(tipos, dtype=np.int8), (cantidad,))
+        self.x[nuevos] = xs
+        self.y[nuevos] = ys
+        self.tipo[nuevos] = tipos
+        self.velocidad_base[nuevos] = VELOCIDAD_BASE_TIPO[tipos]
+        self.vida_maxima[nuevos] = VIDA_MAXIMA_TIPO[tipos]
+        self.pasos_vida[nuevos] = pasos_vida
+        self.reiniciar_dia(nuevos)
+
+    def reiniciar_dia(self, filas=slice(None)):
+        """Equivalente vectorizado de Particula.reiniciar_dia, sin cambiar la posición"""
+        self.pos_inicial_x[filas] = self.x[filas]
+        self.pos_inicial_y[filas] = self.y[filas]
+        self.pasos_restantes[filas] = self.pasos_vida[filas]
+        self.en_casa[filas] = True
+        self.veces_comido[filas] = 0
+        self.ha_comido_hoy[filas] = False
+        self.salio_de_casa[filas] = False
+        self.activa[filas] = True
+        self.debe_morir[filas] = False
+        self.puede_reproducirse[filas] = False
+        self.stamina[filas] = STAMINA_MAXIMA
+        self.velocidad[filas] = self.velocidad_base[filas]
+        self.vida_actual[filas] = self.vida_maxima[filas]
+        self.invulnerable_frames[filas] = 0
+        self.huyendo[filas] = False
+
+    def compactar(self, mascara):
+        """Conserva solo las filas donde mascara es True, preservando el orden"""
+        indices = np.flatnonzero(mascara)
+        cantidad = len(indices)
+        for nombre in NOMBRES_CAMPOS:
+            buffer = self._buffers[nombre]
+            buffer[:cantidad] = buffer[:self.n][indices]
+        self.n = cantidad
+        self._actualizar_vistas()
+
+    def contar_tipos(self):
+        """Cantidad de partículas por código de tipo: [normales, verdes, rojos]"""
+        return np.bincount(self.tipo, minlength=len(NOMBRES_TIPO))
+
+    @classmethod
+    def desde_particulas(cls, particulas):
+        """Copia una lista de Particula a arreglos"""
+        poblacion = cls(capacidad=len(particulas))
+        poblacion.n = len(particulas)
+        poblacion._actualizar_vistas()
+        for i, p in enumerate(particulas):
+            poblacion.x[i] = p.x
+            poblacion.y[i] = p.y
+            poblacion.pos_inicial_x[i], poblacion.pos_inicial_y[i] = p.pos_inicial
+            poblacion.tipo[i] = CODIGO_TIPO[p.tipo_mutacion]
+            poblacion.velocidad_base[i] = p.velocidad_base
+            poblacion.velocidad[i] = p.velocidad
+            poblacion.pasos_vida[i] = p.pasos_vida
+            poblacion.pasos_restantes[i] = p.pasos_restantes
+            poblacion.activa[i] = p.activa
+            poblacion.en_casa[i] = p.en_casa
+            poblacion.veces_comido[i] = p.veces_comido
+            poblacion.ha_comido_hoy[i] = p.ha_comido_hoy
+            poblacion.salio_de_casa[i] = p.salio_de_casa
+            poblacion.debe_morir[i] = p.debe_morir
+            poblacion.puede_reproducirse[i] = p.puede_reproducirse
+            poblacion.stamina[i] = p.stamina
+            poblacion.vida_maxima[i] = p.vida_maxima
+            poblacion.vida_actual[i] = p.vida_actual
+            poblacion.invulnerable_frames[i] = p.invulnerable_frames
+            poblacion.huyendo[i] = p.huyendo
+        return poblacion
+
+    def a_particulas(self):
+        """Crea objetos Particula independientes con el estado actual de cada fila"""
+        particulas = []
+        for i in range(self.n):
+            p = Particula(int(self.x[i]), int(self.y[i]), int(self.pasos_vida[i]),
+                          tipo_mutacion=NOMBRES_TIPO[self.tipo[i]])
+            p.pos_inicial = (int(self.pos_inicial_x[i]), int(self.pos_inicial_y[i]))
+            p.velocidad = int(self.velocidad[i])
+            p.pasos_restantes = int(self.pasos_restantes[i])
+            p.activa = bool(self.activa[i])
+            p.en_casa = bool(self.en_casa[i])
+            p.veces_comido = int(self.veces_comido[i])
+            p.ha_comido_hoy = bool(self.ha_comido_hoy[i])
+            p.salio_de_casa = bool(self.salio_de_casa[i])
+            p.debe_morir = bool(self.debe_morir[i])
+            p.puede_reproducirse = bool(self.puede_reproducirse[i])
+            p.stamina = float(self.stamina[i])
+            p.vida_actual = int(self.vida_actual[i])
+            p.invulnerable_frames = int(self.invulnerable_frames[i])
+            p.huyendo = bool(self.huyendo[i])
+            particulas.append(p)
+        return particulas
+
+    def vista(self, i):
+        return VistaParticula(self, i)
+
+    def vistas(self):
+        """Una VistaParticula por fila, para el renderer"""
+        return [VistaParticula(self, i) for i in range(self.n)]
+
+
+class VistaParticula:
+    """
+    Vista de solo lectura de una fila de PoblacionArrays con la interfaz de Particula.
+
+    Solo es válida hasta la siguiente llamada a agregar()/compactar() de la población.
+    """
+
+    __slots__ = ("_poblacion", "_i")
+
+    def __init__(self, poblacion, i):
+        self._poblacion = poblacion
+        self._i = i
+
+    @property
+    def x(self):
+        return int(self._poblacion.x[self._i])
+
+    @property
+    def y(self):
+        return int(self._poblacion.y[self._i])
+
+    @property
+    def tipo_mutacion(self):
+        return NOMBRES_TIPO[self._poblacion.tipo[self._i]]
+
+    @property
+    def color(self):
+        return COLORES_TIPO[self._poblacion.tipo[self._i]]
+
+    @property
+    def trayectoria(self):
+        trayectorias = self._poblacion.trayectorias
+        return None if trayectorias is None else trayectorias.fila(self._i)
+
+    @property
+    def stamina(self):
+        return float(self._poblacion.stamina[self._i])
+
+    @property
+    def activa(self):
+        return bool(self._poblacion.activa[self._i])
+
+    @property
+    def en_casa(self):
+        return bool(self._poblacion.en_casa[self._i])
+
+    @property
+    def huyendo(self):
+        return bool(self._poblacion.huyendo[self._i])
+
+    @property
+    def debe_morir(self):
+        return bool(self._poblacion.debe_morir[self._i])
+
+    @property
+    def ha_comido_hoy(self):
+        return bool(self._poblacion.ha_comido_hoy[self._i])
+
+    @property
+    def puede_reproducirse(self):
+        return bool(self._poblacion.puede_reproducirse[self._i])
+
+    @property
+    def pasos_restantes(self):
+        return int(self._poblacion.pasos_restantes[self._i])
+
+    @property
+    def veces_comido(self):
+        return int(self._poblacion.veces_comido[self._i])
@@ -0,0 +1,199 @@
+"""
+Escritura en streaming de los historiales de una corrida.
+
+Cada registro diario (estadísticas, purga, población por tipo, tiempos por
+fase) se envía a un sumidero en cuanto el motor lo produce, en lugar de
+esperar al final de la corrida. Los sumideros agrupan las filas en lotes y
+las escriben al archivo al completar cada lote:
+
+- CSV y JSON Lines: cada lote se agrega al final del archivo y se vacía al
+  disco, así otras herramientas pueden leer el archivo mientras la corrida sigue.
+- Parquet (requiere pyarrow): cada lote es un grupo de filas; el archivo es
+  legible al cerrarse.
+
+El formato se elige por la extensión de la ruta:
+
+    escritor = EscritorHistorial("corrida.csv")   # corrida_estadisticas.csv, ...
+    motor.activar_historial(escritor, cola=100)
+    motor.run()
+    escritor.cerrar()
+"""
+import csv
+import json
+import os
+
+FILAS_POR_LOTE = 64
+# Tablas que produce el motor (ver SimulationEngine.activar_historial)
+TABLAS = ("poblacion", "estadisticas", "depredadores", "tiempos")
+
+
+class Sumidero:
+    """Acumula filas (dicts con las mismas claves) y las escribe por lotes en `ruta`"""
+
+    def __init__(self, ruta, filas_por_lote=FILAS_POR_LOTE):
+        self.ruta = ruta
+        self.filas_por_lote = filas_por_lote
+        self.filas_escritas = 0
+        self._pendientes = []
+
+    def escribir(self, fila):
+        self._pendientes.append(fila)
+        if len(self._pendientes) >= self.filas_por_lote:
+            self.vaciar()
+
+    def escribir_filas(self, filas):
+        for fila in filas:
+            self.escribir(fila)
+
+    def vaciar(self):
+        """Escribe las filas pendientes aunque el lote no esté completo"""
+        if self._pendientes:
+            self._escribir_lote(self._pendientes)
+            self.filas_escritas += len(self._pendientes)
+            self._pendientes = []
+
+    def cerrar(self):
+        self.vaciar()
+        self._cerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def _escribir_lote(self, filas):
+        raise NotImplementedError
+
+    def _cerrar(self):
+        pass
+
+
+class SumideroTexto(Sumidero):
+    """Base de los formatos de texto: el archivo se abre con el primer lote y se vacía tras cada uno"""
+
+    def __init__(self, ruta, filas_por_lote=FILAS_POR_LOTE):
+        super().__init__(ruta, filas_por_lote)
+        self._archivo = None
+
+    def _escribir_lote(self, filas):
+        if self._archivo is None:
+            self._archivo = open(self.ruta, "w", newline="", encoding="utf-8")
+            self._abrir(filas[0])
+        self._escribir_filas(filas)
+        self._archivo.flush()
+
+    def _cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+    def _abrir(self, primera_fila):
+        pass
+
+    def _escribir_filas(self, filas):
+        raise NotImplementedError
+
+
+class SumideroCSV(SumideroTexto):
+    """Una columna por clave; la cabecera sale de la primera fila"""
+
+    def _abrir(self, primera_fila):
+        self._escritor = csv.DictWriter(self._archivo, fieldnames=list(primera_fila))
+        self._escritor.writeheader()
+
+    def _escribir_filas(self, filas):
+        self._escritor.writerows(filas)
+
+
+class SumideroJSONL(SumideroTexto):
+    """Un objeto JSON por línea"""
+
+    def _escribir_filas(self, filas):
+        self._archivo.writelines(json.dumps(fila, ensure_ascii=False) + "\n" for fila in filas)
+
+
+class SumideroParquet(Sumidero):
+    """Un grupo de filas por lote; el esquema sale del primer lote"""
+
+    def __init__(self, ruta, filas_por_lote=FILAS_POR_LOTE):
+        super().__init__(ruta, filas_por_lote)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ImportError("Los historiales en Parquet requieren pyarrow (pip install pyarrow)") from error
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._escritor = None
+
+    def _escribir_lote(self, filas):
+        if self._escritor is None:
+            tabla = self._pa.Table.from_pylist(filas)
+            self._escritor = self._pq.ParquetWriter(self.ruta, tabla.schema)
+        else:
+            tabla = self._pa.Table.from_pylist(filas, schema=self._escritor.schema)
+        self._escritor.write_table(tabla)
+
+    def _cerrar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+            self._escritor = None
+
+
+FORMATOS = {".csv": SumideroCSV, ".jsonl": SumideroJSONL, ".parquet": SumideroParquet}
+
+
+def crear_sumidero(ruta, filas_por_lote=FILAS_POR_LOTE):
+    """Sumidero del formato que indica la extensión de `ruta` (.csv, .jsonl o .parquet)"""
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in FORMATOS:
+        raise ValueError(f"Formato de historial desconocido: '{extension}' (use {', '.join(FORMATOS)})")
+    return FORMATOS[extension](ruta, filas_por_lote)
+
+
+class EscritorHistorial:
+    """
+    Un sumidero por tabla de la corrida, creado con la primera fila de esa
+    tabla: "corrida.csv" produce corrida_estadisticas.csv, corrida_poblacion.csv, ...
+    Tras nueva_corrida() los archivos llevan el número de corrida
+    (corrida_2_estadisticas.csv, ...), así un reinicio no repite días en el mismo archivo.
+    """
+
+    def __init__(self, ruta, filas_por_lote=FILAS_POR_LOTE):
+        self.base, self.extension = os.path.splitext(ruta)
+        if self.extension.lower() not in FORMATOS:
+            raise ValueError(f"Formato de historial desconocido: '{self.extension}' (use {', '.join(FORMATOS)})")
+        self.filas_por_lote = filas_por_lote
+        self.corrida = 1
+        self.sumideros = {}
+
+    def ruta(self, tabla):
+        sufijo = f"_{self.corrida}" if self.corrida > 1 else ""
+        return f"{self.base}{sufijo}_{tabla}{self.extension}"
+
+    def nueva_corrida(self):
+        """Cierra los archivos de la corrida actual; las filas siguientes van a archivos nuevos"""
+        self.cerrar()
+        self.sumideros = {}
+        self.corrida += 1
+
+    def escribir(self, tabla, fila):
+        sumidero = self.sumideros.get(tabla)
+        if sumidero is None:
+            sumidero = self.sumideros[tabla] = crear_sumidero(self.ruta(tabla), self.filas_por_lote)
+        sumidero.escribir(fila)
+
+    def vaciar(self):
+        for sumidero in self.sumideros.values():
+            sumidero.vaciar()
+
+    def cerrar(self):
+        for sumidero in self.sumideros.values():
+            sumidero.cerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
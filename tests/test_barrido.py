@@ -0,0 +1,69 @@
+import csv
+
+import pytest
+
+from barrido import (crear_parser, ejecutar_barrido, ejecutar_corrida, expandir_rejilla, main, semilla_corrida,
+                     tabla_resultados)
+from motor_simulacion import CONFIG_POR_DEFECTO
+
+BASE = dict(CONFIG_POR_DEFECTO, dias=3, particulas=20, duracion=120, pasos=60, ancho_mundo=12, alto_mundo=12)
+
+
+def test_expandir_rejilla_es_el_producto_cartesiano():
+    configs = expandir_rejilla({"comida": [10, 20], "pasos": [50, 60, 70]}, base=BASE)
+    assert len(configs) == 6
+    assert [(c["comida"], c["pasos"]) for c in configs[:3]] == [(10, 50), (10, 60), (10, 70)]
+    assert all(c["particulas"] == 20 for c in configs)
+
+
+def test_barrido_en_paralelo_da_lo_mismo_que_en_serie():
+    configs = expandir_rejilla({"comida": [10, 30], "semilla": [1, 2]}, base=BASE)
+    avisos = []
+    resultados = ejecutar_barrido(configs, procesos=2, progreso=lambda hechas, total, i, r: avisos.append(i))
+    assert sorted(avisos) == [0, 1, 2, 3]
+    for i, (config, resultado) in enumerate(zip(configs, resultados)):
+        assert resultado["config"] == config
+        assert resultado["spawn_key"] == [i, 0]
+        en_serie = ejecutar_corrida(config, semilla=semilla_corrida(config["semilla"], i))
+        assert list(resultado["historial_poblacion"]) == list(en_serie["historial_poblacion"])
+
+    filas = tabla_resultados(resultados)
+    assert len(filas) == sum(len(r["historial_estadisticas"]) for r in resultados)
+    assert {"corrida", "replica", "spawn_key", "comida", "comida_dia", "particulas_eliminadas"} <= set(filas[0])
+
+
+def test_cada_configuracion_y_replica_tiene_su_flujo():
+    # Dos configuraciones iguales en la rejilla no repiten la corrida, y el barrido se repite con la misma semilla
+    configs = [dict(BASE, semilla=5), dict(BASE, semilla=5)]
+    historiales = [[list(r["historial_poblacion"]) for r in ejecutar_barrido(configs, procesos=2, replicas=2)]
+                   for _ in range(2)]
+    assert historiales[0] == historiales[1]
+    assert len({str(h) for h in historiales[0]}) == 4
+
+
+def test_sin_semilla_el_barrido_elige_una_comun():
+    resultados = ejecutar_barrido([BASE, BASE], procesos=1)
+    semillas = {r["config"]["semilla"] for r in resultados}
+    assert len(semillas) == 1 and None not in semillas
+    # La semilla y el spawn_key de la fila bastan para repetir la corrida
+    resultado = resultados[1]
+    repetida = ejecutar_corrida(BASE, semilla=semilla_corrida(resultado["config"]["semilla"], *resultado["spawn_key"]))
+    assert list(repetida["historial_poblacion"]) == list(resultado["historial_poblacion"])
+
+
+def test_main_escribe_una_fila_por_corrida_y_dia(tmp_path):
+    salida = tmp_path / "barrido.csv"
+    assert main(["--dias", "2", "--particulas", "15", "--comida", "10", "20", "--semilla", "3",
+                 "--ancho-mundo", "10", "--alto-mundo", "10", "--procesos", "2", "--salida", str(salida)]) == 0
+    with open(salida, newline="", encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    assert sorted({fila["comida"] for fila in filas}) == ["10", "20"]
+    assert all(fila["dia"] in ("1", "2") for fila in filas)
+    assert {(fila["semilla"], fila["spawn_key"]) for fila in filas} == {("3", "[0, 0]"), ("3", "[1, 0]")}
+
+
+def test_opciones_sin_valor_por_defecto_quedan_fuera_de_la_rejilla():
+    args = crear_parser().parse_args(["--semilla", "4", "7", "--ancho-mundo", "15"])
+    assert (args.semilla, args.ancho_mundo, args.alto_mundo) == ([4, 7], [15], None)
+    with pytest.raises(SystemExit):
+        crear_parser().parse_args(["--alto-mundo", "grande"])
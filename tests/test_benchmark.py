@@ -0,0 +1,48 @@
+from benchmark import MAX_PARTICULAS_OBJETOS, combinaciones_macro, comparar, importaciones_prohibidas
+
+
+def resultados(micro_ms, importacion_ms, ticks, particulas=1000):
+    return {"particulas_micro": particulas,
+            "micro": {"mover_particulas": {"mediana_ms": micro_ms}},
+            "importacion": {"motor_simulacion": {"mediana_ms": importacion_ms}},
+            "macro": {"vectorizado/n=1000": {"ticks_por_segundo": ticks}}}
+
+
+def test_sin_regresiones_dentro_del_umbral():
+    base = resultados(10.0, 100.0, 500.0)
+    assert comparar(resultados(10.9, 124.0, 460.0), base) == []
+    # Mejorar nunca es una regresión
+    assert comparar(resultados(1.0, 10.0, 5000.0), base) == []
+
+
+def test_regresiones_por_categoria():
+    base = resultados(10.0, 100.0, 500.0)
+    regresiones = comparar(resultados(12.0, 130.0, 400.0), base)
+    assert [(metrica, round(cambio)) for metrica, _, _, cambio in regresiones] == [
+        ("micro/mover_particulas (ms)", 20), ("importacion/motor_simulacion (ms)", 30),
+        ("macro/vectorizado/n=1000 (ticks/s)", 20)]
+
+
+def test_micro_solo_con_la_misma_poblacion():
+    base = resultados(10.0, 100.0, 500.0)
+    regresiones = comparar(resultados(50.0, 100.0, 500.0, particulas=5000), base)
+    assert regresiones == []
+
+
+def test_metricas_nuevas_sin_referencia():
+    assert comparar(resultados(10.0, 100.0, 500.0), {}) == []
+
+
+def test_importaciones_prohibidas():
+    importaciones = {"motor_simulacion": {"matplotlib": False, "pygame_iniciado": False},
+                     "SRW_Natural_Selection": {"matplotlib": True, "pygame_iniciado": True}}
+    assert importaciones_prohibidas(importaciones) == [("SRW_Natural_Selection", "importa matplotlib"),
+                                                      ("SRW_Natural_Selection", "inicializa pygame")]
+
+
+def test_objetos_grandes_solo_a_pedido():
+    motores, tamanos = ("objetos", "vectorizado"), (500, 10000)
+    por_defecto = combinaciones_macro(motores, tamanos, (10,), (0,))
+    assert por_defecto == [("objetos", 500, 10, 0), ("vectorizado", 500, 10, 0), ("vectorizado", 10000, 10, 0)]
+    assert all(n <= MAX_PARTICULAS_OBJETOS for motor, n, _, _ in por_defecto if motor == "objetos")
+    assert ("objetos", 10000, 10, 0) in combinaciones_macro(motores, tamanos, (10,), (0,), objetos_grandes=True)
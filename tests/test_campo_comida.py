@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from campo_comida import CampoComida
+from motor_simulacion import PRIORIDAD_COMIDA, TAMANO_PASO, calcular_limites
+
+NORMAL, VELOCIDAD, PRIORIDAD = (PRIORIDAD_COMIDA[tipo] for tipo in ("normal", "mutacion_velocidad", "mutacion_prioridad"))
+
+
+@pytest.fixture
+def campo():
+    return CampoComida(calcular_limites(10, 10), TAMANO_PASO)
+
+
+def posicion(campo, columna, fila):
+    return campo.limites['izq'] + columna * TAMANO_PASO, campo.limites['arr'] + fila * TAMANO_PASO
+
+
+def test_interfaz_de_conjunto(campo):
+    comida = [posicion(campo, 2, 3), posicion(campo, 5, 5)]
+    campo.cargar(comida)
+    assert len(campo) == 2
+    assert sorted(campo) == sorted(comida)
+    assert comida[0] in campo and posicion(campo, 1, 1) not in campo
+    # Fuera del mundo nunca hay comida
+    assert (campo.limites['izq'] - TAMANO_PASO, campo.limites['arr']) not in campo
+    campo.remove(comida[0])
+    assert len(campo) == 1 and comida[0] not in campo
+    with pytest.raises(KeyError):
+        campo.remove(comida[0])
+
+
+def test_gana_la_mayor_prioridad_y_se_consume_la_celda(campo):
+    a, b, c = posicion(campo, 2, 2), posicion(campo, 4, 4), posicion(campo, 6, 6)
+    campo.cargar([a, b])
+    # a: normal, velocidad y prioridad; b: dos normales; c: sin comida
+    xs, ys = np.array([a, a, a, b, b, c]).T
+    prioridad = np.array([NORMAL, VELOCIDAD, PRIORIDAD, NORMAL, NORMAL, PRIORIDAD])
+    ganadores = sorted(campo.consumir(xs, ys, prioridad, np.random.default_rng(0)).tolist())
+
+    assert len(ganadores) == 2
+    assert ganadores[0] == 2 and ganadores[1] in (3, 4)
+    assert len(campo) == 0
+    # Ya no queda comida: nadie más gana
+    assert len(campo.consumir(xs, ys, prioridad, np.random.default_rng(0))) == 0
+
+
+def test_velocidad_le_gana_a_normal(campo):
+    a = posicion(campo, 3, 3)
+    campo.cargar([a])
+    xs, ys = np.array([a, a, a]).T
+    assert campo.consumir(xs, ys, np.array([NORMAL, VELOCIDAD, NORMAL]), np.random.default_rng(1)).tolist() == [1]
+
+
+def test_empate_se_sortea_parejo(campo):
+    a = posicion(campo, 3, 3)
+    xs, ys = np.array([a, a, a]).T
+    prioridad = np.array([NORMAL, PRIORIDAD, PRIORIDAD])
+    rng = np.random.default_rng(2)
+    victorias = np.zeros(3, dtype=int)
+    for _ in range(2000):
+        campo.cargar([a])
+        victorias[campo.consumir(xs, ys, prioridad, rng)] += 1
+    assert victorias[0] == 0
+    assert abs(victorias[1] - victorias[2]) < 200
@@ -0,0 +1,133 @@
+import json
+
+import numpy as np
+import pytest
+
+from checkpoint import ESTADO, cargar_checkpoint, guardar_checkpoint, leer_config
+from motor_simulacion import SimulationEngine, calcular_limites
+from motor_vectorizado import MotorVectorizado
+
+MOTORES = (SimulationEngine, MotorVectorizado)
+REBROTES = ({}, {"ticks_rebrote": 15, "distribucion_comida": "parches"},
+            {"ticks_rebrote": 15, "modo_rebrote": "probabilidad"})
+
+
+def crear(clase, **opciones):
+    opciones = dict(dict(num_dias=6, num_particulas_inicial=40, frecuencia_purga=2, duracion_dia=60, pasos_vida=40,
+                         limites=calcular_limites(20, 20), semilla=11), **opciones)
+    return clase(**opciones)
+
+
+def avanzar(motor, pasos):
+    for _ in range(pasos):
+        if motor.terminado:
+            break
+        motor.step()
+
+
+def historiales(motor):
+    return [list(historial) for historial in motor.historiales()]
+
+
+@pytest.mark.parametrize("clase", MOTORES)
+@pytest.mark.parametrize("opciones", REBROTES)
+def test_reanudar_igual_a_corrida_continua(tmp_path, clase, opciones):
+    continuo = crear(clase, **opciones)
+    continuo.run()
+
+    motor = crear(clase, **opciones)
+    # A mitad de un día de purga, con depredadores en juego
+    avanzar(motor, 3 * 60 + 25)
+    ruta = str(tmp_path / "medio.npz")
+    guardar_checkpoint(motor, ruta)
+    reanudado = cargar_checkpoint(ruta)
+    assert type(reanudado) is clase
+    reanudado.run()
+
+    assert historiales(reanudado) == historiales(continuo)
+    np.testing.assert_array_equal(reanudado.posiciones_particulas(), continuo.posiciones_particulas())
+
+
+@pytest.mark.parametrize("clase", MOTORES)
+def test_bifurcar_con_semilla_nueva(tmp_path, clase):
+    motor = crear(clase)
+    avanzar(motor, 2 * 60)
+    ruta = str(tmp_path / "dia_2.npz")
+    guardar_checkpoint(motor, ruta)
+    comun = historiales(motor)
+
+    ramas = []
+    for semilla in (1, 1, 2):
+        rama = cargar_checkpoint(ruta, semilla=semilla)
+        assert rama.semilla == semilla
+        rama.run()
+        ramas.append(historiales(rama))
+    # Las ramas comparten el pasado y solo la semilla decide el futuro
+    for rama in ramas:
+        assert rama[0][:len(comun[0])] == comun[0]
+    assert ramas[0] == ramas[1]
+    assert ramas[0] != ramas[2]
+
+
+def test_solo_se_restauran_los_escalares_conocidos(tmp_path):
+    motor = crear(MotorVectorizado)
+    avanzar(motor, 70)
+    ruta = str(tmp_path / "c.npz")
+    guardar_checkpoint(motor, ruta)
+
+    with np.load(ruta, allow_pickle=False) as datos:
+        arreglos = dict(datos)
+    meta = json.loads(str(arreglos["meta"]))
+    assert set(meta["estado"]) == set(ESTADO)
+    meta["estado"].update(num_dias=10 ** 6, indice="x")
+    arreglos["meta"] = np.array(json.dumps(meta))
+    np.savez_compressed(ruta, **arreglos)
+
+    cargado = cargar_checkpoint(ruta)
+    assert cargado.num_dias == motor.num_dias
+    assert cargado.indice is not None and cargado.indice != "x"
+    assert cargado.paso_actual_dia == motor.paso_actual_dia
+
+
+def test_version_desconocida(tmp_path):
+    ruta = str(tmp_path / "c.npz")
+    guardar_checkpoint(crear(SimulationEngine), ruta)
+    with np.load(ruta, allow_pickle=False) as datos:
+        arreglos = dict(datos)
+    meta = json.loads(str(arreglos["meta"]))
+    meta["version"] += 1
+    arreglos["meta"] = np.array(json.dumps(meta))
+    np.savez_compressed(ruta, **arreglos)
+    with pytest.raises(ValueError):
+        cargar_checkpoint(ruta)
+
+
+def test_reanudar_con_el_otro_motor(tmp_path):
+    motor = crear(SimulationEngine)
+    avanzar(motor, 130)
+    ruta = str(tmp_path / "c.npz")
+    guardar_checkpoint(motor, ruta)
+    vectorizado = cargar_checkpoint(ruta, clase=MotorVectorizado)
+    assert isinstance(vectorizado, MotorVectorizado)
+    np.testing.assert_array_equal(vectorizado.posiciones_particulas(), motor.posiciones_particulas())
+    assert vectorizado.contadores.vivas == motor.contadores.vivas
+    vectorizado.run()
+    assert vectorizado.terminado
+
+
+def test_leer_config(tmp_path):
+    motor = crear(SimulationEngine, ticks_rebrote=15, distribucion_comida="gradiente")
+    ruta = str(tmp_path / "c.npz")
+    guardar_checkpoint(motor, ruta)
+    config = leer_config(ruta)
+    assert config["semilla"] == 11
+    assert config["distribucion"] == "gradiente"
+    assert config["rebrote"] == 15
+    assert (config["ancho_mundo"], config["alto_mundo"]) == (20, 20)
+    assert config["particulas"] == 40
+
+    # La configuración leída recrea la misma corrida desde el día 1
+    copia = SimulationEngine.desde_config(config)
+    copia.run()
+    motor.run()
+    assert historiales(copia) == historiales(motor)
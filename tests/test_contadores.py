@@ -0,0 +1,44 @@
+import pytest
+
+from contadores import TIPOS
+from motor_simulacion import SimulationEngine, calcular_limites
+from motor_vectorizado import MotorVectorizado
+
+
+def recontar(motor):
+    """Los contadores calculados recorriendo toda la población"""
+    particulas = motor.particulas
+    return {
+        "total": len(particulas),
+        "vivas": sum(p.activa for p in particulas),
+        "en_casa": sum(p.en_casa for p in particulas),
+        "comieron": sum(p.ha_comido_hoy for p in particulas),
+        "pueden_reproducirse": sum(p.puede_reproducirse for p in particulas),
+        "por_tipo": {tipo: sum(p.tipo_mutacion == tipo for p in particulas) for tipo in TIPOS},
+    }
+
+
+def leer(contadores):
+    return {
+        "total": contadores.total,
+        "vivas": contadores.vivas,
+        "en_casa": contadores.en_casa,
+        "comieron": contadores.comieron,
+        "pueden_reproducirse": contadores.pueden_reproducirse,
+        "por_tipo": dict(contadores.por_tipo),
+    }
+
+
+@pytest.mark.parametrize("clase", [SimulationEngine, MotorVectorizado])
+def test_contadores_coinciden_con_un_recuento_en_cada_tick(clase):
+    # Purga cada dos días y mundo chico: hay muertes por depredadores, por agotamiento e hijos
+    motor = clase(num_dias=6, num_particulas_inicial=80, frecuencia_purga=2, duracion_dia=120, pasos_vida=60,
+                  limites=calcular_limites(15, 15), semilla=7)
+    assert leer(motor.contadores) == recontar(motor)
+    while not motor.terminado:
+        motor.step()
+        if not motor.terminado:
+            assert leer(motor.contadores) == recontar(motor), (motor.dia_actual, motor.paso_actual_dia)
+    assert motor.dias_cerrados >= 4
+    c = motor.contadores
+    assert c.normales + c.verdes + c.rojos == c.total
@@ -0,0 +1,48 @@
+import numpy as np
+
+from decimacion import agrupar_barras, envolvente_min_max
+
+
+def test_serie_corta_sin_cambios():
+    x = np.arange(10)
+    y = x ** 2
+    xd, yd = envolvente_min_max(x, y, 5)
+    np.testing.assert_array_equal(xd, x)
+    np.testing.assert_array_equal(yd, y)
+
+
+def test_envolvente_conserva_extremos_y_orden():
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 1000, 100003)
+    y[4321] = -5  # Una extinción
+    y[77777] = 5000  # Un pico
+    x = np.arange(len(y))
+    xd, yd = envolvente_min_max(x, y, 200)
+    assert len(xd) <= 2 * 200 + 2
+    assert (np.diff(xd) > 0).all()
+    np.testing.assert_array_equal(yd, y[xd])
+    assert xd[0] == 0 and xd[-1] == len(y) - 1
+    assert {4321, 77777} <= set(xd.tolist())
+
+    # Cada cubeta conserva su mínimo y su máximo
+    largo = -(-len(y) // 200)
+    for inicio in range(0, len(y), largo):
+        cubeta = y[inicio:inicio + largo]
+        dentro = yd[(xd >= inicio) & (xd < inicio + largo)]
+        assert dentro.min() == cubeta.min() and dentro.max() == cubeta.max()
+
+
+def test_agrupar_barras_conserva_las_sumas():
+    x = np.arange(1, 1001)
+    verdes = np.arange(1000)
+    rojos = np.ones(1000, dtype=np.int64)
+    inicio, fin, (suma_verdes, suma_rojos) = agrupar_barras(x, [verdes, rojos], 64)
+    assert len(inicio) == len(fin) == 64
+    assert inicio[0] == 1 and fin[-1] == 1000
+    np.testing.assert_array_equal(inicio[1:], fin[:-1] + 1)
+    assert suma_verdes.sum() == verdes.sum() and suma_rojos.sum() == 1000
+    np.testing.assert_array_equal(suma_rojos, fin - inicio + 1)
+
+    inicio, fin, columnas = agrupar_barras(x[:10], [verdes[:10]], 64)
+    np.testing.assert_array_equal(inicio, fin)
+    np.testing.assert_array_equal(columnas[0], verdes[:10])
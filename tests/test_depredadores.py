@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from motor_simulacion import RADIO_COLISION, RADIO_VISION_DEPREDADOR, calcular_limites
+from motor_vectorizado import MotorVectorizado
+from movimiento import DIRECCIONES_DX, destinos_depredadores
+
+
+class MotorSecuencial(MotorVectorizado):
+    """Referencia: mueve los depredadores de a uno y revisa toda la población en cada turno"""
+
+    def _mover_depredadores(self):
+        activos = [d for d in self.depredadores if d.activo]
+        if not activos:
+            return
+        p = self.poblacion
+        direccion = self.rng.integers(0, len(DIRECCIONES_DX), len(activos))
+        for k, depredador in enumerate(activos):
+            vulnerables = p.activa & ~p.en_casa
+            distancia = np.abs(p.x - depredador.x) + np.abs(p.y - depredador.y)
+            candidatos = np.flatnonzero(vulnerables & (distancia <= RADIO_VISION_DEPREDADOR))
+            objetivo = candidatos[np.argmin(distancia[candidatos])] if len(candidatos) else -1
+            x, y = destinos_depredadores(
+                np.array([depredador.x]), np.array([depredador.y]), p.x[[max(objetivo, 0)]], p.y[[max(objetivo, 0)]],
+                np.array([objetivo >= 0]), direccion[k:k + 1], np.array([depredador.velocidad]), self.limites)
+            depredador.objetivo = int(objetivo) if objetivo >= 0 else None
+            depredador.mover_a(int(x[0]), int(y[0]))
+
+            alcance = (p.x - depredador.x) ** 2 + (p.y - depredador.y) ** 2 < RADIO_COLISION ** 2
+            golpeadas = np.flatnonzero(vulnerables & (p.invulnerable_frames == 0) & alcance)
+            if len(golpeadas):
+                murieron = golpeadas[self._recibir_danos(golpeadas)]
+                self.muertes.extend(zip(p.x[murieron].tolist(), p.y[murieron].tolist()))
+                depredador.particulas_eliminadas += len(murieron)
+                if len(murieron):
+                    depredador.objetivo = None
+
+
+def corrida(clase, particulas, depredadores, columnas, semilla):
+    motor = clase(num_dias=2, num_particulas_inicial=particulas, num_depredadores=depredadores, frecuencia_purga=1,
+                  duracion_dia=150, pasos_vida=100, limites=calcular_limites(columnas, columnas), semilla=semilla)
+    muertes = []
+    while not motor.terminado:
+        motor.step()
+        muertes.append(list(motor.muertes))
+    estado = [(d.x, d.y, d.particulas_eliminadas, d.objetivo) for d in motor.depredadores]
+    return list(motor.historial_poblacion), muertes, estado
+
+
+# Mundos chicos y muchos depredadores: varios pierden su presa ante uno anterior en el mismo tick
+@pytest.mark.parametrize("particulas, depredadores, columnas", [(300, 40, 30), (400, 20, 60), (150, 60, 20)])
+@pytest.mark.parametrize("semilla", [0, 1])
+def test_lote_equivale_a_mover_de_a_uno(particulas, depredadores, columnas, semilla):
+    lote = corrida(MotorVectorizado, particulas, depredadores, columnas, semilla)
+    secuencial = corrida(MotorSecuencial, particulas, depredadores, columnas, semilla)
+    assert sum(len(muertes) for muertes in lote[1]) > 0
+    assert lote == secuencial
+
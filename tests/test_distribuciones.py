@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from campo_comida import (DISTRIBUCIONES, CampoComida, Distribucion, DistribucionGradiente, crear_distribucion,
+                          indice_interior)
+from motor_simulacion import TAMANO_PASO, SimulationEngine, calcular_limites, generar_comida
+
+LIMITES = calcular_limites(30, 20)
+
+
+@pytest.mark.parametrize("nombre", DISTRIBUCIONES)
+def test_celdas_interiores_distintas(nombre):
+    rng = np.random.default_rng(0)
+    distribucion = crear_distribucion(nombre, LIMITES, TAMANO_PASO, rng)
+    celdas = generar_comida(LIMITES, 25, rng, distribucion)
+    # El porcentaje es sobre todo el mapa, borde incluido
+    assert len(celdas) == 30 * 20 * 25 // 100
+    assert len(np.unique(celdas)) == len(celdas)
+    fila, columna = np.divmod(celdas, 30)
+    assert ((fila > 0) & (fila < 19) & (columna > 0) & (columna < 29)).all()
+
+    campo = CampoComida(LIMITES, TAMANO_PASO)
+    campo.cargar_celdas(celdas)
+    assert len(campo) == len(celdas)
+
+
+@pytest.mark.parametrize("nombre", DISTRIBUCIONES)
+def test_mas_comida_que_celdas(nombre):
+    rng = np.random.default_rng(0)
+    distribucion = crear_distribucion(nombre, LIMITES, TAMANO_PASO, rng)
+    assert np.array_equal(np.sort(distribucion.muestrear(10 ** 6, rng)), distribucion.interior)
+    assert len(distribucion.muestrear(0, rng)) == 0
+
+
+def test_indice_interior_compartido():
+    interior = indice_interior(LIMITES, TAMANO_PASO)
+    assert indice_interior(dict(LIMITES), TAMANO_PASO) is interior
+    assert len(interior) == 28 * 18
+    with pytest.raises(ValueError):
+        interior[0] = 0
+
+
+def frecuencias(nombre, semilla=0, dias=400):
+    rng = np.random.default_rng(semilla)
+    distribucion = crear_distribucion(nombre, LIMITES, TAMANO_PASO, rng)
+    conteo = np.zeros(30 * 20)
+    for _ in range(dias):
+        np.add.at(conteo, distribucion.muestrear(60, rng), 1)
+    return conteo.reshape(20, 30)
+
+
+def test_gradiente_crece_hacia_la_derecha():
+    por_columna = frecuencias("gradiente").sum(axis=0)[1:-1]
+    izquierda, derecha = por_columna[:9].sum(), por_columna[-9:].sum()
+    assert derecha > 3 * izquierda
+    assert np.corrcoef(np.arange(len(por_columna)), por_columna)[0, 1] > 0.9
+
+
+def test_uniforme_sin_sesgo():
+    por_columna = frecuencias("uniforme").sum(axis=0)[1:-1]
+    assert abs(np.corrcoef(np.arange(len(por_columna)), por_columna)[0, 1]) < 0.5
+    assert por_columna.min() > 0.7 * por_columna.mean()
+
+
+def test_parches_concentran_la_comida():
+    def decil_superior(conteo):
+        conteo = np.sort(conteo.ravel())[::-1]
+        return conteo[:len(conteo) // 10].sum() / conteo.sum()
+
+    # La décima parte de las celdas más visitadas recibe mucho más que con el reparto uniforme
+    assert decil_superior(frecuencias("parches")) > 1.5 * decil_superior(frecuencias("uniforme"))
+
+
+def test_distribucion_propia_y_desconocida():
+    class SoloPrimeraColumna(Distribucion):
+        def pesos(self, rng):
+            _, columna = self.coordenadas()
+            return np.where(columna == 1, 1.0, 1e-12)
+
+    rng = np.random.default_rng(0)
+    distribucion = crear_distribucion(SoloPrimeraColumna, LIMITES, TAMANO_PASO, rng)
+    assert (distribucion.muestrear(18, rng) % 30 == 1).all()
+    with pytest.raises(ValueError):
+        crear_distribucion("espiral", LIMITES, TAMANO_PASO, rng)
+
+
+def test_motor_con_gradiente():
+    motor = SimulationEngine(num_dias=3, num_particulas_inicial=20, limites=LIMITES, semilla=2,
+                             distribucion_comida=DistribucionGradiente)
+    assert isinstance(motor.distribucion, DistribucionGradiente)
+    assert len(motor.comida_pos) == 30 * 20 * motor.porcentaje_comida // 100
+    motor.run()
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from checkpoint import cargar_checkpoint, guardar_checkpoint, leer_config
+from ensamble import (REPLICAS_EXACTAS, SERIES, AcumuladorWelford, CuantilP2, EstadisticasEnsamble, ejecutar_ensamble,
+                      ejecutar_ensamble_en_segundo_plano, ejecutar_replica)
+from motor_simulacion import CONFIG_POR_DEFECTO
+from motor_vectorizado import MotorVectorizado
+
+
+def test_welford_coincide_con_numpy():
+    datos = np.random.default_rng(0).normal(50, 12, size=(500, 7))
+    acumulador = AcumuladorWelford(7)
+    for fila in datos:
+        acumulador.agregar(fila)
+    assert acumulador.media == pytest.approx(datos.mean(axis=0))
+    assert acumulador.varianza == pytest.approx(datos.var(axis=0, ddof=1))
+    inferior, superior = acumulador.intervalo_confianza()
+    assert superior - inferior == pytest.approx(2 * 1.96 * datos.std(axis=0, ddof=1) / np.sqrt(500))
+
+
+def test_welford_con_una_sola_replica_no_tiene_varianza():
+    acumulador = AcumuladorWelford(3)
+    acumulador.agregar(np.array([1.0, 2.0, 3.0]))
+    assert acumulador.varianza.tolist() == [0, 0, 0]
+
+
+@pytest.mark.parametrize("p", [0.05, 0.5, 0.95])
+def test_p2_se_acerca_al_cuantil_exacto(p):
+    rng = np.random.default_rng(1)
+    # Una columna por distribución: normal, exponencial (asimétrica) y discreta con muchos empates
+    datos = np.column_stack([rng.normal(100, 15, 5000), rng.exponential(20, 5000), rng.integers(0, 10, 5000)])
+    estimador = CuantilP2(p, 3)
+    for fila in datos:
+        estimador.agregar(fila)
+    # Tolerancia en rango: la estimación cae entre los cuantiles p - 0.02 y p + 0.02
+    # (la interpolación parabólica puede quedar a milésimas de los valores enteros)
+    valor = estimador.valor()
+    assert np.all(np.quantile(datos, max(p - 0.02, 0), axis=0) - 1e-3 <= valor)
+    assert np.all(valor <= np.quantile(datos, min(p + 0.02, 1), axis=0) + 1e-3)
+
+
+def test_p2_con_menos_de_cinco_observaciones_es_exacto():
+    estimador = CuantilP2(0.5, 1)
+    for valor in (3.0, 1.0, 2.0):
+        estimador.agregar(np.array([valor]))
+    assert estimador.valor().tolist() == [2.0]
+
+
+def historiales(valores):
+    tipos = [{"normal": v, "verde": 0, "rojo": 0} for v in valores]
+    return list(valores), tipos
+
+
+def test_cuantiles_exactos_hasta_replicas_exactas():
+    rng = np.random.default_rng(2)
+    replicas = rng.integers(0, 100, size=(REPLICAS_EXACTAS + 30, 4))
+    estadisticas = EstadisticasEnsamble(3)
+    for k, valores in enumerate(replicas, 1):
+        estadisticas.agregar(*historiales(valores))
+        resumen = estadisticas.resumen("poblacion")
+        if k <= REPLICAS_EXACTAS:
+            assert resumen["p50"] == pytest.approx(np.quantile(replicas[:k], 0.5, axis=0))
+    # Con más réplicas ya no se guardan los valores: P² y Welford
+    assert estadisticas._exactos is None
+    assert resumen["media"] == pytest.approx(replicas.mean(axis=0))
+    assert set(estadisticas.tabla()[0]) >= {f"{serie}_p95" for serie in SERIES}
+
+
+def test_extincion_cuenta_como_cero_el_resto_de_los_dias():
+    estadisticas = EstadisticasEnsamble(4)
+    estadisticas.agregar(*historiales([10, 4, 0]), extinta=True)
+    estadisticas.agregar(*historiales([10, 6, 6, 8, 8]))
+    assert estadisticas.resumen("poblacion")["media"].tolist() == [10, 5, 3, 4, 4]
+    assert estadisticas.extinciones == 1
+
+
+def test_ensamble_no_depende_del_numero_de_procesos():
+    config = dict(CONFIG_POR_DEFECTO, dias=3, particulas=15, duracion=120, pasos=60, ancho_mundo=10, alto_mundo=10,
+                  semilla=9)
+    avisos = []
+    uno = ejecutar_ensamble(config, 6, procesos=1)
+    dos = ejecutar_ensamble(config, 6, procesos=2, progreso=lambda hechas, total, extinta: avisos.append(hechas))
+    assert avisos == [1, 2, 3, 4, 5, 6]
+    assert uno.tabla() == dos.tabla()
+
+
+def test_replica_desde_checkpoint_conserva_el_motor_guardado(tmp_path):
+    config = dict(CONFIG_POR_DEFECTO, dias=4, particulas=30, duracion=120, pasos=60, ancho_mundo=15, alto_mundo=15,
+                  frecuencia_purga=2, semilla=3)
+    motor = MotorVectorizado.desde_config(config)
+    for _ in range(150):
+        motor.step()
+    ruta = str(tmp_path / "c.npz")
+    guardar_checkpoint(motor, ruta)
+
+    semilla = np.random.SeedSequence(5)
+    bifurcado = cargar_checkpoint(ruta, semilla=semilla)
+    assert isinstance(bifurcado, MotorVectorizado)
+    poblacion, tipos, _, _ = bifurcado.run()
+    # Sin vectorizado=True la réplica sigue con el motor del checkpoint, no con SimulationEngine
+    replica = ejecutar_replica(leer_config(ruta), semilla, desde=ruta)
+    assert (list(replica[0]), list(replica[1]), replica[2]) == (list(poblacion), list(tipos), bifurcado.extinta)
+
+
+def test_ensamble_en_segundo_plano_igual_al_directo():
+    config = dict(CONFIG_POR_DEFECTO, dias=3, particulas=15, duracion=120, pasos=60, ancho_mundo=10, alto_mundo=10,
+                  semilla=4)
+    avisos = []
+    futuro = ejecutar_ensamble_en_segundo_plano(config, 3, progreso=lambda hechas, total, extinta: avisos.append(hechas))
+    assert futuro.result(timeout=60).tabla() == ejecutar_ensamble(config, 3, procesos=1).tabla()
+    assert avisos == [1, 2, 3]
@@ -0,0 +1,61 @@
+from collections import deque
+
+import numpy as np
+
+from historial_columnar import CAPACIDAD_INICIAL, SerieColumnar, TablaColumnar, como_tabla
+from motor_simulacion import SimulationEngine, calcular_limites
+
+
+def test_serie_se_comporta_como_lista():
+    serie = SerieColumnar([3, 1])
+    valores = [3, 1]
+    for valor in range(2 * CAPACIDAD_INICIAL + 5):
+        serie.append(valor)
+        valores.append(valor)
+    assert len(serie) == len(valores)
+    assert list(serie) == valores
+    assert serie[0] == 3 and serie[-1] == valores[-1]
+    assert serie[5:9] == valores[5:9]
+    assert isinstance(serie[0], int)
+    np.testing.assert_array_equal(np.asarray(serie), valores)
+
+
+def test_vista_sin_copia():
+    serie = SerieColumnar([1, 2, 3])
+    assert np.shares_memory(serie.vista(), serie._datos)
+    tabla = TablaColumnar([{"a": 1, "b": 0.5}])
+    assert np.shares_memory(tabla.columna("a"), tabla.series["a"]._datos)
+
+
+def test_tabla_tipos_y_filas():
+    registros = [{"dia": dia, "media": dia / 3, "purga": dia % 2 == 0} for dia in range(100)]
+    tabla = TablaColumnar(registros)
+    assert tabla.claves == ["dia", "media", "purga"]
+    assert tabla.columna("dia").dtype == np.int64
+    assert tabla.columna("media").dtype == np.float64
+    assert tabla.columna("purga").dtype == np.bool_
+    assert len(tabla) == 100
+    assert list(tabla) == registros
+    assert tabla[7] == registros[7]
+    assert tabla[-3:] == registros[-3:]
+    assert len(TablaColumnar()) == 0
+
+
+def test_desde_columnas_y_como_tabla():
+    tabla = TablaColumnar.desde_columnas({"x": np.arange(4), "y": np.ones(4)})
+    assert list(tabla) == [{"x": i, "y": 1.0} for i in range(4)]
+    tabla.append({"x": 9, "y": 2.0})
+    assert tabla[-1] == {"x": 9, "y": 2.0}
+
+    assert como_tabla(tabla) is tabla
+    registros = deque([{"x": 1}, {"x": 2}], maxlen=2)
+    assert list(como_tabla(registros)) == list(registros)
+
+
+def test_historiales_del_motor_son_columnares():
+    motor = SimulationEngine(num_dias=5, num_particulas_inicial=30, limites=calcular_limites(20, 20), semilla=3)
+    motor.run()
+    assert isinstance(motor.historial_poblacion, SerieColumnar)
+    assert isinstance(motor.historial_tipos, TablaColumnar)
+    total = sum(motor.historial_tipos.columna(tipo) for tipo in ("normal", "verde", "rojo"))
+    np.testing.assert_array_equal(total, np.asarray(motor.historial_poblacion))
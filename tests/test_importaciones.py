@@ -0,0 +1,10 @@
+import pytest
+
+from benchmark import MODULOS_IMPORTACION, medir_importacion
+
+
+@pytest.mark.parametrize("modulo", MODULOS_IMPORTACION)
+def test_importar_no_carga_matplotlib_ni_inicia_pygame(modulo):
+    datos = medir_importacion(modulo, repeticiones=1)
+    assert not datos["matplotlib"]
+    assert not datos["pygame_iniciado"]
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from indice_espacial import IndiceEspacial
+from motor_simulacion import TAMANO_PASO, calcular_limites
+
+
+def poblacion(columnas, cantidad, semilla=0):
+    """Límites de un mundo cuadrado y posiciones al azar dentro de él"""
+    limites = calcular_limites(columnas, columnas)
+    rng = np.random.default_rng(semilla)
+    xs = rng.integers(limites['izq'], limites['der'] + 1, cantidad)
+    ys = rng.integers(limites['arr'], limites['abaj'] + 1, cantidad)
+    return limites, xs, ys, rng
+
+
+# Mundo chico para su población (tabla densa de inicios) y mundo grande (solo claves ocupadas)
+MUNDOS = [(30, 2000), (400, 2000), (30, 0), (30, 3)]
+
+
+@pytest.fixture(params=MUNDOS, ids=lambda mundo: f"{mundo[0]}x{mundo[0]}-{mundo[1]}")
+def mundo(request):
+    columnas, cantidad = request.param
+    limites, xs, ys, rng = poblacion(columnas, cantidad)
+    indice = IndiceEspacial(limites, TAMANO_PASO)
+    indice.construir(xs, ys)
+    # Consultas dentro del mundo y algunas fuera (se recortan a las celdas del borde)
+    qx = rng.integers(limites['izq'] - 100, limites['der'] + 100, 40)
+    qy = rng.integers(limites['arr'] - 100, limites['abaj'] + 100, 40)
+    return indice, xs, ys, qx, qy
+
+
+def manhattan(xs, ys, x, y):
+    return np.abs(xs - x) + np.abs(ys - y)
+
+
+@pytest.mark.parametrize("radio", [15, 60, 100, 250])
+def test_consultas_de_un_punto(mundo, radio):
+    indice, xs, ys, qx, qy = mundo
+    for x, y in zip(qx.tolist(), qy.tolist()):
+        distancia = manhattan(xs, ys, x, y)
+        assert indice.dentro_de_manhattan(x, y, radio).tolist() == np.flatnonzero(distancia <= radio).tolist()
+        cercanos = np.flatnonzero((xs - x) ** 2 + (ys - y) ** 2 < radio ** 2)
+        assert indice.dentro_de_radio(x, y, radio).tolist() == cercanos.tolist()
+
+        validos = np.arange(len(xs)) % 3 != 0
+        candidatos = np.flatnonzero(validos & (distancia <= radio))
+        esperado = candidatos[np.argmin(distancia[candidatos])] if len(candidatos) else -1
+        assert indice.mas_cercano_manhattan(x, y, radio, validos) == esperado
+
+
+@pytest.mark.parametrize("radio", [15, 60, 100, 250])
+def test_consultas_en_lote(mundo, radio):
+    indice, xs, ys, qx, qy = mundo
+    esperado = [(q, i) for q in range(len(qx)) for i in np.flatnonzero(manhattan(xs, ys, qx[q], qy[q]) <= radio)]
+    consulta, filas = indice.pares_dentro_de_manhattan(qx, qy, radio)
+    assert list(zip(consulta.tolist(), filas.tolist())) == esperado
+
+    esperado = [(q, i) for q in range(len(qx))
+                for i in np.flatnonzero((xs - qx[q]) ** 2 + (ys - qy[q]) ** 2 < radio ** 2)]
+    consulta, filas = indice.pares_dentro_de_radio(qx, qy, radio, ordenar=False)
+    assert sorted(zip(consulta.tolist(), filas.tolist())) == esperado
+
+
+def test_mas_cercanos_en_lote_con_vencimiento(mundo):
+    indice, xs, ys, qx, qy = mundo
+    validos = np.arange(len(xs)) % 4 != 1
+    # El índice i solo vale para las consultas q <= vence[i]
+    vence = np.random.default_rng(5).integers(0, len(qx), len(xs))
+    turnos = np.arange(len(qx))
+    resultado = indice.mas_cercanos_manhattan(qx, qy, 100, validos, vence=vence, turnos=turnos)
+    sin_vencimiento = indice.mas_cercanos_manhattan(qx, qy, 100, validos)
+    for q in range(len(qx)):
+        distancia = manhattan(xs, ys, qx[q], qy[q])
+        for filtro, obtenido in ((validos, sin_vencimiento[q]), (validos & (vence >= q), resultado[q])):
+            candidatos = np.flatnonzero(filtro & (distancia <= 100))
+            assert obtenido == (candidatos[np.argmin(distancia[candidatos])] if len(candidatos) else -1)
+
+
+def test_en_rectangulo(mundo):
+    indice, xs, ys, qx, qy = mundo
+    for x, y in zip(qx.tolist(), qy.tolist()):
+        dentro = (xs >= x) & (xs <= x + 300) & (ys >= y) & (ys <= y + 180)
+        assert indice.en_rectangulo(x, y, x + 300, y + 180).tolist() == np.flatnonzero(dentro).tolist()
+
+
+def test_reconstruir_reemplaza_las_posiciones():
+    limites, xs, ys, _ = poblacion(20, 100)
+    indice = IndiceEspacial(limites, TAMANO_PASO)
+    indice.construir(xs, ys)
+    indice.construir(xs[:10], ys[:10])
+    assert len(indice) == 10
+    assert indice.dentro_de_manhattan(xs[0], ys[0], 10 ** 6).tolist() == list(range(10))
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+import motor_simulacion
+from motor_simulacion import CONFIG_POR_DEFECTO, SimulationEngine, calcular_limites, celdas_mundo
+
+
+def test_run_sin_interfaz_registra_un_dia_por_dia_cerrado():
+    motor = SimulationEngine(num_dias=6, num_particulas_inicial=30, frecuencia_purga=2, semilla=1)
+    historial_poblacion, historial_tipos, historial_depredadores, historial_estadisticas = motor.run()
+
+    assert motor.terminado
+    assert len(historial_poblacion) == len(historial_tipos) == motor.dias_cerrados + 1
+    assert len(historial_estadisticas) == motor.dias_cerrados
+    assert historial_poblacion[0] == 30
+    assert historial_poblacion[-1] == len(motor.particulas)
+    # Purgas en los días 2, 4 y 6 mientras la población no se extinga
+    assert [registro["dia"] for registro in historial_depredadores] == [
+        dia for dia in (2, 4, 6) if dia <= motor.dias_cerrados]
+
+
+def test_run_por_tramos_equivale_a_una_corrida():
+    completo = SimulationEngine(num_dias=5, num_particulas_inicial=30, semilla=3)
+    completo.run()
+    por_tramos = SimulationEngine(num_dias=5, num_particulas_inicial=30, semilla=3)
+    por_tramos.run(2)
+    assert por_tramos.dia_actual == 3
+    por_tramos.run_day()
+    por_tramos.run()
+    assert list(por_tramos.historial_poblacion) == list(completo.historial_poblacion)
+
+
+def test_duracion_del_dia_siempre_mayor_que_los_pasos_de_vida():
+    motor = SimulationEngine(num_dias=1, pasos_vida=50, duracion_dia=10, num_particulas_inicial=5, semilla=0)
+    assert motor.duracion_dia == 51
+
+
+def test_desde_config_usa_las_claves_de_la_pantalla():
+    config = dict(CONFIG_POR_DEFECTO, dias=2, particulas=12, ancho_mundo=10, alto_mundo=8, semilla=5)
+    motor = SimulationEngine.desde_config(config)
+    assert (motor.num_dias, motor.num_particulas_inicial) == (2, 12)
+    assert celdas_mundo(motor.limites) == (10, 8)
+
+
+def test_mundo_fuera_de_rango():
+    with pytest.raises(ValueError):
+        calcular_limites(2, 10)
+
+
+def test_main_batch_escribe_los_historiales(tmp_path, capsys):
+    salida = tmp_path / "corrida.json"
+    motor_simulacion.main(["--dias", "3", "--particulas", "20", "--semilla", "4", "--salida", str(salida)])
+    assert "Días simulados" in capsys.readouterr().out
+    datos = json.loads(salida.read_text(encoding="utf-8"))
+    assert datos["config"]["semilla"] == 4
+    assert datos["historial_poblacion"][0] == 20
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from camara import MARGEN_CAMARA, ZOOM_MAXIMO, Camara
+from indice_espacial import IndiceEspacial
+from motor_simulacion import MAX_CELDAS_MUNDO, TAMANO_PASO, calcular_limites, celdas_mundo
+from motor_vectorizado import MotorVectorizado
+
+VISTA = (0, 102, 720, 648)
+
+
+def test_limites_independientes_de_la_ventana():
+    limites = calcular_limites(2000, 1500)
+    assert celdas_mundo(limites) == (2000, 1500)
+    assert celdas_mundo(calcular_limites(2000))[0] == 2000
+    for celdas in (2, MAX_CELDAS_MUNDO + 1):
+        with pytest.raises(ValueError):
+            calcular_limites(celdas, 10)
+
+
+def test_indice_disperso_en_un_mundo_enorme():
+    limites = calcular_limites(2000, 2000)
+    rng = np.random.default_rng(0)
+    xs = rng.integers(limites['izq'], limites['der'] + 1, 5000)
+    ys = rng.integers(limites['arr'], limites['abaj'] + 1, 5000)
+    indice = IndiceEspacial(limites, TAMANO_PASO)
+    indice.construir(xs, ys)
+    # Cuatro millones de celdas para cinco mil posiciones: nada por celda
+    assert indice._densa is None
+
+    for x0, y0 in rng.integers(limites['izq'], limites['der'], (20, 2)).tolist():
+        x1, y1 = x0 + 720, y0 + 648
+        esperados = np.flatnonzero((xs >= x0) & (xs <= x1) & (ys >= y0) & (ys <= y1))
+        np.testing.assert_array_equal(indice.en_rectangulo(x0, y0, x1, y1), esperados)
+
+
+def test_motor_en_un_mundo_enorme():
+    motor = MotorVectorizado(num_dias=2, num_particulas_inicial=300, duracion_dia=60, pasos_vida=40,
+                             limites=calcular_limites(2000, 2000), semilla=1)
+    motor.run()
+    assert motor.terminado
+
+
+def test_vista_inicial_es_la_identidad():
+    camara = Camara(calcular_limites(), VISTA)
+    assert camara.zoom == 1.0
+    assert camara.punto(123, 456) == (123, 456)
+    assert camara.a_mundo(123, 456) == (123, 456)
+
+
+def test_punto_y_a_mundo_son_inversas():
+    camara = Camara(calcular_limites(500, 500), VISTA)
+    camara.acercar(2.3)
+    camara.desplazar(4000, 2500)
+    for x, y in ((500, 900), (3000, 7000)):
+        sx, sy = camara.punto(x, y)
+        mx, my = camara.a_mundo(sx, sy)
+        assert abs(mx - x) <= 1 / camara.zoom and abs(my - y) <= 1 / camara.zoom
+    xs, ys = camara.puntos(np.array([500, 3000]), np.array([900, 7000]))
+    assert list(zip(xs.tolist(), ys.tolist())) == [camara.punto(500, 900), camara.punto(3000, 7000)]
+
+
+def test_acercar_deja_fijo_el_ancla():
+    camara = Camara(calcular_limites(500, 500), VISTA)
+    camara.desplazar(3000, 3000)
+    ancla = (300, 400)
+    antes = camara.a_mundo(*ancla)
+    camara.acercar(1.25, ancla=ancla)
+    assert camara.a_mundo(*ancla) == pytest.approx(antes)
+
+
+def test_zoom_y_desplazamiento_acotados():
+    limites = calcular_limites(500, 500)
+    camara = Camara(limites, VISTA)
+    for _ in range(50):
+        camara.acercar(1.25)
+    assert camara.zoom == ZOOM_MAXIMO
+    for _ in range(50):
+        camara.acercar(0.8)
+    # Alejado al máximo el mundo completo cabe en la vista
+    assert camara.zoom == pytest.approx(camara.zoom_minimo)
+    x0, y0, x1, y1 = camara.rectangulo_visible()
+    assert x0 <= limites['izq'] and x1 >= limites['der']
+
+    camara.restablecer()
+    camara.desplazar(-10 ** 7, -10 ** 7)
+    assert camara.x == limites['izq'] - MARGEN_CAMARA and camara.y == limites['arr'] - MARGEN_CAMARA
+    camara.desplazar(10 ** 8, 10 ** 8)
+    x0, y0, x1, y1 = camara.rectangulo_visible()
+    assert x1 == pytest.approx(limites['der'] + MARGEN_CAMARA)
+
+
+def test_celdas_visibles_dentro_del_mundo():
+    limites = calcular_limites(500, 500)
+    camara = Camara(limites, VISTA)
+    camara.desplazar(2000, 1000)
+    fila0, fila1, columna0, columna1 = camara.celdas_visibles(TAMANO_PASO)
+    assert 0 <= fila0 < fila1 <= 500 and 0 <= columna0 < columna1 <= 500
+    # Con margen de una celda cubren todo el rectángulo visible
+    x0, y0, x1, y1 = camara.rectangulo_visible()
+    assert limites['izq'] + columna0 * TAMANO_PASO <= x0 and limites['izq'] + columna1 * TAMANO_PASO >= x1
+    assert limites['arr'] + fila0 * TAMANO_PASO <= y0 and limites['arr'] + fila1 * TAMANO_PASO >= y1
+    # Y cubren solo lo que se ve, no el mundo completo
+    assert (fila1 - fila0) * (columna1 - columna0) < 60 * 60
@@ -0,0 +1,65 @@
+import pytest
+
+from motor_simulacion import SimulationEngine, calcular_limites
+from motor_vectorizado import MotorVectorizado
+from perfilador import FASES, Perfilador, resumen_dias
+
+OPCIONES = dict(num_dias=4, num_particulas_inicial=40, frecuencia_purga=2, duracion_dia=60, pasos_vida=40,
+                limites=calcular_limites(20, 20), semilla=9)
+
+
+@pytest.mark.parametrize("clase", (SimulationEngine, MotorVectorizado))
+def test_perfilar_no_cambia_la_corrida(clase):
+    sin_perfilar = clase(**OPCIONES)
+    sin_perfilar.run()
+    motor = clase(**OPCIONES)
+    motor.activar_perfilador(True)
+    motor.run()
+
+    assert [list(h) for h in motor.historiales()] == [list(h) for h in sin_perfilar.historiales()]
+    assert len(sin_perfilar.historial_tiempos) == 0
+    tiempos = list(motor.historial_tiempos)
+    assert [registro["dia"] for registro in tiempos] == list(range(1, motor.dias_cerrados + 1))
+    assert all(registro["ticks"] == 60 for registro in tiempos)
+    assert all(registro["movimiento_ms"] > 0 for registro in tiempos)
+    # Solo los días de purga tienen depredadores que mover
+    assert all((registro["depredadores_ms"] > 0) == (registro["dia"] % 2 == 0) for registro in tiempos)
+
+
+def test_desactivar_conserva_los_dias_medidos():
+    motor = SimulationEngine(**OPCIONES)
+    motor.activar_perfilador(True)
+    motor.run_day()
+    motor.activar_perfilador(False)
+    motor.run_day()
+    assert motor.perfilador is None
+    assert len(motor.historial_tiempos) == 1
+
+
+def test_ventana_movil_y_resumen():
+    perfilador = Perfilador([], ventana=3)
+    for nanosegundos in (1e6, 2e6, 3e6, 4e6):
+        perfilador.agregar("movimiento", nanosegundos)
+        perfilador.agregar("dibujo", 3e6)
+        perfilador.cerrar_cuadro()
+    filas = {fila[0]: fila[1:] for fila in perfilador.resumen()}
+    # La ventana conserva los tres últimos cuadros de cada fase, aunque no haya medido nada
+    assert set(filas) == set(FASES)
+    media, p50, p95, porcentaje = filas["movimiento"]
+    assert (media, p50) == (pytest.approx(3.0), pytest.approx(3.0))
+    assert porcentaje == pytest.approx(50.0)
+
+
+def test_registro_por_dia_y_resumen_de_dias():
+    historial = []
+    perfilador = Perfilador(historial)
+    perfilador.ticks = 10
+    perfilador.agregar("comida", 2e6)
+    perfilador.agregar("muerte", 6e6)
+    perfilador.cerrar_dia(1)
+    perfilador.agregar("comida", 2e6)
+    perfilador.cerrar_dia(2)
+    assert historial[0]["ticks"] == 10 and historial[0]["muerte_ms"] == 6.0 and historial[1]["ticks"] == 0
+    totales = resumen_dias(historial)
+    assert totales["comida"] == (4.0, 40.0)
+    assert totales["muerte"] == (6.0, 60.0)
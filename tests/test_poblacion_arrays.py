@@ -0,0 +1,61 @@
+import random
+
+import numpy as np
+
+from motor_simulacion import COLOR_MUTACION_PRIORIDAD, Particula, calcular_limites, crear_particulas_iniciales
+from poblacion_arrays import (
+    NOMBRES_CAMPOS, TIPO_NORMAL, TIPO_PRIORIDAD, TIPO_VELOCIDAD, PoblacionArrays
+)
+
+
+def test_agregar_crece_y_conserva_las_filas_anteriores():
+    poblacion = PoblacionArrays(capacidad=2)
+    poblacion.agregar([20, 40], [60, 80], TIPO_NORMAL, 100)
+    poblacion.stamina[0] = 5.0
+    poblacion.agregar(np.arange(10) * 20, np.zeros(10), [TIPO_VELOCIDAD] * 5 + [TIPO_PRIORIDAD] * 5, 50)
+
+    assert len(poblacion) == 12
+    assert poblacion.capacidad >= 12
+    assert poblacion.stamina[0] == 5.0
+    assert poblacion.x[:2].tolist() == [20, 40]
+    # Velocidad base y vida máxima según el tipo
+    assert poblacion.velocidad_base.tolist() == [1, 1] + [2] * 5 + [1] * 5
+    assert poblacion.vida_maxima.tolist() == [1, 1] + [1] * 5 + [2] * 5
+    assert poblacion.pasos_restantes[2:].tolist() == [50] * 10
+    assert poblacion.en_casa.all() and poblacion.activa.all()
+    assert poblacion.contar_tipos().tolist() == [2, 5, 5]
+
+
+def test_compactar_conserva_el_orden():
+    poblacion = PoblacionArrays()
+    poblacion.agregar(np.arange(6) * 20, np.arange(6) * 20, TIPO_NORMAL, 10)
+    poblacion.compactar(np.array([True, False, True, False, False, True]))
+    assert poblacion.x.tolist() == [0, 40, 100]
+    assert all(len(getattr(poblacion, nombre)) == 3 for nombre in NOMBRES_CAMPOS)
+
+
+def test_ida_y_vuelta_con_particulas():
+    particulas = crear_particulas_iniciales(calcular_limites(), 8, 100, random.Random(1))
+    particulas[3] = Particula(particulas[3].x, particulas[3].y, 100, tipo_mutacion="mutacion_prioridad")
+    particulas[3].activa = False
+    particulas[5].stamina = 42.5
+    particulas[6].pos_inicial = (0, 0)
+
+    poblacion = PoblacionArrays.desde_particulas(particulas)
+    copia = PoblacionArrays.desde_particulas(poblacion.a_particulas())
+    for nombre in NOMBRES_CAMPOS:
+        assert np.array_equal(getattr(copia, nombre), getattr(poblacion, nombre)), nombre
+    assert poblacion.tipo[3] == TIPO_PRIORIDAD
+    assert poblacion.stamina[5] == 42.5
+
+
+def test_vista_expone_la_interfaz_de_particula():
+    poblacion = PoblacionArrays()
+    poblacion.agregar([100], [200], TIPO_PRIORIDAD, 30)
+    vista = poblacion.vista(0)
+    assert (vista.x, vista.y) == (100, 200)
+    assert vista.tipo_mutacion == "mutacion_prioridad"
+    assert vista.color == COLOR_MUTACION_PRIORIDAD
+    assert vista.activa and vista.en_casa and not vista.debe_morir
+    assert vista.pasos_restantes == 30
+    assert vista.trayectoria is None
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from campo_comida import CampoComida, RebroteComida
+from motor_simulacion import TAMANO_PASO, SimulationEngine, calcular_limites
+from motor_vectorizado import MotorVectorizado
+
+LIMITES = calcular_limites(20, 20)
+
+
+def campo_con_rebrote(retraso, modo="fijo", semilla=0):
+    campo = CampoComida(LIMITES, TAMANO_PASO)
+    rebrote = RebroteComida(campo, retraso, np.random.default_rng(semilla), modo)
+    return campo, rebrote
+
+
+def comer(campo, celdas):
+    """Consume las celdas dadas con una partícula normal en cada una"""
+    xs, ys = campo.posicion(np.asarray(celdas))
+    campo.consumir(xs, ys, np.zeros(len(celdas), dtype=np.int8), np.random.default_rng(0))
+
+
+def ticks_hasta_rebrotar(campo, rebrote, celdas, maximo):
+    """Tick (contado desde ahora) en que rebrota cada celda"""
+    rebroto = np.full(len(celdas), -1)
+    for tick in range(1, maximo + 1):
+        rebrote.avanzar()
+        nuevas = (rebroto < 0) & campo._plano[celdas]
+        rebroto[nuevas] = tick
+    return rebroto
+
+
+def test_fijo_rebrota_exactamente_a_los_n_ticks():
+    campo, rebrote = campo_con_rebrote(7)
+    celdas = np.arange(21, 60)
+    campo.cargar_celdas(celdas)
+    comer(campo, celdas[:20])
+    assert len(campo) == len(celdas) - 20
+    # Otra tanda, comida tres ticks más tarde
+    for _ in range(3):
+        rebrote.avanzar()
+    comer(campo, celdas[20:])
+    assert len(campo) == 0
+
+    rebroto = ticks_hasta_rebrotar(campo, rebrote, celdas, 20)
+    assert (rebroto[:20] == 4).all() and (rebroto[20:] == 7).all()
+    assert len(campo) == len(celdas)
+    assert (rebrote.vence == -1).all()
+
+
+def test_retraso_por_celda_y_celdas_que_dan_varias_vueltas():
+    retraso = np.full(400, 3)
+    retraso[:200] = 11
+    campo, rebrote = campo_con_rebrote(retraso)
+    celdas = np.array([5, 250])
+    campo.cargar_celdas(celdas)
+    comer(campo, celdas)
+    assert ticks_hasta_rebrotar(campo, rebrote, celdas, 30).tolist() == [11, 3]
+
+
+def test_probabilidad_rebrota_en_promedio_a_los_n_ticks():
+    campo, rebrote = campo_con_rebrote(8, "probabilidad", semilla=3)
+    celdas = np.arange(400)
+    rebroto = []
+    for _ in range(40):
+        campo.cargar_celdas(celdas)
+        comer(campo, celdas)
+        rebroto.append(ticks_hasta_rebrotar(campo, rebrote, celdas, 200))
+    rebroto = np.concatenate(rebroto)
+    assert (rebroto >= 1).all()
+    # Geométrica con p = 1/8: media 8, y a veces tarda varias vueltas de la rueda
+    assert rebroto.mean() == pytest.approx(8, rel=0.05)
+    assert rebroto.max() > len(rebrote._ranuras)
+
+
+def test_cargar_celdas_olvida_los_rebrotes():
+    campo, rebrote = campo_con_rebrote(5)
+    campo.cargar_celdas([21, 22])
+    comer(campo, [21])
+    campo.cargar_celdas([30])
+    assert (rebrote.vence == -1).all()
+    for _ in range(10):
+        rebrote.avanzar()
+    assert sorted(np.flatnonzero(campo._plano)) == [30]
+
+
+def test_restaurar_continua_la_rueda():
+    campo, rebrote = campo_con_rebrote(6, "probabilidad", semilla=1)
+    celdas = np.arange(21, 200)
+    campo.cargar_celdas(celdas)
+    comer(campo, celdas)
+    for _ in range(4):
+        rebrote.avanzar()
+
+    copia, rebrote_copia = campo_con_rebrote(6, "probabilidad", semilla=1)
+    copia.celdas[:] = campo.celdas
+    copia.cantidad = campo.cantidad
+    rebrote_copia.restaurar(rebrote.vence.copy(), rebrote.tick)
+    for _ in range(60):
+        assert rebrote.avanzar() == rebrote_copia.avanzar()
+        np.testing.assert_array_equal(copia.celdas, campo.celdas)
+
+
+def test_modo_desconocido():
+    with pytest.raises(ValueError):
+        campo_con_rebrote(5, "exponencial")
+
+
+@pytest.mark.parametrize("clase", (SimulationEngine, MotorVectorizado))
+def test_motor_con_rebrote_no_repone_la_comida_cada_dia(clase):
+    motor = clase(num_dias=4, num_particulas_inicial=40, limites=LIMITES, semilla=6, ticks_rebrote=10 ** 4)
+    inicial = len(motor.comida_pos)
+    motor.run()
+    # Con un retraso enorme nada rebrota: la comida del día 1 solo se consume
+    assert len(motor.comida_pos) == inicial - (motor.comida_pos.rebrote.vence >= 0).sum()
+    assert len(motor.comida_pos) < inicial
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from contadores import TIPOS
+from motor_simulacion import TAMANO_PASO, calcular_limites
+from motor_vectorizado import MotorVectorizado
+from poblacion_arrays import TIPO_NORMAL, TIPO_PRIORIDAD, TIPO_VELOCIDAD
+
+N = 6000
+
+
+def motor_al_cierre(semilla=0):
+    """Motor con una población sorteada de tipos y resultados del día, lista para _cerrar_dia"""
+    motor = MotorVectorizado(num_particulas_inicial=N, pasos_vida=30, limites=calcular_limites(40, 40),
+                             semilla=semilla)
+    p = motor.poblacion
+    rng = np.random.default_rng(semilla)
+    p.tipo[:] = rng.integers(0, 3, N)
+    p.veces_comido[:] = rng.integers(0, 5, N)
+    p.ha_comido_hoy[:] = p.veces_comido > 0
+    p.en_casa[:] = rng.random(N) < 0.7
+    p.puede_reproducirse[:] = p.ha_comido_hoy & p.en_casa & (p.veces_comido >= 2)
+    p.x[:] = rng.integers(1, 39, N)
+    p.pasos_restantes[:] = 3
+    c = motor.contadores
+    c.por_tipo = dict(zip(TIPOS, p.contar_tipos().tolist()))
+    return motor
+
+
+def test_recambio_en_lote():
+    motor = motor_al_cierre()
+    p = motor.poblacion
+    sobrevive = p.ha_comido_hoy & p.en_casa
+    padres = sobrevive & p.puede_reproducirse
+    tipos_sobrevivientes = p.tipo[sobrevive].copy()
+    tipos_padres = p.tipo[padres].copy()
+    veces_padres = p.veces_comido[padres].copy()
+
+    motor._cerrar_dia()
+
+    sobrevivientes = len(tipos_sobrevivientes)
+    assert len(p) == sobrevivientes + len(tipos_padres)
+    # Primero los sobrevivientes en su orden, luego un hijo por padre
+    np.testing.assert_array_equal(p.tipo[:sobrevivientes], tipos_sobrevivientes)
+    hijos = p.tipo[sobrevivientes:]
+    # Si comió 2 veces: hijo igual al padre, salvo que pierda la mutación heredada
+    iguales = veces_padres == 2
+    perdida = (tipos_padres != TIPO_NORMAL) & (hijos == TIPO_NORMAL)
+    assert ((hijos == tipos_padres) | perdida)[iguales].all()
+    # De un padre normal con 3+ comidas nace siempre un mutado
+    assert (hijos[(veces_padres >= 3) & (tipos_padres == TIPO_NORMAL)] != TIPO_NORMAL).all()
+
+    # Todos empiezan el día siguiente reiniciados, a un paso del borde
+    l = motor.limites
+    assert ((p.x == l["izq"] + TAMANO_PASO) | (p.x == l["der"] - TAMANO_PASO) |
+            (p.y == l["arr"] + TAMANO_PASO) | (p.y == l["abaj"] - TAMANO_PASO)).all()
+    np.testing.assert_array_equal(p.pos_inicial_x, p.x)
+    assert p.en_casa.all() and p.activa.all()
+    assert not (p.ha_comido_hoy.any() or p.puede_reproducirse.any() or p.salio_de_casa.any())
+    assert (p.pasos_restantes == 30).all() and (p.veces_comido == 0).all()
+
+    c = motor.contadores
+    assert c.total == len(p) == motor.historial_poblacion[-1]
+    assert [c.por_tipo[tipo] for tipo in TIPOS] == p.contar_tipos().tolist()
+    assert c.vivas == c.en_casa == c.total
+
+
+def test_proporciones_de_mutacion_y_herencia():
+    motor = motor_al_cierre(1)
+    p = motor.poblacion
+    sobrevive = p.ha_comido_hoy & p.en_casa
+    padres = sobrevive & p.puede_reproducirse
+    sobrevivientes = int(np.count_nonzero(sobrevive))
+    mutan = p.veces_comido[padres] >= 3
+    padre_mutado = p.tipo[padres] != TIPO_NORMAL
+    motor._cerrar_dia()
+    hijos = p.tipo[sobrevivientes:]
+
+    # Mutación: mitad velocidad, mitad prioridad
+    normales = hijos[mutan & ~padre_mutado]
+    assert np.mean(normales == TIPO_VELOCIDAD) == pytest.approx(0.5, abs=0.06)
+    # Con padre mutado, el 20% de los hijos mutados pierde la mutación
+    mutados = hijos[mutan & padre_mutado]
+    assert np.mean(mutados == TIPO_NORMAL) == pytest.approx(0.2, abs=0.05)
+    assert np.mean(mutados == TIPO_PRIORIDAD) == pytest.approx(0.4, abs=0.06)
+
+
+def test_extincion():
+    motor = motor_al_cierre()
+    motor.poblacion.ha_comido_hoy[:] = False
+    motor._cerrar_dia()
+    assert motor.extinta and len(motor.poblacion) == 0 and motor.contadores.total == 0
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from motor_simulacion import SimulationEngine, calcular_limites, flujos_aleatorios
+from motor_vectorizado import MotorVectorizado
+
+MOTORES = (SimulationEngine, MotorVectorizado)
+
+
+def corrida(clase, semilla, **opciones):
+    opciones = dict(dict(num_dias=5, num_particulas_inicial=40, frecuencia_purga=2, limites=calcular_limites(20, 20)),
+                    **opciones)
+    motor = clase(semilla=semilla, **opciones)
+    muertes = []
+    while not motor.terminado:
+        motor.step()
+        muertes.extend(motor.muertes)
+    return historiales(motor), muertes
+
+
+def historiales(motor):
+    poblacion, tipos, depredadores, estadisticas = motor.historiales()
+    return list(poblacion), list(tipos), list(depredadores), list(estadisticas)
+
+
+@pytest.mark.parametrize("clase", MOTORES)
+@pytest.mark.parametrize("opciones", [{}, {"distribucion_comida": "parches", "ticks_rebrote": 40},
+                                      {"ticks_rebrote": 10, "modo_rebrote": "probabilidad"}])
+def test_misma_semilla_mismo_historial(clase, opciones):
+    assert corrida(clase, 123, **opciones) == corrida(clase, 123, **opciones)
+
+
+@pytest.mark.parametrize("clase", MOTORES)
+def test_otra_semilla_otro_historial(clase):
+    assert corrida(clase, 1) != corrida(clase, 2)
+
+
+@pytest.mark.parametrize("clase", MOTORES)
+def test_reiniciar_repite_la_corrida(clase):
+    motor = clase(num_dias=4, num_particulas_inicial=30, frecuencia_purga=2, semilla=5)
+    motor.run()
+    primera = historiales(motor)
+    motor.reiniciar()
+    motor.run()
+    assert historiales(motor) == primera
+
+
+def test_flujos_derivados_de_la_semilla():
+    rng_a, aleatorio_a = flujos_aleatorios(7)
+    rng_b, aleatorio_b = flujos_aleatorios(np.random.SeedSequence(7))
+    assert rng_a.integers(0, 10 ** 9, 5).tolist() == rng_b.integers(0, 10 ** 9, 5).tolist()
+    assert aleatorio_a.random() == aleatorio_b.random()
+
+    # Los hijos de un ensamble dan flujos distintos, y derivarlos no altera la secuencia recibida
+    hijo_1, hijo_2 = np.random.SeedSequence(7).spawn(2)
+    assert flujos_aleatorios(hijo_1)[0].random() != flujos_aleatorios(hijo_2)[0].random()
+    flujos_aleatorios(hijo_1)
+    assert hijo_1.n_children_spawned == 0
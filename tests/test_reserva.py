@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from motor_simulacion import Depredador, Particula, Reserva, SimulationEngine, calcular_limites
+from trayectorias import Trayectoria
+
+
+def estado(entidad):
+    valores = {nombre: getattr(entidad, nombre) for nombre in type(entidad).__slots__ if nombre != "trayectoria"}
+    trayectoria = entidad.trayectoria
+    valores["trayectoria"] = None if trayectoria is None else (trayectoria.largo, trayectoria.puntos())
+    return valores
+
+
+@pytest.mark.parametrize("largo", (0, 8))
+def test_reutilizada_igual_a_nueva(largo):
+    limites = calcular_limites(20, 20)
+    aleatorio = random.Random(1)
+    reserva = Reserva(Particula)
+    usada = reserva.obtener(3, 4, 30, "mutacion_prioridad", largo)
+    for _ in range(5):
+        usada.mover(limites, aleatorio)
+    usada.recibir_dano()
+    usada.ha_comido_hoy = True
+    usada.veces_comido = 3
+    reserva.devolver(usada)
+
+    reutilizada = reserva.obtener(7, 8, 30, "mutacion_velocidad", largo)
+    assert reutilizada is usada
+    assert estado(reutilizada) == estado(Particula(7, 8, 30, "mutacion_velocidad", largo))
+    if largo:
+        # El buffer de la trayectoria también se reutiliza
+        assert isinstance(reutilizada.trayectoria, Trayectoria)
+
+
+def test_depredador_reutilizado():
+    reserva = Reserva(Depredador)
+    depredador = reserva.obtener(1, 1)
+    depredador.particulas_eliminadas = 4
+    depredador.objetivo = Particula(0, 0, 10)
+    depredador.activo = False
+    reserva.devolver_todas([depredador])
+    assert reserva.obtener(5, 6) is depredador
+    assert estado(depredador) == estado(Depredador(5, 6))
+
+
+def test_entidades_sin_dict():
+    for entidad in (Particula(0, 0, 10), Depredador(0, 0)):
+        assert not hasattr(entidad, "__dict__")
+
+
+def test_recambio_diario_reutiliza_las_muertas():
+    motor = SimulationEngine(num_dias=12, num_particulas_inicial=40, frecuencia_purga=2,
+                             limites=calcular_limites(20, 20), semilla=8)
+    anteriores = vistas = {id(p) for p in motor.particulas}
+    while not motor.terminado:
+        motor.run_day()
+        vivas = {id(p) for p in motor.particulas}
+        libres = {id(p) for p in motor.reserva_particulas.libres}
+        assert not vivas & libres
+        assert vivas | libres >= vistas
+        # Los sobrevivientes siguen siendo los mismos objetos; solo se crean partículas
+        # cuando no alcanzan las de la reserva, así nunca hay más objetos que la
+        # población anterior más los hijos del día
+        hijos = len(vivas - anteriores)
+        assert len(vivas | libres) <= max(len(vistas), len(anteriores) + hijos)
+        anteriores = vivas
+        vistas = vistas | vivas | libres
+    # Al cerrar cada purga los depredadores vuelven a su reserva
+    assert not motor.depredadores
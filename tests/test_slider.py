@@ -0,0 +1,26 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from SRW_Natural_Selection import TICKS_POR_SEGUNDO_MAX, TICKS_POR_SEGUNDO_MIN, Slider  # noqa: E402
+
+
+def arrastrar(slider, x):
+    slider.manejar_evento(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(x, slider.rect.centery), button=1))
+    slider.manejar_evento(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(x, slider.rect.centery), button=1))
+    return slider.valor
+
+
+def test_escala_logaritmica_de_ticks_por_segundo():
+    slider = Slider(100, 50, 200, TICKS_POR_SEGUNDO_MIN, TICKS_POR_SEGUNDO_MAX, 30, logaritmico=True)
+    assert arrastrar(slider, 100) == TICKS_POR_SEGUNDO_MIN
+    assert arrastrar(slider, 299) == pytest.approx(TICKS_POR_SEGUNDO_MAX, rel=0.05)
+    # La mitad del recorrido es la media geométrica, no la aritmética
+    assert arrastrar(slider, 200) == round((TICKS_POR_SEGUNDO_MIN * TICKS_POR_SEGUNDO_MAX) ** 0.5)
+    assert slider._proporcion() == pytest.approx(0.5, abs=0.01)
+
+
+def test_escala_lineal():
+    slider = Slider(0, 0, 100, 0, 50, 10)
+    assert arrastrar(slider, 50) == 25
+    assert slider._proporcion() == 0.5
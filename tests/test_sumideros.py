@@ -0,0 +1,87 @@
+import csv
+import json
+
+import pytest
+
+from motor_simulacion import SimulationEngine, calcular_limites
+from motor_vectorizado import MotorVectorizado
+from sumideros import EscritorHistorial, SumideroJSONL, crear_sumidero
+
+OPCIONES = dict(num_dias=7, num_particulas_inicial=30, frecuencia_purga=2, limites=calcular_limites(20, 20),
+                semilla=4)
+
+
+def leer_csv(ruta):
+    with open(ruta, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def como_texto(registros):
+    return [{clave: str(valor) for clave, valor in registro.items()} for registro in registros]
+
+
+@pytest.mark.parametrize("clase", (SimulationEngine, MotorVectorizado))
+def test_csv_con_cola_igual_al_historial_completo(tmp_path, clase):
+    completo = clase(**OPCIONES)
+    completo.run()
+
+    motor = clase(**OPCIONES)
+    with EscritorHistorial(str(tmp_path / "corrida.csv"), filas_por_lote=2) as escritor:
+        motor.activar_historial(escritor, cola=3)
+        motor.run()
+
+    assert leer_csv(tmp_path / "corrida_estadisticas.csv") == como_texto(completo.historial_estadisticas)
+    assert leer_csv(tmp_path / "corrida_depredadores.csv") == como_texto(completo.historial_depredadores)
+    poblacion = [{"dia": dia, "poblacion": total, **tipos} for dia, (total, tipos)
+                 in enumerate(zip(completo.historial_poblacion, completo.historial_tipos))]
+    assert leer_csv(tmp_path / "corrida_poblacion.csv") == como_texto(poblacion)
+
+    # En memoria quedan solo los últimos registros
+    assert list(motor.historial_estadisticas) == list(completo.historial_estadisticas)[-3:]
+    assert list(motor.historial_poblacion) == list(completo.historial_poblacion)[-3:]
+
+
+def test_reiniciar_escribe_archivos_nuevos(tmp_path):
+    motor = SimulationEngine(**OPCIONES)
+    escritor = EscritorHistorial(str(tmp_path / "corrida.jsonl"))
+    motor.activar_historial(escritor)
+    motor.run()
+    motor.reiniciar()
+    motor.run()
+    escritor.cerrar()
+
+    with open(tmp_path / "corrida_estadisticas.jsonl", encoding="utf-8") as f:
+        primera = [json.loads(linea) for linea in f]
+    with open(tmp_path / "corrida_2_estadisticas.jsonl", encoding="utf-8") as f:
+        segunda = [json.loads(linea) for linea in f]
+    # Misma semilla: el reinicio repite la corrida, cada una en su archivo
+    assert primera == segunda == list(motor.historial_estadisticas)
+    assert [registro["dia"] for registro in primera] == list(range(1, len(primera) + 1))
+
+
+def test_lotes_se_escriben_al_completarse(tmp_path):
+    ruta = tmp_path / "t.jsonl"
+    sumidero = SumideroJSONL(str(ruta), filas_por_lote=3)
+    sumidero.escribir_filas({"dia": dia} for dia in range(2))
+    assert not ruta.exists()
+    sumidero.escribir({"dia": 2})
+    assert sumidero.filas_escritas == 3
+    assert len(ruta.read_text(encoding="utf-8").splitlines()) == 3
+    sumidero.escribir({"dia": 3})
+    sumidero.cerrar()
+    assert len(ruta.read_text(encoding="utf-8").splitlines()) == 4
+
+
+def test_formato_desconocido(tmp_path):
+    with pytest.raises(ValueError):
+        crear_sumidero(str(tmp_path / "t.txt"))
+    with pytest.raises(ValueError):
+        EscritorHistorial(str(tmp_path / "t.xlsx"))
+
+
+def test_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    ruta = str(tmp_path / "t.parquet")
+    with crear_sumidero(ruta, filas_por_lote=2) as sumidero:
+        sumidero.escribir_filas({"dia": dia, "media": dia / 2} for dia in range(5))
+    assert pq.read_table(ruta).to_pylist() == [{"dia": dia, "media": dia / 2} for dia in range(5)]
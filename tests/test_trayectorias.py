@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from motor_simulacion import SimulationEngine
+from motor_vectorizado import MotorVectorizado
+from trayectorias import Trayectoria, TrayectoriasPoblacion
+
+
+def test_trayectoria_conserva_los_ultimos_puntos():
+    trayectoria = Trayectoria(4, 0, 0)
+    for k in range(1, 7):
+        trayectoria.agregar(k, 10 * k)
+    assert len(trayectoria) == 4
+    assert trayectoria.puntos() == [(3, 30), (4, 40), (5, 50), (6, 60)]
+    trayectoria.reiniciar(7, 8)
+    assert trayectoria.puntos() == [(7, 8)]
+
+
+def test_trayectorias_de_la_poblacion_igual_que_una_por_fila():
+    xs = np.array([0, 100, 200])
+    ys = np.array([5, 15, 25])
+    poblacion = TrayectoriasPoblacion(3, xs, ys)
+    referencia = [Trayectoria(3, x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        filas = np.flatnonzero(rng.random(3) < 0.7)
+        nuevos_x = rng.integers(0, 60000, len(filas))
+        nuevos_y = rng.integers(0, 60000, len(filas))
+        poblacion.registrar(filas, nuevos_x, nuevos_y)
+        for fila, x, y in zip(filas.tolist(), nuevos_x.tolist(), nuevos_y.tolist()):
+            referencia[fila].agregar(x, y)
+    for i, trayectoria in enumerate(referencia):
+        assert len(poblacion.fila(i)) == len(trayectoria)
+        assert [tuple(punto) for punto in poblacion.fila(i).puntos()] == trayectoria.puntos()
+
+
+@pytest.mark.parametrize("clase", [SimulationEngine, MotorVectorizado])
+def test_solo_se_registran_mientras_se_muestran(clase):
+    motor = clase(num_dias=2, num_particulas_inicial=20, frecuencia_purga=1, semilla=0, largo_trayectoria=16)
+    assert motor.particula(0).trayectoria is None
+    motor.activar_trayectorias(True)
+    for _ in range(40):
+        motor.step()
+    particula = motor.particula(0)
+    assert 1 < len(particula.trayectoria) <= 16
+    # El último punto registrado es la posición actual
+    assert tuple(particula.trayectoria.puntos()[-1]) == (particula.x, particula.y)
+    assert all(len(d.trayectoria) <= 16 for d in motor.depredadores)
+    motor.activar_trayectorias(False)
+    assert motor.particula(0).trayectoria is None
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from contadores import ContadoresPoblacion
+from motor_simulacion import TAMANO_PASO, SimulationEngine, calcular_limites
+from motor_vectorizado import MotorVectorizado
+from movimiento import esta_en_borde, generar_posiciones_borde, mover_poblacion
+from poblacion_arrays import TIPO_NORMAL, TIPO_VELOCIDAD, PoblacionArrays
+
+MOTORES = (SimulationEngine, MotorVectorizado)
+
+
+def poblacion_en_el_borde(limites, rng, cantidad, tipo=TIPO_NORMAL, pasos_vida=100):
+    poblacion = PoblacionArrays()
+    poblacion.agregar(*generar_posiciones_borde(limites, rng, cantidad), tipo, pasos_vida)
+    return poblacion
+
+
+def test_posiciones_iniciales_a_un_paso_del_borde():
+    limites = calcular_limites(12, 9)
+    xs, ys = generar_posiciones_borde(limites, np.random.default_rng(0), 500)
+    assert ((xs - limites['izq']) % TAMANO_PASO == 0).all() and ((ys - limites['arr']) % TAMANO_PASO == 0).all()
+    # Un paso hacia adentro desde algún borde
+    adentro = ((xs == limites['izq'] + TAMANO_PASO) | (xs == limites['der'] - TAMANO_PASO) |
+               (ys == limites['arr'] + TAMANO_PASO) | (ys == limites['abaj'] - TAMANO_PASO))
+    assert adentro.all()
+
+
+def test_mover_poblacion_da_un_paso_en_el_grid_por_subpaso():
+    limites = calcular_limites(15, 15)
+    rng = np.random.default_rng(1)
+    p = poblacion_en_el_borde(limites, rng, 400)
+    contadores = ContadoresPoblacion()
+    contadores.nacer("normal", len(p))
+    contadores.iniciar_dia()
+    contadores.en_casa = int(p.en_casa.sum())
+
+    for _ in range(30):
+        x0, y0, stamina0, fuera0 = p.x.copy(), p.y.copy(), p.stamina.copy(), ~p.en_casa
+        pasos0 = p.pasos_restantes.copy()
+        mover_poblacion(p, limites, rng, contadores=contadores)
+        distancia = np.abs(p.x - x0) + np.abs(p.y - y0)
+        # Las normales dan un paso; contra una pared pueden quedarse quietas
+        assert np.isin(distancia, (0, TAMANO_PASO)).all()
+        assert (p.pasos_restantes == pasos0 - 1).all()
+        assert (p.x >= limites['izq']).all() and (p.x <= limites['der']).all()
+        assert (p.y >= limites['arr']).all() and (p.y <= limites['abaj']).all()
+        assert np.array_equal(p.en_casa, esta_en_borde(p.x, p.y, limites))
+        assert contadores.en_casa == int(p.en_casa.sum())
+        # La stamina solo baja por los pasos fuera de casa
+        assert (p.stamina <= stamina0).all()
+        assert (p.stamina[~fuera0 & p.en_casa] == stamina0[~fuera0 & p.en_casa]).all()
+
+
+def test_mutacion_de_velocidad_da_dos_subpasos_con_stamina_llena():
+    limites = calcular_limites(40, 40)
+    p = PoblacionArrays()
+    centro_x = limites['izq'] + 20 * TAMANO_PASO
+    centro_y = limites['arr'] + 20 * TAMANO_PASO
+    p.agregar([centro_x] * 50, [centro_y] * 50, TIPO_VELOCIDAD, 100)
+    mover_poblacion(p, limites, np.random.default_rng(2))
+    assert (p.pasos_restantes == 98).all()
+    assert np.isin(np.abs(p.x - centro_x) + np.abs(p.y - centro_y), (0, 2 * TAMANO_PASO)).all()
+
+
+def test_particulas_sin_pasos_no_se_mueven():
+    limites = calcular_limites(15, 15)
+    p = poblacion_en_el_borde(limites, np.random.default_rng(3), 50, pasos_vida=0)
+    x0 = p.x.copy()
+    mover_poblacion(p, limites, np.random.default_rng(3))
+    assert np.array_equal(p.x, x0)
+
+
+@pytest.mark.parametrize("clase", MOTORES)
+def test_invariantes_de_cada_dia(clase):
+    motor = clase(num_dias=8, num_particulas_inicial=60, frecuencia_purga=2, semilla=11)
+    motor.run()
+    for registro in motor.historial_estadisticas:
+        assert registro["normales"] + registro["verdes"] + registro["rojos"] == registro["poblacion_total"]
+        assert 0 <= registro["comieron"] <= registro["poblacion_total"]
+        assert 0 <= registro["pueden_reproducirse"] <= registro["comieron"]
+    poblacion = list(motor.historial_poblacion)
+    # Cada partícula que se reproduce tiene un solo hijo
+    for anterior, registro, siguiente in zip(poblacion, motor.historial_estadisticas, poblacion[1:]):
+        assert siguiente <= anterior + registro["pueden_reproducirse"]
+
+
+def test_ambos_motores_dan_la_misma_dinamica_media():
+    """Con distinto generador no coinciden corrida a corrida, pero sí en promedio"""
+    medias = []
+    for clase in MOTORES:
+        corridas = []
+        for semilla in range(12):
+            motor = clase(num_dias=2, num_particulas_inicial=60, semilla=semilla)
+            motor.run()
+            corridas.append([motor.historial_poblacion[-1],
+                             np.mean([registro["comieron"] for registro in motor.historial_estadisticas])])
+        medias.append(np.mean(corridas, axis=0))
+    escalar, vectorizado = medias
+    assert vectorizado == pytest.approx(escalar, rel=0.2)
+
+
+def test_motor_vectorizado_expone_particulas_como_vistas():
+    motor = MotorVectorizado(num_dias=1, num_particulas_inicial=10, semilla=0)
+    xs, ys = motor.posiciones_particulas()
+    assert [(particula.x, particula.y) for particula in motor.particulas] == list(zip(xs.tolist(), ys.tolist()))
+    assert motor.particula(3).tipo_mutacion == "normal"
@@ -0,0 +1,99 @@
+"""
+Trayectorias acotadas: buffers circulares de coordenadas de 16 bits
+sin signo (hasta 65535 píxeles, ver MAX_CELDAS_MUNDO).
+
+Cada entidad guarda solo los últimos `largo` puntos de su recorrido en un
+buffer de capacidad fija, así la memoria no crece con la duración del día ni
+con el número de subpasos. Los motores solo las registran mientras se
+muestran (tecla T); con las trayectorias ocultas el atributo es None.
+"""
+from array import array
+
+import numpy as np
+
+LARGO_TRAYECTORIA = 200  # Puntos que se conservan de la cola de cada trayectoria
+
+
+class Trayectoria:
+    """Buffer circular de los últimos `largo` puntos (x, y) de una entidad"""
+
+    __slots__ = ("largo", "_coords", "_cabeza", "_longitud")
+
+    def __init__(self, largo, x, y):
+        self.largo = largo
+        # x, y intercalados en un arreglo compacto de uint16
+        self._coords = array('H', bytes(4 * largo))
+        self.reiniciar(x, y)
+
+    def reiniciar(self, x, y):
+        """Descarta el recorrido y empieza de nuevo en (x, y)"""
+        self._cabeza = 0
+        self._longitud = 0
+        self.agregar(x, y)
+
+    def agregar(self, x, y):
+        i = 2 * self._cabeza
+        self._coords[i] = x
+        self._coords[i + 1] = y
+        self._cabeza = (self._cabeza + 1) % self.largo
+        if self._longitud < self.largo:
+            self._longitud += 1
+
+    def __len__(self):
+        return self._longitud
+
+    def puntos(self):
+        """Lista de puntos del más antiguo al más reciente (para pygame.draw.lines)"""
+        coords = self._coords
+        inicio = self._cabeza - self._longitud
+        return [(coords[2 * (k % self.largo)], coords[2 * (k % self.largo) + 1])
+                for k in range(inicio, self._cabeza)]
+
+
+class TrayectoriasPoblacion:
+    """
+    Trayectorias de todas las filas de PoblacionArrays en un solo arreglo
+    (filas, largo, 2) de uint16, con un cursor por fila.
+    """
+
+    def __init__(self, largo, xs, ys):
+        self.largo = largo
+        self.reiniciar(xs, ys)
+
+    def reiniciar(self, xs, ys):
+        """Una trayectoria por posición, con (xs[i], ys[i]) como primer punto"""
+        n = len(xs)
+        self._coords = np.empty((n, self.largo, 2), dtype=np.uint16)
+        self._coords[:, 0, 0] = xs
+        self._coords[:, 0, 1] = ys
+        self._cabeza = np.ones(n, dtype=np.int32) % self.largo
+        self._longitud = np.ones(n, dtype=np.int32)
+
+    def registrar(self, filas, xs, ys):
+        """Agrega el punto (xs[k], ys[k]) a la trayectoria de filas[k]"""
+        cabeza = self._cabeza[filas]
+        self._coords[filas, cabeza, 0] = xs
+        self._coords[filas, cabeza, 1] = ys
+        self._cabeza[filas] = (cabeza + 1) % self.largo
+        self._longitud[filas] = np.minimum(self._longitud[filas] + 1, self.largo)
+
+    def fila(self, i):
+        """Trayectoria de la fila i con la interfaz de Trayectoria (len y puntos)"""
+        return _TrayectoriaFila(self, i)
+
+
+class _TrayectoriaFila:
+    __slots__ = ("_trayectorias", "_i")
+
+    def __init__(self, trayectorias, i):
+        self._trayectorias = trayectorias
+        self._i = i
+
+    def __len__(self):
+        return int(self._trayectorias._longitud[self._i])
+
+    def puntos(self):
+        t = self._trayectorias
+        longitud = int(t._longitud[self._i])
+        orden = (t._cabeza[self._i] - longitud + np.arange(longitud)) % t.largo
+        return t._coords[self._i, orden].tolist()